@@ -1,5 +1,5 @@
 import { NextRequest, NextResponse } from 'next/server';
-import { ContentConverterV2 } from '@/lib/content-converter-v2';
+import { ContentConverterV2, ConversionBusyError } from '@/lib/content-converter-v2';
 import { detectContentType } from '@/lib/content-types';
 import { getContentBySlug } from '@/lib/mdx';
 import fs from 'fs';
@@ -89,6 +89,13 @@ author: Milav Dabgar
     return response;
 
   } catch (error) {
+    if (error instanceof ConversionBusyError) {
+      // Backpressure: every build slot is taken, so ask the client to come back
+      return NextResponse.json(
+        { error: 'busy, retry', details: error.message },
+        { status: 503, headers: { 'Retry-After': String(error.retryAfter) } }
+      );
+    }
     console.error('Download conversion error:', error);
     return NextResponse.json(
       {
@@ -2,6 +2,7 @@
 import { NextRequest, NextResponse } from 'next/server';
 import fs from 'fs';
 import path from 'path';
+import crypto from 'crypto';
 import mime from 'mime';
 
 export async function GET(request: NextRequest) {
@@ -52,13 +53,22 @@ export async function GET(request: NextRequest) {
         const contentType = mime.getType(absolutePath) || 'application/octet-stream';
         const filename = path.basename(absolutePath);
 
-        return new NextResponse(fileBuffer, {
-            headers: {
-                'Content-Type': contentType,
-                'Content-Disposition': `inline; filename="${filename}"`,
-                'Cache-Control': 'public, max-age=3600'
-            }
-        });
+        // Content-hash ETag: deterministic PDF builds keep it stable across deploys,
+        // so clients revalidate unchanged files instead of downloading them again
+        const etag = `"${crypto.createHash('sha256').update(fileBuffer).digest('hex')}"`;
+        const headers = {
+            'Content-Type': contentType,
+            'Content-Disposition': `inline; filename="${filename}"`,
+            'Cache-Control': 'public, max-age=3600',
+            'ETag': etag
+        };
+
+        const ifNoneMatch = request.headers.get('if-none-match');
+        if (ifNoneMatch && ifNoneMatch.split(',').some(tag => tag.trim().replace(/^W\//, '') === etag)) {
+            return new NextResponse(null, { status: 304, headers });
+        }
+
+        return new NextResponse(fileBuffer, { headers });
 
     } catch (error) {
         console.error('File serve error:', error);
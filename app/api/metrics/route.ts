@@ -0,0 +1,30 @@
+import { NextResponse } from 'next/server';
+import { execFile } from 'child_process';
+import { promisify } from 'util';
+import path from 'path';
+
+const execFileAsync = promisify(execFile);
+
+// Prometheus scrape endpoint for the LaTeX conversion pipeline (see scripts/build_metrics.py)
+export async function GET() {
+  try {
+    const scriptPath = path.resolve(process.cwd(), 'scripts/build_metrics.py');
+    const { stdout } = await execFileAsync('python3', [scriptPath], { timeout: 10000 });
+
+    return new NextResponse(stdout, {
+      headers: {
+        'Content-Type': 'text/plain; version=0.0.4; charset=utf-8',
+        'Cache-Control': 'no-store',
+      },
+    });
+  } catch (error) {
+    console.error('Metrics collection error:', error);
+    return NextResponse.json(
+      {
+        error: 'Failed to collect metrics',
+        details: error instanceof Error ? error.message : String(error)
+      },
+      { status: 500 }
+    );
+  }
+}
@@ -8,12 +8,19 @@ Achieves 100% mapping accuracy with comprehensive keyword mappings
 import json
 import re
 import os
+import sys
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Set
 from dataclasses import dataclass
 from datetime import datetime
 import unicodedata
 
+# Shared corpus tools live in <project root>/scripts
+sys.path.insert(0, str(Path(__file__).resolve().parents[6] / 'scripts'))
+from question_dedup import cluster_questions
+from keyword_pack import KeywordPack
+from content_snapshot import read_text
+
 @dataclass
 class Question:
     id: str
@@ -23,13 +30,16 @@ class Question:
     marks: int = 0
     mapping_score: float = 0.0
     mapping_path: str = ""
+    duplicate_cluster: str = ""
+    cluster_frequency: int = 1
 
 class PythonQuestionBankGenerator:
     def __init__(self, subject_path: str):
         self.subject_path = Path(subject_path)
         self.questions = []
         self.syllabus = None
-        self.enhanced_keywords_map = {}
+        # Topic keyword sets live in 1323203-keywords.json, compiled once into a cached pack
+        self.keyword_pack = KeywordPack(self.subject_path / "1323203-keywords.json")
         self.unit_topics_map = {}
         
     def load_syllabus(self) -> bool:
@@ -39,8 +49,7 @@ class PythonQuestionBankGenerator:
             print(f"Error: Syllabus file not found at {syllabus_file}")
             return False
             
-        with open(syllabus_file, 'r', encoding='utf-8') as f:
-            self.syllabus = json.load(f)
+        self.syllabus = json.loads(read_text(syllabus_file))
             
         print(f"Loaded syllabus: {self.syllabus['courseInfo']['courseTitle']}")
         return True
@@ -70,478 +79,6 @@ class PythonQuestionBankGenerator:
                     'title': topic_title,
                     'full_path': topic_key
                 }
-        
-        # Enhanced Python Programming Keywords with comprehensive coverage
-        self.enhanced_keywords_map = {
-            # Unit I: Problem Solving using Flowchart and Algorithm
-            "Problem Solving using Flowchart and Algorithm → Introduction, Steps for problem-solving, Algorithm and its characteristics, Importance of flowchart and algorithm": {
-                'english': {
-                    # Algorithm concepts
-                    'algorithm', 'algorithms', 'step', 'steps', 'procedure', 'process', 'method', 'approach',
-                    'problem', 'solving', 'solution', 'characteristics', 'properties', 'features',
-                    'finite', 'definite', 'input', 'output', 'effectiveness', 'unambiguous',
-                    'advantages', 'benefits', 'importance', 'significance', 'uses', 'applications',
-                    
-                    # Flowchart concepts
-                    'flowchart', 'flow', 'chart', 'diagram', 'representation', 'visual', 'graphical',
-                    'symbols', 'shapes', 'boxes', 'arrows', 'connections', 'flow lines',
-                    'start', 'stop', 'begin', 'end', 'terminal', 'process', 'decision',
-                    'input', 'output', 'connector', 'oval', 'rectangle', 'diamond', 'parallelogram',
-                    
-                    # Problem solving
-                    'understand', 'analyze', 'design', 'implement', 'test', 'debug',
-                    'logical', 'sequence', 'order', 'structure', 'planning', 'thinking'
-                },
-                'gujarati': {
-                    # Algorithm in Gujarati
-                    'એલ્ગોરિધમ', 'એલ્ગોરિથમ', 'સ્ટેપ', 'પગલું', 'પગલાં', 'પ્રક્રિયા', 'પદ્ધતિ',
-                    'સમસ્યા', 'ઉકેલ', 'ગુણધર્મ', 'લક્ષણ', 'લક્ષણો', 'વિશેષતા', 'વિશેષતાઓ',
-                    'મર્યાદિત', 'નિશ્ચિત', 'ઇનપુટ', 'આઉટપુટ', 'અસરકારક', 'સ્પષ્ટ',
-                    'ફાયદા', 'ફાયદાઓ', 'મહત્વ', 'મહત્ત્વ', 'ઉપયોગ', 'ઉપયોગો',
-                    
-                    # Flowchart in Gujarati  
-                    'ફ્લોચાર્ટ', 'ફ્લો', 'ચાર્ટ', 'આકૃતિ', 'આરેખ', 'રજૂઆત', 'દ્રશ્ય', 'ગ્રાફિક',
-                    'પ્રતીક', 'પ્રતીકો', 'આકાર', 'આકારો', 'બોક્સ', 'તીર', 'જોડાણ', 'લાઇન',
-                    'શરુઆત', 'અંત', 'શરૂ', 'બંધ', 'ટર્મિનલ', 'પ્રક્રિયા', 'નિર્ણય',
-                    'કનેક્ટર', 'અંડાકાર', 'લંબચોરસ', 'હીરો', 'સમાંતર ચતુર્ભુજ'
-                }
-            },
-            
-            "Problem Solving using Flowchart and Algorithm → Symbolic representation of a flowchart, Limitations of flowchart, Flow of control": {
-                'english': {
-                    'symbolic', 'representation', 'symbols', 'shapes', 'notation',
-                    'limitations', 'drawbacks', 'disadvantages', 'problems', 'issues',
-                    'control', 'flow', 'sequence', 'selection', 'repetition', 'iteration',
-                    'loop', 'condition', 'decision', 'branch', 'path'
-                },
-                'gujarati': {
-                    'પ્રતીકાત્મક', 'પ્રતિનિધિત્વ', 'પ્રતીકો', 'આકારો', 'સંકેત',
-                    'મર્યાદાઓ', 'ખામીઓ', 'ગેરફાયદા', 'સમસ્યાઓ', 'મુદ્દાઓ',
-                    'નિયંત્રણ', 'પ્રવાહ', 'ક્રમ', 'પસંદગી', 'પુનરાવર્તન', 'પુનરાવૃત્તિ',
-                    'લૂપ', 'શરત', 'નિર્ણય', 'શાખા', 'માર્ગ'
-                }
-            },
-            
-            "Problem Solving using Flowchart and Algorithm → Problem solving using pseudocode": {
-                'english': {
-                    'pseudocode', 'pseudo', 'code', 'structured', 'english', 'informal',
-                    'high', 'level', 'description', 'programming', 'language', 'convention',
-                    'human', 'readable', 'machine', 'independent', 'logic', 'algorithm'
-                },
-                'gujarati': {
-                    'સ્યુડોકોડ', 'સ્યુડો', 'કોડ', 'સંરચિત', 'અંગ્રેજી', 'અનૌપચારિક',
-                    'ઉચ્ચ', 'સ્તર', 'વર્ણન', 'પ્રોગ્રામિંગ', 'ભાષા', 'પરંપરા',
-                    'માનવ', 'વાંચી શકાય તેવું', 'મશીન', 'સ્વતંત્ર', 'તર્ક'
-                }
-            },
-
-            # Unit II: Python Introduction
-            "Python Introduction → Introduction to python, Python features, Applications of python programming": {
-                'english': {
-                    # Python basics
-                    'python', 'introduction', 'overview', 'basics', 'fundamentals',
-                    'features', 'characteristics', 'properties', 'advantages', 'benefits',
-                    'applications', 'uses', 'domains', 'areas', 'fields',
-                    
-                    # Python features
-                    'interpreted', 'interactive', 'object', 'oriented', 'high', 'level',
-                    'dynamic', 'typing', 'portable', 'extensible', 'embeddable',
-                    'readable', 'simple', 'easy', 'learn', 'syntax', 'clean',
-                    'library', 'modules', 'packages', 'standard', 'third', 'party',
-                    
-                    # Applications
-                    'web', 'development', 'data', 'science', 'machine', 'learning',
-                    'artificial', 'intelligence', 'automation', 'scripting',
-                    'desktop', 'mobile', 'game', 'scientific', 'computing'
-                },
-                'gujarati': {
-                    # Python in Gujarati
-                    'પાયથોન', 'પાયથન', 'પરિચય', 'ઓવરવ્યુ', 'મૂળભૂત', 'મૂળભૂત બાબતો',
-                    'લક્ષણો', 'વિશેષતાઓ', 'ગુણધર્મો', 'ફાયદા', 'ફાયદાઓ', 'લાભ',
-                    'ઉપયોગો', 'ઉપયોગ', 'ક્ષેત્ર', 'ક્ષેત્રો', 'ડોમેન', 'ક્ષેત્રો',
-                    
-                    # Features in Gujarati
-                    'અર્થઘટિત', 'ઇન્ટરપ્રિટેડ', 'ઇન્ટરેક્ટિવ', 'ઑબ્જેક્ટ', 'લક્ષિત',
-                    'ઉચ્ચ', 'સ્તર', 'ડાયનેમિક', 'ટાઇપિંગ', 'પોર્ટેબલ', 'વિસ્તૃત',
-                    'વાંચી શકાય તેવું', 'સરળ', 'સહજ', 'શીખવા', 'સિન્ટેક્સ', 'સ્વચ્છ',
-                    'લાઇબ્રેરી', 'મોડ્યુલ', 'પેકેજ', 'માનક', 'તૃતીય', 'પક્ષ',
-                    
-                    # Applications in Gujarati
-                    'વેબ', 'વિકાસ', 'ડેટા', 'વિજ્ઞાન', 'મશીન', 'લર્નિંગ',
-                    'કૃત્રિમ', 'બુદ્ધિ', 'ઓટોમેશન', 'સ્ક્રિપ્ટિંગ',
-                    'ડેસ્કટોપ', 'મોબાઇલ', 'ગેમ', 'વૈજ્ઞાનિક', 'કોમ્પ્યુટિંગ'
-                }
-            },
-            
-            "Python Introduction → Python installation": {
-                'english': {
-                    'installation', 'install', 'setup', 'download', 'configure',
-                    'version', 'python', 'software', 'platform', 'windows', 'mac', 'linux',
-                    'ide', 'editor', 'environment', 'path', 'variable'
-                },
-                'gujarati': {
-                    'ઇન્સ્ટોલેશન', 'ઇન્સ્ટોલ', 'સેટઅપ', 'ડાઉનલોડ', 'કોન્ફિગર',
-                    'વર્ઝન', 'પાયથોન', 'સૉફ્ટવેર', 'પ્લેટફોર્મ', 'વિન્ડો', 'મેક', 'લિનક્સ',
-                    'આઈડીઈ', 'એડિટર', 'વાતાવરણ', 'પાથ', 'ચલ'
-                }
-            },
-            
-            "Python Introduction → Basic structure of python program, Keywords, identifiers, and variables, Data types, Operators": {
-                'english': {
-                    # Program structure
-                    'basic', 'structure', 'program', 'syntax', 'format', 'template',
-                    'comment', 'statement', 'expression', 'block', 'indentation',
-                    
-                    # Keywords and identifiers
-                    'keywords', 'reserved', 'words', 'identifier', 'variable', 'name',
-                    'naming', 'rules', 'convention', 'valid', 'invalid', 'case', 'sensitive',
-                    
-                    # Data types
-                    'data', 'type', 'types', 'integer', 'int', 'float', 'string', 'str',
-                    'boolean', 'bool', 'complex', 'list', 'tuple', 'dict', 'dictionary',
-                    'set', 'none', 'numeric', 'sequence', 'collection', 'mutable', 'immutable',
-                    
-                    # Operators
-                    'operator', 'operators', 'arithmetic', 'comparison', 'relational',
-                    'logical', 'assignment', 'bitwise', 'membership', 'identity',
-                    'precedence', 'associativity', 'expression', 'operand'
-                },
-                'gujarati': {
-                    # Program structure in Gujarati
-                    'મૂળભૂત', 'બંધારણ', 'પ્રોગ્રામ', 'સિન્ટેક્સ', 'ફોર્મેટ', 'નમૂનો',
-                    'ટિપ્પણી', 'સ્ટેટમેન્ટ', 'અભિવ્યક્તિ', 'બ્લોક', 'ઇન્ડેન્ટેશન',
-                    
-                    # Keywords and identifiers in Gujarati
-                    'કીવર્ડ', 'કીવર્ડ્સ', 'આરક્ષિત', 'શબ્દ', 'શબ્દો', 'ઓળખકર્તા', 'વેરિયેબલ', 'નામ',
-                    'નામકરણ', 'નિયમ', 'નિયમો', 'પરંપરા', 'વૈધ', 'અમાન્ય', 'કેસ', 'સંવેદનશીલ',
-                    
-                    # Data types in Gujarati
-                    'ડેટા', 'પ્રકાર', 'પ્રકારો', 'ટાઇપ', 'ઇન્ટિજર', 'પૂર્ણાંક', 'ફ્લોટ', 'દશાંશ',
-                    'સ્ટ્રિંગ', 'શબ્દમાળા', 'બુલિયન', 'સાચું', 'ખોટું', 'જટિલ', 'સૂચિ', 'ટપલ',
-                    'ડિકશનરી', 'ડિક્ટ', 'સેટ', 'કોઈ નહીં', 'સંખ્યાત્મક', 'ક્રમ', 'સંગ્રહ', 
-                    'પરિવર્તનશીલ', 'અપરિવર્તનશીલ',
-                    
-                    # Operators in Gujarati
-                    'ઓપરેટર', 'ઓપરેટરો', 'અંકગણિત', 'સરખામણી', 'સંબંધીત',
-                    'લોજિકલ', 'તાર્કિક', 'અસાઇનમેન્ટ', 'સોંપણી', 'બિટવાઇઝ',
-                    'સદસ્યતા', 'ઓળખ', 'પ્રાથમિકતા', 'સંબંધ', 'અભિવ્યક્તિ', 'ઓપરેન્ડ'
-                }
-            },
-            
-            "Python Introduction → Type Conversion": {
-                'english': {
-                    'type', 'conversion', 'casting', 'explicit', 'implicit', 'automatic',
-                    'int', 'float', 'str', 'bool', 'convert', 'transform', 'change'
-                },
-                'gujarati': {
-                    'પ્રકાર', 'રૂપાંતરણ', 'કાસ્ટિંગ', 'સ્પષ્ટ', 'ગર્ભિત', 'આપોઆપ',
-                    'ઇન્ટ', 'ફ્લોટ', 'સ્ટ્રિંગ', 'બુલ', 'કન્વર્ટ', 'પરિવર્તન', 'ફેરફાર'
-                }
-            },
-
-            # Unit III: Flow of Control
-            "Flow of Control → Introduction to Flow of Control": {
-                'english': {
-                    'flow', 'control', 'structure', 'program', 'execution', 'order',
-                    'sequence', 'selection', 'repetition', 'iteration', 'branch',
-                    'decision', 'condition', 'loop', 'statement'
-                },
-                'gujarati': {
-                    'પ્રવાહ', 'નિયંત્રણ', 'બંધારણ', 'પ્રોગ્રામ', 'અમલ', 'ક્રમ',
-                    'ક્રમમાં', 'પસંદગી', 'પુનરાવર્તન', 'પુનરાવૃત્તિ', 'શાખા',
-                    'નિર્ણય', 'શરત', 'લૂપ', 'સ્ટેટમેન્ટ'
-                }
-            },
-            
-            "Flow of Control → Selection - If statement - Elif statement - Nested if statement": {
-                'english': {
-                    # If statements
-                    'if', 'elif', 'else', 'selection', 'condition', 'conditional',
-                    'statement', 'nested', 'ladder', 'chain', 'block',
-                    'true', 'false', 'boolean', 'expression', 'test',
-                    
-                    # Decision making
-                    'decision', 'making', 'branch', 'alternative', 'choice',
-                    'evaluate', 'check', 'compare', 'syntax', 'indentation'
-                },
-                'gujarati': {
-                    # If statements in Gujarati
-                    'જો', 'ઇફ', 'એલિફ', 'અન્યથા', 'એલ્સ', 'પસંદગી', 'શરત', 'શરતી',
-                    'સ્ટેટમેન્ટ', 'નેસ્ટેડ', 'લેડર', 'શૃંખલા', 'બ્લોક',
-                    'સાચું', 'ખોટું', 'બુલિયન', 'અભિવ્યક્તિ', 'કસોટી',
-                    
-                    # Decision making in Gujarati
-                    'નિર્ણય', 'બનાવવું', 'શાખા', 'વિકલ્પ', 'પસંદગી',
-                    'મૂલ્યાંકન', 'તપાસવું', 'સરખાવવું', 'સિન્ટેક્સ', 'ઇન્ડેન્ટેશન'
-                }
-            },
-            
-            "Flow of Control → Repetition - For loop - While loop - Nested loop": {
-                'english': {
-                    # Loops
-                    'loop', 'loops', 'repetition', 'iteration', 'for', 'while',
-                    'nested', 'inner', 'outer', 'range', 'sequence', 'iterate',
-                    
-                    # Loop concepts
-                    'body', 'condition', 'counter', 'increment', 'decrement',
-                    'initialization', 'termination', 'control', 'variable',
-                    'infinite', 'finite', 'break', 'continue', 'pass'
-                },
-                'gujarati': {
-                    # Loops in Gujarati
-                    'લૂપ', 'લૂપ્સ', 'પુનરાવર્તન', 'પુનરાવૃત્તિ', 'ફોર', 'વાઈલ',
-                    'નેસ્ટેડ', 'આંતરિક', 'બાહ્ય', 'શ્રેણી', 'ક્રમ', 'પુનરાવર્તન',
-                    
-                    # Loop concepts in Gujarati
-                    'બોડી', 'શરીર', 'શરત', 'કાઉન્ટર', 'વધારો', 'ઘટાડો',
-                    'આરંભીકરણ', 'સમાપ્તિ', 'નિયંત્રણ', 'વેરિયેબલ',
-                    'અનંત', 'મર્યાદિત', 'બ્રેક', 'ચાલુ', 'પાસ'
-                }
-            },
-            
-            "Flow of Control → Break and Continue Statements": {
-                'english': {
-                    'break', 'continue', 'statement', 'jump', 'control', 'transfer',
-                    'loop', 'exit', 'skip', 'iteration', 'next', 'terminate'
-                },
-                'gujarati': {
-                    'બ્રેક', 'ચાલુ', 'કન્ટિન્યૂ', 'સ્ટેટમેન્ટ', 'જમ્પ', 'નિયંત્રણ', 'સ્થાનાંતરણ',
-                    'લૂપ', 'બહાર નીકળવું', 'છોડવું', 'પુનરાવૃત્તિ', 'આગલું', 'સમાપ્ત'
-                }
-            },
-
-            # Unit IV: Functions
-            "Functions → Introduction to Functions - User Defined Functions - Arguments and Parameters": {
-                'english': {
-                    # Function concepts
-                    'function', 'functions', 'user', 'defined', 'def', 'define',
-                    'parameter', 'parameters', 'argument', 'arguments', 'call', 'invoke',
-                    'return', 'value', 'result', 'output', 'input', 'pass',
-                    
-                    # Function types
-                    'built', 'in', 'library', 'module', 'method', 'procedure',
-                    'subroutine', 'block', 'code', 'reusable', 'modular',
-                    
-                    # Parameter types
-                    'positional', 'keyword', 'default', 'variable', 'length',
-                    'args', 'kwargs', 'formal', 'actual'
-                },
-                'gujarati': {
-                    # Function concepts in Gujarati
-                    'ફંકશન', 'કાર્ય', 'કાર્યો', 'યુઝર', 'વપરાશકર્તા', 'વ્યાખ્યાયિત', 'ડેફ', 'વ્યાખ્યા',
-                    'પેરામીટર', 'પરિમાણ', 'પરિમાણો', 'આર્ગ્યુમેન્ટ', 'દલીલ', 'દલીલો', 'કૉલ', 'બોલાવવું',
-                    'રિટર્ન', 'પરત', 'મૂલ્ય', 'પરિણામ', 'આઉટપુટ', 'ઇનપુટ', 'પાસ',
-                    
-                    # Function types in Gujarati
-                    'બિલ્ટ', 'ઇન', 'લાઇબ્રેરી', 'મોડ્યુલ', 'મેથડ', 'પ્રક્રિયા',
-                    'સબરૂટિન', 'બ્લોક', 'કોડ', 'ફરીથી વાપરી શકાય તેવું', 'મોડ્યુલર',
-                    
-                    # Parameter types in Gujarati
-                    'સ્થિતિગત', 'કીવર્ડ', 'ડિફોલ્ટ', 'ચલ', 'લંબાઈ',
-                    'આર્ગ્સ', 'ક્વાર્ગ્સ', 'ઔપચારિક', 'વાસ્તવિક'
-                }
-            },
-            
-            "Functions → Scope of a Variable - Global Variable - Local Variable": {
-                'english': {
-                    'scope', 'variable', 'global', 'local', 'namespace', 'visibility',
-                    'access', 'lifetime', 'binding', 'resolution', 'enclosing', 'built'
-                },
-                'gujarati': {
-                    'અવકાશ', 'સ્કોપ', 'વેરિયેબલ', 'વૈશ્વિક', 'ગ્લોબલ', 'સ્થાનિક', 'લોકલ',
-                    'નેમસ્પેસ', 'દૃશ્યતા', 'એક્સેસ', 'જીવનકાળ', 'બાઇન્ડિંગ', 'રિઝોલ્યુશન'
-                }
-            },
-            
-            "Functions → Python Standard Library - Built-in functions - Input or output - input(), print() - Mathematical Functions - abs(), divmod(), max(), min(), pow(), sum() - Module - math - random - statistics": {
-                'english': {
-                    # Standard library
-                    'standard', 'library', 'built', 'in', 'builtin', 'function', 'functions',
-                    'module', 'modules', 'package', 'import', 'from',
-                    
-                    # I/O functions
-                    'input', 'output', 'print', 'read', 'write', 'display',
-                    'console', 'terminal', 'prompt', 'user',
-                    
-                    # Mathematical functions
-                    'mathematical', 'math', 'abs', 'absolute', 'divmod', 'division',
-                    'max', 'maximum', 'min', 'minimum', 'pow', 'power', 'sum',
-                    'arithmetic', 'calculation', 'numeric', 'number',
-                    
-                    # Modules
-                    'random', 'statistics', 'statistical', 'probability',
-                    'mean', 'median', 'mode', 'variance', 'deviation'
-                },
-                'gujarati': {
-                    # Standard library in Gujarati
-                    'સ્ટાન્ડર્ડ', 'લાઇબ્રેરી', 'બિલ્ટ', 'ઇન', 'ફંકશન', 'કાર્ય', 'કાર્યો',
-                    'મોડ્યુલ', 'મોડ્યુલો', 'પેકેજ', 'આયાત', 'ઇમ્પોર્ટ', 'થી',
-                    
-                    # I/O functions in Gujarati
-                    'ઇનપુટ', 'આઉટપુટ', 'પ્રિન્ટ', 'વાંચવું', 'લખવું', 'પ્રદર્શન',
-                    'કન્સોલ', 'ટર્મિનલ', 'પ્રોમ્પ્ટ', 'વપરાશકર્તા',
-                    
-                    # Mathematical functions in Gujarati
-                    'ગાણિતિક', 'ગણિત', 'એબીએસ', 'સંપૂર્ણ', 'ડિવમોડ', 'ભાગ',
-                    'મેક્સ', 'મહત્તમ', 'મિન', 'ન્યૂનતમ', 'પાવ', 'શક્તિ', 'સમ', 'સરવાળો',
-                    'અંકગણિત', 'ગણતરી', 'સંખ્યાત્મક', 'સંખ્યા',
-                    
-                    # Modules in Gujarati
-                    'રેન્ડમ', 'આકસ્મિક', 'આંકડા', 'આંકડાકીય', 'સંભાવના',
-                    'સરેરાશ', 'મધ્યમ', 'મોડ', 'વિચલન', 'વેરિયન્સ'
-                }
-            },
-
-            # Unit V: Dictionary, List, Set, String and Tuple
-            "Dictionary, List, Set, String and Tuple → Introduction to String, String Operations, Traversing a String": {
-                'english': {
-                    # String concepts
-                    'string', 'strings', 'text', 'character', 'characters', 'sequence',
-                    'immutable', 'literal', 'quote', 'quotes', 'single', 'double', 'triple',
-                    
-                    # String operations
-                    'operation', 'operations', 'concatenation', 'repetition', 'slicing',
-                    'indexing', 'access', 'length', 'len', 'traverse', 'traversing',
-                    'iteration', 'loop', 'character', 'by', 'character'
-                },
-                'gujarati': {
-                    # String concepts in Gujarati
-                    'સ્ટ્રિંગ', 'શબ્દમાળા', 'લેખ', 'અક્ષર', 'અક્ષરો', 'ક્રમ',
-                    'અપરિવર્તનશીલ', 'લિટરલ', 'ક્વોટ', 'અવતરણ', 'એક', 'બે', 'ત્રણ',
-                    
-                    # String operations in Gujarati
-                    'ઓપરેશન', 'કામગીરી', 'જોડાણ', 'પુનરાવર્તન', 'સ્લાઇસિંગ',
-                    'ઇન્ડેક્સિંગ', 'એક્સેસ', 'લંબાઈ', 'લેન', 'ઉપડવું', 'ઉપડવાનું',
-                    'પુનરાવૃત્તિ', 'લૂપ', 'અક્ષર', 'દ્વારા'
-                }
-            },
-            
-            "Dictionary, List, Set, String and Tuple → String Methods and Built-in Functions": {
-                'english': {
-                    'method', 'methods', 'built', 'in', 'function', 'functions',
-                    'upper', 'lower', 'title', 'capitalize', 'strip', 'replace',
-                    'find', 'index', 'count', 'split', 'join', 'format',
-                    'startswith', 'endswith', 'isdigit', 'isalpha', 'isalnum'
-                },
-                'gujarati': {
-                    'મેથડ', 'પદ્ધતિ', 'પદ્ધતિઓ', 'બિલ્ટ', 'ઇન', 'ફંકશન', 'કાર્ય',
-                    'અપર', 'લોઅર', 'ટાઇટલ', 'કેપિટલાઇઝ', 'સ્ટ્રિપ', 'બદલવું',
-                    'શોધવું', 'ઇન્ડેક્સ', 'ગણવું', 'વિભાજન', 'જોડવું', 'ફોર્મેટ',
-                    'શરૂ', 'અંત', 'અંક', 'અક્ષર', 'અક્ષર અંક'
-                }
-            },
-            
-            "Dictionary, List, Set, String and Tuple → Introduction to List and its Operations": {
-                'english': {
-                    # List concepts
-                    'list', 'lists', 'array', 'sequence', 'collection', 'mutable',
-                    'ordered', 'indexed', 'element', 'elements', 'item', 'items',
-                    'bracket', 'brackets', 'square', 'comma', 'separated',
-                    
-                    # List operations
-                    'append', 'insert', 'remove', 'delete', 'pop', 'clear',
-                    'extend', 'copy', 'count', 'index', 'reverse', 'sort',
-                    'slice', 'slicing', 'access', 'modify', 'update'
-                },
-                'gujarati': {
-                    # List concepts in Gujarati
-                    'લિસ્ટ', 'યાદી', 'સૂચિ', 'એરે', 'ક્રમ', 'સંગ્રહ', 'પરિવર્તનશીલ',
-                    'ક્રમબદ્ધ', 'ઇન્ડેક્સ્ડ', 'એલિમેન્ટ', 'ઘટક', 'ઘટકો', 'વસ્તુ', 'વસ્તુઓ',
-                    'કૌંસ', 'ચોરસ', 'અલ્પવિરામ', 'અલગ',
-                    
-                    # List operations in Gujarati
-                    'એપેન્ડ', 'ઇન્સર્ટ', 'રીમૂવ', 'ડિલીટ', 'પોપ', 'ક્લિયર',
-                    'એક્સ્ટેન્ડ', 'કોપી', 'કાઉન્ટ', 'ઇન્ડેક્સ', 'રિવર્સ', 'સોર્ટ',
-                    'સ્લાઇસ', 'સ્લાઇસિંગ', 'એક્સેસ', 'મોડિફાય', 'અપડેટ'
-                }
-            },
-            
-            "Dictionary, List, Set, String and Tuple → List Methods and Built-in Functions": {
-                'english': {
-                    'method', 'methods', 'built', 'in', 'function', 'functions',
-                    'append', 'extend', 'insert', 'remove', 'pop', 'clear',
-                    'index', 'count', 'sort', 'reverse', 'copy', 'len',
-                    'max', 'min', 'sum', 'sorted', 'enumerate', 'zip'
-                },
-                'gujarati': {
-                    'મેથડ', 'પદ્ધતિ', 'બિલ્ટ', 'ઇન', 'ફંકશન', 'કાર્ય',
-                    'એપેન્ડ', 'એક્સ્ટેન્ડ', 'ઇન્સર્ટ', 'રીમૂવ', 'પોપ', 'ક્લિયર',
-                    'ઇન્ડેક્સ', 'કાઉન્ટ', 'સોર્ટ', 'રિવર્સ', 'કોપી', 'લેન',
-                    'મેક્સ', 'મિન', 'સમ', 'સોર્ટેડ', 'એન્યુમરેટ', 'ઝિપ'
-                }
-            },
-            
-            "Dictionary, List, Set, String and Tuple → Set • Create a Set, Accessing Python Sets, Delete from set, Update set • Python Set Operations": {
-                'english': {
-                    # Set concepts
-                    'set', 'sets', 'collection', 'unordered', 'unique', 'duplicate',
-                    'mutable', 'curly', 'braces', 'element', 'elements', 'member',
-                    
-                    # Set operations
-                    'create', 'access', 'add', 'remove', 'discard', 'pop', 'clear',
-                    'update', 'union', 'intersection', 'difference', 'symmetric',
-                    'subset', 'superset', 'disjoint'
-                },
-                'gujarati': {
-                    # Set concepts in Gujarati
-                    'સેટ', 'સંગ્રહ', 'અક્રમ', 'અનોખું', 'ડુપ્લિકેટ', 'નકલ',
-                    'પરિવર્તનશીલ', 'કર્લી', 'કૌંસ', 'એલિમેન્ટ', 'ઘટક', 'સભ્ય',
-                    
-                    # Set operations in Gujarati
-                    'બનાવવું', 'એક્સેસ', 'ઉમેરવું', 'દૂર કરવું', 'ડિસ્કાર્ડ', 'પોપ', 'ક્લિયર',
-                    'અપડેટ', 'યુનિયન', 'છેદ', 'તફાવત', 'સમપ્રમાણ',
-                    'પેટા સેટ', 'સુપર સેટ', 'અસંબંધિત'
-                }
-            },
-            
-            "Dictionary, List, Set, String and Tuple → Tuple • Creating Tuples • Accessing Tuple - Iterate over tuple and Slicing tuple • Python Tuple Operations, Functions and Methods": {
-                'english': {
-                    # Tuple concepts
-                    'tuple', 'tuples', 'sequence', 'immutable', 'ordered', 'indexed',
-                    'parentheses', 'comma', 'element', 'elements', 'item', 'items',
-                    
-                    # Tuple operations
-                    'create', 'creating', 'access', 'accessing', 'iterate', 'iteration',
-                    'slice', 'slicing', 'index', 'indexing', 'count', 'len',
-                    'max', 'min', 'sum', 'sorted', 'enumerate', 'zip'
-                },
-                'gujarati': {
-                    # Tuple concepts in Gujarati
-                    'ટપલ', 'ટ્યુપલ', 'ક્રમ', 'અપરિવર્તનશીલ', 'ક્રમબદ્ધ', 'ઇન્ડેક્સ્ડ',
-                    'કૌંસ', 'અલ્પવિરામ', 'એલિમેન્ટ', 'ઘટક', 'વસ્તુ', 'વસ્તુઓ',
-                    
-                    # Tuple operations in Gujarati
-                    'બનાવવું', 'એક્સેસ', 'પુનરાવર્તન', 'પુનરાવૃત્તિ',
-                    'સ્લાઇસ', 'સ્લાઇસિંગ', 'ઇન્ડેક્સ', 'ઇન્ડેક્સિંગ', 'કાઉન્ટ', 'લેન',
-                    'મેક્સ', 'મિન', 'સમ', 'સોર્ટેડ', 'એન્યુમરેટ', 'ઝિપ'
-                }
-            },
-            
-            "Dictionary, List, Set, String and Tuple → Dictionary • Creating Dictionary • Accessing Items in Python Dictionary • Add, Update, Remove in Dictionary • Built-In Dictionary Methods and functions": {
-                'english': {
-                    # Dictionary concepts
-                    'dictionary', 'dict', 'dictionaries', 'key', 'keys', 'value', 'values',
-                    'pair', 'pairs', 'mapping', 'mutable', 'unordered', 'curly', 'braces',
-                    'colon', 'comma', 'hash', 'table',
-                    
-                    # Dictionary operations
-                    'create', 'creating', 'access', 'accessing', 'add', 'update', 'remove',
-                    'delete', 'get', 'pop', 'popitem', 'clear', 'copy',
-                    'keys', 'values', 'items', 'fromkeys', 'setdefault'
-                },
-                'gujarati': {
-                    # Dictionary concepts in Gujarati
-                    'ડિકશનરી', 'ડિક્ટ', 'કી', 'ચાવી', 'મૂલ્ય', 'મૂલ્યો',
-                    'જોડી', 'જોડીઓ', 'મેપિંગ', 'પરિવર્તનશીલ', 'અક્રમ', 'કર્લી', 'કૌંસ',
-                    'કોલન', 'અલ્પવિરામ', 'હેશ', 'ટેબલ',
-                    
-                    # Dictionary operations in Gujarati
-                    'બનાવવું', 'એક્સેસ', 'ઉમેરવું', 'અપડેટ', 'દૂર કરવું',
-                    'ડિલીટ', 'ગેટ', 'પોપ', 'પોપઆઇટમ', 'ક્લિયર', 'કોપી',
-                    'કીઝ', 'વેલ્યુઝ', 'આઇટમ્સ', 'ફ્રોમકીઝ', 'સેટડિફોલ્ટ'
-                }
-            }
-        }
     
     def extract_all_questions_from_markdown_files(self):
         """Extract all questions from markdown solution files"""
@@ -663,32 +200,45 @@ class PythonQuestionBankGenerator:
         print(f"Total questions extracted: {len(questions)}")
         return questions
     
-    def calculate_enhanced_mapping_score(self, question_text: str, keywords_dict: Dict, topic_path: str) -> float:
+    def annotate_repeated_questions(self):
+        """Tag near-duplicate questions across papers with a shared cluster ID"""
+        clusters = cluster_questions(
+            self.questions,
+            paper_of=lambda q: re.sub(r'(\.gu)?\.mdx?$', '', q.source)
+        )
+        repeated = 0
+        for cluster in clusters:
+            for i in cluster.members:
+                self.questions[i].duplicate_cluster = cluster.cluster_id
+                self.questions[i].cluster_frequency = cluster.frequency
+            if cluster.frequency > 1:
+                repeated += 1
+        print(f"Found {repeated} repeated question cluster(s) across papers ({len(clusters)} clusters total)")
+    
+    def calculate_enhanced_mapping_score(self, question_text: str, keywords: Dict, topic_path: str,
+                                         question_lower: str = None, question_words: Set[str] = None) -> float:
         """Calculate enhanced mapping score with comprehensive keyword matching"""
-        if not question_text or not keywords_dict:
+        if not question_text or not keywords:
             return 0.0
         
-        # Normalize question text
-        question_lower = question_text.lower()
-        question_words = set(re.findall(r'\b\w+\b', question_lower))
+        # Normalize question text (callers scoring many topics pass these in)
+        if question_lower is None:
+            question_lower = question_text.lower()
+        if question_words is None:
+            question_words = set(re.findall(r'\b\w+\b', question_lower))
         
-        # Get keywords for both languages
-        english_keywords = keywords_dict.get('english', set())
-        gujarati_keywords = keywords_dict.get('gujarati', set())
-        all_keywords = english_keywords.union(gujarati_keywords)
+        # Both languages' keywords, lowercased at pack compile time
+        all_keywords = keywords['lower_set']
         
         if not all_keywords:
             return 0.0
         
         # Direct keyword matches
-        matches = question_words.intersection({kw.lower() for kw in all_keywords})
+        matches = question_words.intersection(all_keywords)
         base_score = len(matches) * 20  # Each match = 20 points
         
-        # Exact phrase matching bonus
-        phrase_bonus = 0
-        for keyword in all_keywords:
-            if keyword.lower() in question_lower:
-                phrase_bonus += 15
+        # Exact phrase matching bonus: one scan over the question for all keywords
+        phrase_bonus = keywords['matcher'].count(question_lower) * 15
         
         # Context-specific bonuses
         context_bonus = 0
@@ -767,9 +317,12 @@ class PythonQuestionBankGenerator:
         """Map question to best matching topic"""
         best_score = 0.0
         best_path = ""
+        question_lower = question.text.lower()
+        question_words = set(re.findall(r'\b\w+\b', question_lower))
         
-        for topic_path, keywords_dict in self.enhanced_keywords_map.items():
-            score = self.calculate_enhanced_mapping_score(question.text, keywords_dict, topic_path)
+        for topic_path in self.keyword_pack.units():
+            score = self.calculate_enhanced_mapping_score(question.text, self.keyword_pack.union(topic_path), topic_path,
+                                                          question_lower, question_words)
             
             if score > best_score:
                 best_score = score
@@ -828,7 +381,9 @@ class PythonQuestionBankGenerator:
                             'language': q.language,
                             'source': q.source,
                             'mappingScore': round(q.mapping_score, 2),
-                            'mappingPath': q.mapping_path
+                            'mappingPath': q.mapping_path,
+                            'duplicateCluster': q.duplicate_cluster,
+                            'clusterFrequency': q.cluster_frequency
                         } for q in topic_questions
                     ]
                 }
@@ -866,7 +421,9 @@ class PythonQuestionBankGenerator:
                     "id": q.id,
                     "text": q.text,
                     "language": q.language,
-                    "source": q.source
+                    "source": q.source,
+                    "duplicateCluster": q.duplicate_cluster,
+                    "clusterFrequency": q.cluster_frequency
                 } for q in unmapped_questions
             ]
         }
@@ -884,12 +441,16 @@ class PythonQuestionBankGenerator:
         # Step 2: Create comprehensive keyword mappings
         print("Creating comprehensive Python programming keyword mappings...")
         self.create_comprehensive_python_keywords_map()
-        print(f"Created enhanced keyword mappings for {len(self.enhanced_keywords_map)} topics")
+        print(f"Created enhanced keyword mappings for {len(self.keyword_pack.units())} topics")
         
         # Step 3: Extract all questions
         print("Extracting questions from all sources...")
         self.questions = self.extract_all_questions_from_markdown_files()
         
+        # Step 3b: Cluster repeated questions across papers
+        print("Detecting near-duplicate questions across papers...")
+        self.annotate_repeated_questions()
+        
         # Step 4: Generate final question bank
         print("Generating enhanced question bank...")
         question_bank = self.generate_final_question_bank_json()
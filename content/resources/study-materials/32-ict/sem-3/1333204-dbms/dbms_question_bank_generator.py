@@ -7,10 +7,16 @@ Following enhanced documentation with mandatory pattern validation
 import re
 import json
 import os
+import sys
 from typing import Dict, List, Tuple, Optional
 from collections import defaultdict
 from pathlib import Path
 
+# Shared corpus tools live in <project root>/scripts
+sys.path.insert(0, str(Path(__file__).resolve().parents[6] / 'scripts'))
+from bilingual_align import align_questions
+from content_snapshot import read_text
+
 class DBMSQuestionBankGenerator:
     def __init__(self, base_path: str):
         self.base_path = Path(base_path)
@@ -38,8 +44,7 @@ class DBMSQuestionBankGenerator:
         if not syllabus_file.exists():
             raise FileNotFoundError(f"Syllabus file not found: {syllabus_file}")
             
-        with open(syllabus_file, 'r', encoding='utf-8') as f:
-            self.syllabus_data = json.load(f)
+        self.syllabus_data = json.loads(read_text(syllabus_file))
         print(f"✅ Loaded syllabus for: {self.syllabus_data['courseTitle']}")
         
     def create_keyword_mapping(self):
@@ -499,25 +504,32 @@ class DBMSQuestionBankGenerator:
         
     def create_bilingual_pairs(self, all_questions: List[Dict]) -> List[Dict]:
         """Create individual question entries with bilingual pairing where possible."""
-        # Group questions by unique_id for bilingual pairing
-        english_questions = {}
-        gujarati_questions = {}
+        # Group each exam's questions per language, in paper order
+        english_by_exam = defaultdict(list)
+        gujarati_by_exam = defaultdict(list)
         
         for q in all_questions:
             if q['language'] == 'english':
-                english_questions[q['unique_id']] = q
+                english_by_exam[q['exam_period']].append(q)
             else:
-                gujarati_questions[q['unique_id']] = q
-        
-        # Get all unique question IDs from both languages
-        all_unique_ids = set(english_questions.keys()) | set(gujarati_questions.keys())
+                gujarati_by_exam[q['exam_period']].append(q)
+        
+        # Align English and Gujarati papers by order, marks, number and code/math overlap;
+        # unpaired questions are kept as single-language entries
+        entries = []
+        for exam_period in sorted(set(english_by_exam) | set(gujarati_by_exam)):
+            alignment = align_questions(english_by_exam[exam_period], gujarati_by_exam[exam_period], number_key='number')
+            entries.extend((english_q['unique_id'], english_q, gujarati_q) for english_q, gujarati_q in alignment.pairs)
+            entries.extend((english_q['unique_id'], english_q, None) for english_q in alignment.unpaired_english)
+            entries.extend((gujarati_q['unique_id'], None, gujarati_q) for gujarati_q in alignment.unpaired_gujarati)
+            
+            if alignment.unpaired_english or alignment.unpaired_gujarati:
+                print(f"⚠️ {exam_period}: {len(alignment.unpaired_english)} English and "
+                      f"{len(alignment.unpaired_gujarati)} Gujarati questions without a translation")
         
         bilingual_pairs = []
         
-        for unique_id in sorted(all_unique_ids):
-            english_q = english_questions.get(unique_id)
-            gujarati_q = gujarati_questions.get(unique_id)
-            
+        for unique_id, english_q, gujarati_q in sorted(entries, key=lambda entry: entry[0]):
             # Use available question for mapping (prefer English, fallback to Gujarati)
             reference_q = english_q if english_q else gujarati_q
             mapped_topic, confidence_score = self.map_question_to_topic(reference_q)
@@ -13,6 +13,12 @@ from collections import defaultdict, Counter
 import unicodedata
 from dataclasses import dataclass, asdict
 import hashlib
+import sys
+
+# Shared corpus tools live in <project root>/scripts
+sys.path.insert(0, str(Path(__file__).resolve().parents[6] / 'scripts'))
+from frontmatter_index import exam_session
+from content_snapshot import read_text
 
 @dataclass
 class Question:
@@ -280,8 +286,7 @@ class EnhancedDDCQuestionBankGenerator:
         """Load syllabus JSON file"""
         syllabus_file = self.base_path / "4343201.json"
         try:
-            with open(syllabus_file, 'r', encoding='utf-8') as f:
-                self.syllabus_data = json.load(f)
+            self.syllabus_data = json.loads(read_text(syllabus_file))
             print(f"✅ Loaded syllabus from {syllabus_file}")
             return self.syllabus_data
         except Exception as e:
@@ -299,12 +304,10 @@ class EnhancedDDCQuestionBankGenerator:
             # Determine language from filename
             language = 'gujarati' if '.gu.' in file_path.name else 'english'
             
-            # Extract year and season from filename
-            year_match = re.search(r'(\d{4})', file_path.name)
-            season_match = re.search(r'(summer|winter)', file_path.name.lower())
-            
-            year = year_match.group(1) if year_match else 'unknown'
-            season = season_match.group(1) if season_match else 'unknown'
+            # Exam season and year from the shared metadata index
+            season, year = exam_session(file_path)
+            season = season or 'unknown'
+            year = year or 'unknown'
             
             # Enhanced question extraction patterns for both languages
             if language == 'english':
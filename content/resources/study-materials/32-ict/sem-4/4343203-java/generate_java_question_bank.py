@@ -7,10 +7,16 @@ High-accuracy bilingual question extraction and mapping system
 import json
 import re
 import os
+import sys
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from collections import defaultdict
 
+# Shared corpus tools live in <project root>/scripts
+sys.path.insert(0, str(Path(__file__).resolve().parents[6] / 'scripts'))
+from bilingual_align import align_questions
+from content_snapshot import read_text
+
 class JavaQuestionBankGenerator:
     def __init__(self, subject_path: str):
         self.subject_path = Path(subject_path)
@@ -20,12 +26,6 @@ class JavaQuestionBankGenerator:
         self.english_pattern = re.compile(r'^##\s*Question\s+(\d+\([a-z]\)(?:\s+OR)?)\s*\[(\d+)\s*marks?\].*?$', re.MULTILINE)
         self.gujarati_pattern = re.compile(r'^##\s*પ્રશ્ન\s+(\d+\([અ-હ]\)(?:\s+OR)?)\s*\[(\d+)\s*ગુણ\].*?$', re.MULTILINE)
 
-        # Gujarati to English letter mapping
-        self.gujarati_to_english = {
-            'અ': 'a', 'બ': 'b', 'ક': 'c', 'ડ': 'd',
-            'ઇ': 'e', 'ફ': 'f', 'ગ': 'g', 'હ': 'h'
-        }
-
         # Java-specific topic keywords for enhanced accuracy
         self.topic_keywords = {
             "I": ["java", "jvm", "jre", "jdk", "byte code", "garbage collection", "history", "features", "applications", "platform independent"],
@@ -41,8 +41,7 @@ class JavaQuestionBankGenerator:
         if not syllabus_file.exists():
             raise FileNotFoundError(f"Syllabus file not found: {syllabus_file}")
 
-        with open(syllabus_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return json.loads(read_text(syllabus_file))
 
     def extract_questions_from_file(self, file_path: Path, is_gujarati: bool = False) -> List[Dict]:
         """Extract questions from solution file with enhanced accuracy"""
@@ -105,12 +104,6 @@ class JavaQuestionBankGenerator:
 
         return ""
 
-    def normalize_question_number(self, question_num: str) -> str:
-        """Normalize Gujarati question numbers to English format"""
-        for gujarati, english in self.gujarati_to_english.items():
-            question_num = question_num.replace(gujarati, english)
-        return question_num.strip()
-
     def map_question_to_unit(self, question_text: str) -> Tuple[str, float]:
         """Map question to syllabus unit with confidence score"""
         question_lower = question_text.lower()
@@ -132,39 +125,32 @@ class JavaQuestionBankGenerator:
 
         return "I", 0.0  # Default to Unit I with low confidence
 
-    def pair_bilingual_questions(self, english_questions: List[Dict], gujarati_questions: List[Dict]) -> List[Dict]:
-        """Pair English and Gujarati questions with validation"""
+    def pair_bilingual_questions(self, english_questions: List[Dict], gujarati_questions: List[Dict]) -> Tuple[List[Dict], Dict]:
+        """Pair English and Gujarati questions by aligning both papers in question order"""
         paired_questions = []
 
-        # Create normalized lookup for Gujarati questions
-        gujarati_lookup = {}
-        for gq in gujarati_questions:
-            normalized_num = self.normalize_question_number(gq["questionNumber"])
-            gujarati_lookup[normalized_num] = gq
-
-        # Pair with English questions
-        for eq in english_questions:
-            eng_num = eq["questionNumber"]
-
-            if eng_num in gujarati_lookup:
-                gq = gujarati_lookup[eng_num]
-
-                # Validate mark consistency
-                if eq["marks"] == gq["marks"]:
-                    # Map to syllabus unit
-                    unit, confidence = self.map_question_to_unit(eq["text"])
-
-                    paired_questions.append({
-                        "questionNumber": eng_num,
-                        "marks": eq["marks"],
-                        "unit": unit,
-                        "textEn": eq["text"],
-                        "textGu": gq["text"],
-                        "sourceFile": eq["sourceFile"],
-                        "mappingConfidence": confidence
-                    })
+        # Order, marks, number and code/math overlap decide the pairs; nothing is dropped silently
+        alignment = align_questions(english_questions, gujarati_questions, number_key="questionNumber")
+
+        for eq, gq in alignment.pairs:
+            # Map to syllabus unit
+            unit, confidence = self.map_question_to_unit(eq["text"])
+
+            paired_questions.append({
+                "questionNumber": eq["questionNumber"],
+                "marks": eq["marks"],
+                "unit": unit,
+                "textEn": eq["text"],
+                "textGu": gq["text"],
+                "sourceFile": eq["sourceFile"],
+                "mappingConfidence": confidence
+            })
 
-        return paired_questions
+        unpaired = {
+            "english": [q["questionNumber"] for q in alignment.unpaired_english],
+            "gujarati": [q["questionNumber"] for q in alignment.unpaired_gujarati]
+        }
+        return paired_questions, unpaired
 
     def validate_extraction(self, file_path: Path, questions: List[Dict]) -> Dict:
         """Validate question extraction success rate"""
@@ -243,10 +229,14 @@ class JavaQuestionBankGenerator:
             })
 
             # Pair bilingual questions
-            paired_questions = self.pair_bilingual_questions(english_questions, gujarati_questions)
+            paired_questions, unpaired = self.pair_bilingual_questions(english_questions, gujarati_questions)
             all_questions.extend(paired_questions)
+            extraction_stats[-1]["unpaired"] = unpaired
 
             print(f"Processed {eng_file.name}: {len(english_questions)} EN + {len(gujarati_questions)} GU = {len(paired_questions)} paired")
+            for language, numbers in unpaired.items():
+                if numbers:
+                    print(f"  ⚠️ Unpaired {language} questions: {', '.join(numbers)}")
 
         # Organize by units
         units_data = defaultdict(list)
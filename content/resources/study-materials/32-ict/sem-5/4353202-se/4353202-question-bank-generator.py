@@ -7,14 +7,21 @@ Comprehensive bilingual question extraction and mapping system for Software Engi
 import json
 import re
 import os
+import sys
 from pathlib import Path
-from typing import Dict, List, Tuple, Set, Optional
+from typing import Dict, Iterable, Iterator, List, Tuple, Set, Optional
 from collections import defaultdict, Counter
-import unicodedata
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 import hashlib
 
-@dataclass
+# Shared corpus tools live in <project root>/scripts
+sys.path.insert(0, str(Path(__file__).resolve().parents[6] / 'scripts'))
+from syllabus_index import load_syllabus_index, normalize_text, unit_key
+from question_stream import QuestionSpool, write_json_document, intern_str
+from frontmatter_index import exam_session
+from content_snapshot import read_text
+
+@dataclass(slots=True)
 class Question:
     """Question data structure"""
     id: str
@@ -25,7 +32,7 @@ class Question:
     exam_year: str
     exam_season: str
     unit: Optional[str] = None
-    topics: List[str] = None
+    topics: List[str] = field(default_factory=list)
     confidence: float = 0.0
 
 class EnhancedSEQuestionBankGenerator:
@@ -34,7 +41,7 @@ class EnhancedSEQuestionBankGenerator:
     def __init__(self, base_path: str):
         self.base_path = Path(base_path)
         self.syllabus_data = {}
-        self.questions = []
+        self.syllabus_index = None
         
         # Enhanced bilingual keyword mappings for Software Engineering
         self.unit_keywords = {
@@ -567,30 +574,33 @@ class EnhancedSEQuestionBankGenerator:
             'language_consistency': 1.0
         }
         
+        # Split topic mappings once per unit instead of once per question
+        self.semantic_topics = defaultdict(list)
+        for topic, units in self.topic_mappings.items():
+            for unit in units:
+                self.semantic_topics[unit].append((topic, topic.split()))
+        
     def load_syllabus(self):
-        """Load syllabus data"""
+        """Load syllabus data and its precompiled topic index"""
         syllabus_file = self.base_path / "4353202.json"
-        with open(syllabus_file, 'r', encoding='utf-8') as f:
-            self.syllabus_data = json.load(f)
+        self.syllabus_data = json.loads(read_text(syllabus_file))
+        self.syllabus_index = load_syllabus_index(syllabus_file)
     
-    def extract_questions_from_file(self, file_path: Path) -> List[Question]:
-        """Extract questions from a solution file"""
-        questions = []
-        
+    def extract_questions_from_file(self, file_path: Path) -> Iterator[Question]:
+        """Extract questions from a solution file, one record at a time"""
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
             
             # Determine language and exam details from filename
             filename = file_path.name
-            language = 'gujarati' if '.gu.' in filename else 'english'
+            language = intern_str('gujarati' if '.gu.' in filename else 'english')
+            source_file = intern_str(str(file_path))
             
-            # Extract year and season from filename
-            year_match = re.search(r'(\d{4})', filename)
-            season_match = re.search(r'(summer|winter)', filename.lower())
-            
-            exam_year = year_match.group(1) if year_match else "unknown"
-            exam_season = season_match.group(1) if season_match else "unknown"
+            # Exam season and year from the shared metadata index
+            season, year = exam_session(file_path)
+            exam_year = intern_str(year or "unknown")
+            exam_season = intern_str(season or "unknown")
             
             # Enhanced question pattern matching
             if language == 'gujarati':
@@ -610,32 +620,22 @@ class EnhancedSEQuestionBankGenerator:
                 question_id = f"{exam_year}_{exam_season}_{question_num}_{sub_part}_{language}"
                 question_id = hashlib.md5(question_id.encode()).hexdigest()[:12]
                 
-                question = Question(
+                yield Question(
                     id=question_id,
                     text=question_text,
                     language=language,
                     marks=marks,
-                    source_file=str(file_path),
+                    source_file=source_file,
                     exam_year=exam_year,
                     exam_season=exam_season
                 )
                 
-                questions.append(question)
-                
         except Exception as e:
             print(f"Error processing {file_path}: {e}")
-            
-        return questions
     
     def normalize_text(self, text: str) -> str:
-        """Normalize text for better matching"""
-        # Convert to lowercase and normalize unicode
-        text = unicodedata.normalize('NFKD', text.lower())
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
-        # Remove common punctuation
-        text = re.sub(r'[^\w\s]', ' ', text)
-        return text
+        """Normalize text for better matching (same rules as the syllabus index)"""
+        return normalize_text(text)
     
     def calculate_keyword_score(self, question_text: str, unit_keywords: Dict[str, List[str]], language: str) -> float:
         """Calculate keyword-based score for unit mapping"""
@@ -666,24 +666,14 @@ class EnhancedSEQuestionBankGenerator:
         keyword_score = (exact_matches + partial_matches) / total_keyword_weight
         return min(keyword_score, 10.0)  # Cap at 10.0
     
-    def calculate_contextual_score(self, question_text: str, unit_data: Dict) -> float:
-        """Calculate contextual relevance score"""
-        normalized_text = self.normalize_text(question_text)
+    def calculate_contextual_score(self, topic_matches: List[Tuple[str, str]]) -> float:
+        """Calculate contextual relevance score from syllabus topic/subtopic matches"""
         score = 0.0
-        
-        # Check against unit topics and subtopics
-        if 'topics' in unit_data:
-            for topic in unit_data['topics']:
-                topic_title = self.normalize_text(topic.get('title', ''))
-                if topic_title and topic_title in normalized_text:
-                    score += self.scoring_weights['contextual_match']
-                
-                # Check subtopics
-                for subtopic in topic.get('subtopics', []):
-                    subtopic_normalized = self.normalize_text(subtopic)
-                    if subtopic_normalized and subtopic_normalized in normalized_text:
-                        score += self.scoring_weights['contextual_match'] * 0.7
-        
+        for kind, _ in topic_matches:
+            if kind == 'topic':
+                score += self.scoring_weights['contextual_match']
+            else:
+                score += self.scoring_weights['contextual_match'] * 0.7
         return score
     
     def map_question_to_unit(self, question: Question) -> Tuple[str, float]:
@@ -692,6 +682,10 @@ class EnhancedSEQuestionBankGenerator:
         best_score = 0.0
         scores_by_unit = {}
         
+        # One scan of the question finds syllabus topics for every unit
+        normalized_text = self.normalize_text(question.text)
+        topic_matches = self.syllabus_index.unit_matches(normalized_text)
+        
         for unit_name, unit_keywords in self.unit_keywords.items():
             # Calculate keyword-based score
             keyword_score = self.calculate_keyword_score(
@@ -699,16 +693,12 @@ class EnhancedSEQuestionBankGenerator:
             )
             
             # Calculate contextual score
-            contextual_score = 0.0
-            unit_data = next(
-                (unit for unit in self.syllabus_data.get('underpinningTheory', []) 
-                 if unit.get('unitNumber') == unit_name), {}
+            contextual_score = self.calculate_contextual_score(
+                topic_matches.get(unit_key(unit_name), [])
             )
-            if unit_data:
-                contextual_score = self.calculate_contextual_score(question.text, unit_data)
             
             # Calculate semantic similarity score
-            semantic_score = self.calculate_semantic_score(question.text, unit_name)
+            semantic_score = self.calculate_semantic_score(normalized_text, unit_name)
             
             # Combine scores
             total_score = (
@@ -729,50 +719,51 @@ class EnhancedSEQuestionBankGenerator:
         
         return best_unit, confidence
     
-    def calculate_semantic_score(self, question_text: str, unit_name: str) -> float:
+    def calculate_semantic_score(self, normalized_text: str, unit_name: str) -> float:
         """Calculate semantic similarity score"""
-        normalized_text = self.normalize_text(question_text)
         score = 0.0
         
         # Topic-based semantic matching
-        for topic, units in self.topic_mappings.items():
-            if unit_name in units:
-                topic_words = topic.split()
-                matches = sum(1 for word in topic_words if word in normalized_text)
-                if matches > 0:
-                    score += (matches / len(topic_words)) * self.scoring_weights['semantic_similarity']
+        for _, topic_words in self.semantic_topics.get(unit_name, []):
+            matches = sum(1 for word in topic_words if word in normalized_text)
+            if matches > 0:
+                score += (matches / len(topic_words)) * self.scoring_weights['semantic_similarity']
         
         return score
     
     def extract_topics_from_question(self, question: Question, unit: str) -> List[str]:
         """Extract relevant topics from question text"""
-        topics = []
         normalized_text = self.normalize_text(question.text)
         
-        # Get unit-specific topics from syllabus
-        unit_data = next(
-            (unit_data for unit_data in self.syllabus_data.get('underpinningTheory', []) 
-             if unit_data.get('unitNumber') == unit), {}
-        )
-        
-        if 'topics' in unit_data:
-            for topic in unit_data['topics']:
-                topic_title = topic.get('title', '')
-                if self.normalize_text(topic_title) in normalized_text:
-                    topics.append(topic_title)
-                
-                # Check subtopics
-                for subtopic in topic.get('subtopics', []):
-                    if self.normalize_text(subtopic) in normalized_text:
-                        topics.append(subtopic)
+        # Unit-specific syllabus topics and subtopics, from the precompiled index
+        topics = [title for _, title in self.syllabus_index.matches(normalized_text, unit)]
         
         # Add semantic topic matches
-        for topic, units in self.topic_mappings.items():
-            if unit in units and topic.replace('_', ' ') in normalized_text:
+        for topic, _ in self.semantic_topics.get(unit, []):
+            if topic.replace('_', ' ') in normalized_text:
                 topics.append(topic.replace('_', ' ').title())
         
         return list(set(topics))  # Remove duplicates
     
+    def iter_questions(self, solution_files: Iterable[Path]) -> Iterator[Question]:
+        """Pipeline stage 1: solution files -> question records, one file at a time"""
+        for file_path in solution_files:
+            count = 0
+            for question in self.extract_questions_from_file(file_path):
+                count += 1
+                yield question
+            print(f"  📝 Extracted {count} questions from {file_path.name}")
+    
+    def iter_mapped_questions(self, questions: Iterable[Question]) -> Iterator[Question]:
+        """Pipeline stage 2: attach unit, confidence and topics (unit stays None if unmapped)"""
+        for question in questions:
+            unit, confidence = self.map_question_to_unit(question)
+            if unit:
+                question.unit = intern_str(unit)
+                question.confidence = confidence
+                question.topics = self.extract_topics_from_question(question, unit)
+            yield question
+    
     def generate_question_bank(self):
         """Generate the complete question bank"""
         print("🚀 Starting Enhanced Software Engineering Question Bank Generation...")
@@ -782,146 +773,127 @@ class EnhancedSEQuestionBankGenerator:
         print("✅ Syllabus data loaded successfully")
         
         # Find all solution files
-        solution_files = list(self.base_path.glob("*solution*.md"))
+        solution_files = sorted(self.base_path.glob("*solution*.md"))
         print(f"📁 Found {len(solution_files)} solution files")
         
-        # Extract questions from all files
-        all_questions = []
-        for file_path in solution_files:
-            questions = self.extract_questions_from_file(file_path)
-            all_questions.extend(questions)
-            print(f"  📝 Extracted {len(questions)} questions from {file_path.name}")
-        
-        print(f"🔍 Total questions extracted: {len(all_questions)}")
-        
-        # Map questions to units and extract topics
-        mapped_questions = []
+        # Stream questions through extraction and mapping; only running
+        # statistics and the spool index are kept in memory
+        total_questions = 0
         mapping_stats = defaultdict(int)
-        confidence_stats = []
-        
-        for question in all_questions:
-            unit, confidence = self.map_question_to_unit(question)
-            if unit:
-                question.unit = unit
-                question.confidence = confidence
-                question.topics = self.extract_topics_from_question(question, unit)
-                mapped_questions.append(question)
-                mapping_stats[unit] += 1
-                confidence_stats.append(confidence)
-        
-        self.questions = mapped_questions
-        
-        # Calculate statistics
-        total_mapped = len(mapped_questions)
-        mapping_accuracy = (total_mapped / len(all_questions)) * 100 if all_questions else 0
-        avg_confidence = sum(confidence_stats) / len(confidence_stats) if confidence_stats else 0
-        
-        print(f"\n📊 Mapping Results:")
-        print(f"   Total questions: {len(all_questions)}")
-        print(f"   Successfully mapped: {total_mapped}")
-        print(f"   Mapping accuracy: {mapping_accuracy:.2f}%")
-        print(f"   Average confidence: {avg_confidence:.3f}")
+        summary = {
+            'language': Counter(),
+            'marks': Counter(),
+            'confidence_total': 0.0,
+            'high': 0,
+            'medium': 0,
+            'low': 0,
+        }
         
-        print(f"\n📈 Distribution by unit:")
-        for unit, count in sorted(mapping_stats.items()):
-            print(f"   {unit}: {count} questions")
+        with QuestionSpool() as spool:
+            for question in self.iter_mapped_questions(self.iter_questions(solution_files)):
+                total_questions += 1
+                if not question.unit:
+                    continue
+                
+                mapping_stats[question.unit] += 1
+                summary['language'][question.language] += 1
+                summary['marks'][question.marks] += 1
+                summary['confidence_total'] += question.confidence
+                if question.confidence >= 0.7:
+                    summary['high'] += 1
+                elif question.confidence >= 0.4:
+                    summary['medium'] += 1
+                else:
+                    summary['low'] += 1
+                
+                # Final order is by confidence (highest first)
+                spool.add(asdict(question), (-question.confidence,))
+            
+            print(f"🔍 Total questions extracted: {total_questions}")
+            
+            # Calculate statistics
+            total_mapped = len(spool)
+            mapping_accuracy = (total_mapped / total_questions) * 100 if total_questions else 0
+            avg_confidence = summary['confidence_total'] / total_mapped if total_mapped else 0
+            
+            print(f"\n📊 Mapping Results:")
+            print(f"   Total questions: {total_questions}")
+            print(f"   Successfully mapped: {total_mapped}")
+            print(f"   Mapping accuracy: {mapping_accuracy:.2f}%")
+            print(f"   Average confidence: {avg_confidence:.3f}")
+            
+            print(f"\n📈 Distribution by unit:")
+            for unit, count in sorted(mapping_stats.items()):
+                print(f"   {unit}: {count} questions")
+            
+            # Generate final JSON
+            self.save_question_bank(spool)
         
-        # Generate final JSON
-        self.save_question_bank()
+        summary['unit'] = Counter(mapping_stats)
+        summary['extracted'] = total_questions
+        if total_mapped:
+            self.generate_summary_report(total_mapped, summary)
         
         return {
-            'total_questions': len(all_questions),
+            'total_questions': total_questions,
             'mapped_questions': total_mapped,
             'mapping_accuracy': mapping_accuracy,
             'average_confidence': avg_confidence,
             'unit_distribution': dict(mapping_stats)
         }
     
-    def save_question_bank(self):
-        """Save the question bank to JSON file"""
+    def save_question_bank(self, spool: QuestionSpool):
+        """Stream the spooled questions into the question bank JSON file"""
         output_file = self.base_path / "4353202-question-bank-final.json"
         
-        # Prepare data structure
-        question_bank = {
-            "metadata": {
-                "subject": "Software Engineering",
-                "subject_code": "4353202",
-                "semester": "5",
-                "generated_at": "2024-09-11",
-                "total_questions": len(self.questions),
-                "mapping_methodology": "Enhanced bilingual keyword mapping with contextual analysis",
-                "confidence_threshold": 0.3,
-                "languages": ["english", "gujarati"]
-            },
-            "questions": []
+        metadata = {
+            "subject": "Software Engineering",
+            "subject_code": "4353202",
+            "semester": "5",
+            "generated_at": "2024-09-11",
+            "total_questions": len(spool),
+            "mapping_methodology": "Enhanced bilingual keyword mapping with contextual analysis",
+            "confidence_threshold": 0.3,
+            "languages": ["english", "gujarati"]
         }
         
-        # Convert questions to dictionaries
-        for question in self.questions:
-            question_dict = asdict(question)
-            # Ensure topics is not None
-            if question_dict['topics'] is None:
-                question_dict['topics'] = []
-            question_bank["questions"].append(question_dict)
-        
-        # Sort questions by confidence (highest first)
-        question_bank["questions"].sort(key=lambda x: x['confidence'], reverse=True)
-        
-        # Save to file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(question_bank, f, ensure_ascii=False, indent=2)
+        write_json_document(output_file, {"metadata": metadata}, "questions", spool.iter_json())
         
         print(f"\n✅ Question bank saved to: {output_file}")
-        
-        # Generate summary statistics
-        self.generate_summary_report(question_bank)
     
-    def generate_summary_report(self, question_bank: Dict):
-        """Generate and display summary report"""
-        questions = question_bank["questions"]
-        
-        # Language distribution
-        lang_dist = Counter(q['language'] for q in questions)
-        
-        # Unit distribution
-        unit_dist = Counter(q['unit'] for q in questions)
-        
-        # Marks distribution
-        marks_dist = Counter(q['marks'] for q in questions)
-        
-        # Confidence statistics
-        confidences = [q['confidence'] for q in questions]
-        high_conf = sum(1 for c in confidences if c >= 0.7)
-        medium_conf = sum(1 for c in confidences if 0.4 <= c < 0.7)
-        low_conf = sum(1 for c in confidences if c < 0.4)
+    def generate_summary_report(self, total: int, summary: Dict):
+        """Generate and display summary report from the streamed statistics"""
+        high_conf = summary['high']
+        medium_conf = summary['medium']
+        low_conf = summary['low']
         
         print(f"\n📋 QUESTION BANK SUMMARY REPORT")
         print(f"=" * 50)
         print(f"Subject: Software Engineering (4353202)")
-        print(f"Total Questions: {len(questions)}")
-        print(f"Mapping Success Rate: {(len(questions)/question_bank['metadata']['total_questions'])*100:.1f}%")
+        print(f"Total Questions: {total}")
+        print(f"Mapping Success Rate: {(total / summary['extracted']) * 100:.1f}%")
         
         print(f"\n🌍 Language Distribution:")
-        for lang, count in lang_dist.items():
-            percentage = (count / len(questions)) * 100
+        for lang, count in summary['language'].items():
+            percentage = (count / total) * 100
             print(f"   {lang.title()}: {count} ({percentage:.1f}%)")
         
         print(f"\n📚 Unit Distribution:")
-        for unit, count in sorted(unit_dist.items()):
-            percentage = (count / len(questions)) * 100
+        for unit, count in sorted(summary['unit'].items()):
+            percentage = (count / total) * 100
             print(f"   {unit}: {count} ({percentage:.1f}%)")
         
         print(f"\n🎯 Marks Distribution:")
-        for marks, count in sorted(marks_dist.items()):
-            percentage = (count / len(questions)) * 100
+        for marks, count in sorted(summary['marks'].items()):
+            percentage = (count / total) * 100
             print(f"   {marks} marks: {count} ({percentage:.1f}%)")
         
         print(f"\n📈 Confidence Levels:")
-        print(f"   High (≥0.7): {high_conf} ({(high_conf/len(questions))*100:.1f}%)")
-        print(f"   Medium (0.4-0.7): {medium_conf} ({(medium_conf/len(questions))*100:.1f}%)")
-        print(f"   Low (<0.4): {low_conf} ({(low_conf/len(questions))*100:.1f}%)")
+        print(f"   High (≥0.7): {high_conf} ({(high_conf/total)*100:.1f}%)")
+        print(f"   Medium (0.4-0.7): {medium_conf} ({(medium_conf/total)*100:.1f}%)")
+        print(f"   Low (<0.4): {low_conf} ({(low_conf/total)*100:.1f}%)")
         
-        avg_confidence = sum(confidences) / len(confidences)
+        avg_confidence = summary['confidence_total'] / total
         print(f"   Average Confidence: {avg_confidence:.3f}")
         
         if low_conf == 0:
@@ -17,8 +17,152 @@ import os
 from datetime import datetime
 from typing import Dict, List, Any, Tuple, Optional
 import hashlib
+import sys
 from pathlib import Path
 
+# Shared corpus tools live in <project root>/scripts
+sys.path.insert(0, str(Path(__file__).resolve().parents[6] / 'scripts'))
+from keyword_pack import PhraseMatcher
+from content_snapshot import read_text
+
+UNIT_ORDER = ['Unit-I', 'Unit-II', 'Unit-III', 'Unit-IV', 'Unit-V']
+
+# Relative weight of a keyword hit in the question text vs. only in the answer
+# body. Answers mention neighbouring topics in passing, so their hits count half.
+FIELD_WEIGHTS = {'question': 1.0, 'answer': 0.5}
+
+
+class UnitRuleEngine:
+    """
+    Compiled three-tier unit mapping cascade.
+
+    Every phrase used by any tier (unit keywords, fallback patterns, Gujarati
+    patterns, last-resort words) goes into one Aho-Corasick matcher, so each
+    question's text is scanned once. The tiers are then resolved from the set
+    of hits in order, stopping at the first one that yields a unit:
+
+    1. Weighted keyword match per unit/language (confidence >= threshold)
+    2. Fallback pattern scores, then Gujarati-specific patterns
+    3. Question number and content-word heuristics
+    """
+
+    def __init__(self, keywords, fallback_patterns, gujarati_patterns, last_resort_rules,
+                 forensic_words, confidence_threshold=10.0, field_weights=FIELD_WEIGHTS):
+        self.confidence_threshold = confidence_threshold
+        self.field_weights = field_weights
+        self._phrase_ids = {}
+        self._phrases = []
+
+        # Tier 1: (unit, language) -> keywords in order; phrase -> [(unit, language, index, weight)]
+        self.units = list(keywords)
+        self.keywords = {}
+        self._keyword_rules = {}
+        for unit, languages in keywords.items():
+            for language, words in languages.items():
+                self.keywords[(unit, language)] = list(words)
+                for index, keyword in enumerate(words):
+                    # Multi-word keywords get higher weight
+                    rule = (unit, language, index, len(keyword.split()) * 2)
+                    self._keyword_rules.setdefault(self._phrase(keyword.lower()), []).append(rule)
+
+        # Tier 2: phrase -> [(unit, weight)] and Gujarati phrase -> units
+        self._fallback_rules = {}
+        for unit, patterns in fallback_patterns.items():
+            for pattern in patterns:
+                self._fallback_rules.setdefault(self._phrase(pattern), []).append((unit, len(pattern.split())))
+        self._gujarati_rules = {}
+        for unit, patterns in gujarati_patterns.items():
+            for pattern in patterns:
+                self._gujarati_rules.setdefault(self._phrase(pattern), []).append(unit)
+        self._gujarati_order = list(gujarati_patterns)
+
+        # Tier 3: content-word rules in priority order
+        self._forensic_ids = {self._phrase(word) for word in forensic_words}
+        self._last_resort_rules = [({self._phrase(word) for word in words}, unit) for words, unit in last_resort_rules]
+
+        self.matcher = PhraseMatcher(self._phrases)
+
+    def _phrase(self, phrase):
+        if phrase not in self._phrase_ids:
+            self._phrase_ids[phrase] = len(self._phrases)
+            self._phrases.append(phrase)
+        return self._phrase_ids[phrase]
+
+    def map_question(self, question: Dict[str, Any]) -> Tuple[Optional[str], float, List[str]]:
+        """
+        Resolve a question's unit from a single scan of its question and answer text.
+
+        Returns:
+            Tuple of (unit or None, mapping confidence, keywords found)
+        """
+        question_text = question['question_text'].lower()
+        text = f"{question_text} {question['answer_text'].lower()}"
+        hits, question_hits = self.matcher.found_split(text, len(question_text))
+
+        def field_weight(pid):
+            return self.field_weights['question' if pid in question_hits else 'answer']
+
+        # Tier 1: weighted keyword confidence for the question's language
+        scores = {}
+        matched = {}
+        for pid in hits:
+            for unit, language, index, weight in self._keyword_rules.get(pid, ()):
+                if language == question['language']:
+                    scores[unit] = scores.get(unit, 0.0) + weight * field_weight(pid)
+                    matched.setdefault(unit, []).append(index)
+
+        best_unit = None
+        best_confidence = 0.0
+        for unit in self.units:
+            lang_keywords = self.keywords.get((unit, question['language']), [])
+            confidence = scores.get(unit, 0.0)
+            if lang_keywords:
+                confidence = min(confidence / len(lang_keywords) * 100, 100.0)
+            if confidence > best_confidence:
+                best_confidence = confidence
+                best_unit = unit
+
+        if best_confidence >= self.confidence_threshold:
+            found = [self.keywords[(best_unit, question['language'])][i] for i in sorted(matched[best_unit])]
+            return best_unit, best_confidence, found
+
+        # Tier 2: fallback pattern scores, then Gujarati-specific patterns
+        unit_scores = dict.fromkeys(UNIT_ORDER, 0)
+        for pid in hits:
+            for unit, weight in self._fallback_rules.get(pid, ()):
+                unit_scores[unit] += weight * field_weight(pid)
+        max_unit = max(unit_scores, key=unit_scores.get)
+        if unit_scores[max_unit] > 0:
+            return max_unit, 8.0, []
+
+        if question['language'] == 'gujarati':
+            gujarati_units = {unit for pid in hits for unit in self._gujarati_rules.get(pid, ())}
+            for unit in self._gujarati_order:
+                if unit in gujarati_units:
+                    return unit, 8.0, []
+
+        # Tier 3: question number, then content words
+        unit = self._last_resort_unit(question.get('question_number', '0'), hits)
+        return unit, 5.0 if unit else 0.0, []
+
+    def _last_resort_unit(self, q_num, hits) -> Optional[str]:
+        # Typical question distribution in cyber security exams
+        try:
+            q_int = int(q_num)
+            if q_int == 3:
+                # Q3 covers network security (Unit-III) or forensics/crimes (Unit-V)
+                return 'Unit-V' if hits & self._forensic_ids else 'Unit-III'
+            if 1 <= q_int <= 5:
+                return UNIT_ORDER[q_int - 1]
+        except (ValueError, TypeError):
+            pass
+
+        for phrase_ids, unit in self._last_resort_rules:
+            if hits & phrase_ids:
+                return unit
+        return None
+
+
 class CyberSecurityQuestionBankGenerator:
     """Enhanced Question Bank Generator for Cyber Security with 100% accuracy target"""
     
@@ -40,6 +184,15 @@ class CyberSecurityQuestionBankGenerator:
         # Enhanced bilingual keyword mappings for Cyber Security
         self.enhanced_keywords = self._build_enhanced_keyword_mappings()
         
+        # All mapping tiers compiled into one single-scan rule engine
+        self.rule_engine = UnitRuleEngine(
+            self.enhanced_keywords,
+            self._build_fallback_patterns(),
+            self._build_gujarati_patterns(),
+            self._build_last_resort_rules(),
+            forensic_words=['forensic', 'crime', 'investigation']
+        )
+        
     def _build_enhanced_keyword_mappings(self) -> Dict[str, Dict[str, List[str]]]:
         """Build comprehensive bilingual keyword mappings for cyber security"""
         
@@ -344,8 +497,7 @@ class CyberSecurityQuestionBankGenerator:
     def load_syllabus(self) -> bool:
         """Load and parse syllabus JSON file"""
         try:
-            with open(self.syllabus_file, 'r', encoding='utf-8') as f:
-                self.syllabus_data = json.load(f)
+            self.syllabus_data = json.loads(read_text(self.syllabus_file))
             
             # Build unit mappings from syllabus
             if 'underpinningTheory' in self.syllabus_data:
@@ -465,165 +617,81 @@ class CyberSecurityQuestionBankGenerator:
             return 'General'
     
     def map_questions_to_units(self):
-        """Map questions to units using enhanced keyword matching"""
+        """Map questions to units using enhanced keyword matching with fallback tiers"""
         
         print("\n🎯 Mapping questions to units using enhanced keyword matching...")
         
         for question in self.questions:
-            best_unit = None
-            best_confidence = 0.0
-            keyword_matches = []
-            
-            # Combine question and answer text for better matching
-            full_text = f"{question['question_text']} {question['answer_text']}".lower()
-            
-            # Try mapping to each unit
-            for unit_id, keywords in self.enhanced_keywords.items():
-                confidence = 0.0
-                unit_keywords = []
-                
-                # Get keywords for the question's language
-                lang_keywords = keywords.get(question['language'], [])
-                
-                # Calculate keyword match score
-                for keyword in lang_keywords:
-                    if keyword.lower() in full_text:
-                        # Weight keywords by importance and specificity
-                        weight = len(keyword.split()) * 2  # Multi-word keywords get higher weight
-                        confidence += weight
-                        unit_keywords.append(keyword)
-                
-                # Normalize confidence score
-                if lang_keywords:
-                    confidence = min(confidence / len(lang_keywords) * 100, 100.0)
-                
-                # Update best match
-                if confidence > best_confidence:
-                    best_confidence = confidence
-                    best_unit = unit_id
-                    keyword_matches = unit_keywords
-            
-            # Assign unit if confidence is above threshold or use fallback
-            confidence_threshold = 10.0  # Lowered threshold for better coverage
-            
-            if best_confidence >= confidence_threshold:
-                question['unit'] = best_unit
+            unit, confidence, keyword_matches = self.rule_engine.map_question(question)
+            question['unit'] = unit
+            question['mapping_confidence'] = confidence
+            if keyword_matches:
                 question['keywords_found'] = keyword_matches
-                question['mapping_confidence'] = best_confidence
-            else:
-                # Try fallback mapping based on question structure or manual patterns
-                fallback_unit = self._fallback_unit_mapping(question)
-                if fallback_unit:
-                    question['unit'] = fallback_unit
-                    question['mapping_confidence'] = 8.0  # Lower confidence for fallback
-                else:
-                    # Last resort: try simple text matching
-                    question['unit'] = self._last_resort_mapping(question)
-                    question['mapping_confidence'] = 5.0 if question['unit'] else 0.0
     
-    def _fallback_unit_mapping(self, question: Dict[str, Any]) -> Optional[str]:
-        """Enhanced fallback unit mapping for questions that didn't match keywords"""
-        
-        # Pattern-based fallback mapping
-        q_text = question['question_text'].lower()
-        combined_text = f"{question['question_text']} {question['answer_text']}".lower()
-        
-        # Unit-I patterns (Enhanced)
-        unit_1_patterns = [
-            'cia', 'triad', 'confidentiality', 'integrity', 'availability',
-            'adversary', 'attack', 'countermeasure', 'threat', 'vulnerability', 'risk',
-            'security policy', 'system resource', 'osi security', 'security architecture',
-            'md5', 'hash', 'hashing', 'sha', 'secure hash', 'message digest',
-            'cryptography', 'encryption', 'decryption', 'public key', 'private key',
-            'asymmetric', 'symmetric', 'rsa', 'digital signature'
-        ]
-        
-        # Unit-II patterns (Enhanced)
-        unit_2_patterns = [
-            'authentication', 'authorization', 'multi-factor', 'mfa', '2fa', 'biometric',
-            'password', 'verification', 'sso', 'single sign', 'captcha',
-            'firewall', 'packet filter', 'application proxy', 'personal firewall',
-            'malware', 'malicious software', 'virus', 'worm', 'trojan', 'ransomware',
-            'spyware', 'adware', 'rootkit', 'keylogger', 'backdoor', 'sniffer',
-            'brute force', 'credential stuffing', 'dictionary attack',
-            'social engineering', 'phishing', 'vishing', 'man in the middle'
-        ]
-        
-        # Unit-III patterns (Enhanced)
-        unit_3_patterns = [
-            'network security', 'web security', 'port', 'port 80', 'port 443',
-            'ssl', 'tls', 'secure socket', 'transport layer security',
-            'https', 'http secure', 'certificate', 'digital certificate',
-            'certificate authority', 'ca', 'pki', 'public key infrastructure',
-            'digital signature', 'vpn', 'virtual private network',
-            'ssh', 'secure shell', 'remote access', 'tunneling'
-        ]
-        
-        # Unit-IV patterns (Enhanced)
-        unit_4_patterns = [
-            'hacking', 'ethical hacking', 'penetration testing', 'pen testing',
-            'white hat', 'black hat', 'grey hat', 'gray hat', 'script kiddie',
-            'vulnerability', 'exploit', 'zero day', '0-day', 'security flaw',
-            'reconnaissance', 'footprinting', 'information gathering',
-            'scanning', 'enumeration', 'vulnerability scanning', 'port scanning',
-            'kali linux', 'nmap', 'netcat', 'hydra', 'metasploit', 'burp suite',
-            'injection attack', 'sql injection', 'xss', 'cross-site scripting',
-            'session hijacking', 'sniffing', 'packet sniffing',
-            'rat', 'remote administration tool'
-        ]
+    def _build_fallback_patterns(self) -> Dict[str, List[str]]:
+        """Fallback patterns for questions that didn't match the unit keywords"""
         
-        # Unit-V patterns (Enhanced)
-        unit_5_patterns = [
-            'cybercrime', 'cyber crime', 'cybercriminal', 'cyber criminal',
-            'digital crime', 'computer crime', 'internet crime',
-            'cyber stalking', 'cyber bullying', 'cyber terrorism', 'cyber espionage',
-            'email bombing', 'salami attack', 'web jacking', 'data diddling',
-            'ddos', 'distributed denial', 'ransomware', 'credit card fraud',
-            'software piracy', 'copyright infringement', 'trademark violations',
-            'digital forensics', 'computer forensics', 'cyber forensics',
-            'forensic investigation', 'evidence preservation', 'data recovery',
-            'disk forensics', 'network forensics', 'mobile forensics',
-            'forensic analysis', 'chain of custody', 'forensic imaging',
-            'autopsy', 'ftk imager', 'memoryze', 'volatility', 'cctv'
-        ]
-        
-        # Enhanced pattern matching with scoring
-        unit_scores = {
-            'Unit-I': 0,
-            'Unit-II': 0,
-            'Unit-III': 0,
-            'Unit-IV': 0,
-            'Unit-V': 0
+        return {
+            # Unit-I patterns (Enhanced)
+            'Unit-I': [
+                'cia', 'triad', 'confidentiality', 'integrity', 'availability',
+                'adversary', 'attack', 'countermeasure', 'threat', 'vulnerability', 'risk',
+                'security policy', 'system resource', 'osi security', 'security architecture',
+                'md5', 'hash', 'hashing', 'sha', 'secure hash', 'message digest',
+                'cryptography', 'encryption', 'decryption', 'public key', 'private key',
+                'asymmetric', 'symmetric', 'rsa', 'digital signature'
+            ],
+            # Unit-II patterns (Enhanced)
+            'Unit-II': [
+                'authentication', 'authorization', 'multi-factor', 'mfa', '2fa', 'biometric',
+                'password', 'verification', 'sso', 'single sign', 'captcha',
+                'firewall', 'packet filter', 'application proxy', 'personal firewall',
+                'malware', 'malicious software', 'virus', 'worm', 'trojan', 'ransomware',
+                'spyware', 'adware', 'rootkit', 'keylogger', 'backdoor', 'sniffer',
+                'brute force', 'credential stuffing', 'dictionary attack',
+                'social engineering', 'phishing', 'vishing', 'man in the middle'
+            ],
+            # Unit-III patterns (Enhanced)
+            'Unit-III': [
+                'network security', 'web security', 'port', 'port 80', 'port 443',
+                'ssl', 'tls', 'secure socket', 'transport layer security',
+                'https', 'http secure', 'certificate', 'digital certificate',
+                'certificate authority', 'ca', 'pki', 'public key infrastructure',
+                'digital signature', 'vpn', 'virtual private network',
+                'ssh', 'secure shell', 'remote access', 'tunneling'
+            ],
+            # Unit-IV patterns (Enhanced)
+            'Unit-IV': [
+                'hacking', 'ethical hacking', 'penetration testing', 'pen testing',
+                'white hat', 'black hat', 'grey hat', 'gray hat', 'script kiddie',
+                'vulnerability', 'exploit', 'zero day', '0-day', 'security flaw',
+                'reconnaissance', 'footprinting', 'information gathering',
+                'scanning', 'enumeration', 'vulnerability scanning', 'port scanning',
+                'kali linux', 'nmap', 'netcat', 'hydra', 'metasploit', 'burp suite',
+                'injection attack', 'sql injection', 'xss', 'cross-site scripting',
+                'session hijacking', 'sniffing', 'packet sniffing',
+                'rat', 'remote administration tool'
+            ],
+            # Unit-V patterns (Enhanced)
+            'Unit-V': [
+                'cybercrime', 'cyber crime', 'cybercriminal', 'cyber criminal',
+                'digital crime', 'computer crime', 'internet crime',
+                'cyber stalking', 'cyber bullying', 'cyber terrorism', 'cyber espionage',
+                'email bombing', 'salami attack', 'web jacking', 'data diddling',
+                'ddos', 'distributed denial', 'ransomware', 'credit card fraud',
+                'software piracy', 'copyright infringement', 'trademark violations',
+                'digital forensics', 'computer forensics', 'cyber forensics',
+                'forensic investigation', 'evidence preservation', 'data recovery',
+                'disk forensics', 'network forensics', 'mobile forensics',
+                'forensic analysis', 'chain of custody', 'forensic imaging',
+                'autopsy', 'ftk imager', 'memoryze', 'volatility', 'cctv'
+            ]
         }
+    
+    def _build_gujarati_patterns(self) -> Dict[str, List[str]]:
+        """Special case patterns for specific Gujarati questions"""
         
-        # Score each unit based on pattern matches
-        for pattern in unit_1_patterns:
-            if pattern in combined_text:
-                unit_scores['Unit-I'] += len(pattern.split())
-                
-        for pattern in unit_2_patterns:
-            if pattern in combined_text:
-                unit_scores['Unit-II'] += len(pattern.split())
-                
-        for pattern in unit_3_patterns:
-            if pattern in combined_text:
-                unit_scores['Unit-III'] += len(pattern.split())
-                
-        for pattern in unit_4_patterns:
-            if pattern in combined_text:
-                unit_scores['Unit-IV'] += len(pattern.split())
-                
-        for pattern in unit_5_patterns:
-            if pattern in combined_text:
-                unit_scores['Unit-V'] += len(pattern.split())
-        
-        # Return unit with highest score if above threshold
-        max_unit = max(unit_scores, key=unit_scores.get)
-        if unit_scores[max_unit] > 0:
-            return max_unit
-            
-        # Special case patterns for specific Gujarati questions
-        gujarati_patterns = {
+        return {
             'Unit-I': ['પબ્લિક કી', 'પ્રાઇવેટ કી', 'ક્રિપ્ટોગ્રાફી', 'એન્ક્રિપ્શન', 'ડિક્રિપ્શન', 
                       'cia', 'osi', 'સુરક્ષા હુમલા', 'md5', 'હેશ'],
             'Unit-II': ['ફાયરવોલ', 'ઓથેન્ટિકેશન', 'પ્રમાણીકરણ', 'દૂષિત સૉફ્ટવેર', 'મેલવેર'],
@@ -634,60 +702,18 @@ class CyberSecurityQuestionBankGenerator:
                       'ડેટા ડિડલિંગ', 'રેન્સમવેર', 'ડિસ્ક ફોરેન્સિક્સ', 'મોબાઇલ ફોરેન્સિક્સ',
                       'પાસવર્ડ ક્રેકિંગ', 'rat']
         }
-        
-        if question['language'] == 'gujarati':
-            for unit, patterns in gujarati_patterns.items():
-                for pattern in patterns:
-                    if pattern in combined_text:
-                        return unit
-        
-        return None
     
-    def _last_resort_mapping(self, question: Dict[str, Any]) -> Optional[str]:
-        """Last resort mapping using question number and structure patterns"""
+    def _build_last_resort_rules(self) -> List[Tuple[List[str], str]]:
+        """Content-based last resort patterns, checked in order"""
         
-        q_num = question.get('question_number', '0')
-        combined_text = f"{question['question_text']} {question['answer_text']}".lower()
-        
-        # Question number based patterns (common exam patterns)
-        try:
-            q_int = int(q_num)
-            
-            # Typical question distribution patterns in cyber security exams
-            if q_int == 1:
-                # Q1 usually covers fundamentals (Unit-I)
-                return 'Unit-I'
-            elif q_int == 2:
-                # Q2 usually covers authentication/security mechanisms (Unit-II)
-                return 'Unit-II'
-            elif q_int == 3:
-                # Q3 usually covers network security (Unit-III or Unit-V)
-                if any(word in combined_text for word in ['forensic', 'crime', 'investigation']):
-                    return 'Unit-V'
-                else:
-                    return 'Unit-III'
-            elif q_int == 4:
-                # Q4 usually covers hacking/tools (Unit-IV)
-                return 'Unit-IV'
-            elif q_int == 5:
-                # Q5 usually covers forensics/crimes (Unit-V)
-                return 'Unit-V'
-                
-        except (ValueError, TypeError):
-            pass
-        
-        # Content-based last resort patterns
-        if any(word in combined_text for word in ['define', 'definition', 'what is', 'વ્યાખ્યા']):
+        return [
             # Definitions are often Unit-I
-            return 'Unit-I'
-        elif any(word in combined_text for word in ['protocol', 'stack', 'પ્રોટોકોલ', 'સ્ટેક']):
+            (['define', 'definition', 'what is', 'વ્યાખ્યા'], 'Unit-I'),
             # Protocol questions are often Unit-III
-            return 'Unit-III'
-        elif any(word in combined_text for word in ['tool', 'command', 'linux', 'ટૂલ', 'કમાન્ડ']):
+            (['protocol', 'stack', 'પ્રોટોકોલ', 'સ્ટેક'], 'Unit-III'),
             # Tool-based questions are often Unit-IV
-            return 'Unit-IV'
-        
-        return None
+            (['tool', 'command', 'linux', 'ટૂલ', 'કમાન્ડ'], 'Unit-IV')
+        ]
     
     def generate_question_bank(self) -> Dict[str, Any]:
         """Generate the final question bank JSON"""
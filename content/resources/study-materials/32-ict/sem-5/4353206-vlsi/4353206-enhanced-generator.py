@@ -6,11 +6,17 @@ Version 3.0 - Improved mapping accuracy with manual validation
 
 import json
 import re
+import sys
 import hashlib
 from datetime import datetime
+from pathlib import Path
 from typing import Dict, List, Tuple, Any
 from dataclasses import dataclass, asdict
 
+# Shared corpus tools live in <project root>/scripts
+sys.path.insert(0, str(Path(__file__).resolve().parents[6] / 'scripts'))
+from keyword_pack import PhraseMatcher
+
 @dataclass
 class Question:
     id: str
@@ -26,6 +32,190 @@ class Question:
     line_number: int
     confidence_score: float
 
+class QuestionAnnotator:
+    """
+    Fused per-question annotation pass.
+
+    Every phrase from the unit signatures, question-type patterns, type
+    categories and complexity indicators is compiled into one Aho-Corasick
+    matcher per (question language, script language) pair, together with a
+    table of what each phrase contributes. Each question is lowercased and
+    scanned once; unit scores, keywords, difficulty and question type are all
+    resolved from that single hit set.
+    """
+
+    def __init__(self, unit_signatures, question_patterns, type_patterns, complex_indicators):
+        self.units = list(unit_signatures)
+        self._unit_sizes = {
+            language: [(len(unit_signatures[unit].get(language, {}).get("primary", [])),
+                        len(unit_signatures[unit].get(language, {}).get("secondary", [])))
+                       for unit in self.units]
+            for language in question_patterns
+        }
+        self._type_order = {language: list(groups) for language, groups in type_patterns.items()}
+
+        # (language, text_language) -> (matcher, per-phrase contributions)
+        self._tables = {}
+        for language in question_patterns:
+            for text_language in type_patterns:
+                self._tables[(language, text_language)] = self._compile(
+                    unit_signatures, question_patterns[language],
+                    type_patterns[text_language], complex_indicators[text_language], language
+                )
+
+    def _compile(self, unit_signatures, question_patterns, type_patterns, complex_indicators, language):
+        phrase_ids = {}
+        effects = []
+
+        def effect(phrase):
+            phrase = phrase.lower()
+            if phrase not in phrase_ids:
+                phrase_ids[phrase] = len(effects)
+                effects.append({'units': [], 'patterns': [], 'types': set(), 'complex': 0})
+            return effects[phrase_ids[phrase]]
+
+        for u_index, unit in enumerate(self.units):
+            tiers = unit_signatures[unit].get(language, {})
+            for keyword in tiers.get("primary", []):
+                # Weight by keyword length and specificity
+                weight = len(keyword.split()) * 2.0
+                if len(keyword) > 10:  # Long specific terms
+                    weight *= 1.5
+                effect(keyword)['units'].append((u_index, weight, 1, 0, keyword))
+            for keyword in tiers.get("secondary", []):
+                effect(keyword)['units'].append((u_index, 0.0, 0, 1, keyword))
+
+        for patterns in question_patterns.values():
+            for pattern in patterns:
+                effect(pattern)['patterns'].append(pattern)
+
+        for t_index, keywords in enumerate(type_patterns.values()):
+            for keyword in keywords:
+                effect(keyword)['types'].add(t_index)
+
+        for indicator in complex_indicators:
+            effect(indicator)['complex'] += 1
+
+        table = [(tuple(e['units']), tuple(e['patterns']), frozenset(e['types']), e['complex']) for e in effects]
+        return PhraseMatcher(list(phrase_ids)), table
+
+    @staticmethod
+    def detect_language(question_text: str) -> str:
+        """Script-based language used for difficulty and type tables"""
+        return "gujarati" if any(char in question_text for char in "અઆઇઈઉ") else "english"
+
+    def annotate(self, question: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Annotate one extracted question from a single scan of its text.
+
+        Returns:
+            Dict with mapped_units, confidence, keywords, difficulty and question_type
+        """
+        text = question['text']
+        language = question['language']
+        text_language = self.detect_language(text)
+        matcher, table = self._tables[(language, text_language)]
+
+        unit_count = len(self.units)
+        primary_score = [0.0] * unit_count
+        primary_matches = [0] * unit_count
+        secondary_matches = [0] * unit_count
+        unit_keywords = [[] for _ in range(unit_count)]
+        keywords = set()
+        type_hits = set()
+        complexity_score = 0
+
+        for pid in matcher.found(text.lower()):
+            units, patterns, types, complex_count = table[pid]
+            for u_index, weight, primary, secondary, keyword in units:
+                primary_score[u_index] += weight
+                primary_matches[u_index] += primary
+                secondary_matches[u_index] += secondary
+                unit_keywords[u_index].append(keyword)
+            keywords.update(patterns)
+            type_hits |= types
+            complexity_score += complex_count
+
+        sizes = self._unit_sizes[language]
+        unit_scores = {
+            unit: self._unit_score(primary_score[i], primary_matches[i], secondary_matches[i], sizes[i], text)
+            for i, unit in enumerate(self.units)
+        }
+        mapped_units, confidence = self._select_units(unit_scores)
+
+        # Keywords from mapped units only, plus question type keywords
+        for unit in mapped_units:
+            keywords.update(unit_keywords[self.units.index(unit)])
+
+        marks = question['marks']
+        if marks >= 7 or complexity_score >= 3:
+            difficulty = "Hard"
+        elif marks >= 4 or complexity_score >= 2:
+            difficulty = "Medium"
+        else:
+            difficulty = "Easy"
+
+        type_order = self._type_order[text_language]
+        question_type = type_order[min(type_hits)] if type_hits else "General"
+
+        return {
+            'mapped_units': mapped_units,
+            'confidence': confidence,
+            'keywords': list(keywords),
+            'difficulty': difficulty,
+            'question_type': question_type
+        }
+
+    @staticmethod
+    def _unit_score(primary_score, primary_matches, secondary_matches, sizes, question_text: str) -> float:
+        total_primary, total_secondary = sizes
+        secondary_score = float(secondary_matches)
+
+        # Normalize scores
+        primary_normalized = primary_score / (total_primary * 2.0) if total_primary > 0 else 0
+        secondary_normalized = secondary_score / total_secondary if total_secondary > 0 else 0
+
+        # Combine scores with primary emphasis
+        final_score = (primary_normalized * 0.8) + (secondary_normalized * 0.2)
+
+        # Boost score if multiple keywords match
+        if primary_matches > 1:
+            final_score *= 1.3
+        if secondary_matches > 2:
+            final_score *= 1.1
+
+        # Penalty for generic questions
+        if len(question_text) < 50:
+            final_score *= 0.8
+
+        return min(final_score, 1.0)
+
+    @staticmethod
+    def _select_units(unit_scores: Dict[str, float]) -> Tuple[List[str], float]:
+        """Stricter threshold-based unit selection"""
+        high_threshold = 0.4
+        medium_threshold = 0.25
+
+        # Find high confidence mappings
+        high_conf_units = [unit for unit, score in unit_scores.items() if score >= high_threshold]
+
+        if high_conf_units:
+            # Use high confidence units
+            mapped_units = high_conf_units[:2]  # Limit to top 2
+            return mapped_units, max(unit_scores[unit] for unit in mapped_units)
+
+        # Find medium confidence mappings
+        medium_conf_units = [unit for unit, score in unit_scores.items() if score >= medium_threshold]
+        if medium_conf_units:
+            # Take top scoring medium confidence unit
+            best_medium = max(medium_conf_units, key=lambda x: unit_scores[x])
+            return [best_medium], unit_scores[best_medium]
+
+        # Assign to best scoring unit even if low confidence
+        best_unit = max(unit_scores.items(), key=lambda x: x[1])
+        return [best_unit[0]], best_unit[1]
+
+
 class EnhancedVLSIQuestionBankGenerator:
     def __init__(self, syllabus_file: str):
         """Initialize with enhanced unit-specific mappings"""
@@ -124,6 +314,35 @@ class EnhancedVLSIQuestionBankGenerator:
             }
         }
         
+        # Question type categories (first matching category wins)
+        self.type_patterns = {
+            "english": {
+                "Theoretical": ["explain", "describe", "define", "what is", "discuss"],
+                "Analytical": ["analyze", "compare", "differentiate", "contrast"],
+                "Design": ["design", "implement", "draw", "create", "realize"],
+                "Programming": ["verilog", "code", "program", "write", "module"],
+                "Problem Solving": ["calculate", "find", "solve", "determine"]
+            },
+            "gujarati": {
+                "Theoretical": ["સમજાવો", "વર્ણન", "વ્યાખ્યા", "શું છે", "ચર્ચા"],
+                "Analytical": ["વિશ્લેષણ", "સરખાવો", "તફાવત", "વિરોધાભાસ"],
+                "Design": ["ડિઝાઇન", "અમલીકરણ", "દોરો", "બનાવો", "અમલમાં"],
+                "Programming": ["વેરિલોગ", "કોડ", "પ્રોગ્રામ", "લખો", "મોડ્યુલ"],
+                "Problem Solving": ["ગણતરી", "શોધો", "ઉકેલો", "નક્કી કરો"]
+            }
+        }
+        
+        # Complexity indicators used for difficulty
+        self.complex_indicators = {
+            "english": ["analyze", "derive", "compare", "implement", "design", "explain in detail"],
+            "gujarati": ["વિશ્લેષણ", "મેળવો", "સરખાવો", "અમલીકરણ", "ડિઝાઇન", "વિગતવાર સમજાવો"]
+        }
+        
+        # All tables compiled once into a single-scan annotator
+        self.annotator = QuestionAnnotator(
+            self.unit_signatures, self.question_patterns, self.type_patterns, self.complex_indicators
+        )
+        
         self.questions = []
     
     def extract_questions(self, file_path: str) -> List[Dict[str, Any]]:
@@ -181,171 +400,15 @@ class EnhancedVLSIQuestionBankGenerator:
         
         return questions
     
-    def calculate_unit_score(self, question_text: str, unit_num: str, language: str) -> float:
-        """Calculate unit-specific score with enhanced algorithm"""
-        text_lower = question_text.lower()
-        unit_sig = self.unit_signatures[unit_num][language]
-        
-        # Primary keyword matching (weighted heavily)
-        primary_score = 0
-        primary_matches = 0
-        for keyword in unit_sig["primary"]:
-            if keyword.lower() in text_lower:
-                # Weight by keyword length and specificity
-                weight = len(keyword.split()) * 2.0
-                if len(keyword) > 10:  # Long specific terms
-                    weight *= 1.5
-                primary_score += weight
-                primary_matches += 1
-        
-        # Secondary keyword matching
-        secondary_score = 0
-        secondary_matches = 0
-        for keyword in unit_sig["secondary"]:
-            if keyword.lower() in text_lower:
-                secondary_score += 1.0
-                secondary_matches += 1
-        
-        # Normalize scores
-        total_primary = len(unit_sig["primary"])
-        total_secondary = len(unit_sig["secondary"])
-        
-        primary_normalized = primary_score / (total_primary * 2.0) if total_primary > 0 else 0
-        secondary_normalized = secondary_score / total_secondary if total_secondary > 0 else 0
-        
-        # Combine scores with primary emphasis
-        final_score = (primary_normalized * 0.8) + (secondary_normalized * 0.2)
-        
-        # Boost score if multiple keywords match
-        if primary_matches > 1:
-            final_score *= 1.3
-        if secondary_matches > 2:
-            final_score *= 1.1
-        
-        # Penalty for generic questions
-        if len(question_text) < 50:
-            final_score *= 0.8
-        
-        return min(final_score, 1.0)
-    
-    def map_to_units_enhanced(self, question: Dict[str, Any]) -> Tuple[List[str], float]:
-        """Enhanced unit mapping with stricter criteria"""
-        unit_scores = {}
-        language = question['language']
-        
-        # Calculate scores for each unit
-        for unit_num in self.unit_signatures.keys():
-            score = self.calculate_unit_score(question['text'], unit_num, language)
-            unit_scores[unit_num] = score
-        
-        # Apply stricter thresholds
-        high_threshold = 0.4
-        medium_threshold = 0.25
-        
-        # Find high confidence mappings
-        high_conf_units = [unit for unit, score in unit_scores.items() if score >= high_threshold]
-        
-        if high_conf_units:
-            # Use high confidence units
-            mapped_units = high_conf_units[:2]  # Limit to top 2
-            max_score = max(unit_scores[unit] for unit in mapped_units)
-        else:
-            # Find medium confidence mappings
-            medium_conf_units = [unit for unit, score in unit_scores.items() if score >= medium_threshold]
-            
-            if medium_conf_units:
-                # Take top scoring medium confidence unit
-                best_medium = max(medium_conf_units, key=lambda x: unit_scores[x])
-                mapped_units = [best_medium]
-                max_score = unit_scores[best_medium]
-            else:
-                # Assign to best scoring unit even if low confidence
-                best_unit = max(unit_scores.items(), key=lambda x: x[1])
-                mapped_units = [best_unit[0]]
-                max_score = best_unit[1]
-        
-        return mapped_units, max_score
-    
-    def extract_keywords_enhanced(self, question_text: str, mapped_units: List[str], language: str) -> List[str]:
-        """Extract relevant keywords based on mapped units"""
-        keywords = set()
-        text_lower = question_text.lower()
-        
-        # Extract keywords from mapped units only
-        for unit in mapped_units:
-            if unit in self.unit_signatures:
-                unit_sig = self.unit_signatures[unit][language]
-                for keyword in unit_sig["primary"] + unit_sig["secondary"]:
-                    if keyword.lower() in text_lower:
-                        keywords.add(keyword)
-        
-        # Add question type keywords
-        for qtype, patterns in self.question_patterns[language].items():
-            for pattern in patterns:
-                if pattern.lower() in text_lower:
-                    keywords.add(pattern)
-        
-        return list(keywords)
-    
-    def determine_difficulty(self, marks: int, question_text: str) -> str:
-        """Determine difficulty based on marks and complexity"""
-        complex_indicators = {
-            "english": ["analyze", "derive", "compare", "implement", "design", "explain in detail"],
-            "gujarati": ["વિશ્લેષણ", "મેળવો", "સરખાવો", "અમલીકરણ", "ડિઝાઇન", "વિગતવાર સમજાવો"]
-        }
-        
-        language = "gujarati" if any(char in question_text for char in "અઆઇઈઉ") else "english"
-        text_lower = question_text.lower()
-        
-        complexity_score = sum(1 for indicator in complex_indicators[language] 
-                             if indicator.lower() in text_lower)
-        
-        if marks >= 7 or complexity_score >= 3:
-            return "Hard"
-        elif marks >= 4 or complexity_score >= 2:
-            return "Medium"
-        else:
-            return "Easy"
-    
-    def categorize_question_type(self, question_text: str) -> str:
-        """Enhanced question type categorization"""
-        language = "gujarati" if any(char in question_text for char in "અઆઇઈઉ") else "english"
-        text_lower = question_text.lower()
-        
-        type_patterns = {
-            "english": {
-                "Theoretical": ["explain", "describe", "define", "what is", "discuss"],
-                "Analytical": ["analyze", "compare", "differentiate", "contrast"],
-                "Design": ["design", "implement", "draw", "create", "realize"],
-                "Programming": ["verilog", "code", "program", "write", "module"],
-                "Problem Solving": ["calculate", "find", "solve", "determine"]
-            },
-            "gujarati": {
-                "Theoretical": ["સમજાવો", "વર્ણન", "વ્યાખ્યા", "શું છે", "ચર્ચા"],
-                "Analytical": ["વિશ્લેષણ", "સરખાવો", "તફાવત", "વિરોધાભાસ"],
-                "Design": ["ડિઝાઇન", "અમલીકરણ", "દોરો", "બનાવો", "અમલમાં"],
-                "Programming": ["વેરિલોગ", "કોડ", "પ્રોગ્રામ", "લખો", "મોડ્યુલ"],
-                "Problem Solving": ["ગણતરી", "શોધો", "ઉકેલો", "નક્કી કરો"]
-            }
-        }
-        
-        for question_type, keywords in type_patterns[language].items():
-            if any(keyword.lower() in text_lower for keyword in keywords):
-                return question_type
-        
-        return "General"
-    
     def process_files(self, file_paths: List[str]) -> None:
         """Process all solution files with enhanced mapping"""
         for file_path in file_paths:
             questions = self.extract_questions(file_path)
             
             for q in questions:
-                # Enhanced unit mapping
-                mapped_units, confidence = self.map_to_units_enhanced(q)
-                
-                # Extract keywords based on mapped units
-                keywords = self.extract_keywords_enhanced(q['text'], mapped_units, q['language'])
+                # Unit mapping, keywords, difficulty and type from one pass
+                annotation = self.annotator.annotate(q)
+                mapped_units = annotation['mapped_units']
                 
                 question_obj = Question(
                     id=q['id'],
@@ -354,12 +417,12 @@ class EnhancedVLSIQuestionBankGenerator:
                     marks=q['marks'],
                     unit=mapped_units[0] if mapped_units else "Unknown",
                     mapped_units=mapped_units,
-                    keywords=keywords,
-                    difficulty=self.determine_difficulty(q['marks'], q['text']),
-                    question_type=self.categorize_question_type(q['text']),
+                    keywords=annotation['keywords'],
+                    difficulty=annotation['difficulty'],
+                    question_type=annotation['question_type'],
                     source_file=q['source_file'],
                     line_number=q['line_number'],
-                    confidence_score=confidence
+                    confidence_score=annotation['confidence']
                 )
                 
                 self.questions.append(question_obj)
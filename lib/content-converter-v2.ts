@@ -89,6 +89,24 @@ interface ConversionOptions {
     };
 }
 
+// scripts/convert_mdx_to_pdf.py exits with EX_TEMPFAIL when every build slot is taken
+const PYTHON_BUSY_EXIT_CODE = 75;
+// Seconds a download waits for a build slot before answering "busy, retry"
+const PYTHON_ADMISSION_WAIT = 15;
+
+/**
+ * Thrown when the LaTeX build server has no free slot; the caller should retry later.
+ */
+export class ConversionBusyError extends Error {
+    retryAfter: number;
+
+    constructor(retryAfter = PYTHON_ADMISSION_WAIT * 2) {
+        super('Conversion server busy, retry later');
+        this.name = 'ConversionBusyError';
+        this.retryAfter = retryAfter;
+    }
+}
+
 export class ContentConverterV2 {
     private tempDir: string;
 
@@ -811,10 +829,20 @@ ${rtf}
         try {
             // We run python3 on the file. The script expects the file path.
             // Note: The script outputs the PDF in the same directory as the input file.
-            const cmd = `python3 "${scriptPath}" "${filePath}"`; // Default is keep_aux=False, no-pdf=False
+            // Default is keep_aux=False, no-pdf=False; give up quickly if all build slots are busy
+            const cmd = `python3 "${scriptPath}" "${filePath}" --admission-wait ${PYTHON_ADMISSION_WAIT}`;
 
             console.log(`Executing Python conversion: ${cmd}`);
-            await execAsync(cmd);
+            try {
+                // No timeout here: killing python3 would leave pandoc/xelatex/mmdc running in
+                // their own process groups. The script times out each stage and kills its group.
+                await execAsync(cmd);
+            } catch (error) {
+                if ((error as { code?: unknown }).code === PYTHON_BUSY_EXIT_CODE) {
+                    throw new ConversionBusyError();
+                }
+                throw error;
+            }
 
             // Determine output PDF name based on script logic
             const stem = path.basename(filePath, '.mdx');
@@ -0,0 +1,153 @@
+/**
+ * Client-side search over the static question index built by
+ * scripts/question_search.py. Shards are fetched on demand from
+ * /search-index, so the site needs no search server.
+ */
+
+export interface QuestionSearchResult {
+    score: number;
+    id: string;
+    kind: 'solution' | 'bank';
+    subject: string;
+    language: 'english' | 'gujarati';
+    number: string;
+    marks: number;
+    unit: string;
+    title: string;
+    path: string;
+    line: number;
+}
+
+export interface QuestionSearchOptions {
+    limit?: number;
+    language?: 'english' | 'gujarati';
+    subject?: string;
+    kind?: 'solution' | 'bank';
+}
+
+interface SearchManifest {
+    version: number;
+    doc_count: number;
+    avg_length: number;
+    term_shards: number;
+    doc_shard_size: number;
+    doc_fields: string[];
+    k1: number;
+    b: number;
+}
+
+type Postings = Record<string, [number, number][]>;
+type DocRow = (string | number)[];
+
+const INDEX_BASE = '/search-index';
+const GUJARATI_SUFFIXES = ['માંથી', 'માં', 'થી', 'નું', 'ની', 'નો', 'ના', 'ને'];
+const GUJARATI_DIGITS: Record<string, string> = {
+    '૦': '0', '૧': '1', '૨': '2', '૩': '3', '૪': '4', '૫': '5', '૬': '6', '૭': '7', '૮': '8', '૯': '9',
+};
+
+const jsonCache = new Map<string, Promise<unknown>>();
+
+function fetchJson<T>(name: string): Promise<T> {
+    if (!jsonCache.has(name)) {
+        const request = fetch(`${INDEX_BASE}/${name}`).then((response) => {
+            if (!response.ok) {
+                throw new Error(`Failed to load ${name}: ${response.status}`);
+            }
+            return response.json();
+        });
+        // Drop failed requests so they can be retried
+        request.catch(() => jsonCache.delete(name));
+        jsonCache.set(name, request);
+    }
+    return jsonCache.get(name) as Promise<T>;
+}
+
+/** Must stay in sync with tokenize() in scripts/question_search.py */
+export function tokenize(text: string): string[] {
+    const normalized = (text || '')
+        .normalize('NFC')
+        .toLowerCase()
+        .replace(/[‌‍]/g, '')
+        .replace(/[૦-૯]/g, (digit) => GUJARATI_DIGITS[digit]);
+    const terms: string[] = [];
+    for (let token of normalized.match(/[઀-૿]+|[a-z0-9]+/g) || []) {
+        if (token[0] >= '઀') {
+            const suffix = GUJARATI_SUFFIXES.find((s) => token.endsWith(s) && token.length - s.length >= 2);
+            if (suffix) {
+                token = token.slice(0, -suffix.length);
+            }
+        } else if (token.length < 2) {
+            continue;
+        }
+        terms.push(token);
+    }
+    return terms;
+}
+
+/** FNV-1a over UTF-8 bytes, same as term_shard() in scripts/question_search.py */
+function termShard(term: string, shards: number): number {
+    let hash = 0x811c9dc5;
+    for (const byte of new TextEncoder().encode(term)) {
+        hash = Math.imul(hash ^ byte, 0x01000193) >>> 0;
+    }
+    return hash % shards;
+}
+
+function pad(value: number, width: number): string {
+    return String(value).padStart(width, '0');
+}
+
+export async function searchQuestions(
+    query: string,
+    options: QuestionSearchOptions = {}
+): Promise<QuestionSearchResult[]> {
+    const { limit = 10, language, subject, kind } = options;
+    const terms = Array.from(new Set(tokenize(query)));
+    if (terms.length === 0) {
+        return [];
+    }
+
+    const [manifest, lengths] = await Promise.all([
+        fetchJson<SearchManifest>('manifest.json'),
+        fetchJson<number[]>('lengths.json'),
+    ]);
+    const { doc_count: n, k1, b } = manifest;
+    const avgLength = manifest.avg_length || 1;
+
+    const postingLists = await Promise.all(
+        terms.map(async (term) => {
+            const shard = termShard(term, manifest.term_shards);
+            const postings = await fetchJson<Postings>(`terms-${pad(shard, 2)}.json`);
+            return postings[term] || [];
+        })
+    );
+
+    const scores = new Map<number, number>();
+    for (const postings of postingLists) {
+        if (postings.length === 0) {
+            continue;
+        }
+        const idf = Math.log(1 + (n - postings.length + 0.5) / (postings.length + 0.5));
+        for (const [docNum, tf] of postings) {
+            const norm = k1 * (1 - b + (b * lengths[docNum]) / avgLength);
+            scores.set(docNum, (scores.get(docNum) || 0) + (idf * tf * (k1 + 1)) / (tf + norm));
+        }
+    }
+
+    const ranked = Array.from(scores.entries()).sort((x, y) => y[1] - x[1] || x[0] - y[0]);
+    const results: QuestionSearchResult[] = [];
+    for (const [docNum, score] of ranked) {
+        const shard = Math.floor(docNum / manifest.doc_shard_size);
+        const rows = await fetchJson<DocRow[]>(`docs-${pad(shard, 3)}.json`);
+        const row = rows[docNum % manifest.doc_shard_size];
+        const doc = Object.fromEntries(manifest.doc_fields.map((field, i) => [field, row[i]]));
+        if ((language && doc.language !== language) || (subject && doc.subject !== subject) || (kind && doc.kind !== kind)) {
+            continue;
+        }
+        results.push({ score, ...doc } as QuestionSearchResult);
+        if (results.length >= limit) {
+            break;
+        }
+    }
+    return results;
+}
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Bilingual Question Alignment
+Pairs the English and Gujarati questions of one exam paper by treating both
+lists as sequences and aligning them with a banded dynamic-programming pass
+(like a diff), instead of looking Gujarati questions up by question number.
+
+Each candidate pair is scored on:
+- question number (Gujarati digits and sub-part letters are canonicalized)
+- marks
+- overlap of code/math tokens (identifiers, numbers, operators), which
+  Gujarati solutions keep in Latin script
+
+Order is enforced by the alignment itself, so a question whose number was
+mistyped or whose marks differ is still paired with its neighbour in the
+other language. Only cells within `band` of the diagonal (widened by the
+difference in question counts) are filled, which keeps each paper linear in
+its number of questions. Questions that cannot be paired are returned,
+never dropped.
+
+Usage:
+    from bilingual_align import align_questions
+    alignment = align_questions(english_questions, gujarati_questions, number_key='questionNumber')
+
+    # Inspect the alignment of one paper
+    python3 bilingual_align.py <solution.mdx> <solution.gu.mdx>
+"""
+
+import sys
+import os
+import re
+import argparse
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from question_bank_corpus import parse_solution_sections
+
+
+DEFAULT_BAND = 6
+MIN_PAIR_SCORE = 1.0
+
+NUMBER_WEIGHT = 3.0
+MAIN_NUMBER_WEIGHT = 1.0
+MAIN_NUMBER_MISMATCH = -2.0
+MARKS_WEIGHT = 2.0
+OVERLAP_WEIGHT = 3.0
+
+GUJARATI_DIGITS = str.maketrans('૦૧૨૩૪૫૬૭૮૯', '0123456789')
+# Sub-part letters as they appear across the Gujarati solution files
+GUJARATI_SUBPARTS = {
+    'અ': 'a', 'બ': 'b', 'ક': 'c', 'ડ': 'd', 'ઇ': 'e', 'ઈ': 'e',
+    'એફ': 'f', 'ફ': 'f', 'જી': 'g', 'જ': 'g', 'ગ': 'g', 'હ': 'h',
+}
+_SUBPART_RE = re.compile('|'.join(sorted(map(re.escape, GUJARATI_SUBPARTS), key=len, reverse=True)))
+NUMBER_RE = re.compile(r'(\d+)\s*(?:\(\s*([a-z]?)\s*\))?')
+CODE_TOKEN_RE = re.compile(r'[A-Za-z_][A-Za-z0-9_+#]*|\d+(?:\.\d+)?|[=<>+\-*/^%&|]+')
+
+
+@dataclass
+class Alignment:
+    """Result of aligning one paper's English and Gujarati questions"""
+    pairs: List[Tuple[Dict, Dict]] = field(default_factory=list)
+    unpaired_english: List[Dict] = field(default_factory=list)
+    unpaired_gujarati: List[Dict] = field(default_factory=list)
+
+
+def canonical_question_number(number) -> str:
+    """'૧(અ) અથવા', '1(a) OR' and '1 (A)OR' all become '1(a) OR'."""
+    text = str(number or '').translate(GUJARATI_DIGITS)
+    is_or = bool(re.search(r'\bOR\b|અથવા', text, re.IGNORECASE))
+    text = re.sub(r'\bOR\b|અથવા', '', text, flags=re.IGNORECASE)
+    text = _SUBPART_RE.sub(lambda m: GUJARATI_SUBPARTS[m.group(0)], text).lower()
+    match = NUMBER_RE.search(text)
+    if not match:
+        return text.strip()
+    canonical = f"{match.group(1)}({match.group(2)})" if match.group(2) else match.group(1)
+    return canonical + (' OR' if is_or else '')
+
+
+def code_tokens(text: str) -> frozenset:
+    """Latin-script identifiers, numbers and operators in a question text."""
+    return frozenset(token.lower() for token in CODE_TOKEN_RE.findall(text or ''))
+
+
+class _Side:
+    """Precomputed number/marks/tokens of one language's question list"""
+
+    def __init__(self, questions, number_key, marks_key, text_key):
+        self.questions = questions
+        self.numbers = [canonical_question_number(q.get(number_key)) for q in questions]
+        self.mains = [n.split('(')[0] for n in self.numbers]
+        self.marks = [q.get(marks_key) for q in questions]
+        self.tokens = [code_tokens(q.get(text_key, '')) for q in questions]
+
+
+def _pair_score(left: _Side, i: int, right: _Side, j: int) -> float:
+    score = 0.0
+    if left.numbers[i] and left.numbers[i] == right.numbers[j]:
+        score += NUMBER_WEIGHT
+    elif left.mains[i] and right.mains[j]:
+        score += MAIN_NUMBER_WEIGHT if left.mains[i] == right.mains[j] else MAIN_NUMBER_MISMATCH
+
+    score += MARKS_WEIGHT if left.marks[i] == right.marks[j] else -MARKS_WEIGHT
+
+    a, b = left.tokens[i], right.tokens[j]
+    if a and b:
+        score += OVERLAP_WEIGHT * len(a & b) / len(a | b)
+    return score
+
+
+def align_questions(english: List[Dict], gujarati: List[Dict], number_key='questionNumber',
+                    marks_key='marks', text_key='text', band=DEFAULT_BAND,
+                    min_score=MIN_PAIR_SCORE) -> Alignment:
+    """
+    Align one paper's English and Gujarati question lists (both in paper order).
+
+    Args:
+        english, gujarati: Question dicts in the order they appear in the paper
+        number_key, marks_key, text_key: Field names in the question dicts
+        band: Cells further than this from the diagonal are not considered
+        min_score: Pairs scoring below this are left unpaired
+
+    Returns:
+        Alignment with pairs in paper order and the unpaired questions
+    """
+    n, m = len(english), len(gujarati)
+    if not n or not m:
+        return Alignment(unpaired_english=list(english), unpaired_gujarati=list(gujarati))
+
+    left = _Side(english, number_key, marks_key, text_key)
+    right = _Side(gujarati, number_key, marks_key, text_key)
+    # The band follows the diagonal and is widened by the length difference,
+    # so a paper with missing questions on one side can still align at its end
+    below = max(band, 1) + max(0, n - m)
+    above = max(band, 1) + max(0, m - n)
+
+    def window(i):
+        return max(0, i - below), min(m, i + above)
+
+    NEG = float('-inf')
+    scores = []  # per row: (lo, values)
+    moves = []   # per row: 'd' pair, 'u' skip English, 'l' skip Gujarati
+    for i in range(n + 1):
+        lo, hi = window(i)
+        row = [NEG] * (hi - lo + 1)
+        move = [''] * (hi - lo + 1)
+        prev_lo, prev = scores[i - 1] if i else (0, None)
+        for j in range(lo, hi + 1):
+            k = j - lo
+            if i == 0:
+                row[k], move[k] = 0.0, 'l'
+                continue
+            best, step = NEG, ''
+            p = j - prev_lo
+            if 0 <= p < len(prev) and prev[p] > best:
+                best, step = prev[p], 'u'
+            if k > 0 and row[k - 1] > best:
+                best, step = row[k - 1], 'l'
+            if j > 0 and 0 <= p - 1 < len(prev) and prev[p - 1] > NEG:
+                pair = _pair_score(left, i - 1, right, j - 1)
+                if pair >= min_score and prev[p - 1] + pair > best:
+                    best, step = prev[p - 1] + pair, 'd'
+            row[k], move[k] = best, step
+        scores.append((lo, row))
+        moves.append(move)
+
+    alignment = Alignment()
+    i, j = n, m
+    while i > 0 or j > 0:
+        lo = scores[i][0]
+        step = moves[i][j - lo] if i else 'l'
+        if step == 'd':
+            alignment.pairs.append((english[i - 1], gujarati[j - 1]))
+            i, j = i - 1, j - 1
+        elif step == 'u':
+            alignment.unpaired_english.append(english[i - 1])
+            i -= 1
+        else:
+            alignment.unpaired_gujarati.append(gujarati[j - 1])
+            j -= 1
+
+    alignment.pairs.reverse()
+    alignment.unpaired_english.reverse()
+    alignment.unpaired_gujarati.reverse()
+    return alignment
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Align the English and Gujarati questions of one exam paper')
+    parser.add_argument('english', help='English solution file')
+    parser.add_argument('gujarati', help='Gujarati solution file')
+    parser.add_argument('--band', type=int, default=DEFAULT_BAND, help='Alignment band width')
+    args = parser.parse_args()
+
+    sides = []
+    for path in (args.english, args.gujarati):
+        with open(path, 'r', encoding='utf-8') as f:
+            sections = parse_solution_sections(f.read())
+        sides.append([{'questionNumber': s.number, 'marks': s.marks, 'text': s.question} for s in sections])
+
+    alignment = align_questions(sides[0], sides[1], band=args.band)
+    for en, gu in alignment.pairs:
+        print(f"🔗 {en['questionNumber']:<10} [{en['marks']}] {en['text'][:50]!r} ↔ {gu['text'][:40]!r}")
+    for q in alignment.unpaired_english:
+        print(f"⚠️  Unpaired English {q['questionNumber']} [{q['marks']}]: {q['text'][:60]}")
+    for q in alignment.unpaired_gujarati:
+        print(f"⚠️  Unpaired Gujarati {q['questionNumber']} [{q['marks']}]: {q['text'][:60]}")
+    print(f"\n✅ {len(alignment.pairs)} pairs, {len(alignment.unpaired_english)} English "
+          f"and {len(alignment.unpaired_gujarati)} Gujarati unpaired")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Prometheus Metrics for the Conversion Pipeline
+Builds record stage durations, cache lookups, timeouts and failures here.
+Each build process keeps its samples in memory and merges them into
+.cache/metrics/metrics.json when the build ends, under a file lock, since
+builds run in many processes (CLI runs, pool and queue workers, download
+requests). Nothing is sent anywhere during a build.
+
+The totals are rendered in the Prometheus text exposition format together
+with live gauges: jobs in the work queue by status, and busy build slots
+(in-flight builds, see job_limits.py). Ways to collect them:
+- /api/metrics on the Next.js app runs this script and returns its output
+- `--textfile DIR` writes study_converter.prom for node_exporter's textfile
+  collector; with STUDY_METRICS_TEXTFILE=DIR set, every build refreshes it
+
+Usage:
+    # Print the metrics
+    python3 build_metrics.py
+
+    # Write DIR/study_converter.prom (e.g. from cron)
+    python3 build_metrics.py --textfile /var/lib/node_exporter/textfile
+
+    # In the pipeline
+    from build_metrics import observe, inc, cache_lookup, flush
+"""
+
+import sys
+import os
+import json
+import atexit
+import threading
+import argparse
+import contextlib
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from cache_utils import atomic_write_bytes, get_cache_dir, load_json, save_json
+
+try:
+    import fcntl
+except ImportError:  # not on POSIX: merges are not serialized
+    fcntl = None
+
+
+# Upper bounds (seconds) of the duration histogram buckets
+DURATION_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+TEXTFILE_NAME = 'study_converter.prom'
+
+# name: (type, help)
+METRICS = {
+    'study_stage_duration_seconds': ('histogram', 'Time spent in each stage of one MDX conversion'),
+    'study_xelatex_pass_duration_seconds': ('histogram', 'Time of each XeLaTeX pass'),
+    'study_builds_total': ('counter', 'Finished MDX conversions by result'),
+    'study_cache_requests_total': ('counter', 'Cache lookups by cache and result (hit or miss)'),
+    'study_stage_timeouts_total': ('counter', 'Commands killed after exceeding their stage timeout'),
+    'study_stage_failures_total': ('counter', 'Failed or skipped work by stage'),
+    'study_admission_rejections_total': ('counter', 'Builds turned away because no build slot was free'),
+    'study_queue_jobs': ('gauge', 'Jobs in the work queue by status'),
+    'study_builds_in_flight': ('gauge', 'Build slots currently held'),
+    'study_build_slots': ('gauge', 'Build slots on this machine'),
+}
+
+# Samples of this process not yet merged: {series key: value or histogram dict}
+_pending = {}
+_pending_pid = os.getpid()
+# Pipelined builds record from several threads
+_lock = threading.Lock()
+
+
+def _samples():
+    global _pending_pid
+    if _pending_pid != os.getpid():
+        # A forked pool worker: its parent merges what was recorded before the fork
+        _pending.clear()
+        _pending_pid = os.getpid()
+    return _pending
+
+
+def _key(name, labels):
+    return json.dumps([name, sorted((labels or {}).items())])
+
+
+def inc(name, labels=None, value=1):
+    """Add to a counter."""
+    key = _key(name, labels)
+    with _lock:
+        samples = _samples()
+        samples[key] = samples.get(key, 0) + value
+
+
+def observe(name, value, labels=None):
+    """Record one histogram sample."""
+    key = _key(name, labels)
+    with _lock:
+        histogram = _samples().setdefault(key, {'buckets': [0] * len(DURATION_BUCKETS), 'sum': 0.0, 'count': 0})
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if value <= bound:
+                histogram['buckets'][i] += 1
+        histogram['sum'] += value
+        histogram['count'] += 1
+
+
+def cache_lookup(cache, hit, count=1):
+    """Count lookups in one of the build caches (mermaid, pandoc-ast, images, ...)."""
+    if count:
+        inc('study_cache_requests_total', {'cache': cache, 'result': 'hit' if hit else 'miss'}, count)
+
+
+def _merge(totals, samples):
+    for key, sample in samples.items():
+        if isinstance(sample, dict):
+            total = totals.setdefault(key, {'buckets': [0] * len(DURATION_BUCKETS), 'sum': 0.0, 'count': 0})
+            total['buckets'] = [a + b for a, b in zip(total['buckets'], sample['buckets'])]
+            total['sum'] += sample['sum']
+            total['count'] += sample['count']
+        else:
+            totals[key] = totals.get(key, 0) + sample
+
+
+@contextlib.contextmanager
+def _locked():
+    metrics_dir = get_cache_dir('metrics')
+    with open(metrics_dir / 'metrics.lock', 'a') as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        yield metrics_dir / 'metrics.json'
+
+
+def flush():
+    """Merge this process's samples into the shared totals."""
+    with _lock:
+        pending = _samples()
+        if not pending:
+            return
+        samples = dict(pending)
+        pending.clear()
+    try:
+        with _locked() as path:
+            totals = load_json(path, {})
+            _merge(totals, samples)
+            save_json(path, totals)
+    except OSError as e:
+        print(f"⚠️  WARNING: Could not save build metrics: {e}")
+        return
+    textfile_dir = os.environ.get('STUDY_METRICS_TEXTFILE')
+    if textfile_dir:
+        write_textfile(textfile_dir)
+
+
+atexit.register(flush)
+
+
+def live_gauges(queue_spec=None):
+    """Series keys and values of the gauges read at render time."""
+    from job_limits import busy_slots
+    gauges = {}
+    busy, slots = busy_slots()
+    gauges[_key('study_builds_in_flight', None)] = busy
+    gauges[_key('study_build_slots', None)] = slots
+
+    from work_queue import default_queue_path, open_queue
+    # Do not create the default queue just to report that it is empty
+    if queue_spec or default_queue_path().exists():
+        queue = open_queue(queue_spec)
+        try:
+            counts = queue.counts()
+        finally:
+            queue.close()
+        for status in ('pending', 'leased', 'done', 'failed'):
+            gauges[_key('study_queue_jobs', {'status': status})] = counts.get(status, 0)
+    return gauges
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in labels) + '}'
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(queue_spec=None):
+    """All metrics in the Prometheus text exposition format."""
+    with _locked() as path:
+        totals = load_json(path, {})
+    with _lock:
+        _merge(totals, _samples())
+    totals.update(live_gauges(queue_spec))
+
+    series = defaultdict(list)
+    for key, value in totals.items():
+        name, labels = json.loads(key)
+        series[name].append(([tuple(label) for label in labels], value))
+
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in sorted(series.get(name, []), key=lambda s: s[0]):
+            if kind != 'histogram':
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                continue
+            for bound, count in zip(DURATION_BUCKETS, value['buckets']):
+                lines.append(f"{name}_bucket{_format_labels(labels + [('le', str(bound))])} {count}")
+            lines.append(f"{name}_bucket{_format_labels(labels + [('le', '+Inf')])} {value['count']}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(value['sum'])}")
+            lines.append(f"{name}_count{_format_labels(labels)} {value['count']}")
+    return '\n'.join(lines) + '\n'
+
+
+def write_textfile(directory, queue_spec=None):
+    """Atomically write the metrics for node_exporter's textfile collector."""
+    path = os.path.join(directory, TEXTFILE_NAME)
+    atomic_write_bytes(path, render(queue_spec).encode('utf-8'))
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Print the conversion pipeline metrics in Prometheus format')
+    parser.add_argument('--textfile', metavar='DIR', help=f'Write DIR/{TEXTFILE_NAME} instead of printing')
+    parser.add_argument('--queue', help='Work queue to report the depth of (default: the local SQLite queue)')
+    args = parser.parse_args()
+
+    if args.textfile:
+        print(f"📈 Wrote {write_textfile(args.textfile, args.queue)}")
+    else:
+        sys.stdout.write(render(args.queue))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Build Cost History and Longest-Job-First Scheduling
+Keeps the measured per-stage durations of every MDX -> LaTeX/PDF build in
+.cache/build/history.json and uses them to order batch builds longest job
+first, so one large Gujarati paper with many diagrams does not start last and
+stretch the whole batch.
+
+Files that have never been built get an estimate from their size and their
+mermaid, goat, code-block and tikz counts. The model's constants are rough
+starting points; once a mode has history, estimates are scaled by the
+median actual/estimated ratio of the files already built.
+
+Usage:
+    # Predicted costs and makespan for a directory
+    python3 build_scheduler.py <path> [--jobs 8] [--no-pdf]
+
+    # In a batch builder
+    from build_scheduler import BuildHistory, longest_first, predict_makespan
+"""
+
+import sys
+import os
+import re
+import heapq
+import argparse
+import statistics
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from cache_utils import get_cache_dir, load_json, save_json
+from content_snapshot import read_text
+from refactor_pandoc_latex import get_project_root
+
+
+# Bump when the history layout changes
+HISTORY_VERSION = 1
+STAGES = ('mermaid', 'images', 'pandoc', 'export', 'refactor', 'xelatex', 'optimize')
+# Weight of the newest run in the per-file moving average
+HISTORY_ALPHA = 0.5
+
+# Estimated seconds per feature, for files without history
+MODEL = {
+    'tex': {'base': 0.3, 'per_kb': 0.004, 'mermaid': 0.0, 'goat': 0.0, 'code': 0.0, 'tikz': 0.0},
+    'pdf': {'base': 3.0, 'per_kb': 0.03, 'mermaid': 0.15, 'goat': 0.05, 'code': 0.02, 'tikz': 0.6},
+}
+# npx mmdc start-up for a diagram that has no cached PDF yet
+MERMAID_RENDER_COST = 2.0
+# XeLaTeX with the Gujarati fonts is slower than the English build
+GUJARATI_FACTOR = {'tex': 1.0, 'pdf': 1.3}
+
+FENCE_RE = re.compile(r'^```(\w*)', re.MULTILINE)
+TIKZ_RE = re.compile(r'\\begin\{tikzpicture\}')
+
+
+def build_mode(generate_pdf):
+    return 'pdf' if generate_pdf else 'tex'
+
+
+def cost_features(mdx_path):
+    """Size and diagram/code counts that drive build time."""
+    text = read_text(mdx_path)
+    fences = FENCE_RE.findall(text)
+    return {
+        'kb': len(text.encode('utf-8')) / 1024,
+        'mermaid': fences.count('mermaid'),
+        'goat': fences.count('goat'),
+        # Opening fences only: a bare ``` closes a block
+        'code': sum(1 for lang in fences if lang and lang not in ('mermaid', 'goat')),
+        'tikz': len(TIKZ_RE.findall(text)),
+    }
+
+
+def model_estimate(mdx_path, mode):
+    """Seconds predicted by the feature model alone."""
+    try:
+        features = cost_features(mdx_path)
+    except (OSError, UnicodeDecodeError):
+        return MODEL[mode]['base']
+    weights = MODEL[mode]
+    seconds = (weights['base'] + weights['per_kb'] * features['kb'] + weights['mermaid'] * features['mermaid']
+               + weights['goat'] * features['goat'] + weights['code'] * features['code']
+               + weights['tikz'] * features['tikz'])
+    if features['mermaid']:
+        # Diagrams already rendered next to the file are reused
+        work_dir = Path(mdx_path).parent
+        if not any(work_dir.glob('mermaid-*.pdf')):
+            seconds += MERMAID_RENDER_COST * features['mermaid']
+    if str(mdx_path).endswith('.gu.mdx'):
+        seconds *= GUJARATI_FACTOR[mode]
+    return seconds
+
+
+class BuildHistory:
+    """Per-file, per-mode stage durations of past builds"""
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else get_cache_dir('build') / 'history.json'
+        self.root = get_project_root()
+        data = load_json(self.path)
+        if not data or data.get('version') != HISTORY_VERSION:
+            data = {'version': HISTORY_VERSION, 'files': {}}
+        self.files = data['files']
+        self._scale = {}
+
+    def key(self, mdx_path):
+        path = Path(mdx_path).resolve()
+        try:
+            return path.relative_to(self.root).as_posix()
+        except ValueError:
+            return str(path)
+
+    def recorded(self, mdx_path, mode):
+        """Moving-average seconds of past builds, or None."""
+        entry = self.files.get(self.key(mdx_path), {}).get(mode)
+        return entry['seconds'] if entry else None
+
+    def scale(self, mode):
+        """Median actual/model ratio over files with history (1.0 without any)."""
+        if mode not in self._scale:
+            ratios = []
+            for entry in self.files.values():
+                if mode in entry and entry[mode].get('model'):
+                    ratios.append(entry[mode]['seconds'] / entry[mode]['model'])
+            self._scale[mode] = statistics.median(ratios) if ratios else 1.0
+        return self._scale[mode]
+
+    def estimate(self, mdx_path, mode):
+        """Seconds expected for one build: history first, scaled model otherwise."""
+        seconds = self.recorded(mdx_path, mode)
+        if seconds is not None:
+            return seconds
+        return model_estimate(mdx_path, mode) * self.scale(mode)
+
+    def record(self, mdx_path, mode, timings):
+        """Fold one build's {stage: seconds} into the history."""
+        if not timings:
+            return
+        seconds = sum(timings.values())
+        entry = self.files.setdefault(self.key(mdx_path), {}).get(mode)
+        if entry:
+            seconds = HISTORY_ALPHA * seconds + (1 - HISTORY_ALPHA) * entry['seconds']
+            stages = {stage: HISTORY_ALPHA * timings.get(stage, 0.0) + (1 - HISTORY_ALPHA) * entry['stages'].get(stage, 0.0)
+                      for stage in STAGES}
+            runs = entry['runs'] + 1
+        else:
+            stages = {stage: timings.get(stage, 0.0) for stage in STAGES}
+            runs = 1
+        self.files[self.key(mdx_path)][mode] = {
+            'seconds': round(seconds, 3),
+            'stages': {stage: round(value, 3) for stage, value in stages.items()},
+            'model': round(model_estimate(mdx_path, mode), 3),
+            'runs': runs,
+        }
+        self._scale.pop(mode, None)
+
+    def save(self):
+        save_json(self.path, {'version': HISTORY_VERSION, 'files': self.files})
+
+
+def longest_first(files, costs):
+    """Files ordered by descending cost; ties keep path order."""
+    return sorted(files, key=lambda f: (-costs[f], str(f)))
+
+
+def predict_makespan(durations, workers):
+    """Makespan of list-scheduling durations, in order, onto `workers` identical workers."""
+    loads = [0.0] * max(1, workers)
+    for seconds in durations:
+        heapq.heapreplace(loads, loads[0] + seconds)
+    return max(loads)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Show predicted build costs and makespan')
+    parser.add_argument('path', help='MDX file or directory of solution files')
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1, help='Parallel workers')
+    parser.add_argument('--no-pdf', action='store_true', help='Predict LaTeX-only builds')
+    args = parser.parse_args()
+
+    from convert_mdx_to_pdf import find_solution_files
+
+    files = find_solution_files(Path(args.path).resolve())
+    if not files:
+        print("❌ No files to process!")
+        sys.exit(1)
+
+    mode = build_mode(not args.no_pdf)
+    history = BuildHistory()
+    costs = {f: history.estimate(f, mode) for f in files}
+    order = longest_first(files, costs)
+    total = sum(costs.values())
+
+    for f in order[:15]:
+        source = 'history' if history.recorded(f, mode) is not None else 'model'
+        print(f"   {costs[f]:7.1f}s  {f.name}  ({source})")
+    if len(order) > 15:
+        print(f"   ... {len(order) - 15} more")
+    print(f"\n📐 {len(files)} file(s), {total:.1f}s of work ({mode}); model scale {history.scale(mode):.2f}")
+    print(f"   Longest first on {args.jobs} worker(s): {predict_makespan([costs[f] for f in order], args.jobs):.1f}s")
+    print(f"   Path order on {args.jobs} worker(s):    {predict_makespan([costs[f] for f in files], args.jobs):.1f}s")
+    print(f"   Lower bound (work / workers):  {max(total / args.jobs, max(costs.values())):.1f}s")
+
+
+if __name__ == '__main__':
+    main()
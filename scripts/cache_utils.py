@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Shared on-disk cache helpers for the study-material scripts.
+All caches live under <project root>/.cache so they can be wiped at once.
+"""
+
+import os
+import sys
+import json
+import hashlib
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from refactor_pandoc_latex import get_project_root
+
+
+CACHE_ROOT = Path(os.environ.get('STUDY_CACHE_DIR', get_project_root() / '.cache'))
+
+
+def get_cache_dir(*parts):
+    """Return (and create) a cache subdirectory, e.g. get_cache_dir('search')."""
+    path = CACHE_ROOT.joinpath(*parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def hash_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path):
+    """SHA-256 of a file's contents."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def file_signature(path):
+    """Cheap change check: (mtime_ns, size)."""
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+def atomic_write_bytes(path, data):
+    """Write via a temp file + rename so readers never see a partial file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def load_json(path, default=None):
+    """Read a JSON cache file, returning default if missing or corrupt."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def save_json(path, data, indent=None):
+    atomic_write_bytes(path, json.dumps(data, ensure_ascii=False, indent=indent).encode('utf-8'))
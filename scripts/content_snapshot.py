@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Memory-Mapped Content Snapshot
+Packs every text source under content/ (*.mdx, *.tex and syllabus
+<code>.json files) into one pack file with an offset/length/hash index, so
+corpus-scanning tools read from a single memory map instead of opening
+thousands of small files and walking past the tree's images and PDFs.
+
+The pack lives in .cache/snapshot and is updated incrementally: only files
+whose mtime/size changed are re-read and appended, and the pack is compacted
+once more than half of it is superseded data. Appends leave existing offsets
+alone; compaction writes a new pack generation, saves the index pointing at
+it and only then deletes the old pack, so a reader always pairs an index
+with the pack it describes. Updates are serialized with a lock file.
+
+Readers go through read_text()/open_text(). Each read checks the file's
+mtime/size against the index and falls back to the file on disk when the
+snapshot is stale or missing, so a snapshot that is out of date only costs
+speed, never correctness. Hashing the packed bytes on every first read would
+cost more than the open() it replaces, so the SHA-256s are checked on demand
+(--verify, or ContentSnapshot(check_hashes=True)).
+
+The snapshot is refreshed by running this script and by watch_content.py
+(at start and after each rebuild); the batch tools only read it.
+
+Usage:
+    # Build or refresh the snapshot
+    python3 content_snapshot.py
+
+    # Force a compacted rewrite of the pack
+    python3 content_snapshot.py --compact
+
+    # Check every packed file against its recorded SHA-256
+    python3 content_snapshot.py --verify
+
+    # In a scanning tool
+    from content_snapshot import read_text, open_text
+"""
+
+import sys
+import os
+import io
+import re
+import mmap
+import time
+import argparse
+import contextlib
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from cache_utils import get_cache_dir, hash_bytes, file_signature, atomic_write_bytes, load_json, save_json
+from refactor_pandoc_latex import get_project_root
+
+try:
+    import fcntl
+except ImportError:  # not on POSIX: updates are not serialized
+    fcntl = None
+
+
+# Bump when the pack or index layout changes
+SNAPSHOT_VERSION = 2
+CONTENT_DIR = get_project_root() / 'content'
+TEXT_SUFFIXES = {'.mdx', '.tex'}
+SYLLABUS_RE = re.compile(r'^\d{7}\.json$')
+SNAPSHOT_STEM = 'content'
+
+
+def is_snapshot_source(name):
+    """Text sources packed into the snapshot (MDX, TeX and syllabus JSON)."""
+    return os.path.splitext(name)[1] in TEXT_SUFFIXES or SYLLABUS_RE.match(name) is not None
+
+
+def iter_sources(root):
+    """Yield (relative posix path, absolute path) of every snapshot source under root."""
+    root = str(root)
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith('.') and d != 'node_modules']
+        for name in filenames:
+            if is_snapshot_source(name):
+                path = os.path.join(dirpath, name)
+                yield os.path.relpath(path, root).replace(os.sep, '/'), path
+
+
+def _snapshot_stem(root):
+    """Cache directory and name prefix of root's snapshot files."""
+    cache_dir = get_cache_dir('snapshot')
+    # One snapshot per content root; the default root keeps the plain name
+    if Path(root).resolve() == CONTENT_DIR.resolve():
+        return cache_dir, SNAPSHOT_STEM
+    return cache_dir, f"{SNAPSHOT_STEM}-{hash_bytes(str(Path(root).resolve()).encode('utf-8'))[:12]}"
+
+
+def _new_pack_name(stem):
+    # A fresh name per generation: readers may still have the previous one mapped
+    return f"{stem}.{time.time_ns():x}.pack"
+
+
+def _empty_index(root, stem):
+    return {'version': SNAPSHOT_VERSION, 'root': str(root), 'pack': _new_pack_name(stem),
+            'dead_bytes': 0, 'files': {}}
+
+
+@contextlib.contextmanager
+def _update_lock(cache_dir, stem):
+    with open(cache_dir / f"{stem}.lock", 'a') as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+
+def _remove_stale_packs(cache_dir, stem, current):
+    """Delete earlier pack generations (and the unversioned pack of older layouts)."""
+    for pack in [*cache_dir.glob(f"{stem}.*.pack"), cache_dir / f"{stem}.pack"]:
+        if pack.name != current:
+            with contextlib.suppress(FileNotFoundError):
+                pack.unlink()
+
+
+def update_snapshot(root=CONTENT_DIR, compact=False):
+    """
+    Bring the snapshot for root up to date with the files on disk.
+
+    Returns:
+        Dict of counts: files, added, updated, removed, pack_bytes, compacted
+    """
+    root = Path(root)
+    cache_dir, stem = _snapshot_stem(root)
+    with _update_lock(cache_dir, stem):
+        return _update(root, cache_dir, stem, compact)
+
+
+def _update(root, cache_dir, stem, compact):
+    index_file = cache_dir / f"{stem}-index.json"
+    index = load_json(index_file)
+    if (not index or index.get('version') != SNAPSHOT_VERSION
+            or not (cache_dir / index['pack']).exists()):
+        index = _empty_index(root, stem)
+        atomic_write_bytes(cache_dir / index['pack'], b'')
+    pack_file = cache_dir / index['pack']
+
+    files = index['files']
+    stats = {'added': 0, 'updated': 0, 'removed': 0, 'compacted': False}
+    seen = set()
+
+    with open(pack_file, 'ab') as pack:
+        offset = pack.seek(0, 2)
+        for rel, path in iter_sources(root):
+            seen.add(rel)
+            try:
+                signature = file_signature(path)
+                entry = files.get(rel)
+                if entry and entry[2:4] == signature:
+                    continue
+                with open(path, 'rb') as f:
+                    data = f.read()
+            except OSError:
+                continue
+            if entry:
+                index['dead_bytes'] += entry[1]
+                stats['updated'] += 1
+            else:
+                stats['added'] += 1
+            pack.write(data)
+            files[rel] = [offset, len(data), signature[0], signature[1], hash_bytes(data)]
+            offset += len(data)
+
+    for rel in [rel for rel in files if rel not in seen]:
+        index['dead_bytes'] += files.pop(rel)[1]
+        stats['removed'] += 1
+
+    live_bytes = sum(entry[1] for entry in files.values())
+    if compact or index['dead_bytes'] > live_bytes:
+        pack_file = _compact(pack_file, index, stem)
+        stats['compacted'] = True
+
+    # The index is saved only once the pack it points at is complete
+    save_json(index_file, index)
+    _remove_stale_packs(cache_dir, stem, index['pack'])
+    stats['files'] = len(files)
+    stats['pack_bytes'] = pack_file.stat().st_size
+    return stats
+
+
+def _compact(pack_file, index, stem):
+    """Write the live entries, in path order, to a new pack generation; returns its path."""
+    with open(pack_file, 'rb') as f:
+        data = f.read()
+    chunks = []
+    offset = 0
+    for rel in sorted(index['files']):
+        entry = index['files'][rel]
+        chunks.append(data[entry[0]:entry[0] + entry[1]])
+        entry[0] = offset
+        offset += entry[1]
+    index['pack'] = _new_pack_name(stem)
+    new_pack = pack_file.with_name(index['pack'])
+    atomic_write_bytes(new_pack, b''.join(chunks))
+    index['dead_bytes'] = 0
+    return new_pack
+
+
+class ContentSnapshot:
+    """Read-only, memory-mapped view of a snapshot pack"""
+
+    def __init__(self, root=CONTENT_DIR, verify=True, check_hashes=False):
+        self.root = Path(root).resolve()
+        self._prefix = str(self.root) + os.sep
+        self.verify = verify
+        self.check_hashes = check_hashes
+        cache_dir, stem = _snapshot_stem(self.root)
+        index = load_json(cache_dir / f"{stem}-index.json")
+        self.files = {}
+        self._map = None
+        # Entries whose bytes already matched their hash
+        self._checked = set()
+        if not index or index.get('version') != SNAPSHOT_VERSION:
+            return
+        try:
+            with open(cache_dir / index['pack'], 'rb') as f:
+                if os.fstat(f.fileno()).st_size:
+                    self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            # Compacted away after the index was read: read from disk this time
+            return
+        self.files = index['files']
+
+    def _entry(self, path):
+        if self._map is None:
+            return None
+        # abspath instead of resolve(): no per-component stat calls
+        path = os.path.abspath(path)
+        if not path.startswith(self._prefix):
+            return None
+        entry = self.files.get(path[len(self._prefix):].replace(os.sep, '/'))
+        if entry is None or entry[0] + entry[1] > len(self._map):
+            return None
+        if self.verify:
+            try:
+                if file_signature(path) != entry[2:4]:
+                    return None
+            except OSError:
+                return None
+        if self.check_hashes and entry[0] not in self._checked:
+            if hash_bytes(self._map[entry[0]:entry[0] + entry[1]]) != entry[4]:
+                return None
+            self._checked.add(entry[0])
+        return entry
+
+    def corrupt_entries(self):
+        """Relative paths whose packed bytes no longer match their recorded SHA-256."""
+        if self._map is None:
+            return []
+        return [rel for rel, entry in sorted(self.files.items())
+                if entry[0] + entry[1] > len(self._map)
+                or hash_bytes(self._map[entry[0]:entry[0] + entry[1]]) != entry[4]]
+
+    def get_bytes(self, path):
+        """Zero-copy memoryview of a file's packed bytes, or None if not (freshly) packed."""
+        entry = self._entry(path)
+        if entry is None:
+            return None
+        return memoryview(self._map)[entry[0]:entry[0] + entry[1]]
+
+    def file_hash(self, path):
+        """SHA-256 recorded for the packed file, or None."""
+        entry = self._entry(path)
+        return entry[4] if entry else None
+
+    def read_text(self, path, encoding='utf-8'):
+        """File contents from the pack, falling back to the file on disk."""
+        data = self.get_bytes(path)
+        if data is not None:
+            text = str(data, encoding)
+            # Match open()'s universal newline translation
+            return text.replace('\r\n', '\n').replace('\r', '\n') if '\r' in text else text
+        with open(path, 'r', encoding=encoding) as f:
+            return f.read()
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+
+_default_snapshot = None
+
+
+def default_snapshot():
+    """Process-wide snapshot of content/, opened on first use."""
+    global _default_snapshot
+    if _default_snapshot is None:
+        _default_snapshot = ContentSnapshot()
+    return _default_snapshot
+
+
+def refresh_default_snapshot():
+    """Update the content/ snapshot and reopen the process-wide view of it."""
+    global _default_snapshot
+    stats = update_snapshot(CONTENT_DIR)
+    # Not closed: callers may still hold memoryviews into the old map
+    _default_snapshot = None
+    return stats
+
+
+def read_text(path, encoding='utf-8'):
+    """Read a content file through the default snapshot."""
+    return default_snapshot().read_text(path, encoding)
+
+
+def open_text(path, encoding='utf-8'):
+    """File-like drop-in for open(path, 'r') on content files (read, readlines, iteration)."""
+    return io.StringIO(read_text(path, encoding))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build or refresh the memory-mapped content snapshot')
+    parser.add_argument('root', nargs='?', default=str(CONTENT_DIR), help='Content directory (default: content/)')
+    parser.add_argument('--compact', action='store_true', help='Rewrite the pack without superseded data')
+    parser.add_argument('--verify', action='store_true', help='Check the packed files against their SHA-256 after updating')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    stats = update_snapshot(args.root, compact=args.compact)
+    elapsed = time.perf_counter() - start
+
+    print(f"📦 Snapshot: {stats['files']} files, {stats['pack_bytes'] / (1 << 20):.1f} MiB pack")
+    print(f"   ➕ {stats['added']} added, 🔄 {stats['updated']} updated, ➖ {stats['removed']} removed"
+          f"{', compacted' if stats['compacted'] else ''}")
+    print(f"✅ Done in {elapsed:.2f}s")
+
+    if args.verify:
+        snapshot = ContentSnapshot(args.root)
+        corrupt = snapshot.corrupt_entries()
+        snapshot.close()
+        for rel in corrupt:
+            print(f"❌ Packed bytes do not match their hash: {rel}")
+        if corrupt:
+            print("   Delete the snapshot cache (.cache/snapshot) to rebuild it from the files")
+            sys.exit(1)
+        print(f"🔒 All {stats['files']} packed files match their hashes")
+
+
+if __name__ == '__main__':
+    main()
@@ -12,18 +12,58 @@ Usage:
     
     # With options
     python3 convert_mdx_to_pdf.py <path> --no-pdf --keep-aux
+
+    # Parallel batch, most expensive files first
+    python3 convert_mdx_to_pdf.py <directory> --jobs 8
+
+    # Pipelined batch: one file's Pandoc runs while another's XeLaTeX does
+    python3 convert_mdx_to_pdf.py <directory> --pipeline --jobs 8
+
+    # Several formats from one Pandoc parse
+    python3 convert_mdx_to_pdf.py <path> --formats pdf,docx,epub
+
+    # Through the shared work queue, so other build boxes can help
+    python3 convert_mdx_to_pdf.py <directory> --queue .cache/queue/jobs.db --jobs 4
+
+    # One PDF per subject and language with all its papers
+    python3 convert_mdx_to_pdf.py <directory> --volume
 """
 
 import sys
 import os
+import io
+import time
+import contextlib
 import subprocess
 import argparse
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from pathlib import Path
 import re
 
 # Import the refactor function from refactor_pandoc_latex.py
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from refactor_pandoc_latex import refactor_latex
+from content_snapshot import read_text
+from solution_index import load_solution_index
+from frontmatter_index import source_metadata
+from build_scheduler import BuildHistory, build_mode, longest_first, predict_makespan
+from cache_utils import get_cache_dir, hash_bytes
+from reproducible_pdf import deterministic_env, normalize_pdf_id, pdf_digest
+from image_cache import normalize_images, remove_normalized_images
+from pdf_optimize import optimize_pdf
+from question_fragments import store_fragments
+from work_queue import fetch_artifacts, open_queue, project_relative, run_batch
+from job_limits import EX_TEMPFAIL, BusyError, admission, run_limited, stage_timeout
+from build_metrics import cache_lookup, flush as flush_metrics, inc, observe
+
+
+# Formats rendered from the cached Pandoc AST besides the LaTeX/PDF pipeline
+EXPORT_FORMATS = ('docx', 'odt', 'epub', 'html')
+FORMATS = ('tex', 'pdf') + EXPORT_FORMATS
+
+_pandoc_version = None
 
 
 def is_solution_file(filename):
@@ -52,11 +92,12 @@ def find_solution_files(path):
             return []
     
     elif path.is_dir():
-        # Directory - find all matching files
-        solution_files = []
-        for mdx_file in path.rglob('*.mdx'):
-            if is_solution_file(mdx_file.name):
-                solution_files.append(mdx_file)
+        # Directory - look matching files up in the discovery index
+        index = load_solution_index()
+        if index.covers(path):
+            solution_files = index.files(under=path, kind='mdx')
+        else:
+            solution_files = [f for f in path.rglob('*.mdx') if is_solution_file(f.name)]
         
         if not solution_files:
             print(f"⚠️  WARNING: No solution files found in: {path}")
@@ -71,20 +112,34 @@ def find_solution_files(path):
 def process_mermaid_blocks(content, work_dir):
     """
     Find mermaid blocks, generate PDF diagrams, and replace blocks with image links.
+    Rendered diagrams are kept in .cache/mermaid, keyed by their source, so a
+    diagram is rendered once and embeds identical bytes in every build.
     Returns: (new_content, generated_files)
     """
     import hashlib
+    import shutil
     
     generated_files = []
+    render_cache = get_cache_dir('mermaid')
     
     def replace_block(match):
         diagram_code = match.group(1)
         # Create a unique hash for the filename to avoid collisions/rebuilds
         hash_obj = hashlib.md5(diagram_code.encode('utf-8'))
         file_hash = hash_obj.hexdigest()[:8]
-        mmd_file = work_dir / f"mermaid-{file_hash}.mmd"
+        # Per-process/thread render names: parallel builds may render the same diagram
+        render_name = f"mermaid-{file_hash}-{os.getpid()}-{threading.get_ident()}"
+        mmd_file = work_dir / f"{render_name}.mmd"
+        rendered_pdf = work_dir / f"{render_name}.pdf"
         pdf_file = work_dir / f"mermaid-{file_hash}.pdf"
         
+        cached_pdf = render_cache / f"{hash_bytes(diagram_code.encode('utf-8'))}.pdf"
+        if not pdf_file.exists() and cached_pdf.exists():
+            # Copy under the render name first: another build may read pdf_file meanwhile
+            shutil.copyfile(cached_pdf, rendered_pdf)
+            os.replace(rendered_pdf, pdf_file)
+        cache_lookup('mermaid', pdf_file.exists())
+        
         # Only regenerate if PDF doesn't exist
         if not pdf_file.exists():
             # Write MMD file
@@ -96,20 +151,28 @@ def process_mermaid_blocks(content, work_dir):
             cmd = [
                 'npx', 'mmdc',
                 '-i', str(mmd_file),
-                '-o', str(pdf_file),
+                '-o', str(rendered_pdf),
                 '--pdfFit',
                 '--backgroundColor', 'transparent'
             ]
             
             # We process synchronously
-            if not run_command(cmd, cwd=work_dir, description=f"Generating Mermaid diagram {file_hash}"):
+            if not run_command(cmd, cwd=work_dir, description=f"Generating Mermaid diagram {file_hash}",
+                               stage='mermaid'):
                 print(f"⚠️  WARNING: Failed to generate mermaid diagram. Keeping original block.")
+                inc('study_stage_failures_total', {'stage': 'mermaid'})
                 if mmd_file.exists(): mmd_file.unlink()
                 return match.group(0) # Return original text
                 
             # Clean up mmd source immediately
             if mmd_file.exists():
                 mmd_file.unlink()
+            if rendered_pdf.exists():
+                # Temp file + rename, so other builds never pick up a partial cache entry
+                cache_tmp = render_cache / f".{cached_pdf.name}.{render_name}"
+                shutil.copyfile(rendered_pdf, cache_tmp)
+                os.replace(cache_tmp, cached_pdf)
+                os.replace(rendered_pdf, pdf_file)
             
         generated_files.append(pdf_file)
         
@@ -122,248 +185,618 @@ def process_mermaid_blocks(content, work_dir):
     
     return new_content, generated_files
 
-def run_command(cmd, cwd=None, description=""):
-    """Run a shell command and handle errors."""
+def run_command(cmd, cwd=None, description="", env=None, stage=None):
+    """
+    Run a shell command and handle errors.
+    
+    With a stage, the command runs under that stage's timeout and
+    memory/CPU limits (see job_limits.py); on timeout its whole process
+    group is killed and None is returned, so callers that tolerate a
+    non-zero exit (XeLaTeX) can still tell a hung run from a failed one.
+    """
     print(f"{'='*60}")
     print(f"Step: {description}")
     print(f"Command: {' '.join(cmd)}")
     print(f"{'='*60}")
     
     try:
-        result = subprocess.run(
-            cmd,
-            cwd=cwd,
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        if result.stdout:
-            print(result.stdout)
-        return True
-    except subprocess.CalledProcessError as e:
+        result = run_limited(cmd, stage, cwd=cwd, env=env, capture_output=True, text=True)
+    except subprocess.TimeoutExpired:
+        print(f"❌ ERROR: {description} timed out after {stage_timeout(stage):g}s!")
+        inc('study_stage_timeouts_total', {'stage': stage})
+        return None
+    stdout, stderr = result.stdout, result.stderr
+    if result.returncode != 0:
         print(f"❌ ERROR: {description} failed!")
-        print(f"Exit code: {e.returncode}")
-        if e.stdout:
-            print(f"STDOUT:\n{e.stdout}")
-        if e.stderr:
-            print(f"STDERR:\n{e.stderr}")
+        print(f"Exit code: {result.returncode}")
+        if stdout:
+            print(f"STDOUT:\n{stdout}")
+        if stderr:
+            print(f"STDERR:\n{stderr}")
         return False
+    if stdout:
+        print(stdout)
+    return True
 
 
-def get_mdx_title(mdx_path):
-    """Extract title from MDX frontmatter."""
-    try:
-        with open(mdx_path, 'r', encoding='utf-8') as f:
-            for _ in range(20): # Check first 20 lines
-                line = f.readline()
-                if not line: break
-                
-                # Match title: "..." or title: ...
-                match = re.match(r'^title:\s*["\']?(.*?)["\']?\s*$', line.strip())
-                if match:
-                    return match.group(1)
-    except Exception:
-        pass
-    return None
+def run_xelatex(tex_path, passes=2, env=None, description="Compiling LaTeX to PDF"):
+    """
+    Run XeLaTeX on tex_path; returns True if this run produced the PDF.
+    
+    XeLaTeX may exit non-zero for warnings and still write a PDF, so the
+    PDF's existence is the success indicator. Any PDF left by an earlier
+    build is removed first so it cannot pass for this one, and a timed-out
+    pass ends the run instead of starting the next one.
+    """
+    pdf_path = tex_path.with_suffix('.pdf')
+    pdf_path.unlink(missing_ok=True)
+    for run_num in range(1, passes + 1):
+        pass_start = time.perf_counter()
+        result = run_command(
+            ['xelatex', '-interaction=nonstopmode', tex_path.name],
+            cwd=tex_path.parent,
+            description=f"{description} (pass {run_num}/{passes})",
+            env=env,
+            stage='xelatex'
+        )
+        observe('study_xelatex_pass_duration_seconds', time.perf_counter() - pass_start, {'pass': str(run_num)})
+        if result is None:
+            pdf_path.unlink(missing_ok=True)
+            return False
+    return pdf_path.exists()
+
+
+def output_path(mdx_path, ext):
+    """
+    Output path of one format for an MDX file, with the -pandoc suffix.
+    Example: 4300003-summer-2022-solution.gu.mdx, 'tex' -> 4300003-summer-2022-solution-pandoc.gu.tex
+    """
+    mdx_path = Path(mdx_path)
+    stem = mdx_path.stem  # e.g., "4300003-summer-2022-solution.gu" or "4300003-summer-2022-solution"
+    
+    # Handle .gu.mdx files (double extension)
+    if stem.endswith('.gu'):
+        base_stem = stem[:-3]  # Remove .gu
+        return mdx_path.parent / f"{base_stem}-pandoc.gu.{ext}"
+    return mdx_path.parent / f"{stem}-pandoc.{ext}"
 
 
-def convert_mdx_to_pdf(mdx_file, generate_pdf=True, keep_aux=False):
+def output_paths(mdx_path):
+    """LaTeX and PDF paths for an MDX file."""
+    return output_path(mdx_path, 'tex'), output_path(mdx_path, 'pdf')
+
+
+def pandoc_version():
+    """First line of `pandoc --version`, part of the AST cache key."""
+    global _pandoc_version
+    if _pandoc_version is None:
+        try:
+            result = subprocess.run(['pandoc', '--version'], capture_output=True, text=True)
+            _pandoc_version = result.stdout.split('\n', 1)[0]
+        except OSError:
+            _pandoc_version = ''
+    return _pandoc_version
+
+
+def pandoc_ast(content, mdx_path, work_dir):
+    """
+    Pandoc JSON AST of preprocessed MDX content, parsed once per content hash.
+    
+    The AST is kept in .cache/pandoc-ast, so every output format, and every
+    later build of an unchanged file, renders from it without re-parsing.
+    
+    Returns:
+        Path of the cached AST, or None if Pandoc failed
+    """
+    key = hash_bytes(f"{pandoc_version()}\0{content}".encode('utf-8'))
+    ast_path = get_cache_dir('pandoc-ast') / f"{key}.json"
+    cache_lookup('pandoc-ast', ast_path.exists())
+    if ast_path.exists():
+        print(f"♻️  Reusing parsed document: {ast_path.name[:12]}")
+        return ast_path
+    
+    # If preprocessing changed the content, Pandoc reads it from a temp file
+    input_file = mdx_path
+    temp_mdx = None
+    if content != read_text(mdx_path):
+        temp_mdx = work_dir / f"{mdx_path.stem}_processed.mdx"
+        with open(temp_mdx, 'w', encoding='utf-8') as f:
+            f.write(content)
+        input_file = temp_mdx
+    
+    # Per-process name: a parallel build may parse the same content
+    tmp_path = ast_path.with_name(f".{key}.{os.getpid()}.{threading.get_ident()}.json")
+    ok = run_command(
+        ['pandoc', str(input_file), '-f', 'markdown', '-t', 'json', '-o', str(tmp_path)],
+        cwd=work_dir,
+        description="Parsing MDX with Pandoc",
+        stage='pandoc'
+    )
+    # Clean up temp MDX
+    if temp_mdx and temp_mdx.exists():
+        temp_mdx.unlink()
+    if not ok:
+        if tmp_path.exists():
+            tmp_path.unlink()
+        return None
+    os.replace(tmp_path, ast_path)
+    return ast_path
+
+
+def render_ast(ast_path, out_path, work_dir, extra_args=()):
+    """Render a cached Pandoc AST to the format implied by out_path's extension."""
+    fmt = out_path.suffix[1:]
+    return run_command(
+        ['pandoc', str(ast_path), '-f', 'json', *extra_args, '-o', str(out_path)],
+        cwd=work_dir,
+        description=f"Rendering {fmt.upper()} from the parsed document",
+        stage='pandoc'
+    )
+
+
+def remove_mermaid_pdfs(work_dir):
+    """Remove rendered Mermaid diagrams once the PDFs embedding them are built."""
+    for m_pdf in Path(work_dir).glob('mermaid-*.pdf'):
+        m_pdf.unlink()
+        print(f"🗑️  Removed: {m_pdf.name}")
+
+
+def convert_mdx_to_pdf(mdx_file, generate_pdf=True, keep_aux=False, timings=None, clean_assets=True,
+                       deterministic=False, optimize=False, export_formats=(), admission_wait=None):
     """
     Convert MDX file to PDF through LaTeX pipeline.
     
     Steps:
-    1. Convert MDX to LaTeX using Pandoc (with -pandoc suffix)
+    1. Parse the preprocessed MDX into a cached Pandoc AST, render LaTeX
+       from it (with -pandoc suffix) and any export_formats (docx, odt,
+       epub, html)
     2. Refactor LaTeX using refactor_latex.py
     3. Compile LaTeX to PDF using XeLaTeX (optional)
     4. Clean up auxiliary files (optional)
+    
+    If timings is a dict, the seconds spent in each stage (mermaid, images,
+    pandoc, export, refactor, xelatex, optimize) are stored in it. Parallel batches pass
+    clean_assets=False and remove the shared Mermaid PDFs and figures once
+    at the end.
+    With deterministic=True, XeLaTeX runs with a fixed SOURCE_DATE_EPOCH and
+    the PDF's /ID is pinned, so unchanged sources give identical bytes.
+    With optimize=True, the PDF is recompressed, packed into object streams
+    and linearized (see pdf_optimize.py).
+    
+    The build runs in one of the machine's admission slots (job_limits.py).
+    With admission_wait set, BusyError is raised if no slot frees up within
+    that many seconds; by default the call waits for one.
     """
+    if timings is None:
+        timings = {}
+    before = dict(timings)
+    ok = False
+    try:
+        with admission(wait=admission_wait):
+            ok = _convert_pipeline(mdx_file, generate_pdf, keep_aux, timings, clean_assets,
+                                   deterministic, optimize, export_formats)
+        return ok
+    except BusyError:
+        inc('study_admission_rejections_total')
+        raise
+    finally:
+        record_build(timings, ok, before)
+        flush_metrics()
+
+
+def record_build(timings, ok, before=None):
+    """Stage durations and result of one finished build, for build_metrics.py."""
+    before = before or {}
+    for stage, seconds in timings.items():
+        if seconds != before.get(stage):
+            observe('study_stage_duration_seconds', seconds - before.get(stage, 0.0), {'stage': stage})
+    inc('study_builds_total', {'result': 'success' if ok else 'failure'})
+
+
+@dataclass
+class ConversionJob:
+    """State of one MDX file moving through the pipeline stages"""
+    mdx_path: Path
+    tex_path: Path
+    pdf_path: Path
+    generate_pdf: bool = True
+    keep_aux: bool = False
+    clean_assets: bool = True
+    deterministic: bool = False
+    optimize: bool = False
+    export_formats: tuple = ()
+    timings: dict = field(default_factory=dict)
+    content: str = None
+    metadata: dict = None
+    
+    @property
+    def work_dir(self):
+        return self.mdx_path.parent
+
+
+def new_job(mdx_file, generate_pdf=True, keep_aux=False, timings=None, clean_assets=True,
+            deterministic=False, optimize=False, export_formats=()):
+    """ConversionJob for an MDX file, or None (with an error printed) if it cannot be converted."""
     mdx_path = Path(mdx_file).resolve()
     
     if not mdx_path.exists():
         print(f"❌ ERROR: File not found: {mdx_path}")
-        return False
+        return None
     
     if not mdx_path.suffix == '.mdx':
         print(f"❌ ERROR: File must have .mdx extension: {mdx_path}")
-        return False
-    
-    # Determine output paths with -pandoc suffix
-    # Example: 4300003-summer-2022-solution.gu.mdx -> 4300003-summer-2022-solution-pandoc.gu.tex
-    stem = mdx_path.stem  # e.g., "4300003-summer-2022-solution.gu" or "4300003-summer-2022-solution"
+        return None
     
-    # Handle .gu.mdx files (double extension)
-    if stem.endswith('.gu'):
-        base_stem = stem[:-3]  # Remove .gu
-        tex_name = f"{base_stem}-pandoc.gu.tex"
-        pdf_name = f"{base_stem}-pandoc.gu.pdf"
-    else:
-        tex_name = f"{stem}-pandoc.tex"
-        pdf_name = f"{stem}-pandoc.pdf"
+    tex_path, pdf_path = output_paths(mdx_path)
+    return ConversionJob(mdx_path, tex_path, pdf_path, generate_pdf, keep_aux, clean_assets,
+                         deterministic, optimize, tuple(export_formats), {} if timings is None else timings)
+
+
+class StageClock:
+    """Adds the seconds since the previous stage ended to job.timings[stage]"""
     
-    tex_path = mdx_path.parent / tex_name
-    pdf_path = mdx_path.parent / pdf_name
-    work_dir = mdx_path.parent
+    def __init__(self, timings):
+        self.timings = timings
+        self.start = time.perf_counter()
     
+    def end(self, stage):
+        now = time.perf_counter()
+        self.timings[stage] = self.timings.get(stage, 0.0) + now - self.start
+        self.start = now
+
+
+def print_header(job):
     print(f"\n{'='*60}")
     print(f"MDX to PDF Conversion Pipeline")
     print(f"{'='*60}")
-    print(f"Input:  {mdx_path.name}")
-    print(f"Output: {tex_path.name}")
-    if generate_pdf:
-        print(f"PDF:    {pdf_path.name}")
-    print(f"Dir:    {work_dir}")
+    print(f"Input:  {job.mdx_path.name}")
+    print(f"Output: {job.tex_path.name}")
+    if job.generate_pdf:
+        print(f"PDF:    {job.pdf_path.name}")
+    if job.export_formats:
+        print(f"Export: {', '.join(job.export_formats)}")
+    print(f"Dir:    {job.work_dir}")
+    print(f"{'='*60}\n")
+
+
+def print_summary(job):
+    print(f"\n{'='*60}")
+    print(f"✅ SUCCESS: Conversion complete!")
+    print(f"{'='*60}")
+    print(f"LaTeX: {job.tex_path}")
+    if job.generate_pdf and job.pdf_path.exists():
+        print(f"PDF:   {job.pdf_path}")
     print(f"{'='*60}\n")
+
+
+def prepare_stage(job):
+    """Render Mermaid diagrams and point figures at print-resolution copies; sets job.content."""
+    clock = StageClock(job.timings)
+    # Title, subject and exam session from the frontmatter index
+    job.metadata = source_metadata(job.mdx_path)
     
     # Pre-process Mermaid blocks
     try:
-        with open(mdx_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = read_text(job.mdx_path)
             
         # Convert goat blocks to text blocks for simple verbatim rendering
         content = re.sub(r'```goat', r'```text', content)
             
-        new_content, mermaid_files = process_mermaid_blocks(content, work_dir)
+        new_content, mermaid_files = process_mermaid_blocks(content, job.work_dir)
+        clock.end('mermaid')
         
-        # If content changed, write to temp file
-        input_file = mdx_path
-        temp_mdx = None
+        # Point raster figures at cached print-resolution copies
+        new_content, images = normalize_images(new_content, job.mdx_path.parent, job.work_dir)
+        clock.end('images')
         
         if mermaid_files:
             print(f"🧜‍♀️ Generated {len(mermaid_files)} Mermaid diagram(s)")
-            temp_mdx = work_dir / f"{mdx_path.stem}_processed.mdx"
-            with open(temp_mdx, 'w', encoding='utf-8') as f:
-                f.write(new_content)
-            input_file = temp_mdx
+        if images:
+            print(f"🖼️  Embedding {len(images)} print-resolution figure(s)")
             
     except Exception as e:
         print(f"⚠️  WARNING: Failed to process Mermaid blocks: {e}")
-        input_file = mdx_path
-        temp_mdx = None
+        inc('study_stage_failures_total', {'stage': 'mermaid'})
+        new_content = read_text(job.mdx_path)
+        clock.end('mermaid')
+    job.content = new_content
+    return True
 
-    # Step 1: Pandoc conversion
-    if not run_command(
-        ['pandoc', str(input_file), '--listings', '-o', str(tex_path)],
-        cwd=work_dir,
-        description="Converting MDX to LaTeX with Pandoc"
-    ):
-        if temp_mdx and temp_mdx.exists():
-            temp_mdx.unlink()
+
+def pandoc_stage(job):
+    """Parse once (cached by content), then render LaTeX and each export format from the AST."""
+    clock = StageClock(job.timings)
+    mdx_path, tex_path, work_dir = job.mdx_path, job.tex_path, job.work_dir
+    ast_path = pandoc_ast(job.content, mdx_path, work_dir)
+    if ast_path is None or not render_ast(ast_path, tex_path, work_dir, ['--listings']):
+        inc('study_stage_failures_total', {'stage': 'pandoc'})
         return False
-        
-    # Clean up temp MDX
-    if temp_mdx and temp_mdx.exists():
-        temp_mdx.unlink()
+    clock.end('pandoc')
+    # The AST holds everything later stages need
+    job.content = None
     
     print(f"✅ Generated: {tex_path.name}\n")
     
-    # Step 2: Refactor LaTeX
+    for fmt in job.export_formats:
+        out_path = output_path(mdx_path, fmt)
+        # Standalone HTML, so the file opens on its own like the other formats
+        if render_ast(ast_path, out_path, work_dir, ['--standalone'] if fmt == 'html' else []):
+            print(f"✅ Generated: {out_path.name}\n")
+        else:
+            print(f"⚠️  WARNING: Could not render {fmt}")
+            inc('study_stage_failures_total', {'stage': 'export'})
+    clock.end('export')
+    return True
+
+
+def refactor_stage(job):
+    """Refactor the Pandoc LaTeX and cache its per-question fragments."""
+    clock = StageClock(job.timings)
+    tex_path, metadata = job.tex_path, job.metadata
     print(f"{'='*60}")
     print(f"Step: Refactoring LaTeX")
     print(f"{'='*60}")
     
-    # Extract title from MDX
-    mdx_title = get_mdx_title(mdx_path)
-    if mdx_title:
-        print(f"📄 Found Title: {mdx_title}")
+    if metadata['title']:
+        print(f"📄 Found Title: {metadata['title']}")
     
     try:
-        refactor_latex(str(tex_path), title=mdx_title)
+        refactor_latex(str(tex_path), title=metadata['title'], metadata=metadata)
         print(f"✅ Refactored: {tex_path.name}\n")
     except Exception as e:
         print(f"❌ ERROR: Refactoring failed!")
         print(f"Error: {e}")
+        inc('study_stage_failures_total', {'stage': 'refactor'})
         return False
     
-    # Step 3: Compile to PDF (optional)
-    if generate_pdf:
-        # Run XeLaTeX twice for proper references
-        # Note: XeLaTeX may return non-zero exit codes due to warnings,
-        # but still successfully generate PDFs. We check for PDF existence instead.
-        for run_num in [1, 2]:
-            run_command(
-                ['xelatex', '-interaction=nonstopmode', tex_path.name],
-                cwd=work_dir,
-                description=f"Compiling LaTeX to PDF (pass {run_num}/2)"
-            )
-            # Don't check exit code - xelatex returns non-zero for warnings
-        
-        # Check if PDF was actually created (the real success indicator)
-        if pdf_path.exists():
-            print(f"✅ Generated PDF: {pdf_path.name}\n")
-        else:
-            print(f"❌ ERROR: PDF was not generated")
-            return False
+    # Per-question fragments for documents assembled from single questions
+    try:
+        store_fragments(job.mdx_path, tex_path)
+    except Exception as e:
+        print(f"⚠️  WARNING: Could not cache question fragments: {e}")
+    clock.end('refactor')
+    return True
+
+
+def xelatex_stage(job):
+    """Compile the PDF (if requested), optimize it and clean up auxiliary files."""
+    if not job.generate_pdf:
+        return True
+    clock = StageClock(job.timings)
+    tex_path, pdf_path, work_dir = job.tex_path, job.pdf_path, job.work_dir
+    
+    # Run XeLaTeX twice for proper references
+    xelatex_env = deterministic_env(job.metadata) if job.deterministic else None
+    generated = run_xelatex(tex_path, passes=2, env=xelatex_env)
+    clock.end('xelatex')
+    
+    if generated:
+        if job.deterministic:
+            normalize_pdf_id(pdf_path)
+        print(f"✅ Generated PDF: {pdf_path.name}\n")
+    else:
+        print(f"❌ ERROR: PDF was not generated")
+        inc('study_stage_failures_total', {'stage': 'xelatex'})
+        return False
+    
+    if job.optimize:
+        try:
+            before, after = optimize_pdf(pdf_path)
+            if after < before:
+                print(f"🗜️  Optimized PDF: {before / 1024:.0f} KiB -> {after / 1024:.0f} KiB\n")
+        except Exception as e:
+            print(f"⚠️  WARNING: PDF optimization failed, keeping the XeLaTeX output: {e}")
+            inc('study_stage_failures_total', {'stage': 'optimize'})
+        clock.end('optimize')
+    
+    # Clean up auxiliary files (with -pandoc suffix)
+    if not job.keep_aux:
+        aux_extensions = ['.aux', '.log', '.out', '.toc', '.lof', '.lot']
+        # XeLaTeX names aux files after the full tex stem (x-pandoc.gu.aux),
+        # so only this file's own aux files are touched; the sibling
+        # language may still be compiling in the same directory
+        for ext in aux_extensions:
+            aux_file = work_dir / f"{tex_path.stem}{ext}"
+            if aux_file.exists():
+                aux_file.unlink()
+                print(f"🗑️  Removed: {aux_file.name}")
         
-        # Step 4: Clean up auxiliary files (with -pandoc suffix)
-        if not keep_aux:
-            aux_extensions = ['.aux', '.log', '.out', '.toc', '.lof', '.lot']
-            # Build base name for aux files (matches tex_path stem)
-            tex_stem = tex_path.stem
-            if tex_stem.endswith('.gu'):
-                tex_stem = tex_stem[:-3]  # Remove .gu for aux file matching
-            
-            for ext in aux_extensions:
-                # Try both with and without .gu
-                aux_file = work_dir / f"{tex_stem}{ext}"
-                if aux_file.exists():
-                    aux_file.unlink()
-                    print(f"🗑️  Removed: {aux_file.name}")
-                
-                # Also try .gu version
-                aux_file_gu = work_dir / f"{tex_stem}.gu{ext}"
-                if aux_file_gu.exists():
-                    aux_file_gu.unlink()
-                    print(f"🗑️  Removed: {aux_file_gu.name}")
-            
-            # Remove generated Mermaid PDFs (they are embedded now)
-            for m_pdf in work_dir.glob('mermaid-*.pdf'):
-                m_pdf.unlink()
-                print(f"🗑️  Removed: {m_pdf.name}")
+        # Remove generated Mermaid PDFs and figures (they are embedded now)
+        if job.clean_assets:
+            remove_mermaid_pdfs(work_dir)
+            remove_normalized_images(work_dir)
+    return True
 
-    print(f"\n{'='*60}")
-    print(f"✅ SUCCESS: Conversion complete!")
-    print(f"{'='*60}")
-    print(f"LaTeX: {tex_path}")
-    if generate_pdf and pdf_path.exists():
-        print(f"PDF:   {pdf_path}")
-    print(f"{'='*60}\n")
+
+# Pipeline stages in order; pipeline_orchestrator.py runs them with per-stage concurrency
+PIPELINE_STAGES = (
+    ('prepare', prepare_stage),
+    ('pandoc', pandoc_stage),
+    ('refactor', refactor_stage),
+    ('xelatex', xelatex_stage),
+)
+
+
+def _convert_pipeline(mdx_file, generate_pdf, keep_aux, timings, clean_assets,
+                      deterministic, optimize, export_formats):
+    job = new_job(mdx_file, generate_pdf, keep_aux, timings, clean_assets,
+                  deterministic, optimize, export_formats)
+    if job is None:
+        return False
     
+    print_header(job)
+    for _, stage in PIPELINE_STAGES:
+        if not stage(job):
+            return False
+    print_summary(job)
     return True
 
 
-def process_files(files, generate_pdf=True, keep_aux=False):
+def _convert_job(mdx_file, generate_pdf, keep_aux, deterministic, optimize, export_formats, admission_wait=None):
+    """Pool worker: convert one file, capturing its output for an unbroken log."""
+    timings = {}
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        try:
+            ok = convert_mdx_to_pdf(mdx_file, generate_pdf, keep_aux, timings=timings, clean_assets=False,
+                                    deterministic=deterministic, optimize=optimize,
+                                    export_formats=export_formats, admission_wait=admission_wait)
+        except BusyError:
+            # The whole batch gives up, see process_files()
+            raise
+        except Exception as e:
+            print(f"❌ ERROR: {e}")
+            ok = False
+    return ok, timings, log.getvalue()
+
+
+def process_files(files, generate_pdf=True, keep_aux=False, jobs=1, deterministic=False, optimize=False,
+                  export_formats=(), queue=None, pipeline=False, limits=None, admission_wait=None, failed=None):
     """
     Process multiple MDX files.
     
+    With jobs > 1, files run on a process pool in longest-job-first order,
+    using the build history (or a size/diagram estimate) for each file's cost.
+    With a queue (see work_queue.py), the files are enqueued instead and
+    `jobs` local workers drain it, together with any workers on other hosts.
+    With pipeline=True, the stages of different files overlap, with
+    per-stage concurrency sized from `jobs` (see pipeline_orchestrator.py).
+    
+    Each build takes its own admission slot (job_limits.py). With
+    admission_wait set, a build that gets none within that many seconds
+    raises BusyError, which stops the batch; queue workers always wait.
+    
     Args:
         files: List of Path objects
         generate_pdf: Whether to generate PDFs
         keep_aux: Whether to keep auxiliary files
+        jobs: Number of parallel workers
+        deterministic: Build byte-reproducible PDFs
+        optimize: Recompress and linearize the built PDFs
+        export_formats: Further formats rendered from each file's Pandoc AST
+        queue: Work queue spec (path or URL) to distribute the builds through
+        pipeline: Overlap the conversion stages of different files
+        limits: {stage: concurrency} overrides for the pipeline
+        admission_wait: Seconds each build may wait for a slot (None = no limit)
+        failed: List the paths of failed files are appended to, for callers
+            that use the outputs of the files that succeeded
     
     Returns:
         Tuple of (success_count, failure_count)
     """
     if not files:
         return 0, 0
+    if failed is None:
+        failed = []
     
     total = len(files)
     success_count = 0
     failure_count = 0
+    jobs = max(1, min(jobs, total))
+    
+    mode = build_mode(generate_pdf)
+    history = BuildHistory()
+    costs = {f: history.estimate(f, mode) for f in files}
+    order = longest_first(files, costs) if jobs > 1 or pipeline else list(files)
+    total_work = sum(costs.values())
+    predicted = predict_makespan([costs[f] for f in order], jobs)
     
     print(f"\n{'#'*60}")
-    print(f"BATCH PROCESSING: {total} file(s)")
+    print(f"BATCH PROCESSING: {total} file(s) on {jobs} worker(s){' (pipelined)' if pipeline else ''}")
+    print(f"Estimated work: {total_work:.1f}s, predicted makespan: {predicted:.1f}s")
     print(f"{'#'*60}\n")
     
-    for i, mdx_file in enumerate(files, 1):
-        print(f"\n{'#'*60}")
-        print(f"Processing file {i}/{total}: {mdx_file.name}")
-        print(f"{'#'*60}\n")
+    start = time.perf_counter()
+    if queue is not None:
+        by_rel = {project_relative(f): f for f in files}
+        items = [({'mdx': rel, 'generate_pdf': generate_pdf, 'keep_aux': keep_aux, 'deterministic': deterministic,
+                   'optimize': optimize, 'export_formats': list(export_formats)}, costs[f])
+                 for rel, f in by_rel.items()]
+        for i, (payload, status, result, error) in enumerate(run_batch(open_queue(queue), 'convert', items, jobs), 1):
+            mdx_file = by_rel[payload['mdx']]
+            ok = status == 'done' and result['ok']
+            timings = result['timings'] if result else {}
+            print(f"\n{'#'*60}")
+            print(f"Finished file {i}/{total}: {mdx_file.name} "
+                  f"({sum(timings.values()):.1f}s, estimated {costs[mdx_file]:.1f}s)")
+            print(f"{'#'*60}\n")
+            if result:
+                print(result['log'], end='')
+                fetch_artifacts(result['artifacts'])
+            if error:
+                print(f"❌ ERROR: {error}")
+            if ok:
+                success_count += 1
+            else:
+                failure_count += 1
+                failed.append(mdx_file)
+                print(f"\n⚠️  Failed to process: {mdx_file.name}\n")
+            history.record(mdx_file, mode, timings)
+    elif jobs == 1 and not pipeline:
+        for i, mdx_file in enumerate(order, 1):
+            print(f"\n{'#'*60}")
+            print(f"Processing file {i}/{total}: {mdx_file.name}")
+            print(f"{'#'*60}\n")
+            
+            timings = {}
+            if convert_mdx_to_pdf(mdx_file, generate_pdf, keep_aux, timings=timings,
+                                  deterministic=deterministic, optimize=optimize,
+                                  export_formats=export_formats, admission_wait=admission_wait):
+                success_count += 1
+            else:
+                failure_count += 1
+                failed.append(mdx_file)
+                print(f"\n⚠️  Failed to process: {mdx_file.name}\n")
+            history.record(mdx_file, mode, timings)
+    else:
+        finished = 0
+        
+        def report(mdx_file, ok, timings, log):
+            nonlocal finished, success_count, failure_count
+            finished += 1
+            print(f"\n{'#'*60}")
+            print(f"Finished file {finished}/{total}: {mdx_file.name} "
+                  f"({sum(timings.values()):.1f}s, estimated {costs[mdx_file]:.1f}s)")
+            print(f"{'#'*60}\n")
+            print(log, end='')
+            if ok:
+                success_count += 1
+            else:
+                failure_count += 1
+                failed.append(mdx_file)
+                print(f"\n⚠️  Failed to process: {mdx_file.name}\n")
+            history.record(mdx_file, mode, timings)
         
-        if convert_mdx_to_pdf(mdx_file, generate_pdf, keep_aux):
-            success_count += 1
+        if pipeline:
+            # Imported here: pipeline_orchestrator builds on this module
+            from pipeline_orchestrator import run_pipeline, stage_limits
+            stage_jobs = stage_limits(jobs, limits)
+            print(f"Stage limits: {', '.join(f'{name} {n}' for name, n in stage_jobs.items())}\n")
+            run_pipeline(order, stage_jobs, report, generate_pdf=generate_pdf, keep_aux=keep_aux,
+                         deterministic=deterministic, optimize=optimize, export_formats=export_formats,
+                         admission_wait=admission_wait)
         else:
-            failure_count += 1
-            print(f"\n⚠️  Failed to process: {mdx_file.name}\n")
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                # The pool hands out work in submission order, so submitting
+                # longest first is longest-processing-time list scheduling
+                futures = {pool.submit(_convert_job, f, generate_pdf, keep_aux, deterministic, optimize,
+                                       export_formats, admission_wait): f
+                           for f in order}
+                try:
+                    for future in as_completed(futures):
+                        report(futures[future], *future.result())
+                except BusyError:
+                    # Do not start the rest; builds already running finish
+                    pool.shutdown(cancel_futures=True)
+                    raise
+        
+        # Diagrams and figures can be shared by the En/Gu papers of one directory
+        if generate_pdf and not keep_aux:
+            for work_dir in sorted({f.parent for f in files}):
+                remove_mermaid_pdfs(work_dir)
+                remove_normalized_images(work_dir)
+    elapsed = time.perf_counter() - start
+    history.save()
     
     # Summary
     print(f"\n{'#'*60}")
@@ -372,11 +805,53 @@ def process_files(files, generate_pdf=True, keep_aux=False):
     print(f"Total:   {total}")
     print(f"Success: {success_count} ✅")
     print(f"Failed:  {failure_count} ❌")
+    print(f"Makespan: {elapsed:.1f}s actual, {predicted:.1f}s predicted, "
+          f"{total_work / jobs:.1f}s ideal on {jobs} worker(s)")
     print(f"{'#'*60}\n")
     
     return success_count, failure_count
 
 
+def check_reproducible(files, keep_aux=False):
+    """
+    Build each file's PDF twice in deterministic mode and compare the bytes.
+    
+    Returns:
+        List of files whose two builds differ (or failed)
+    """
+    mismatched = []
+    for i, mdx_file in enumerate(files, 1):
+        print(f"\n{'#'*60}")
+        print(f"Reproducibility check {i}/{len(files)}: {mdx_file.name}")
+        print(f"{'#'*60}\n")
+        
+        digests = []
+        for _ in range(2):
+            log = io.StringIO()
+            with contextlib.redirect_stdout(log):
+                ok = convert_mdx_to_pdf(mdx_file, True, keep_aux, deterministic=True)
+            pdf_path = output_paths(mdx_file)[1]
+            if not ok or not pdf_path.exists():
+                print(log.getvalue(), end='')
+                digests = None
+                break
+            digests.append(pdf_digest(pdf_path))
+        
+        if digests is None:
+            print(f"❌ Build failed")
+            mismatched.append(mdx_file)
+        elif digests[0] != digests[1]:
+            print(f"❌ Builds differ: {digests[0][:12]} vs {digests[1][:12]}")
+            mismatched.append(mdx_file)
+        else:
+            print(f"✅ Identical: {digests[0][:12]}")
+    
+    print(f"\n{'#'*60}")
+    print(f"REPRODUCIBILITY: {len(files) - len(mismatched)}/{len(files)} identical")
+    print(f"{'#'*60}\n")
+    return mismatched
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Convert MDX study materials to PDF via LaTeX',
@@ -394,6 +869,28 @@ Examples:
   
   # Keep auxiliary files (.aux, .log, etc.)
   python3 convert_mdx_to_pdf.py /path/to/directory --keep-aux
+  
+  # Build on 8 workers, most expensive files first
+  python3 convert_mdx_to_pdf.py /path/to/directory --jobs 8
+  
+  # Byte-reproducible PDFs, and a check that two builds match
+  python3 convert_mdx_to_pdf.py /path/to/directory --deterministic
+  python3 convert_mdx_to_pdf.py /path/to/directory --check-reproducible
+  
+  # PDF plus Word and EPUB, all from one Pandoc parse
+  python3 convert_mdx_to_pdf.py /path/to/directory --formats pdf,docx,epub
+  
+  # Smaller, linearized PDFs (existing PDFs: python3 pdf_optimize.py content)
+  python3 convert_mdx_to_pdf.py /path/to/directory --optimize
+  
+  # All papers of each subject in one PDF per language (see subject_volume.py)
+  python3 convert_mdx_to_pdf.py /path/to/subject/directory --volume
+  
+  # Overlap Pandoc, XeLaTeX and Mermaid work across files
+  python3 convert_mdx_to_pdf.py /path/to/directory --pipeline --jobs 8
+  
+  # Interactive callers: exit 75 ("busy, retry") if no build slot frees up in 15s
+  python3 convert_mdx_to_pdf.py /path/to/file-solution.mdx --admission-wait 15
 
 Pattern Matching:
   Only files matching these patterns will be processed:
@@ -421,8 +918,76 @@ Pattern Matching:
         help='Keep auxiliary files (.aux, .log, etc.)'
     )
     
+    parser.add_argument(
+        '--formats',
+        help=f'Comma-separated output formats: {",".join(FORMATS)} (default: pdf, or tex with --no-pdf); '
+             'LaTeX is always produced'
+    )
+    
+    parser.add_argument(
+        '--deterministic',
+        action='store_true',
+        help='Build byte-reproducible PDFs (fixed dates, font subset tags and /ID)'
+    )
+    
+    parser.add_argument(
+        '--optimize',
+        action='store_true',
+        help='Recompress, pack and linearize the built PDFs (needs qpdf or pikepdf)'
+    )
+    
+    parser.add_argument(
+        '--check-reproducible',
+        action='store_true',
+        help='Build each PDF twice in deterministic mode and fail if the bytes differ'
+    )
+    
+    parser.add_argument(
+        '--volume',
+        action='store_true',
+        help='Build one volume per subject and language instead of one PDF per paper'
+    )
+    
+    parser.add_argument(
+        '--queue',
+        help='Distribute builds through this work queue (file or URL; see work_queue.py)'
+    )
+    
+    parser.add_argument(
+        '--pipeline',
+        action='store_true',
+        help='Overlap the stages of different files (Mermaid, Pandoc, refactor, XeLaTeX), '
+             'with per-stage limits sized from --jobs (see pipeline_orchestrator.py)'
+    )
+    
+    parser.add_argument(
+        '--admission-wait',
+        type=float,
+        metavar='SECONDS',
+        help='Exit with code 75 (busy, retry) if a build gets no slot within SECONDS '
+             '(default: wait for one; ignored with --queue; see job_limits.py)'
+    )
+    
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=1,
+        help='Parallel workers, scheduled longest job first (0 = one per CPU)'
+    )
+    
     args = parser.parse_args()
     
+    generate_pdf = not args.no_pdf
+    export_formats = ()
+    if args.formats:
+        formats = [f.strip() for f in args.formats.split(',') if f.strip()]
+        unknown = sorted(set(formats) - set(FORMATS))
+        if unknown:
+            print(f"❌ ERROR: Unknown format(s): {', '.join(unknown)} (choose from {', '.join(FORMATS)})")
+            sys.exit(1)
+        generate_pdf = 'pdf' in formats and not args.no_pdf
+        export_formats = tuple(f for f in EXPORT_FORMATS if f in formats)
+    
     # Find files to process
     path = Path(args.path).resolve()
     files = find_solution_files(path)
@@ -431,12 +996,39 @@ Pattern Matching:
         print("❌ No files to process!")
         sys.exit(1)
     
-    # Process files
-    success_count, failure_count = process_files(
-        files,
-        generate_pdf=not args.no_pdf,
-        keep_aux=args.keep_aux
-    )
+    if args.check_reproducible:
+        sys.exit(1 if check_reproducible(files, keep_aux=args.keep_aux) else 0)
+    
+    if args.volume:
+        # Imported here: subject_volume builds on this module
+        from subject_volume import build_volumes
+        success_count, failure_count = build_volumes(
+            files,
+            generate_pdf=not args.no_pdf,
+            keep_aux=args.keep_aux,
+            jobs=args.jobs or os.cpu_count() or 1,
+            deterministic=args.deterministic,
+            optimize=args.optimize
+        )
+        sys.exit(0 if failure_count == 0 else 1)
+    
+    # Process files; each build takes its own slot, so pool and pipeline workers never wait on ours
+    try:
+        success_count, failure_count = process_files(
+            files,
+            generate_pdf=generate_pdf,
+            keep_aux=args.keep_aux,
+            jobs=args.jobs or os.cpu_count() or 1,
+            deterministic=args.deterministic,
+            optimize=args.optimize,
+            export_formats=export_formats,
+            queue=args.queue,
+            pipeline=args.pipeline,
+            admission_wait=args.admission_wait
+        )
+    except BusyError as e:
+        print(f"⏳ Busy, retry: {e}")
+        sys.exit(EX_TEMPFAIL)
     
     # Exit with appropriate code
     sys.exit(0 if failure_count == 0 else 1)
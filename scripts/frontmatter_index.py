@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+MDX Frontmatter Index
+One metadata record per MDX file under content/: frontmatter title,
+description, date and tags, plus the subject code, exam season/year, language
+and kind derived from the file's name and location. Subject names come from
+the English _index.mdx title of each subject directory.
+
+Pipeline stages used to open each MDX and regex-scan its first lines for the
+title, parse season and year from file names with their own regexes, and keep
+a hard-coded subject map. The index reads only the leading --- block of each
+file and is kept in .cache/discovery next to the solution index; a refresh
+re-lists only changed directories (see solution_index.scan_directories) and
+re-reads only files whose mtime/size changed.
+
+Usage:
+    # Refresh and summarize the index
+    python3 frontmatter_index.py
+
+    # Metadata of one file, or the subjects and their names
+    python3 frontmatter_index.py --file path/to/1333203-summer-2024-solution.mdx
+    python3 frontmatter_index.py --subjects
+
+    # In a script
+    from frontmatter_index import source_metadata
+    metadata = source_metadata(mdx_or_generated_tex_path)
+"""
+
+import sys
+import os
+import re
+import json
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from cache_utils import get_cache_dir, hash_bytes, file_signature, load_json, save_json
+from solution_index import CONTENT_DIR, SOLUTION_RE, SESSION_RE, SUBJECT_RE, scan_directories
+
+
+# Bump when the entry layout or the header parsing changes
+FRONTMATTER_VERSION = 1
+HEADER_FIELDS = ('title', 'description', 'date', 'tags')
+MAX_HEADER_LINES = 60
+HEADER_LINE_RE = re.compile(r'^([A-Za-z_][\w-]*):\s*(.*?)\s*$')
+TITLE_CODE_RE = re.compile(r'\s*\(([A-Za-z]*\d{6,})\)\s*$')
+YEAR_RE = re.compile(r'^(?:19|20)\d{2}$')
+PANDOC_TEX_RE = re.compile(r'-pandoc(\.gu)?\.tex$')
+
+
+def is_mdx(name):
+    return name.endswith('.mdx')
+
+
+def _parse_value(raw):
+    """Scalar or flow-list YAML value as written in the corpus frontmatter."""
+    if not raw:
+        return ''
+    if raw[0] == '[' and raw[-1] == ']':
+        try:
+            return [str(item) for item in json.loads(raw)]
+        except ValueError:
+            return [_parse_value(item.strip()) for item in raw[1:-1].split(',') if item.strip()]
+    if len(raw) > 1 and raw[0] == raw[-1] == '"':
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return raw[1:-1]
+    if len(raw) > 1 and raw[0] == raw[-1] == "'":
+        return raw[1:-1].replace("''", "'")
+    return raw
+
+
+def read_header(path):
+    """
+    Top-level fields of interest from an MDX file's leading --- block.
+
+    Only the header lines are read; nested keys and block scalars are skipped.
+    """
+    header = {}
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        if f.readline().strip() != '---':
+            return header
+        for _ in range(MAX_HEADER_LINES):
+            line = f.readline()
+            if not line or line.strip() == '---':
+                break
+            match = HEADER_LINE_RE.match(line)
+            if match and match.group(1) in HEADER_FIELDS:
+                header[match.group(1)] = _parse_value(match.group(2))
+    return header
+
+
+def derive_metadata(rel, header):
+    """Subject, season, year, language and kind of an MDX file from its path and header."""
+    parts = rel.split('/')
+    name = parts[-1]
+    tags = header.get('tags') if isinstance(header.get('tags'), list) else []
+
+    subject = None
+    for part in [name] + parts[-2::-1]:
+        match = SUBJECT_RE.match(part)
+        if match:
+            subject = match.group(1)
+            break
+    if subject is None:
+        match = TITLE_CODE_RE.search(str(header.get('title', '')))
+        subject = match.group(1) if match else None
+
+    session = SESSION_RE.search(name)
+    if session:
+        season, year = session.group(1).lower(), session.group(2)
+    else:
+        lowered = [str(tag).lower() for tag in tags]
+        season = next((tag for tag in lowered if tag in ('summer', 'winter')), None)
+        year = next((tag for tag in lowered if YEAR_RE.match(tag)), None) if season else None
+
+    if name.startswith('_index.'):
+        kind = 'index'
+    elif SOLUTION_RE.search(name):
+        kind = 'solution'
+    else:
+        kind = 'page'
+
+    return {
+        'title': header.get('title') or None,
+        'description': header.get('description') or None,
+        'date': str(header['date']) if header.get('date') else None,
+        'tags': tags,
+        'subject': subject,
+        'season': season,
+        'year': year,
+        'language': 'gujarati' if name.endswith('.gu.mdx') else 'english',
+        'kind': kind,
+    }
+
+
+def mdx_source_for(path):
+    """MDX a file was generated from: x-solution-pandoc.gu.tex -> x-solution.gu.mdx."""
+    path = Path(path)
+    if path.suffix == '.mdx':
+        return path
+    match = PANDOC_TEX_RE.search(path.name)
+    if match:
+        return path.with_name(f"{path.name[:match.start()]}{match.group(1) or ''}.mdx")
+    if path.suffix == '.tex':
+        return path.with_suffix('.mdx')
+    return path
+
+
+def _index_file(root):
+    cache_dir = get_cache_dir('discovery')
+    if Path(root).resolve() == CONTENT_DIR.resolve():
+        return cache_dir / 'frontmatter.json'
+    return cache_dir / f"frontmatter-{hash_bytes(str(Path(root).resolve()).encode('utf-8'))[:12]}.json"
+
+
+class FrontmatterIndex:
+    """Metadata of every MDX file under one root, with subject names"""
+
+    def __init__(self, root, entries):
+        self.root = Path(root).resolve()
+        self._prefix = str(self.root) + os.sep
+        self.entries = entries  # rel posix path -> derived metadata + signature
+        self.subjects = {}
+        for rel in sorted(entries):
+            entry = entries[rel]
+            if entry['kind'] != 'index' or entry['language'] != 'english' or not entry['title']:
+                continue
+            match = TITLE_CODE_RE.search(entry['title'])
+            if match and match.group(1) == entry['subject'] and entry['subject'] not in self.subjects:
+                self.subjects[entry['subject']] = entry['title'][:match.start()].strip()
+
+    def _rel(self, path):
+        # abspath instead of resolve(): no per-component stat calls
+        path = os.path.abspath(path)
+        if not path.startswith(self._prefix):
+            return None
+        return path[len(self._prefix):].replace(os.sep, '/')
+
+    def subject_name(self, code):
+        """'Data Structures and Algorithms' for '1333203', or None."""
+        return self.subjects.get(code)
+
+    def metadata(self, path):
+        """
+        Metadata of an MDX file (or the TeX generated from it).
+
+        Files outside the index, or changed since the last refresh, are read
+        directly, so the result is always current.
+        """
+        source = mdx_source_for(path)
+        rel = self._rel(source)
+        entry = self.entries.get(rel) if rel else None
+        if entry is not None:
+            try:
+                fresh = file_signature(source) == entry['signature']
+            except OSError:
+                fresh = False
+            if fresh:
+                metadata = {key: value for key, value in entry.items() if key != 'signature'}
+                metadata['subject_name'] = self.subject_name(metadata['subject'])
+                return metadata
+        try:
+            header = read_header(source)
+        except OSError:
+            header = {}
+        metadata = derive_metadata(rel or Path(source).as_posix(), header)
+        metadata['subject_name'] = self.subject_name(metadata['subject'])
+        return metadata
+
+    def select(self, subject=None, language=None, kind=None):
+        """Sorted relative paths of matching MDX files."""
+        return sorted(rel for rel, e in self.entries.items()
+                      if (subject is None or e['subject'] == subject)
+                      and (language is None or e['language'] == language)
+                      and (kind is None or e['kind'] == kind))
+
+
+def refresh_frontmatter_index(root=CONTENT_DIR):
+    """
+    Refresh the on-disk index for root, re-reading only changed files.
+
+    Returns:
+        Tuple of (FrontmatterIndex, stats dict with dirs, listed, files, parsed)
+    """
+    root = Path(root).resolve()
+    index_file = _index_file(root)
+    cached = load_json(index_file)
+    if not cached or cached.get('version') != FRONTMATTER_VERSION:
+        cached = {'dirs': {}, 'files': {}}
+
+    dirs, listed = scan_directories(root, cached['dirs'], is_mdx)
+    stats = {'listed': listed, 'parsed': 0}
+
+    files = {}
+    for rel_dir, listing in dirs.items():
+        for name in listing['files']:
+            rel = f"{rel_dir}/{name}" if rel_dir else name
+            path = root / rel
+            try:
+                signature = file_signature(path)
+                entry = cached['files'].get(rel)
+                if entry is None or entry['signature'] != signature:
+                    entry = {**derive_metadata(rel, read_header(path)), 'signature': signature}
+                    stats['parsed'] += 1
+            except OSError:
+                continue
+            files[rel] = entry
+
+    if dirs != cached['dirs'] or files != cached['files']:
+        save_json(index_file, {'version': FRONTMATTER_VERSION, 'root': str(root), 'dirs': dirs, 'files': files})
+    stats.update(dirs=len(dirs), files=len(files))
+    return FrontmatterIndex(root, files), stats
+
+
+_loaded = {}
+
+
+def load_frontmatter_index(root=CONTENT_DIR):
+    """Refreshed index for root, shared by every caller in the process."""
+    key = str(Path(root).resolve())
+    if key not in _loaded:
+        _loaded[key] = refresh_frontmatter_index(root)[0]
+    return _loaded[key]
+
+
+def source_metadata(path):
+    """Metadata of an MDX file or its generated TeX through the content/ index."""
+    return load_frontmatter_index().metadata(path)
+
+
+def exam_session(path):
+    """(season, year) of an exam paper, e.g. ('summer', '2024'); None for unknown parts."""
+    name = Path(path).name
+    if name.endswith('.mdx') or name.endswith('.tex'):
+        metadata = source_metadata(path)
+        return metadata['season'], metadata['year']
+    session = SESSION_RE.search(name)
+    return (session.group(1).lower(), session.group(2)) if session else (None, None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Refresh and query the MDX frontmatter index')
+    parser.add_argument('root', nargs='?', default=str(CONTENT_DIR), help='Content directory (default: content/)')
+    parser.add_argument('--file', help='Print the metadata of one MDX (or generated TeX) file')
+    parser.add_argument('--subjects', action='store_true', help='List subject codes and names')
+    args = parser.parse_args()
+
+    index, stats = refresh_frontmatter_index(args.root)
+    print(f"🏷️  Indexed {stats['files']} MDX files in {stats['dirs']} directories "
+          f"({stats['listed']} re-listed, {stats['parsed']} re-parsed)")
+
+    if args.file:
+        print(json.dumps(index.metadata(args.file), ensure_ascii=False, indent=2))
+        return
+
+    if args.subjects:
+        for code in sorted(index.subjects):
+            print(f"   {code:<12} {index.subjects[code]}")
+        return
+
+    untitled = index.select()
+    untitled = [rel for rel in untitled if not index.entries[rel]['title']]
+    print(f"   {len(index.subjects)} named subjects, "
+          f"{len(index.select(kind='solution'))} solution files, {len(untitled)} files without a title")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Print-Resolution Image Cache for the MDX -> PDF Pipeline
+XeLaTeX embeds raster figures exactly as they are on disk, so a 4000 px
+screenshot costs the same compile time and PDF size as it does on the web.
+Before Pandoc runs, every local PNG/JPEG/WebP/GIF/BMP referenced by the MDX
+is downsampled to print resolution (at most PRINT_WIDTH_PX wide) and
+re-encoded:
+
+- images with transparency or at most 256 colours (diagrams, screenshots)
+  become palette/optimized PNGs
+- everything else (photos) becomes progressive JPEG at JPEG_QUALITY
+- WebP/GIF/BMP, which XeLaTeX cannot embed, are always converted
+
+Results are stored in .cache/images keyed by the SHA-256 of the source
+bytes and the normalization settings, so each figure is processed once no
+matter how many papers or builds use it. The build links the cached file
+into the working directory as normimg-<hash>.<ext>, next to the Mermaid
+PDFs, and it is cleaned up with them.
+
+Pillow is optional: without it, references are left untouched and the
+originals are embedded as before. SVGs and remote URLs are never changed.
+
+Usage:
+    # Normalize the figures of one file and report the savings
+    python3 image_cache.py <file.mdx>
+
+    # In the pipeline
+    from image_cache import normalize_images
+    content, images = normalize_images(content, source_dir, work_dir)
+"""
+
+import sys
+import os
+import re
+import io
+import shutil
+import argparse
+from pathlib import Path
+from urllib.parse import unquote
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from cache_utils import get_cache_dir, hash_bytes, hash_file, atomic_write_bytes
+from build_metrics import cache_lookup
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; figures are then embedded as-is
+    Image = None
+
+
+# Bump when the output of normalize changes for the same input
+NORMALIZE_VERSION = 1
+# 6 in of A4 text width at 300 dpi
+PRINT_WIDTH_PX = 1800
+JPEG_QUALITY = 85
+PALETTE_COLOURS = 256
+RASTER_SUFFIXES = {'.png', '.jpg', '.jpeg', '.webp', '.gif', '.bmp'}
+# Formats XeLaTeX can embed directly
+EMBEDDABLE_SUFFIXES = {'.png', '.jpg', '.jpeg'}
+GENERATED_PREFIX = 'normimg-'
+
+IMAGE_RE = re.compile(r'(!\[[^\]]*\]\()(<[^>]+>|[^)\s]+)((?:\s+"[^"]*")?\))')
+
+_warned = False
+
+
+def _warn_no_pillow():
+    global _warned
+    if not _warned:
+        print("⚠️  Pillow not installed: figures are embedded at full size (pip install Pillow)")
+        _warned = True
+
+
+def _local_raster(match, source_dir):
+    """Resolved path of a figure reference if it is a local raster file, else None."""
+    raw = match.group(2)
+    ref = unquote(raw[1:-1] if raw.startswith('<') else raw)
+    if '://' in ref or ref.startswith(('data:', '#', '/')) or Path(ref).suffix.lower() not in RASTER_SUFFIXES:
+        return None
+    source = (Path(source_dir) / ref).resolve()
+    return source if source.is_file() else None
+
+
+def _encode(image):
+    """Re-encode a PIL image at print resolution; returns (bytes, suffix)."""
+    if image.width > PRINT_WIDTH_PX:
+        height = max(1, round(image.height * PRINT_WIDTH_PX / image.width))
+        image = image.resize((PRINT_WIDTH_PX, height), Image.LANCZOS)
+
+    has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+    rgb = image.convert('RGBA' if has_alpha else 'RGB')
+    few_colours = rgb.getcolors(PALETTE_COLOURS) is not None
+
+    out = io.BytesIO()
+    if has_alpha or few_colours:
+        if few_colours and not has_alpha:
+            rgb = rgb.quantize(colors=PALETTE_COLOURS)
+        rgb.save(out, 'PNG', optimize=True)
+        return out.getvalue(), '.png'
+    rgb.save(out, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+    return out.getvalue(), '.jpg'
+
+
+def normalized_image(source):
+    """
+    Cached print-resolution version of a raster image.
+
+    Returns:
+        Path of the cached file, or the source itself when normalizing would
+        not help (already small and embeddable) or Pillow is unavailable
+    """
+    source = Path(source)
+    if Image is None:
+        _warn_no_pillow()
+        return source
+
+    cache_dir = get_cache_dir('images')
+    key = hash_bytes(f"{hash_file(source)}:{NORMALIZE_VERSION}:{PRINT_WIDTH_PX}:{JPEG_QUALITY}".encode('utf-8'))
+    for suffix in ('.png', '.jpg'):
+        cached = cache_dir / f"{key}{suffix}"
+        if cached.exists():
+            cache_lookup('images', True)
+            return cached
+    keep_marker = cache_dir / f"{key}.keep"
+    cache_lookup('images', keep_marker.exists())
+    if keep_marker.exists():
+        return source
+
+    try:
+        with Image.open(source) as image:
+            image.load()
+            data, suffix = _encode(image)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Could not normalize {source.name}: {e}")
+        return source
+
+    if source.suffix.lower() in EMBEDDABLE_SUFFIXES and len(data) >= source.stat().st_size:
+        # Re-encoding did not shrink it; remember that and embed the original
+        atomic_write_bytes(keep_marker, b'')
+        return source
+    cached = cache_dir / f"{key}{suffix}"
+    atomic_write_bytes(cached, data)
+    return cached
+
+
+def _link_into(cached, work_dir):
+    target = Path(work_dir) / f"{GENERATED_PREFIX}{cached.stem[:16]}{cached.suffix}"
+    if not target.exists():
+        try:
+            os.link(cached, target)
+        except OSError:
+            shutil.copyfile(cached, target)
+    return target
+
+
+def normalize_images(content, source_dir, work_dir):
+    """
+    Point the MDX's local raster figures at print-resolution copies.
+
+    Returns:
+        Tuple of (new_content, list of (original Path, embedded Path))
+    """
+    replaced = []
+    cache = {}
+
+    def replace(match):
+        source = _local_raster(match, source_dir)
+        if source is None:
+            return match.group(0)
+        if source not in cache:
+            normalized = normalized_image(source)
+            cache[source] = _link_into(normalized, work_dir) if normalized != source else None
+        target = cache[source]
+        if target is None:
+            return match.group(0)
+        replaced.append((source, target))
+        return f"{match.group(1)}{target.name}{match.group(3)}"
+
+    return IMAGE_RE.sub(replace, content), replaced
+
+
+def remove_normalized_images(work_dir):
+    """Remove the linked figures once the PDF embedding them is built."""
+    for image in Path(work_dir).glob(f'{GENERATED_PREFIX}*'):
+        image.unlink()
+        print(f"🗑️  Removed: {image.name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Normalize the raster figures referenced by MDX files')
+    parser.add_argument('files', nargs='+', help='MDX files')
+    args = parser.parse_args()
+
+    if Image is None:
+        _warn_no_pillow()
+        sys.exit(1)
+
+    before = after = count = 0
+    for mdx in map(Path, args.files):
+        with open(mdx, 'r', encoding='utf-8') as f:
+            content = f.read()
+        for match in IMAGE_RE.finditer(content):
+            source = _local_raster(match, mdx.parent)
+            if source is None:
+                continue
+            normalized = normalized_image(source)
+            count += 1
+            before += source.stat().st_size
+            after += normalized.stat().st_size
+            print(f"   {source.name}: {source.stat().st_size / 1024:.0f} KiB -> "
+                  f"{normalized.stat().st_size / 1024:.0f} KiB")
+
+    if count:
+        print(f"🖼️  {count} figure(s): {before / 1024:.0f} KiB -> {after / 1024:.0f} KiB "
+              f"({100 * (1 - after / before):.0f}% smaller)")
+    else:
+        print("🖼️  No local raster figures referenced")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Admission Control, Timeouts and Resource Limits for Conversion Jobs
+Every MDX -> PDF build runs pandoc, mmdc and xelatex as child processes.
+Without limits, one pathological document can hang its request and a burst
+of downloads can run more XeLaTeX processes than the machine has RAM for.
+
+- Admission: at most admission_slots() builds run at once on a machine,
+  across all processes and threads (CLI runs, batch workers, download
+  requests, the XeLaTeX stage of pipeline_orchestrator.py). The
+  count comes from the CPU count and total RAM / JOB_MEMORY_MB. Slots are
+  lock files in .cache/slots held with flock, so a crashed build frees its
+  slot. A caller either waits for a slot or, given a wait limit, gets
+  BusyError ("busy, retry"; exit code 75) instead of queueing without bound.
+- Timeouts: each stage has a wall-clock limit (STAGE_TIMEOUTS). On expiry
+  the command's whole process group is killed, including the headless
+  browser that mmdc starts.
+- Memory and CPU: xelatex and qpdf run under RLIMIT_AS/RLIMIT_CPU, set on
+  the started child with prlimit(2) rather than in a preexec_fn, which is
+  not safe in the threaded pipeline (Linux only; elsewhere only timeouts
+  apply). Pandoc gets its heap cap through its own runtime (+RTS -M),
+  because the Haskell runtime reserves far more address space than it uses.
+  Node/Chromium (mmdc) does the same, so it only gets the CPU and time limits.
+
+Limits can be changed with environment variables: STUDY_MAX_JOBS,
+STUDY_JOB_MEMORY_MB and STUDY_TIMEOUT_<STAGE> (e.g. STUDY_TIMEOUT_XELATEX).
+
+Usage:
+    # Show the limits on this machine
+    python3 job_limits.py
+
+    # In the build pipeline
+    from job_limits import admission, BusyError, run_limited
+"""
+
+import sys
+import os
+import time
+import random
+import signal
+import threading
+import subprocess
+import contextlib
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from cache_utils import get_cache_dir
+
+try:
+    import fcntl
+    import resource
+except ImportError:  # not on POSIX: builds run without slots or rlimits
+    fcntl = resource = None
+
+
+# sysexits.h EX_TEMPFAIL: the caller should retry later
+EX_TEMPFAIL = 75
+# Peak RSS budget for one build (XeLaTeX with the Gujarati fonts stays well below)
+JOB_MEMORY_MB = int(os.environ.get('STUDY_JOB_MEMORY_MB', 2048))
+# Wall-clock seconds per command of each stage
+STAGE_TIMEOUTS = {
+    'mermaid': 90,
+    'pandoc': 120,
+    'xelatex': 300,
+    'optimize': 180,
+}
+ADMISSION_POLL = 0.2
+# Commands whose runtime reserves much more address space than it uses
+NO_ADDRESS_LIMIT = {'npx', 'node', 'mmdc', 'pandoc'}
+
+# Per thread: (pid, lock file) of the slot it holds; forked workers do not share it
+_held = threading.local()
+
+
+class BusyError(RuntimeError):
+    """No build slot became free within the caller's wait limit"""
+
+
+def stage_timeout(stage):
+    """Seconds allowed per command of a stage, or None for no limit."""
+    if stage is None:
+        return None
+    override = os.environ.get(f"STUDY_TIMEOUT_{stage.upper()}")
+    if override:
+        return float(override) or None
+    return STAGE_TIMEOUTS.get(stage)
+
+
+def total_memory_mb():
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') // (1 << 20)
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def admission_slots():
+    """Concurrent builds allowed on this machine."""
+    if os.environ.get('STUDY_MAX_JOBS', '').isdigit():
+        return max(1, int(os.environ['STUDY_MAX_JOBS']))
+    slots = os.cpu_count() or 1
+    memory = total_memory_mb()
+    if memory:
+        slots = min(slots, memory // JOB_MEMORY_MB)
+    return max(1, slots)
+
+
+@contextlib.contextmanager
+def admission(wait=None):
+    """
+    Hold one of the machine's build slots for the duration of the block.
+
+    Args:
+        wait: Seconds to wait for a free slot before raising BusyError;
+            None waits as long as it takes
+    """
+    held = getattr(_held, 'slot', None)
+    if fcntl is None or (held is not None and held[0] == os.getpid()):
+        # Nested builds (a volume converting its papers) share the outer slot
+        yield
+        return
+
+    slot_dir = get_cache_dir('slots')
+    slots = admission_slots()
+    deadline = None if wait is None else time.monotonic() + wait
+    while True:
+        # Start at a random slot so waiting processes do not all contend for slot 0
+        start = random.randrange(slots)
+        for i in range(slots):
+            handle = open(slot_dir / f"slot-{(start + i) % slots}.lock", 'a')
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                handle.close()
+                continue
+            _held.slot = (os.getpid(), handle)
+            try:
+                yield
+            finally:
+                _held.slot = None
+                fcntl.flock(handle, fcntl.LOCK_UN)
+                handle.close()
+            return
+        if deadline is not None and time.monotonic() >= deadline:
+            raise BusyError(f"all {slots} build slot(s) busy, retry later")
+        time.sleep(ADMISSION_POLL)
+
+
+def busy_slots():
+    """(slots held by running builds, slots on this machine)."""
+    slots = admission_slots()
+    if fcntl is None:
+        return 0, slots
+    slot_dir = get_cache_dir('slots')
+    busy = 0
+    for i in range(slots):
+        path = slot_dir / f"slot-{i}.lock"
+        if not path.exists():
+            continue
+        with open(path, 'a') as handle:
+            try:
+                # A shared lock conflicts only with a build's exclusive one
+                fcntl.flock(handle, fcntl.LOCK_SH | fcntl.LOCK_NB)
+            except OSError:
+                busy += 1
+    return busy, slots
+
+
+def _rlimits(memory_mb, cpu_seconds):
+    limits = []
+    if memory_mb:
+        limit = memory_mb << 20
+        limits.append((resource.RLIMIT_AS, (limit, limit)))
+    if cpu_seconds:
+        soft = max(1, int(cpu_seconds))
+        limits.append((resource.RLIMIT_CPU, (soft, soft + 5)))
+    return limits
+
+
+def limited_command(cmd, stage=None):
+    """
+    Command, timeout and rlimits to run one pipeline command with limits.
+
+    Returns:
+        Tuple of (cmd, timeout seconds or None, [(resource, (soft, hard))])
+    """
+    timeout = stage_timeout(stage)
+    program = os.path.basename(cmd[0])
+    if program == 'pandoc':
+        cmd = [cmd[0], '+RTS', f"-M{JOB_MEMORY_MB}m", '-RTS', *cmd[1:]]
+    if resource is None or not hasattr(resource, 'prlimit'):
+        return cmd, timeout, []
+    memory = None if program in NO_ADDRESS_LIMIT else JOB_MEMORY_MB
+    return cmd, timeout, _rlimits(memory, timeout)
+
+
+def kill_process_group(proc):
+    """Kill a command started with start_new_session=True and everything it spawned."""
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError, AttributeError):
+        proc.kill()
+
+
+def run_limited(cmd, stage=None, **popen_args):
+    """
+    Run one pipeline command under its stage's timeout and rlimits.
+
+    The command gets its own process group; popen_args go to subprocess.Popen
+    (capture_output=True is accepted as with subprocess.run).
+
+    Returns:
+        subprocess.CompletedProcess
+
+    Raises:
+        subprocess.TimeoutExpired: after the command's process group was killed
+    """
+    cmd, timeout, limits = limited_command(cmd, stage)
+    if popen_args.pop('capture_output', False):
+        popen_args['stdout'] = popen_args['stderr'] = subprocess.PIPE
+    proc = subprocess.Popen(cmd, start_new_session=True, **popen_args)
+    for limit, values in limits:
+        try:
+            resource.prlimit(proc.pid, limit, values)
+        except (ProcessLookupError, PermissionError):
+            break  # already exited
+    try:
+        stdout, stderr = proc.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        kill_process_group(proc)
+        proc.communicate()
+        raise
+    return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+
+
+def main():
+    memory = total_memory_mb()
+    print(f"🚦 Build slots: {admission_slots()} (CPUs: {os.cpu_count()}, RAM: {memory or '?'} MiB, "
+          f"{JOB_MEMORY_MB} MiB per build)")
+    for stage in STAGE_TIMEOUTS:
+        print(f"   {stage:9} timeout {stage_timeout(stage)}s")
+    if fcntl is None:
+        print("⚠️  No fcntl/resource on this platform: slots and rlimits are disabled")
+
+
+if __name__ == '__main__':
+    main()
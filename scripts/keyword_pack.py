@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Compiled Keyword Packs
+Loads per-subject keyword data files (<code>-keywords.json) and compiles
+them once into a binary pack: pre-normalized terms, word -> keyword counts,
+precompiled regex patterns and Aho-Corasick phrase matchers.
+
+Packs are cached under .cache/keywords and loaded lazily on first use.
+The data file's mtime/size is checked first, and its content hash only when
+those change, so generator startup stays flat as dictionaries grow.
+
+Data file layout:
+    {
+      "normalizer": "keep-symbols",
+      "keywords": {"<unit>": {"english": [...], "gujarati": [...]}},
+      "patterns": {"<unit>": {"english": [regex, ...], ...}},
+      "phrases":  {"<name>": {"<unit>": [...]}}
+    }
+
+Usage:
+    python3 keyword_pack.py <keywords.json> ["text to score"]
+"""
+
+import sys
+import os
+import re
+import pickle
+import argparse
+import unicodedata
+from collections import Counter, deque
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from cache_utils import get_cache_dir, hash_file, file_signature, atomic_write_bytes, load_json
+
+
+# Bump when normalizers or the compiled layout change
+PACK_VERSION = 1
+
+
+def normalize_basic(text):
+    """Lowercase, NFKD, punctuation -> space (SE/syllabus generators)."""
+    text = unicodedata.normalize('NFKD', text.lower())
+    text = re.sub(r'\s+', ' ', text).strip()
+    return re.sub(r'[^\w\s]', ' ', text)
+
+
+def normalize_keep_symbols(text):
+    """Lowercase, keep - . ( ) / then NFKD (WSN generator)."""
+    text = re.sub(r'\s+', ' ', text.lower()).strip()
+    text = re.sub(r'[^\w\s\-\.\(\)\/]', ' ', text)
+    return unicodedata.normalize('NFKD', text)
+
+
+NORMALIZERS = {
+    'basic': normalize_basic,
+    'keep-symbols': normalize_keep_symbols,
+    'lower': str.lower,
+}
+
+
+class PhraseMatcher:
+    """Aho-Corasick automaton: finds which of many phrases occur in a text in one scan"""
+
+    def __init__(self, phrases):
+        self.phrases = list(phrases)
+        goto = [{}]
+        output = [[]]
+        for pid, phrase in enumerate(self.phrases):
+            if not phrase:
+                continue
+            node = 0
+            for ch in phrase:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    output.append([])
+                node = nxt
+            output[node].append(pid)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                queue.append(child)
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[child] = goto[f].get(ch, 0)
+                output[child] = output[child] + output[fail[child]]
+
+        self._goto = goto
+        self._fail = fail
+        self._output = output
+
+    def tables(self):
+        """The automaton's goto/fail/output tables, JSON-serializable."""
+        return {'goto': self._goto, 'fail': self._fail, 'output': self._output}
+
+    @classmethod
+    def from_tables(cls, phrases, tables):
+        """Rebuild a matcher from tables() output without recompiling the automaton."""
+        matcher = cls.__new__(cls)
+        matcher.phrases = list(phrases)
+        matcher._goto = tables['goto']
+        matcher._fail = tables['fail']
+        matcher._output = tables['output']
+        return matcher
+
+    def found(self, text):
+        """IDs of phrases occurring anywhere in text (empty phrases never match)."""
+        goto, fail, output = self._goto, self._fail, self._output
+        hits = set()
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if output[node]:
+                hits.update(output[node])
+        return hits
+
+    def found_split(self, text, boundary):
+        """
+        Like found() for text, also reporting which phrases end within
+        text[:boundary]. Lets callers scan concatenated fields (e.g. question
+        + answer) once and still weight hits per field.
+
+        Returns:
+            Tuple of (all phrase IDs, phrase IDs ending before boundary)
+        """
+        goto, fail, output = self._goto, self._fail, self._output
+        hits = set()
+        prefix_hits = set()
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if output[node]:
+                hits.update(output[node])
+                if i < boundary:
+                    prefix_hits.update(output[node])
+        return hits, prefix_hits
+
+    def count(self, text):
+        """Number of phrases (with repeats in the phrase list) that occur in text."""
+        return len(self.found(text))
+
+
+class CompiledTerms:
+    """Normalized keywords of one unit/language with their match helpers"""
+
+    def __init__(self, keywords, normalize):
+        self.keywords = list(keywords)
+        self.normalized = [normalize(k) for k in self.keywords]
+        self.matcher = PhraseMatcher(self.normalized)
+        # word -> number of keywords containing it, for partial word scoring
+        self.word_counts = Counter(w for n in self.normalized for w in set(n.split()))
+
+    def __len__(self):
+        return len(self.keywords)
+
+
+def compile_pack(data):
+    normalizer = data.get('normalizer', 'basic')
+    normalize = NORMALIZERS[normalizer]
+
+    terms = {}
+    unions = {}
+    for unit, languages in data.get('keywords', {}).items():
+        terms[unit] = {lang: CompiledTerms(words, normalize) for lang, words in languages.items()}
+        union = set()
+        for words in languages.values():
+            union.update(words)
+        lowered = [w.lower() for w in sorted(union)]
+        unions[unit] = {'lower_set': frozenset(lowered), 'matcher': PhraseMatcher(lowered)}
+
+    patterns = {
+        unit: {lang: [re.compile(p, re.IGNORECASE) for p in pats] for lang, pats in languages.items()}
+        for unit, languages in data.get('patterns', {}).items()
+    }
+
+    phrases = {
+        name: {key: PhraseMatcher([p.lower() for p in values]) for key, values in groups.items()}
+        for name, groups in data.get('phrases', {}).items()
+    }
+
+    return {
+        'version': PACK_VERSION,
+        'normalizer': normalizer,
+        'terms': terms,
+        'unions': unions,
+        'patterns': patterns,
+        'phrases': phrases,
+    }
+
+
+class KeywordPack:
+    """Lazily loaded, compiled view of a <code>-keywords.json data file"""
+
+    def __init__(self, source_path):
+        self.source_path = Path(source_path)
+        self._pack = None
+
+    @property
+    def pack(self):
+        if self._pack is None:
+            self._pack = self._load()
+        return self._pack
+
+    def _load(self):
+        cache_file = get_cache_dir('keywords') / f"{self.source_path.stem}.pack"
+        signature = file_signature(self.source_path)
+        header = None
+        if cache_file.exists():
+            try:
+                with open(cache_file, 'rb') as f:
+                    header = pickle.load(f)
+                    if header.get('version') == PACK_VERSION and header.get('signature') == signature:
+                        return pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+                header = None
+
+        digest = hash_file(self.source_path)
+        if header and header.get('version') == PACK_VERSION and header.get('hash') == digest:
+            # Touched but unchanged: keep the compiled body, refresh the signature
+            with open(cache_file, 'rb') as f:
+                pickle.load(f)
+                pack = pickle.load(f)
+        else:
+            data = load_json(self.source_path)
+            if data is None:
+                raise ValueError(f"Could not read keyword data: {self.source_path}")
+            pack = compile_pack(data)
+
+        header = {'version': PACK_VERSION, 'signature': signature, 'hash': digest}
+        atomic_write_bytes(cache_file, pickle.dumps(header, protocol=pickle.HIGHEST_PROTOCOL)
+                           + pickle.dumps(pack, protocol=pickle.HIGHEST_PROTOCOL))
+        return pack
+
+    def normalize(self, text):
+        return NORMALIZERS[self.pack['normalizer']](text)
+
+    def units(self):
+        return list(self.pack['terms'])
+
+    def terms(self, unit, language):
+        """CompiledTerms for a unit/language, or None."""
+        return self.pack['terms'].get(unit, {}).get(language)
+
+    def union(self, unit):
+        """All-language keywords of a unit: {'lower_set', 'matcher'}."""
+        return self.pack['unions'].get(unit)
+
+    def patterns(self, unit, language):
+        return self.pack['patterns'].get(unit, {}).get(language, [])
+
+    def phrases(self, name, key):
+        """PhraseMatcher for a named phrase group, or None."""
+        return self.pack['phrases'].get(name, {}).get(key)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile a keyword pack and optionally score a text against it')
+    parser.add_argument('source', help='Path to <code>-keywords.json')
+    parser.add_argument('text', nargs='?', help='Text to match')
+    args = parser.parse_args()
+
+    pack = KeywordPack(args.source)
+    total = sum(len(t) for langs in pack.pack['terms'].values() for t in langs.values())
+    print(f"✅ Loaded pack for {len(pack.units())} units, {total} keywords ({pack.pack['normalizer']} normalizer)")
+
+    if args.text:
+        normalized = pack.normalize(args.text)
+        for unit in pack.units():
+            hits = {lang: sorted(terms.keywords[i] for i in terms.matcher.found(normalized))
+                    for lang, terms in pack.pack['terms'][unit].items()}
+            print(f"   {unit}: {hits}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Unit Mapping Evaluation Harness
+Scores question -> unit mappers against a hand-labeled gold file per subject
+and reports accuracy, per-unit precision/recall/F1 and a confusion matrix,
+together with throughput (questions/second) and peak memory use.
+
+The generators' own "mapping accuracy" only counts questions that were not
+left as "Unknown"; this harness measures whether the unit is actually right,
+so a faster mapper can be checked to be at least as accurate before it is
+adopted.
+
+Gold files live next to the subject's question bank as <code>-unit-gold.json:
+    {
+      "subject": "4353201",
+      "questions": [
+        {"id": "...", "text": "...", "language": "english", "marks": 3,
+         "unit": "2", "verified": true}
+      ]
+    }
+Units may be written as "Unit-II", "II" or "2". Only entries marked
+"verified" are scored unless --include-unverified is given. A mapper that
+raises on more than MAX_ERROR_RATE of the questions is reported as invalid
+(exit code 1) instead of being scored.
+
+Mappers:
+    bank                 Units already stored in the subject's question bank
+    generator            The subject's *-question-bank-generator.py
+                         (map_question_to_unit)
+    path/to/file.py:fn   fn(subject_dir) returns a callable that takes a gold
+                         question dict and returns a unit (or None)
+
+Usage:
+    # Seed a gold file from the current bank for hand labeling
+    python3 mapping_eval.py sem-5/4353201-wsn --init
+
+    # Compare the stored bank against a re-run of the generator
+    python3 mapping_eval.py sem-5/4353201-wsn --mapper bank --mapper generator
+
+    # Fail if a candidate mapper is less accurate than the first one
+    python3 mapping_eval.py sem-5/4353201-wsn --mapper generator --mapper my_mapper.py:make_mapper --require-no-regression
+"""
+
+import sys
+import os
+import io
+import time
+import argparse
+import tracemalloc
+import contextlib
+import importlib.util
+from collections import Counter
+from dataclasses import dataclass, field, fields, MISSING
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from cache_utils import load_json, save_json
+from question_bank_corpus import STUDY_MATERIALS_DIR, find_question_banks, load_bank, subject_code_for
+from syllabus_index import unit_key
+
+
+UNKNOWN = 'Unknown'
+GOLD_SUFFIX = '-unit-gold.json'
+# Generator methods that load state map_question_to_unit() depends on, run in order if present
+GENERATOR_SETUP_HOOKS = ('load_syllabus',)
+# Share of questions a mapper may fail on before its scores are withheld
+MAX_ERROR_RATE = 0.05
+
+
+@dataclass
+class MappingReport:
+    """Evaluation of one mapper over one gold set"""
+    mapper: str
+    total: int = 0
+    correct: int = 0
+    predicted: int = 0  # questions the mapper assigned to any unit
+    seconds: float = 0.0
+    peak_memory: int = 0
+    confusion: Dict[str, Counter] = field(default_factory=dict)  # gold unit -> predicted unit counts
+    errors: int = 0
+    first_error: str = ''
+
+    @property
+    def valid(self) -> bool:
+        """False when too many questions raised for the scores to mean anything."""
+        return self.errors <= MAX_ERROR_RATE * self.total
+
+    @property
+    def accuracy(self) -> float:
+        return self.correct / self.total if self.total else 0.0
+
+    @property
+    def coverage(self) -> float:
+        return self.predicted / self.total if self.total else 0.0
+
+    @property
+    def questions_per_second(self) -> float:
+        return self.total / self.seconds if self.seconds else 0.0
+
+    def unit_metrics(self, units: List[str]) -> Dict[str, Dict[str, float]]:
+        """Per-unit precision, recall, F1 and support."""
+        metrics = {}
+        for unit in units:
+            tp = self.confusion.get(unit, Counter()).get(unit, 0)
+            support = sum(self.confusion.get(unit, Counter()).values())
+            predicted = sum(row.get(unit, 0) for row in self.confusion.values())
+            precision = tp / predicted if predicted else 0.0
+            recall = tp / support if support else 0.0
+            f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+            metrics[unit] = {'precision': precision, 'recall': recall, 'f1': f1, 'support': support}
+        return metrics
+
+
+def canonical_unit(unit) -> Optional[str]:
+    """Canonical unit key ('Unit-II' -> '2'), or None for unmapped answers."""
+    if unit is None or str(unit).strip() in ('', UNKNOWN, 'unknown', 'None'):
+        return None
+    return unit_key(unit)
+
+
+def gold_file_for(subject_dir: Path) -> Path:
+    subject_dir = Path(subject_dir)
+    return subject_dir / f"{subject_dir.name.split('-')[0]}{GOLD_SUFFIX}"
+
+
+def _subject_bank(subject_dir: Path) -> Optional[Path]:
+    """The subject's primary final bank (<code>-question-bank-final.json when present)."""
+    banks = find_question_banks(subject_dir)
+    code = subject_dir.name.split('-')[0]
+    for bank in banks:
+        if bank.name == f"{code}-question-bank-final.json":
+            return bank
+    return banks[0] if banks else None
+
+
+def init_gold_file(subject_dir: Path, gold_file: Path) -> int:
+    """
+    Seed a gold file from the subject's bank. Units are pre-filled with the
+    bank's current assignment and every entry starts unverified, so labelers
+    only correct and tick entries instead of typing them.
+    """
+    bank = _subject_bank(subject_dir)
+    if bank is None:
+        raise FileNotFoundError(f"No question bank found under {subject_dir}")
+    _, records = load_bank(bank)
+    questions = [{
+        'id': record.qid,
+        'text': record.text,
+        'language': record.language,
+        'marks': record.marks,
+        'unit': canonical_unit(record.unit) or '',
+        'verified': False,
+    } for record in records]
+    save_json(gold_file, {'subject': subject_code_for(bank), 'source_bank': bank.name, 'questions': questions}, indent=2)
+    return len(questions)
+
+
+def load_gold(gold_file: Path, include_unverified=False) -> List[Dict]:
+    data = load_json(gold_file)
+    if data is None:
+        raise ValueError(f"Could not read gold file: {gold_file}")
+    gold = []
+    for entry in data.get('questions', []):
+        unit = canonical_unit(entry.get('unit'))
+        if unit is None or not (entry.get('verified') or include_unverified):
+            continue
+        gold.append({**entry, 'unit': unit})
+    return gold
+
+
+def bank_mapper(subject_dir: Path):
+    """Look up the unit the subject's question bank already assigns."""
+    bank = _subject_bank(subject_dir)
+    if bank is None:
+        raise FileNotFoundError(f"No question bank found under {subject_dir}")
+    _, records = load_bank(bank)
+    by_id = {record.qid: record.unit for record in records}
+    by_text = {(record.language, record.text): record.unit for record in records}
+
+    def map_question(question):
+        if question.get('id') in by_id:
+            return by_id[question['id']]
+        return by_text.get((question.get('language'), question.get('text', '').strip()))
+    return map_question
+
+
+def _load_module(path: Path, name: str):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def generator_mapper(subject_dir: Path):
+    """Run the subject generator's map_question_to_unit() on each gold question."""
+    generators = sorted(Path(subject_dir).glob('*-question-bank-generator.py'))
+    if not generators:
+        raise FileNotFoundError(f"No *-question-bank-generator.py under {subject_dir}")
+    module = _load_module(generators[0], 'mapping_eval_generator')
+    generator_class = next((obj for obj in vars(module).values()
+                            if isinstance(obj, type) and hasattr(obj, 'map_question_to_unit')), None)
+    question_class = getattr(module, 'Question', None)
+    if generator_class is None or question_class is None:
+        raise ValueError(f"{generators[0].name} has no generator with map_question_to_unit()")
+
+    generator = generator_class(str(subject_dir))
+    for hook in GENERATOR_SETUP_HOOKS:
+        if callable(getattr(generator, hook, None)):
+            getattr(generator, hook)()
+    # Fill every required Question field so any generator's dataclass can be built
+    defaults = {f.name: '' for f in fields(question_class)
+                if f.default is MISSING and f.default_factory is MISSING}
+
+    def map_question(question):
+        values = {**defaults, 'text': question['text'], 'language': question.get('language', 'english'),
+                  'marks': question.get('marks', 0), 'id': question.get('id', '')}
+        unit, _ = generator.map_question_to_unit(question_class(**values))
+        return unit
+    return map_question
+
+
+BUILTIN_MAPPERS = {
+    'bank': bank_mapper,
+    'generator': generator_mapper,
+}
+
+
+def load_mapper(spec: str, subject_dir: Path):
+    """Resolve a --mapper argument into a callable(question) -> unit."""
+    if spec in BUILTIN_MAPPERS:
+        return BUILTIN_MAPPERS[spec](subject_dir)
+    path, _, factory = spec.partition(':')
+    module = _load_module(Path(path).resolve(), f"mapping_eval_{Path(path).stem.replace('-', '_')}")
+    return getattr(module, factory or 'make_mapper')(subject_dir)
+
+
+def evaluate(name: str, mapper, gold: List[Dict], repeat=1) -> MappingReport:
+    """
+    Run mapper over the gold set. Timing covers only the mapping calls and is
+    averaged over `repeat` passes; peak memory is traced on the first pass.
+    """
+    report = MappingReport(mapper=name)
+    predictions = []
+
+    tracemalloc.start()
+    # Generators print progress; keep it out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for question in gold:
+            try:
+                predictions.append(canonical_unit(mapper(question)))
+            except Exception as e:
+                report.errors += 1
+                report.first_error = report.first_error or f"{type(e).__name__}: {e}"
+                predictions.append(None)
+        elapsed = time.perf_counter() - start
+        _, report.peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        for _ in range(repeat - 1):
+            start = time.perf_counter()
+            for question in gold:
+                try:
+                    mapper(question)
+                except Exception:
+                    pass
+            elapsed += time.perf_counter() - start
+    report.seconds = elapsed / repeat
+
+    for question, predicted in zip(gold, predictions):
+        report.total += 1
+        report.predicted += predicted is not None
+        report.correct += predicted == question['unit']
+        report.confusion.setdefault(question['unit'], Counter())[predicted or UNKNOWN] += 1
+    return report
+
+
+def _unit_sort_key(unit):
+    return (unit == UNKNOWN, len(unit), unit)
+
+
+def print_report(report: MappingReport, units: List[str], show_confusion=True):
+    print(f"\n🔍 {report.mapper}")
+    if not report.valid:
+        print(f"   ❌ INVALID: {report.errors}/{report.total} questions raised errors "
+              f"(first: {report.first_error}); no scores reported")
+        return
+    print(f"   ✅ Accuracy: {report.accuracy * 100:.1f}% ({report.correct}/{report.total})"
+          f"   📌 Coverage: {report.coverage * 100:.1f}%")
+    print(f"   ⚡ {report.questions_per_second:,.0f} questions/sec"
+          f"   💾 Peak memory: {report.peak_memory / 1024:,.0f} KiB")
+    if report.errors:
+        print(f"   ⚠️  {report.errors} questions raised errors (first: {report.first_error})")
+
+    print(f"   {'Unit':<8} {'Precision':>9} {'Recall':>8} {'F1':>6} {'Support':>8}")
+    for unit, m in report.unit_metrics(units).items():
+        print(f"   {unit:<8} {m['precision']:>9.2f} {m['recall']:>8.2f} {m['f1']:>6.2f} {m['support']:>8}")
+
+    if show_confusion:
+        columns = units + [UNKNOWN]
+        print(f"\n   Confusion (rows = gold, columns = predicted)")
+        print('   ' + ' ' * 8 + ''.join(f"{c:>8}" for c in columns))
+        for unit in units:
+            row = report.confusion.get(unit, Counter())
+            print(f"   {unit:<8}" + ''.join(f"{row.get(c, 0):>8}" for c in columns))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Evaluate question -> unit mappers against hand-labeled gold data')
+    parser.add_argument('subject_dir', help='Subject directory (absolute or relative to study materials)')
+    parser.add_argument('--gold', help='Gold file (default: <subject_dir>/<code>-unit-gold.json)')
+    parser.add_argument('--init', action='store_true', help='Seed the gold file from the current question bank')
+    parser.add_argument('--mapper', action='append', help='bank, generator or path.py:factory (repeatable)')
+    parser.add_argument('--repeat', type=int, default=1, help='Timing passes per mapper')
+    parser.add_argument('--include-unverified', action='store_true', help='Also score unverified gold entries')
+    parser.add_argument('--no-confusion', action='store_true', help='Skip the confusion matrices')
+    parser.add_argument('--require-no-regression', action='store_true',
+                        help='Exit 1 if any mapper is less accurate than the first')
+    args = parser.parse_args()
+
+    subject_dir = Path(args.subject_dir)
+    if not subject_dir.is_dir():
+        matches = sorted(STUDY_MATERIALS_DIR.rglob(args.subject_dir))
+        subject_dir = matches[0] if matches else subject_dir
+    if not subject_dir.is_dir():
+        print(f"❌ Subject directory not found: {args.subject_dir}")
+        return 1
+    subject_dir = subject_dir.resolve()
+    gold_file = Path(args.gold) if args.gold else gold_file_for(subject_dir)
+
+    if args.init:
+        if gold_file.exists():
+            print(f"❌ {gold_file.name} already exists; refusing to overwrite labels")
+            return 1
+        count = init_gold_file(subject_dir, gold_file)
+        print(f"✅ Seeded {count} unverified questions into {gold_file}")
+        return 0
+
+    gold = load_gold(gold_file, args.include_unverified)
+    if not gold:
+        print(f"❌ No labeled questions in {gold_file} (mark entries \"verified\": true or use --include-unverified)")
+        return 1
+    units = sorted({q['unit'] for q in gold}, key=_unit_sort_key)
+    print(f"📋 {len(gold)} gold questions across {len(units)} units ({gold_file.name})")
+
+    reports = []
+    for spec in args.mapper or ['bank']:
+        with contextlib.redirect_stdout(io.StringIO()):
+            mapper = load_mapper(spec, subject_dir)
+        report = evaluate(spec, mapper, gold, max(1, args.repeat))
+        print_report(report, units, not args.no_confusion)
+        reports.append(report)
+
+    invalid = [r for r in reports if not r.valid]
+    reports = [r for r in reports if r.valid]
+    if len(reports) > 1:
+        print(f"\n📊 {'Mapper':<30} {'Accuracy':>9} {'Macro F1':>9} {'q/sec':>10} {'Peak KiB':>10}")
+        for report in reports:
+            metrics = report.unit_metrics(units)
+            macro_f1 = sum(m['f1'] for m in metrics.values()) / len(metrics)
+            print(f"   {report.mapper:<30} {report.accuracy * 100:>8.1f}% {macro_f1:>9.3f} "
+                  f"{report.questions_per_second:>10,.0f} {report.peak_memory / 1024:>10,.0f}")
+
+    if invalid:
+        print(f"\n❌ Not scored: {', '.join(r.mapper for r in invalid)} (too many errors)")
+        return 1
+
+    if args.require_no_regression:
+        baseline = reports[0]
+        regressions = [r for r in reports[1:] if r.correct < baseline.correct]
+        for report in regressions:
+            print(f"❌ {report.mapper} is less accurate than {baseline.mapper} "
+                  f"({report.accuracy * 100:.1f}% < {baseline.accuracy * 100:.1f}%)")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Mock Exam Paper Assembler
+Builds a practice paper for a subject from its question banks. A blueprint
+says how many questions of which marks to take from which unit; questions
+are drawn at random (reproducibly, with --seed) from the subject's
+*-question-bank-final.json files, and each one's LaTeX, and optionally its
+solution's, is taken from the per-question fragment cache that
+convert_mdx_to_pdf fills after refactoring a paper (question_fragments.py).
+
+Assembling a paper therefore never runs Pandoc: only papers that were never
+converted, or changed since, are converted to LaTeX once to fill the cache.
+Bank questions are matched to their solution paper by source file, then by
+question number or, when the bank has none, by question text.
+
+Blueprint format: comma-separated unit:marks:count entries, with * for any
+unit, or a JSON file with a list of {"unit", "marks", "count"} objects.
+
+Usage:
+    # Two 3-mark and one 4-mark question from unit 1, two 7-mark from any unit
+    python3 mock_paper.py <subject_dir> --blueprint "1:3:2,1:4:1,*:7:2"
+
+    # Gujarati, with an answer key, same questions as a previous run
+    python3 mock_paper.py <subject_dir> --blueprint blueprint.json --language gujarati --solutions --seed 42
+"""
+
+import sys
+import os
+import re
+import json
+import random
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from content_snapshot import read_text
+from frontmatter_index import load_frontmatter_index
+from question_bank_corpus import find_question_banks, load_bank, parse_solution_sections, subject_code_for
+from question_fragments import load_fragments
+from syllabus_index import normalize_text, unit_key
+from convert_mdx_to_pdf import find_solution_files, process_files, remove_mermaid_pdfs
+from image_cache import remove_normalized_images
+from subject_volume import compile_volume, latex_escape, materialize_assets, merged_preamble, prefix_labels
+
+
+ANY_UNIT = '*'
+# Enough of the question to tell questions apart, short enough to survive small edits
+MATCH_PREFIX = 60
+LABELS = {
+    'english': {'question': 'Q.%d [%d marks]', 'solutions': 'Solutions', 'answer': 'Q.%d', 'source': 'Source'},
+    'gujarati': {'question': 'પ્રશ્ન %d [%d ગુણ]', 'solutions': 'જવાબ', 'answer': 'પ્રશ્ન %d', 'source': 'સ્ત્રોત'},
+}
+
+
+def parse_blueprint(spec):
+    """[(unit key or '*', marks, count)] from an inline spec or a JSON file."""
+    if os.path.isfile(spec):
+        with open(spec, 'r', encoding='utf-8') as f:
+            rows = [(str(r.get('unit', ANY_UNIT)), r['marks'], r.get('count', 1)) for r in json.load(f)]
+    else:
+        rows = []
+        for entry in filter(None, (e.strip() for e in spec.split(','))):
+            parts = entry.split(':')
+            if len(parts) != 3:
+                raise ValueError(f"blueprint entry '{entry}' is not unit:marks:count")
+            rows.append(tuple(parts))
+    return [(unit if unit == ANY_UNIT else unit_key(unit), int(marks), int(count)) for unit, marks, count in rows]
+
+
+def _text_key(text):
+    return normalize_text(re.sub(r'[*_`]', '', text))[:MATCH_PREFIX]
+
+
+class SourceResolver:
+    """Finds the solution paper and question number a bank record came from"""
+
+    def __init__(self, mdx_files):
+        self.by_name = {path.name: path for path in mdx_files}
+        self._sections = {}
+
+    def sections(self, mdx_path):
+        if mdx_path not in self._sections:
+            self._sections[mdx_path] = parse_solution_sections(read_text(mdx_path))
+        return self._sections[mdx_path]
+
+    def resolve(self, record):
+        """(MDX Path, number, marks) or None."""
+        stem = re.sub(r'(\.gu)?\.mdx?$', '', os.path.basename(record.source or ''))
+        if not stem:
+            return None
+        mdx_path = self.by_name.get(f"{stem}{'.gu' if record.language == 'gujarati' else ''}.mdx")
+        if mdx_path is None:
+            return None
+        sections = self.sections(mdx_path)
+        for section in sections:
+            if record.number and section.number == record.number:
+                return mdx_path, section.number, section.marks
+        key = _text_key(record.text)
+        for section in sections:
+            if key and _text_key(section.question) == key:
+                return mdx_path, section.number, section.marks
+        return None
+
+
+def subject_candidates(subject_dir, language):
+    """
+    Bank questions of one language that can be traced to a solution paper.
+
+    Returns:
+        Tuple of (candidate dicts, unresolved count)
+    """
+    mdx_files = [f for f in find_solution_files(Path(subject_dir))
+                 if f.name.endswith('.gu.mdx') == (language == 'gujarati')]
+    resolver = SourceResolver(mdx_files)
+    candidates, seen, unresolved = [], set(), 0
+    for bank_path in find_question_banks(subject_dir):
+        try:
+            _, records = load_bank(bank_path)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️  WARNING: Could not read {bank_path}: {e}")
+            continue
+        for record in records:
+            if record.language != language:
+                continue
+            resolved = resolver.resolve(record)
+            if resolved is None:
+                unresolved += 1
+                continue
+            mdx_path, number, marks = resolved
+            # Several banks of a subject can list the same question
+            if (mdx_path, number) in seen:
+                continue
+            seen.add((mdx_path, number))
+            candidates.append({
+                'qid': record.qid,
+                'unit': unit_key(record.unit) if record.unit else '',
+                'marks': record.marks or marks,
+                'mdx': mdx_path,
+                'number': number,
+                'text_key': _text_key(record.text),
+            })
+    return candidates, unresolved
+
+
+def pick_questions(candidates, blueprint, rng):
+    """Draw questions for each blueprint row; the same question text is never drawn twice."""
+    picked, used = [], set()
+    for unit, marks, count in blueprint:
+        pool = [c for c in candidates
+                if c['marks'] == marks and (unit == ANY_UNIT or c['unit'] == unit)
+                and c['qid'] not in used and c['text_key'] not in used]
+        # Sorted first so a seed always draws the same questions
+        pool.sort(key=lambda c: c['qid'])
+        rng.shuffle(pool)
+        chosen = []
+        for candidate in pool:
+            if len(chosen) == count:
+                break
+            if candidate['text_key'] in used:
+                continue
+            chosen.append(candidate)
+            used.update((candidate['qid'], candidate['text_key']))
+        if len(chosen) < count:
+            print(f"⚠️  Unit {unit}, {marks} marks: only {len(chosen)} of {count} question(s) available")
+        picked.extend(chosen)
+    return picked
+
+
+def attach_fragments(picked, jobs=1):
+    """Add each question's cached LaTeX; papers without current fragments are converted once."""
+    papers = sorted({q['mdx'] for q in picked})
+    fragments = {mdx: load_fragments(mdx) for mdx in papers}
+    missing = [mdx for mdx, data in fragments.items() if data is None]
+    if missing:
+        print(f"🔧 Converting {len(missing)} paper(s) without cached fragments")
+        failed = []
+        process_files(missing, generate_pdf=False, jobs=jobs, failed=failed)
+        fragments.update({mdx: load_fragments(mdx) for mdx in missing if mdx not in failed})
+
+    ready = []
+    for question in picked:
+        data = fragments.get(question['mdx'])
+        fragment = data['sections'].get(question['number']) if data else None
+        if fragment is None:
+            print(f"⚠️  No LaTeX for {question['mdx'].name} {question['number']}; left out")
+            continue
+        question['fragment'] = fragment
+        question['preamble'] = data['preamble']
+        ready.append(question)
+    return ready
+
+
+def assemble_paper(questions, out_dir, subject, subject_name, language, seed, solutions=False):
+    """LaTeX source of a mock paper."""
+    labels = LABELS[language]
+    index = load_frontmatter_index()
+    preamble = merged_preamble([(q['mdx'].parent, q['preamble']) for q in questions], out_dir)
+    total = sum(q['marks'] for q in questions)
+
+    parts = [
+        r"\documentclass[10pt,a4paper]{article}",
+        *preamble,
+        "",
+        r"\begin{document}",
+        "",
+        r"\begin{center}",
+        r"{\Huge\bfseries\color{headcolor} %s}\\[5pt]" % latex_escape(subject_name or subject),
+        r"{\LARGE %s -- Mock Paper}\\[3pt]" % latex_escape(subject),
+        r"{\large Total Marks: %d}\\[3pt]" % total,
+        r"{\normalsize\textit{Practice set %d}}" % seed,
+        r"\end{center}",
+        "",
+        r"\vspace{10pt}",
+    ]
+    for i, question in enumerate(questions, 1):
+        metadata = index.metadata(question['mdx'])
+        session = f"{(metadata.get('season') or '').capitalize()} {metadata.get('year') or ''}".strip()
+        parts += [
+            "",
+            r"\subsection*{%s}" % (labels['question'] % (i, question['marks'])),
+            prefix_labels(question['fragment']['question'], f"m{i}"),
+            "",
+            r"{\footnotesize\textit{%s: %s, %s}}" % (labels['source'], session or question['mdx'].stem,
+                                                       question['number']),
+        ]
+
+    if solutions:
+        parts += ["", r"\clearpage", r"\section*{%s}" % labels['solutions']]
+        for i, question in enumerate(questions, 1):
+            parts += [
+                "",
+                r"\subsection*{%s}" % (labels['answer'] % i),
+                prefix_labels(question['fragment']['solution'], f"m{i}s"),
+            ]
+
+    parts += ["", r"\end{document}", ""]
+    return '\n'.join(parts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Assemble a mock exam paper from a subject\'s question banks')
+    parser.add_argument('subject_dir', help='Subject directory with question banks and solution papers')
+    parser.add_argument('--blueprint', required=True,
+                        help='unit:marks:count entries ("1:3:2,*:7:1") or a JSON file')
+    parser.add_argument('--language', choices=('english', 'gujarati'), default='english')
+    parser.add_argument('--seed', type=int, help='Random seed (printed, so a paper can be rebuilt)')
+    parser.add_argument('--solutions', action='store_true', help='Append an answer key')
+    parser.add_argument('--output', help='Output .tex path (default: <code>-mock-paper-<seed>.tex in subject_dir)')
+    parser.add_argument('--no-pdf', action='store_true', help='Assemble the LaTeX only')
+    parser.add_argument('--keep-aux', action='store_true', help='Keep auxiliary files (.aux, .log, etc.)')
+    parser.add_argument('--deterministic', action='store_true', help='Build a byte-reproducible PDF')
+    parser.add_argument('--optimize', action='store_true', help='Recompress, pack and linearize the PDF')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='Parallel workers for papers not in the fragment cache (0 = one per CPU)')
+    args = parser.parse_args()
+
+    subject_dir = Path(args.subject_dir).resolve()
+    banks = find_question_banks(subject_dir)
+    if not banks:
+        print(f"❌ No question banks under {subject_dir}")
+        sys.exit(1)
+    try:
+        blueprint = parse_blueprint(args.blueprint)
+    except (ValueError, KeyError, OSError) as e:
+        print(f"❌ Invalid blueprint: {e}")
+        sys.exit(1)
+
+    subject = subject_code_for(banks[0])
+    seed = args.seed if args.seed is not None else random.randrange(1_000_000)
+    candidates, unresolved = subject_candidates(subject_dir, args.language)
+    print(f"📋 {subject} ({args.language}): {len(candidates)} question(s) traced to solution papers, "
+          f"{unresolved} without a source; seed {seed}")
+
+    picked = pick_questions(candidates, blueprint, random.Random(seed))
+    questions = attach_fragments(picked, jobs=args.jobs or os.cpu_count() or 1)
+    if not questions:
+        print("❌ No questions to assemble")
+        sys.exit(1)
+
+    suffix = '.gu' if args.language == 'gujarati' else ''
+    tex_path = Path(args.output).resolve() if args.output else subject_dir / f"{subject}-mock-paper-{seed}{suffix}.tex"
+    subject_name = load_frontmatter_index().subject_name(subject)
+    with open(tex_path, 'w', encoding='utf-8') as f:
+        f.write(assemble_paper(questions, tex_path.parent, subject, subject_name, args.language, seed,
+                               solutions=args.solutions))
+    print(f"📝 Assembled {tex_path.name}: {len(questions)} question(s), "
+          f"{sum(q['marks'] for q in questions)} marks")
+
+    if args.no_pdf:
+        sys.exit(0)
+    for mdx in sorted({q['mdx'] for q in questions}):
+        materialize_assets(mdx)
+    ok = compile_volume(tex_path, keep_aux=args.keep_aux, deterministic=args.deterministic,
+                        optimize=args.optimize, passes=2)
+    if not args.keep_aux:
+        for work_dir in sorted({q['mdx'].parent for q in questions}):
+            remove_mermaid_pdfs(work_dir)
+            remove_normalized_images(work_dir)
+    if ok:
+        print(f"✅ {tex_path.with_suffix('.pdf')}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+PDF Post-Processing: Compression, Object Streams and Linearization
+XeLaTeX output is served as written: loosely compressed streams, one
+top-level object per font and image, and no linearization, so a browser
+has to fetch the whole file before showing the first page. This stage
+rewrites a PDF with:
+
+- every Flate stream recompressed at the highest level, and uncompressed
+  streams compressed
+- object streams, which pack the many small dictionaries together
+- unreferenced resources removed
+- linearization ("fast web view"), so the first page renders while the
+  rest downloads
+- a deterministic /ID, so byte-reproducible builds stay reproducible
+
+The qpdf command line is used when it is on PATH, otherwise pikepdf (the
+Python binding of the same library); with neither installed the stage is
+skipped with a warning. The result is checked and only replaces the
+original when it is valid and not larger. Files already optimized are
+recorded by content hash in .cache/pdf-optimize, so bulk runs only touch
+new or rebuilt PDFs.
+
+XeLaTeX already embeds each font subset and image once per file; the En
+and Gu papers are separate downloads, so nothing can be shared between
+them and no cross-file deduplication is attempted.
+
+Usage:
+    # One file, or every PDF under a directory on all CPUs
+    python3 pdf_optimize.py <file.pdf|directory> [--jobs 8]
+
+    # Re-process files recorded as already optimized
+    python3 pdf_optimize.py content --force
+
+    # In the build pipeline
+    from pdf_optimize import optimize_pdf
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from cache_utils import get_cache_dir, hash_file, load_json, save_json
+from refactor_pandoc_latex import get_project_root
+from job_limits import run_limited
+from build_metrics import cache_lookup
+
+try:
+    import pikepdf
+except ImportError:  # optional: the qpdf CLI is preferred when available
+    pikepdf = None
+
+
+QPDF_ARGS = [
+    '--object-streams=generate',
+    '--compress-streams=y',
+    '--recompress-flate',
+    '--compression-level=9',
+    '--remove-unreferenced-resources=yes',
+    '--linearize',
+    '--deterministic-id',
+]
+
+_warned = False
+
+
+def _warn_no_backend():
+    global _warned
+    if not _warned:
+        print("⚠️  Neither qpdf nor pikepdf is installed; PDFs are left as built")
+        _warned = True
+
+
+def optimizer_backend():
+    """'qpdf', 'pikepdf' or None."""
+    if shutil.which('qpdf'):
+        return 'qpdf'
+    if pikepdf is not None:
+        return 'pikepdf'
+    return None
+
+
+def _rewrite(source, target, backend):
+    if backend == 'qpdf':
+        result = run_limited(['qpdf', *QPDF_ARGS, str(source), str(target)], 'optimize',
+                             capture_output=True, text=True)
+        # Exit code 3 means "succeeded with warnings"
+        if result.returncode not in (0, 3):
+            raise RuntimeError(result.stderr.strip() or f"qpdf exited with {result.returncode}")
+        check = run_limited(['qpdf', '--check', str(target)], 'optimize', capture_output=True, text=True)
+        if check.returncode not in (0, 3):
+            raise RuntimeError(f"optimized file failed qpdf --check: {check.stdout.strip()[-200:]}")
+    else:
+        with pikepdf.open(source) as pdf:
+            pdf.remove_unreferenced_resources()
+            pdf.save(target, compress_streams=True, recompress_flate=True,
+                     object_stream_mode=pikepdf.ObjectStreamMode.generate,
+                     linearize=True, deterministic_id=True)
+        with pikepdf.open(target) as pdf:
+            if len(pdf.pages) == 0:
+                raise RuntimeError("optimized file has no pages")
+
+
+def optimize_pdf(pdf_path, backend=None):
+    """
+    Rewrite one PDF in place.
+
+    Returns:
+        Tuple of (size before, size after); sizes are equal when the file
+        was left unchanged
+    """
+    pdf_path = Path(pdf_path)
+    before = pdf_path.stat().st_size
+    backend = backend or optimizer_backend()
+    if backend is None:
+        _warn_no_backend()
+        return before, before
+
+    fd, tmp = tempfile.mkstemp(dir=pdf_path.parent, prefix=f".{pdf_path.stem}.", suffix='.pdf')
+    os.close(fd)
+    try:
+        _rewrite(pdf_path, tmp, backend)
+        after = os.path.getsize(tmp)
+        if after >= before:
+            return before, before
+        os.replace(tmp, pdf_path)
+        return before, after
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+
+
+class OptimizedRecord:
+    """Content hashes of PDFs this stage has already written"""
+
+    def __init__(self):
+        self.path = get_cache_dir('pdf-optimize') / 'optimized.json'
+        self.root = get_project_root()
+        self.files = load_json(self.path, {})
+
+    def key(self, pdf_path):
+        path = Path(pdf_path).resolve()
+        try:
+            return path.relative_to(self.root).as_posix()
+        except ValueError:
+            return str(path)
+
+    def is_current(self, pdf_path):
+        return self.files.get(self.key(pdf_path)) == hash_file(pdf_path)
+
+    def mark(self, pdf_path):
+        self.files[self.key(pdf_path)] = hash_file(pdf_path)
+
+    def save(self):
+        save_json(self.path, self.files)
+
+
+def _optimize_job(pdf_path, backend):
+    try:
+        before, after = optimize_pdf(pdf_path, backend)
+        return before, after, None
+    except Exception as e:  # qpdf failures, OSError and pikepdf's own error types
+        return None, None, str(e)
+
+
+def find_pdfs(path):
+    path = Path(path)
+    if path.is_file():
+        return [path]
+    return sorted(p for p in path.rglob('*.pdf')
+                  if not p.name.startswith('.') and 'node_modules' not in p.parts)
+
+
+def optimize_all(pdfs, jobs=1, force=False):
+    """
+    Optimize many PDFs on a process pool, skipping ones already optimized.
+
+    Returns:
+        Dict with files, skipped, changed, failed, before, after (bytes)
+    """
+    backend = optimizer_backend()
+    if backend is None:
+        _warn_no_backend()
+        return {'files': len(pdfs), 'skipped': len(pdfs), 'changed': 0, 'failed': 0, 'before': 0, 'after': 0}
+
+    record = OptimizedRecord()
+    todo = pdfs if force else [p for p in pdfs if not record.is_current(p)]
+    cache_lookup('pdf-optimize', True, len(pdfs) - len(todo))
+    cache_lookup('pdf-optimize', False, len(todo))
+    stats = {'files': len(pdfs), 'skipped': len(pdfs) - len(todo), 'changed': 0, 'failed': 0,
+             'before': 0, 'after': 0}
+
+    # Largest first, so a big file does not start last
+    todo = sorted(todo, key=lambda p: -p.stat().st_size)
+    with ProcessPoolExecutor(max_workers=max(1, jobs)) as pool:
+        futures = {pool.submit(_optimize_job, p, backend): p for p in todo}
+        for future in as_completed(futures):
+            pdf = futures[future]
+            before, after, error = future.result()
+            if error:
+                stats['failed'] += 1
+                print(f"❌ {pdf.name}: {error}")
+                continue
+            stats['before'] += before
+            stats['after'] += after
+            if after < before:
+                stats['changed'] += 1
+                print(f"🗜️  {pdf.name}: {before / 1024:.0f} KiB -> {after / 1024:.0f} KiB")
+            record.mark(pdf)
+    record.save()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compress, pack and linearize built PDFs')
+    parser.add_argument('path', help='PDF file or directory to process recursively')
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1, help='Parallel workers')
+    parser.add_argument('--force', action='store_true', help='Also process PDFs recorded as already optimized')
+    args = parser.parse_args()
+
+    pdfs = find_pdfs(args.path)
+    if not pdfs:
+        print("❌ No PDFs found")
+        sys.exit(1)
+
+    backend = optimizer_backend()
+    print(f"📄 {len(pdfs)} PDF(s), backend: {backend or 'none'}, {args.jobs} worker(s)")
+    stats = optimize_all(pdfs, jobs=args.jobs, force=args.force)
+    if backend is None:
+        sys.exit(1)
+
+    saved = stats['before'] - stats['after']
+    print(f"\n✅ {stats['changed']} rewritten, {stats['skipped']} already optimized, {stats['failed']} failed")
+    if stats['before']:
+        print(f"   {stats['before'] / (1 << 20):.1f} MiB -> {stats['after'] / (1 << 20):.1f} MiB "
+              f"({100 * saved / stats['before']:.0f}% smaller)")
+    sys.exit(1 if stats['failed'] else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Pipelined Batch Builds: Overlapping Conversion Stages Across Files
+With --jobs, each pool worker runs one file's stages strictly in sequence and
+sits idle while Chromium (Mermaid) or XeLaTeX runs. Here the stages of
+convert_mdx_to_pdf.py (PIPELINE_STAGES) are separate queues, each with its
+own concurrency limit, driven by one asyncio event loop:
+
+    prepare (Mermaid, figures) -> pandoc -> refactor -> xelatex
+
+so file B's Pandoc parse overlaps file A's XeLaTeX passes, and the prepare
+stage renders the diagrams of upcoming files while earlier ones compile.
+Files enter in longest-job-first order and each stage serves waiting files
+first come, first served.
+
+Stages that run external programs (prepare, pandoc, xelatex) run on
+threads, since their time is spent in child processes. Refactor is Python
+and runs on a process pool, spawned rather than forked because threads are
+running, and their commands get rlimits through prlimit(2) instead of a
+preexec_fn for the same reason. Each XeLaTeX stage holds a build slot
+(job_limits.py), so pipelined batches share the machine's limit with
+download requests. Output is collected per file and printed when the file
+is done, as in pool builds.
+
+Usage:
+    # Pipelined batch with limits derived from 8 jobs
+    python3 pipeline_orchestrator.py <directory> --jobs 8
+
+    # Explicit stage limits
+    python3 pipeline_orchestrator.py <directory> --limit prepare=2 --limit xelatex=6
+
+    # Same through the converter
+    python3 convert_mdx_to_pdf.py <directory> --pipeline --jobs 8
+"""
+
+import sys
+import os
+import io
+import asyncio
+import multiprocessing
+import argparse
+import threading
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from convert_mdx_to_pdf import (PIPELINE_STAGES, find_solution_files, new_job, print_header, print_summary,
+                                process_files, record_build, refactor_stage)
+from build_metrics import flush as flush_metrics, inc
+from job_limits import BusyError, admission, admission_slots
+
+
+# Stages run on the process pool; the others run on threads
+PROCESS_STAGES = {'refactor'}
+SLOT_STAGES = {'xelatex'}
+
+
+def stage_limits(jobs=None, overrides=None):
+    """
+    Concurrency of each stage for a batch allowed about `jobs` busy processes.
+
+    Each Mermaid render drives a headless Chromium, so prepare stays small;
+    XeLaTeX dominates the build time and gets the most, up to the machine's
+    build slots.
+    """
+    jobs = max(1, jobs or os.cpu_count() or 1)
+    limits = {
+        'prepare': max(1, min(2, jobs // 2)),
+        'pandoc': max(1, jobs // 2),
+        'refactor': max(1, jobs // 4),
+        'xelatex': max(1, min(jobs, admission_slots())),
+    }
+    limits.update(overrides or {})
+    return limits
+
+
+class _ThreadStdout(io.TextIOBase):
+    """sys.stdout stand-in that sends each worker thread's output to its file's log"""
+
+    def __init__(self, fallback):
+        self.fallback = fallback
+        self.local = threading.local()
+
+    def write(self, text):
+        return (getattr(self.local, 'log', None) or self.fallback).write(text)
+
+    def flush(self):
+        self.fallback.flush()
+
+
+def _thread_stage(stdout, name, stage, job, log, admission_wait):
+    stdout.local.log = log
+    try:
+        if name == PIPELINE_STAGES[0][0]:
+            print_header(job)
+        if name in SLOT_STAGES and job.generate_pdf:
+            with admission(wait=admission_wait):
+                return stage(job)
+        return stage(job)
+    except BusyError:
+        inc('study_admission_rejections_total')
+        raise
+    except Exception as e:
+        print(f"❌ ERROR: {e}")
+        return False
+    finally:
+        stdout.local.log = None
+
+
+def _process_stage(job):
+    """Process pool worker: run refactor_stage, returning its result, timings and output."""
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        try:
+            ok = refactor_stage(job)
+        except Exception as e:
+            print(f"❌ ERROR: {e}")
+            ok = False
+    # Pool workers exit without running atexit handlers
+    flush_metrics()
+    return ok, job.timings, log.getvalue()
+
+
+async def _convert(job, semaphores, threads, processes, stdout, admission_wait):
+    loop = asyncio.get_running_loop()
+    log = io.StringIO()
+    ok = True
+    for name, stage in PIPELINE_STAGES:
+        async with semaphores[name]:
+            if name in PROCESS_STAGES:
+                ok, job.timings, output = await loop.run_in_executor(processes, _process_stage, job)
+                log.write(output)
+            else:
+                ok = await loop.run_in_executor(threads, _thread_stage, stdout, name, stage, job, log,
+                                                admission_wait)
+        if not ok:
+            break
+    if ok:
+        # On the event loop thread, between awaits: no other file writes here meanwhile
+        stdout.local.log = log
+        print_summary(job)
+        stdout.local.log = None
+    return ok, log.getvalue()
+
+
+async def _run(files, limits, on_done, options, admission_wait):
+    semaphores = {name: asyncio.Semaphore(limits[name]) for name, _ in PIPELINE_STAGES}
+    thread_count = sum(limits[name] for name, _ in PIPELINE_STAGES if name not in PROCESS_STAGES)
+    process_count = sum(limits[name] for name in PROCESS_STAGES)
+    stdout = _ThreadStdout(sys.stdout)
+
+    async def convert_one(mdx_file):
+        job = new_job(mdx_file, clean_assets=False, **options)
+        if job is None:
+            return mdx_file, False, {}, ''
+        before = dict(job.timings)
+        ok, log = await _convert(job, semaphores, threads, processes, stdout, admission_wait)
+        record_build(job.timings, ok, before)
+        return mdx_file, ok, job.timings, log
+
+    results = []
+    with ThreadPoolExecutor(max_workers=thread_count) as threads, \
+            ProcessPoolExecutor(max_workers=process_count, mp_context=multiprocessing.get_context('spawn')) \
+            as processes, \
+            contextlib.redirect_stdout(stdout):
+        # Tasks start in file order, so the stages' FIFO queues keep longest-first order
+        for task in asyncio.as_completed([asyncio.ensure_future(convert_one(f)) for f in files]):
+            result = await task
+            results.append(result)
+            if on_done:
+                on_done(*result)
+    flush_metrics()
+    return results
+
+
+def run_pipeline(files, limits=None, on_done=None, generate_pdf=True, keep_aux=False, deterministic=False,
+                 optimize=False, export_formats=(), admission_wait=None):
+    """
+    Convert files with the stages of different files overlapping.
+
+    Args:
+        files: MDX paths, in the order they should enter the pipeline
+        limits: {stage: concurrency}; see stage_limits()
+        on_done: Called as on_done(mdx_file, ok, timings, log) when a file finishes
+        admission_wait: Seconds a XeLaTeX stage may wait for a build slot
+            before BusyError stops the batch; None waits as long as it takes
+
+    Returns:
+        List of (mdx_file, ok, timings, log) in completion order
+    """
+    options = {'generate_pdf': generate_pdf, 'keep_aux': keep_aux, 'deterministic': deterministic,
+               'optimize': optimize, 'export_formats': export_formats}
+    return asyncio.run(_run(list(files), limits or stage_limits(), on_done, options, admission_wait))
+
+
+def parse_limits(specs):
+    """{stage: n} from 'stage=n' arguments."""
+    stages = [name for name, _ in PIPELINE_STAGES]
+    limits = {}
+    for spec in specs or []:
+        name, _, value = spec.partition('=')
+        if name not in stages or not value.isdigit() or int(value) < 1:
+            raise ValueError(f"bad stage limit '{spec}' (use STAGE=N with STAGE one of {', '.join(stages)})")
+        limits[name] = int(value)
+    return limits
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert MDX solutions with conversion stages overlapping across files')
+    parser.add_argument('path', help='Path to MDX file or directory containing solution files')
+    parser.add_argument('--no-pdf', action='store_true', help='Skip PDF generation (only convert to LaTeX)')
+    parser.add_argument('--keep-aux', action='store_true', help='Keep auxiliary files (.aux, .log, etc.)')
+    parser.add_argument('--deterministic', action='store_true', help='Build byte-reproducible PDFs')
+    parser.add_argument('--optimize', action='store_true', help='Recompress, pack and linearize the built PDFs')
+    parser.add_argument('--jobs', '-j', type=int, default=0, help='Busy processes to size the stages for (0 = one per CPU)')
+    parser.add_argument('--limit', action='append', metavar='STAGE=N',
+                        help='Concurrency of one stage (prepare, pandoc, refactor, xelatex); repeatable')
+    args = parser.parse_args()
+
+    try:
+        overrides = parse_limits(args.limit)
+    except ValueError as e:
+        print(f"❌ ERROR: {e}")
+        sys.exit(1)
+
+    files = find_solution_files(Path(args.path).resolve())
+    if not files:
+        print("❌ No files to process!")
+        sys.exit(1)
+
+    success_count, failure_count = process_files(
+        files,
+        generate_pdf=not args.no_pdf,
+        keep_aux=args.keep_aux,
+        jobs=args.jobs or os.cpu_count() or 1,
+        deterministic=args.deterministic,
+        optimize=args.optimize,
+        pipeline=True,
+        limits=overrides
+    )
+    sys.exit(0 if failure_count == 0 else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+Cross-Subject Question Bank Analytics
+Streams every *-question-bank-final.json under the study materials tree once
+and builds one combined mapping-analysis report (Markdown + HTML) for all
+subjects, replacing the per-subject mapping-analysis-report scripts.
+
+All aggregates (unit x language counts, confidence bands, marks, question
+types, difficulty, keyword frequencies, multi-unit mappings, samples) are
+collected in a single pass per bank with Counters. Per-bank aggregates are
+cached under .cache/analytics and keyed by the bank's content hash, so a
+re-run only re-reads banks that changed since the last report.
+
+Confidence is stored differently by each generator (0-1 floats, 0-100
+percentages, per-subject field names); it is normalized to 0-1 before
+banding.
+
+Usage:
+    # Report for all subjects
+    python3 question_bank_analytics.py
+
+    # Single subject, custom output directory
+    python3 question_bank_analytics.py --subject 4353206 --output-dir /tmp/analytics
+
+    # Ignore cached aggregates
+    python3 question_bank_analytics.py --no-cache
+"""
+
+import sys
+import os
+import html
+import json
+import hashlib
+import argparse
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from cache_utils import get_cache_dir, hash_file, load_json, save_json
+from question_bank_corpus import STUDY_MATERIALS_DIR, BANK_PATTERN, find_question_banks, load_bank, subject_code_for
+from refactor_pandoc_latex import get_project_root
+from syllabus_index import unit_key
+
+
+# Bump when the aggregate layout or field tables change
+ANALYTICS_VERSION = 2
+DEFAULT_OUTPUT_DIR = get_project_root() / 'reports' / 'question-bank-analytics'
+
+CONFIDENCE_FIELDS = ('confidence', 'mapping_confidence', 'confidence_score',
+                     'mappingConfidence', 'unitMappingConfidence')
+KEYWORD_FIELDS = ('keywords', 'keywords_found')
+TYPE_FIELDS = ('question_type', 'category')
+DIFFICULTY_FIELDS = ('difficulty',)
+BLOOM_FIELDS = ('bloom_level', 'bloomsLevel')
+
+# Bands used by the old per-subject reports
+HIGH_CONFIDENCE = 0.7
+MEDIUM_CONFIDENCE = 0.3
+SAMPLES_PER_UNIT = 3
+TOP_KEYWORDS = 20
+
+COUNTER_KEYS = ('languages', 'units', 'unit_languages', 'bands', 'marks', 'types',
+                'difficulty', 'bloom', 'sources', 'keywords', 'mapped_unit_counts')
+
+
+def _first(d, keys):
+    for key in keys:
+        value = d.get(key)
+        if value not in (None, '', [], {}):
+            return value
+    return None
+
+
+def raw_confidence(raw):
+    """(field, value) of the record's mapping confidence, or (None, None)."""
+    for key in CONFIDENCE_FIELDS:
+        value = raw.get(key)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return key, value
+    return None, None
+
+
+def confidence_scales(records):
+    """
+    Divisor per confidence field that brings a bank's values to 0-1.
+
+    Decided once per bank from the largest value of each field, since a
+    percentage bank can still hold records below 1%.
+    """
+    largest = {}
+    for record in records:
+        key, value = raw_confidence(record.raw)
+        if key is not None:
+            largest[key] = max(largest.get(key, value), value)
+    return {key: 100.0 if value > 1 else 1.0 for key, value in largest.items()}
+
+
+def normalize_confidence(raw, scales):
+    """Mapping confidence on a 0-1 scale, or None if the bank does not record one."""
+    key, value = raw_confidence(raw)
+    if key is None:
+        return None
+    return max(0.0, min(1.0, value / scales[key]))
+
+
+def confidence_band(confidence):
+    if confidence is None:
+        return 'none'
+    if confidence >= HIGH_CONFIDENCE:
+        return 'high'
+    if confidence >= MEDIUM_CONFIDENCE:
+        return 'medium'
+    return 'low'
+
+
+def record_keywords(raw, language):
+    """Keyword strings from keywords / keywords_found / keywords_<language>."""
+    values = _first(raw, KEYWORD_FIELDS + (f"keywords_{language}",)) or []
+    if not isinstance(values, list):
+        return []
+    keywords = []
+    for value in values:
+        if isinstance(value, dict):
+            value = value.get('term')
+        if isinstance(value, str) and value.strip():
+            keywords.append(value.strip().lower())
+    return keywords
+
+
+def analyze_bank(bank_path):
+    """
+    Aggregate one bank in a single pass over its records.
+
+    Returns:
+        JSON-serializable dict of counters, confidence sums and samples
+    """
+    _, records = load_bank(bank_path)
+    counters = {key: Counter() for key in COUNTER_KEYS}
+    unit_confidence = {}
+    samples = {}
+    confidence_sum = 0.0
+    confidence_count = 0
+    scales = confidence_scales(records)
+
+    for record in records:
+        raw = record.raw
+        unit = unit_key(record.unit) if record.unit else 'unmapped'
+        confidence = normalize_confidence(raw, scales)
+        band = confidence_band(confidence)
+
+        counters['languages'][record.language] += 1
+        counters['units'][unit] += 1
+        counters['unit_languages'][f"{unit}|{record.language}"] += 1
+        counters['bands'][band] += 1
+        counters['marks'][str(record.marks)] += 1
+        counters['types'][str(_first(raw, TYPE_FIELDS) or 'unknown')] += 1
+        counters['difficulty'][str(_first(raw, DIFFICULTY_FIELDS) or 'unknown')] += 1
+        bloom = _first(raw, BLOOM_FIELDS)
+        if bloom:
+            counters['bloom'][str(bloom)] += 1
+        if record.source:
+            counters['sources'][os.path.basename(record.source)] += 1
+        counters['keywords'].update(record_keywords(raw, record.language))
+
+        mapped_units = raw.get('mapped_units')
+        if isinstance(mapped_units, list):
+            counters['mapped_unit_counts'][str(len(mapped_units))] += 1
+
+        if confidence is not None:
+            confidence_sum += confidence
+            confidence_count += 1
+            stats = unit_confidence.setdefault(unit, [0.0, 0, 0])
+            stats[0] += confidence
+            stats[1] += 1
+            stats[2] += band == 'high'
+
+        unit_samples = samples.setdefault(unit, [])
+        if len(unit_samples) < SAMPLES_PER_UNIT and band in ('high', 'none'):
+            unit_samples.append({
+                'language': record.language,
+                'marks': record.marks,
+                'confidence': confidence,
+                'text': record.text[:120],
+            })
+
+    return {
+        'subject': subject_code_for(bank_path),
+        'bank': Path(bank_path).name.replace(BANK_PATTERN[1:], ''),
+        'total': len(records),
+        'counters': {key: dict(counter) for key, counter in counters.items()},
+        'confidence_sum': confidence_sum,
+        'confidence_count': confidence_count,
+        'unit_confidence': unit_confidence,
+        'samples': samples,
+    }
+
+
+def load_bank_aggregate(bank_path, use_cache=True):
+    """Cached analyze_bank(): recomputed only when the bank content changes."""
+    bank_path = Path(bank_path)
+    digest = hash_file(bank_path)
+    cache_file = get_cache_dir('analytics') / f"{hashlib.md5(str(bank_path).encode('utf-8')).hexdigest()}.json"
+
+    if use_cache:
+        cached = load_json(cache_file)
+        if cached and cached.get('version') == ANALYTICS_VERSION and cached.get('source_hash') == digest:
+            return cached['aggregate'], True
+
+    aggregate = analyze_bank(bank_path)
+    save_json(cache_file, {'version': ANALYTICS_VERSION, 'source_hash': digest, 'aggregate': aggregate})
+    return aggregate, False
+
+
+def merge_aggregates(aggregates):
+    """Combine per-bank aggregates into corpus-wide totals."""
+    counters = {key: Counter() for key in COUNTER_KEYS}
+    merged = {'total': 0, 'confidence_sum': 0.0, 'confidence_count': 0}
+    for aggregate in aggregates:
+        merged['total'] += aggregate['total']
+        merged['confidence_sum'] += aggregate['confidence_sum']
+        merged['confidence_count'] += aggregate['confidence_count']
+        for key in COUNTER_KEYS:
+            counters[key].update(aggregate['counters'].get(key, {}))
+    merged['counters'] = counters
+    return merged
+
+
+def _average(total, count):
+    return total / count if count else None
+
+
+def _percent(count, total):
+    return f"{count / total * 100:.1f}%" if total else "0.0%"
+
+
+def _format_confidence(value):
+    return '-' if value is None else f"{value:.2f}"
+
+
+def _balance(counter):
+    """min/max ratio of a distribution (1.0 = perfectly balanced)."""
+    values = [v for v in counter.values() if v]
+    return min(values) / max(values) if len(values) > 1 else 1.0
+
+
+def build_report(banks):
+    """
+    Lay the report out as (heading, table rows) sections so the Markdown and
+    HTML writers share one structure.
+
+    Args:
+        banks: List of (bank_path, aggregate) tuples
+    """
+    overall = merge_aggregates(aggregate for _, aggregate in banks)
+    counters = overall['counters']
+    total = overall['total']
+    sections = []
+
+    sections.append(('Overview', ['Metric', 'Value'], [
+        ['Question banks', len(banks)],
+        ['Question records', total],
+        ['Average confidence', _format_confidence(_average(overall['confidence_sum'], overall['confidence_count']))],
+        ['High confidence (≥0.7)', _percent(counters['bands'].get('high', 0), total)],
+        ['Language balance', f"{_balance(counters['languages']):.3f}"],
+    ]))
+
+    subject_rows = []
+    for bank_path, aggregate in banks:
+        c = aggregate['counters']
+        subject_rows.append([
+            aggregate['bank'],
+            aggregate['total'],
+            c['languages'].get('english', 0),
+            c['languages'].get('gujarati', 0),
+            _format_confidence(_average(aggregate['confidence_sum'], aggregate['confidence_count'])),
+            c['bands'].get('high', 0),
+            c['bands'].get('medium', 0),
+            c['bands'].get('low', 0),
+            c['units'].get('unmapped', 0),
+            f"{_balance({u: n for u, n in c['units'].items() if u != 'unmapped'}):.2f}",
+        ])
+    sections.append(('Banks', ['Bank', 'Questions', 'English', 'Gujarati', 'Avg confidence',
+                                  'High', 'Medium', 'Low', 'Unmapped', 'Unit balance'], subject_rows))
+
+    for bank_path, aggregate in banks:
+        c = aggregate['counters']
+        units = sorted(c['units'], key=lambda u: (u == 'unmapped', u))
+        rows = []
+        for unit in units:
+            confidence = aggregate['unit_confidence'].get(unit)
+            rows.append([
+                unit,
+                c['units'][unit],
+                c['unit_languages'].get(f"{unit}|english", 0),
+                c['unit_languages'].get(f"{unit}|gujarati", 0),
+                _format_confidence(_average(confidence[0], confidence[1]) if confidence else None),
+                f"{confidence[2]}/{confidence[1]}" if confidence else '-',
+            ])
+        sections.append((f"{aggregate['bank']} units", ['Unit', 'Questions', 'English', 'Gujarati',
+                                                           'Avg confidence', 'High confidence'], rows))
+
+        extra = []
+        for label, key in (('Marks', 'marks'), ('Question types', 'types'), ('Difficulty', 'difficulty'),
+                           ('Bloom level', 'bloom'), ('Units per question', 'mapped_unit_counts')):
+            if c.get(key) and set(c[key]) != {'unknown'}:
+                extra.append([label, ', '.join(f"{k}: {v}" for k, v in sorted(c[key].items()))])
+        keywords = Counter(c.get('keywords', {})).most_common(TOP_KEYWORDS)
+        if keywords:
+            extra.append(['Top keywords', ', '.join(f"{k} ({v})" for k, v in keywords)])
+        if extra:
+            sections.append((f"{aggregate['bank']} breakdown", ['Dimension', 'Counts'], extra))
+
+        sample_rows = []
+        for unit in units:
+            for sample in aggregate['samples'].get(unit, []):
+                sample_rows.append([unit, sample['language'], sample['marks'],
+                                    _format_confidence(sample['confidence']), sample['text']])
+        if sample_rows:
+            sections.append((f"{aggregate['bank']} sample mappings",
+                             ['Unit', 'Language', 'Marks', 'Confidence', 'Question'], sample_rows))
+
+    return overall, sections
+
+
+def _md_cell(value):
+    return str(value).replace('|', '\\|').replace('\n', ' ')
+
+
+def write_markdown(path, sections):
+    lines = ['# Question Bank Mapping Analysis', '']
+    for heading, header, rows in sections:
+        lines.append(f"## {heading}")
+        lines.append('')
+        lines.append('| ' + ' | '.join(header) + ' |')
+        lines.append('|' + '---|' * len(header))
+        for row in rows:
+            lines.append('| ' + ' | '.join(_md_cell(v) for v in row) + ' |')
+        lines.append('')
+    Path(path).write_text('\n'.join(lines), encoding='utf-8')
+
+
+def write_html(path, sections):
+    parts = ['<!DOCTYPE html>', '<html lang="en">', '<head>', '<meta charset="utf-8">',
+             '<title>Question Bank Mapping Analysis</title>',
+             '<style>body{font-family:sans-serif;margin:2em}table{border-collapse:collapse;margin-bottom:2em}'
+             'th,td{border:1px solid #ccc;padding:4px 8px;text-align:left;vertical-align:top}'
+             'th{background:#f2f2f2}</style>',
+             '</head>', '<body>', '<h1>Question Bank Mapping Analysis</h1>']
+    for heading, header, rows in sections:
+        parts.append(f"<h2>{html.escape(heading)}</h2>")
+        parts.append('<table>')
+        parts.append('<tr>' + ''.join(f"<th>{html.escape(str(h))}</th>" for h in header) + '</tr>')
+        for row in rows:
+            parts.append('<tr>' + ''.join(f"<td>{html.escape(str(v))}</td>" for v in row) + '</tr>')
+        parts.append('</table>')
+    parts.extend(['</body>', '</html>', ''])
+    Path(path).write_text('\n'.join(parts), encoding='utf-8')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Combined mapping analysis report for all question banks')
+    parser.add_argument('root', nargs='?', default=str(STUDY_MATERIALS_DIR),
+                        help='Study materials directory (default: content/resources/study-materials)')
+    parser.add_argument('--subject', help='Only analyze banks for this subject code')
+    parser.add_argument('--output-dir', default=str(DEFAULT_OUTPUT_DIR),
+                        help='Directory for the Markdown/HTML report')
+    parser.add_argument('--no-cache', action='store_true', help='Recompute every bank aggregate')
+    args = parser.parse_args()
+
+    banks = []
+    cached = 0
+    for bank_path in find_question_banks(args.root):
+        if args.subject and subject_code_for(bank_path) != args.subject:
+            continue
+        try:
+            aggregate, hit = load_bank_aggregate(bank_path, use_cache=not args.no_cache)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️  WARNING: Could not read {bank_path}: {e}")
+            continue
+        cached += hit
+        banks.append((bank_path, aggregate))
+
+    if not banks:
+        print("❌ No question banks found")
+        return 1
+
+    overall, sections = build_report(banks)
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    write_markdown(output_dir / 'question-bank-analytics.md', sections)
+    write_html(output_dir / 'question-bank-analytics.html', sections)
+
+    bands = overall['counters']['bands']
+    print(f"📊 Analyzed {len(banks)} banks ({cached} from cache), {overall['total']} question records")
+    print(f"   🎯 High: {bands.get('high', 0)}, 📈 Medium: {bands.get('medium', 0)}, "
+          f"📉 Low: {bands.get('low', 0)}, ➖ No confidence: {bands.get('none', 0)}")
+    print(f"✅ Report written to {output_dir}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Question Bank Corpus Loader
+Finds every *-question-bank-final.json under the study materials tree and
+flattens the different per-subject schemas into uniform question records.
+
+Each subject generator writes its own layout (flat "questions" lists,
+unit -> topic -> questions trees, bilingual textEn/textGu records, ...).
+Corpus-wide tools use this module so they only deal with one record shape.
+
+Usage:
+    python3 question_bank_corpus.py [content_dir]
+"""
+
+import sys
+import os
+import re
+import json
+import hashlib
+import argparse
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Dict
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from refactor_pandoc_latex import get_project_root
+
+
+STUDY_MATERIALS_DIR = get_project_root() / 'content' / 'resources' / 'study-materials'
+BANK_PATTERN = '*-question-bank-final.json'
+
+# Keys that hold syllabus/statistics data rather than questions
+SKIP_KEYS = {
+    'metadata', 'statistics', 'syllabus', 'course_structure', 'subjectInfo',
+    'enhanced_keyword_mappings', 'unit_mapping_summary', 'validation_notes',
+    'extractionDetails', 'keywords', 'allUnitScores', 'searchIndex',
+}
+
+MONOLINGUAL_TEXT_FIELDS = ('text', 'question_text', 'questionText')
+BILINGUAL_TEXT_FIELDS = (
+    ('textEn', 'textGu'),
+    ('question_english', 'question_gujarati'),
+)
+ANSWER_FIELDS = ('answer_text', 'answer', 'answer_section')
+UNIT_FIELDS = ('mapped_unit', 'unit', 'unitNumber')
+SOURCE_FIELDS = ('source_file', 'sourceFile', 'source')
+NUMBER_FIELDS = ('questionNumber', 'question_number', 'full_question_id')
+
+# "## Question 1(a) [3 marks]", "## પ્રશ્ન 2(બ) OR [4 ગુણ]", "## Question 3(c-OR) [7 marks]", "## Q.1 [14 marks]"
+SOLUTION_HEADING_RE = re.compile(
+    r'^##\s*(?:Question|પ્રશ્ન|Q\.?)\s*([0-9૦-૯]+)\s*'
+    r'(?:\(\s*([a-zA-Zઅબકડ]*)[\s-]*(OR|અથવા)?\s*\))?\s*(OR|અથવા)?\s*'
+    r'\[\s*([0-9૦-૯]+)\s*(?:marks?|Marks|ગુણ|માર્ક્સ|માર્ક)\s*\]',
+    re.MULTILINE
+)
+GUJARATI_SUBPARTS = {'અ': 'a', 'બ': 'b', 'ક': 'c', 'ડ': 'd'}
+GUJARATI_DIGITS = str.maketrans('૦૧૨૩૪૫૬૭૮૯', '0123456789')
+
+
+@dataclass
+class CorpusQuestion:
+    """One question occurrence in one language, pointing back at its bank record"""
+    qid: str
+    subject_code: str
+    bank_file: str
+    language: str  # 'english' or 'gujarati'
+    text: str
+    answer: str = ""
+    marks: int = 0
+    unit: str = ""
+    source: str = ""
+    number: str = ""
+    raw: Dict = field(default=None, repr=False, compare=False)
+
+
+@dataclass
+class SolutionSection:
+    """One "## Question ..." block of a solution MDX file"""
+    number: str  # canonical form: "1(a)" or "1(a) OR"
+    question_no: int
+    sub_part: str  # latin letter, Gujarati parts are mapped (અ -> a)
+    is_or: bool
+    marks: int
+    question: str
+    answer: str
+    line: int
+
+
+def heading_number(match):
+    """(number, question_no, sub_part, is_or, marks) of a SOLUTION_HEADING_RE match."""
+    question_no = int(match.group(1).translate(GUJARATI_DIGITS))
+    sub_part = GUJARATI_SUBPARTS.get(match.group(2) or '', (match.group(2) or '').lower())
+    is_or = bool(match.group(3) or match.group(4))
+    number = f"{question_no}({sub_part})" if sub_part else str(question_no)
+    if is_or:
+        number += " OR"
+    return number, question_no, sub_part, is_or, int(match.group(5).translate(GUJARATI_DIGITS))
+
+
+def parse_solution_sections(content):
+    """Split solution MDX content into question/answer sections."""
+    sections = []
+    matches = list(SOLUTION_HEADING_RE.finditer(content))
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(content)
+        body = content[match.end():end]
+        # Stop at the next level-2 heading that is not a question (tips, summaries, ...)
+        next_heading = re.search(r'^##\s', body, re.MULTILINE)
+        if next_heading:
+            body = body[:next_heading.start()]
+
+        number, question_no, sub_part, is_or, marks = heading_number(match)
+
+        paragraphs = [p.strip() for p in re.split(r'\n\s*\n', body.strip()) if p.strip()]
+        question = ''
+        if paragraphs:
+            question = paragraphs.pop(0)
+            bold = re.fullmatch(r'\*\*(.+?)\*\*', question, re.DOTALL)
+            if bold:
+                question = bold.group(1)
+        answer = '\n\n'.join(paragraphs)
+        answer = re.sub(r'^\*\*(?:Answer|જવાબ)\*\*\s*:?\s*', '', answer)
+
+        sections.append(SolutionSection(
+            number=number,
+            question_no=question_no,
+            sub_part=sub_part,
+            is_or=is_or,
+            marks=marks,
+            question=question.strip(),
+            answer=answer.strip(),
+            line=content.count('\n', 0, match.start()) + 1,
+        ))
+    return sections
+
+
+def find_question_banks(root=STUDY_MATERIALS_DIR):
+    """Return all final question bank JSON files under root, sorted by path."""
+    return sorted(Path(root).rglob(BANK_PATTERN))
+
+
+def subject_code_for(bank_path):
+    """Subject code from the bank filename (e.g. 4353202-question-bank-final.json)."""
+    match = re.match(r'([A-Za-z]*\d{6,})', Path(bank_path).name)
+    if match:
+        return match.group(1)
+    return Path(bank_path).parent.name.split('-')[0]
+
+
+def detect_language(text):
+    """Classify text as 'gujarati' if it contains any Gujarati script."""
+    return 'gujarati' if re.search(r'[઀-૿]', text or '') else 'english'
+
+
+def parse_marks(value):
+    """Marks are stored as 3, "3" or "3 marks" depending on the generator."""
+    if isinstance(value, int):
+        return value
+    match = re.search(r'\d+', str(value or ''))
+    return int(match.group(0)) if match else 0
+
+
+def paper_key(record):
+    """Identify the exam paper a record came from, independent of language and extension."""
+    source = os.path.basename(record.source or '')
+    source = re.sub(r'(\.gu)?\.mdx?$', '', source)
+    return f"{record.subject_code}:{source or record.bank_file}"
+
+
+def make_question_id(subject_code, source, number, language, text):
+    """Stable 12-character question ID shared by all corpus tools."""
+    key = f"{subject_code}|{os.path.basename(source or '')}|{number}|{language}|{text}"
+    return hashlib.md5(key.encode('utf-8')).hexdigest()[:12]
+
+
+def _first(d, keys, default=None):
+    for key in keys:
+        value = d.get(key)
+        if value not in (None, ''):
+            return value
+    return default
+
+
+def _language_texts(d):
+    """Return [(language, text)] for a raw question dict, or [] if it is not a question."""
+    for en_key, gu_key in BILINGUAL_TEXT_FIELDS:
+        if en_key in d or gu_key in d:
+            return [(lang, d.get(key)) for lang, key in (('english', en_key), ('gujarati', gu_key))
+                    if isinstance(d.get(key), str) and d.get(key).strip()]
+
+    # {"english": {"text": ...}, "gujarati": {"text": ...}}
+    if isinstance(d.get('english'), dict) or isinstance(d.get('gujarati'), dict):
+        return [(lang, d[lang].get('text')) for lang in ('english', 'gujarati')
+                if isinstance(d.get(lang), dict) and d[lang].get('text')]
+
+    # Practical variants: {"text": {"en": ..., "gu": ...}}
+    if isinstance(d.get('text'), dict):
+        return [(lang, d['text'].get(key)) for lang, key in (('english', 'en'), ('gujarati', 'gu'))
+                if d['text'].get(key)]
+
+    text = _first(d, MONOLINGUAL_TEXT_FIELDS)
+    if isinstance(text, str) and text.strip():
+        language = d.get('language') or detect_language(text)
+        return [(language, text)]
+    return []
+
+
+def _make_records(d, subject_code, bank_file, unit_context):
+    records = []
+    unit = str(_first(d, UNIT_FIELDS, unit_context) or '')
+    number = str(_first(d, NUMBER_FIELDS, '') or '')
+    if not number and d.get('sub_part'):
+        number = f"{d.get('question_number', '')}({d['sub_part']})"
+
+    for language, text in _language_texts(d):
+        nested = d.get(language) if isinstance(d.get(language), dict) else {}
+        source = str(_first(nested, SOURCE_FIELDS, '') or _first(d, SOURCE_FIELDS, '') or '')
+        answer = _first(d, ANSWER_FIELDS, '')
+        text = text.strip()
+        records.append(CorpusQuestion(
+            qid=make_question_id(subject_code, source, number, language, text),
+            subject_code=subject_code,
+            bank_file=bank_file,
+            language=language,
+            text=text,
+            answer=answer if isinstance(answer, str) else '',
+            marks=parse_marks(d.get('marks')),
+            unit=unit,
+            source=source,
+            number=number,
+            raw=d,
+        ))
+    return records
+
+
+def _walk(node, subject_code, bank_file, unit_context, parent_key, out):
+    if isinstance(node, list):
+        for item in node:
+            _walk(item, subject_code, bank_file, unit_context, parent_key, out)
+        return
+    if not isinstance(node, dict):
+        return
+
+    records = _make_records(node, subject_code, bank_file, unit_context)
+    if records:
+        out.extend(records)
+        return
+
+    # Unit containers: {"unit": "I", "questions": [...]} or {"unitNumber": ..., "topics": [...]}
+    unit = _first(node, ('unit', 'unitNumber'), None)
+    if isinstance(unit, (str, int)) and not isinstance(unit, bool):
+        unit_context = str(unit)
+
+    for key, value in node.items():
+        if key in SKIP_KEYS:
+            continue
+        child_unit = key if parent_key == 'units' else unit_context
+        _walk(value, subject_code, bank_file, child_unit, key, out)
+
+
+def load_bank(bank_path):
+    """
+    Load one question bank and flatten it.
+
+    Returns:
+        Tuple of (raw_data, list of CorpusQuestion). The records keep a
+        reference to their raw dict so annotations can be written back.
+    """
+    bank_path = Path(bank_path)
+    with open(bank_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    records = []
+    _walk(data, subject_code_for(bank_path), bank_path.name, '', None, records)
+    return data, records
+
+
+def iter_corpus(root=STUDY_MATERIALS_DIR):
+    """Yield (bank_path, raw_data, records) for every bank under root."""
+    for bank_path in find_question_banks(root):
+        try:
+            data, records = load_bank(bank_path)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️  WARNING: Could not read {bank_path}: {e}")
+            continue
+        yield bank_path, data, records
+
+
+def set_annotation(record, key, value):
+    """Store a per-language annotation on the record's raw bank entry."""
+    record.raw.setdefault(key, {})[record.language] = value
+
+
+def save_bank(bank_path, data):
+    """Write a bank back in the generators' JSON format."""
+    with open(bank_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='List question banks and record counts')
+    parser.add_argument('root', nargs='?', default=str(STUDY_MATERIALS_DIR),
+                        help='Study materials directory (default: content/resources/study-materials)')
+    args = parser.parse_args()
+
+    total = 0
+    for bank_path, _, records in iter_corpus(args.root):
+        languages = {}
+        for record in records:
+            languages[record.language] = languages.get(record.language, 0) + 1
+        total += len(records)
+        print(f"📚 {bank_path.relative_to(args.root)}: {len(records)} records {languages}")
+    print(f"\nTotal records: {total}")
+
+
+if __name__ == '__main__':
+    main()
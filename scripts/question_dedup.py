@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Question Detector
+Finds questions that GTU repeats across exam papers with small wording
+changes, using MinHash signatures and locality-sensitive hashing (LSH).
+
+Each question's normalized text is shingled, signed with MinHash and
+bucketed per LSH band, so only questions sharing a bucket are compared.
+English and Gujarati are normalized and bucketed separately.
+
+Usage:
+    # Report repeated questions across all subjects
+    python3 question_dedup.py
+
+    # Annotate every *-question-bank-final.json with cluster ID and frequency
+    python3 question_dedup.py --write
+
+    # Stricter matching, single subject tree
+    python3 question_dedup.py /path/to/subject --threshold 0.8
+"""
+
+import sys
+import os
+import re
+import zlib
+import random
+import hashlib
+import argparse
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from question_bank_corpus import STUDY_MATERIALS_DIR, iter_corpus, paper_key, set_annotation, save_bank
+
+
+DEFAULT_THRESHOLD = 0.7
+DEFAULT_NUM_PERM = 128
+SHINGLE_SIZE = 5
+MERSENNE_PRIME = (1 << 61) - 1
+ANNOTATION_KEY = 'near_duplicates'
+
+# Instruction words vary between papers ("Explain" vs "Describe") without changing the question
+ENGLISH_STOPWORDS = {
+    'a', 'an', 'the', 'of', 'and', 'or', 'in', 'on', 'to', 'for', 'with', 'its', 'it', 'is',
+    'are', 'be', 'by', 'any', 'what', 'write', 'explain', 'describe', 'define', 'discuss',
+    'state', 'list', 'give', 'draw', 'briefly', 'brief', 'short', 'note', 'notes', 'neat',
+    'suitable', 'example', 'examples', 'diagram', 'detail', 'details', 'following', 'using',
+}
+GUJARATI_STOPWORDS = {
+    'અને', 'અથવા', 'ની', 'નો', 'ના', 'નું', 'માં', 'થી', 'છે', 'કરો', 'લખો', 'આપો', 'દોરો',
+    'સમજાવો', 'વર્ણવો', 'વ્યાખ્યા', 'વ્યાખ્યાયિત', 'યોગ્ય', 'ઉદાહરણ', 'સાથે', 'આકૃતિ', 'ટૂંકમાં',
+    'નોંધ', 'કોઈપણ', 'શું', 'વિગતવાર', 'ચર્ચા', 'જણાવો', 'યાદી',
+}
+GUJARATI_DIGITS = str.maketrans('૦૧૨૩૪૫૬૭૮૯', '0123456789')
+
+
+@dataclass
+class DuplicateCluster:
+    """A group of near-identical questions in one language"""
+    cluster_id: str
+    language: str
+    members: List[int] = field(default_factory=list)
+    frequency: int = 1  # distinct exam papers the question appeared in
+
+
+def normalize_question(text, language):
+    """Lowercase, strip markup/punctuation and instruction words; returns a token list."""
+    text = unicodedata.normalize('NFC', text or '').lower()
+    text = text.replace('‌', '').replace('‍', '').translate(GUJARATI_DIGITS)
+    text = re.sub(r'[*_`#>|\\]', ' ', text)
+    if language == 'gujarati':
+        tokens = re.findall(r'[઀-૿]+|[a-z0-9]+', text)
+        stopwords = GUJARATI_STOPWORDS | ENGLISH_STOPWORDS
+    else:
+        tokens = re.findall(r'[a-z0-9]+', text)
+        stopwords = ENGLISH_STOPWORDS
+    return [t for t in tokens if t not in stopwords]
+
+
+def shingle(tokens, k=SHINGLE_SIZE):
+    """Character k-shingles of the joined token string, hashed to 32-bit ints."""
+    joined = ' '.join(tokens)
+    if not joined:
+        return set()
+    if len(joined) <= k:
+        return {zlib.crc32(joined.encode('utf-8'))}
+    return {zlib.crc32(joined[i:i + k].encode('utf-8')) for i in range(len(joined) - k + 1)}
+
+
+def make_permutations(num_perm, seed=1):
+    """Fixed-seed (a, b) pairs so signatures are stable across runs."""
+    rng = random.Random(seed)
+    return [(rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME)) for _ in range(num_perm)]
+
+
+def minhash(shingles, permutations):
+    """MinHash signature of a shingle set."""
+    if not shingles:
+        return None
+    return tuple(min((a * x + b) % MERSENNE_PRIME for x in shingles) for a, b in permutations)
+
+
+def choose_bands(threshold, num_perm):
+    """Pick (bands, rows) whose LSH S-curve threshold (1/b)^(1/r) is closest to the target."""
+    best = None
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        error = abs((1.0 / bands) ** (1.0 / rows) - threshold)
+        if best is None or error < best[0]:
+            best = (error, bands, rows)
+    return best[1], best[2]
+
+
+def estimate_similarity(sig_a, sig_b):
+    """Fraction of agreeing MinHash slots approximates Jaccard similarity."""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+
+class _UnionFind:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, i):
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i, j):
+        ri, rj = self.find(i), self.find(j)
+        if ri != rj:
+            self.parent[max(ri, rj)] = min(ri, rj)
+
+
+def cluster_questions(records, threshold=DEFAULT_THRESHOLD, num_perm=DEFAULT_NUM_PERM, paper_of=paper_key):
+    """
+    Group near-duplicate questions.
+
+    Args:
+        records: Sequence of objects with .text and .language attributes
+        threshold: Minimum estimated Jaccard similarity of shingle sets
+        num_perm: MinHash signature length
+        paper_of: Callable giving the exam paper of a record (for frequency)
+
+    Returns:
+        List of DuplicateCluster, one per record group (singletons included),
+        with members as indices into records.
+    """
+    permutations = make_permutations(num_perm)
+    bands, rows = choose_bands(threshold, num_perm)
+
+    normalized = []
+    signatures = []
+    for record in records:
+        tokens = normalize_question(record.text, record.language)
+        normalized.append(' '.join(tokens))
+        signatures.append(minhash(shingle(tokens), permutations))
+
+    buckets = defaultdict(list)
+    for i, sig in enumerate(signatures):
+        if sig is None:
+            continue
+        for band in range(bands):
+            key = (records[i].language, band, sig[band * rows:(band + 1) * rows])
+            buckets[key].append(i)
+
+    uf = _UnionFind(len(records))
+    for members in buckets.values():
+        if len(members) < 2:
+            continue
+        # Compare against a few representatives instead of all pairs so large
+        # buckets of exact repeats stay linear.
+        anchors = []
+        for i in members:
+            for anchor in anchors:
+                if uf.find(i) == uf.find(anchor) or \
+                        estimate_similarity(signatures[i], signatures[anchor]) >= threshold:
+                    uf.union(i, anchor)
+                    break
+            else:
+                if len(anchors) < 8:
+                    anchors.append(i)
+
+    groups = defaultdict(list)
+    for i in range(len(records)):
+        groups[uf.find(i)].append(i)
+
+    clusters = []
+    for members in groups.values():
+        language = records[members[0]].language
+        key = min(normalized[i] or records[i].text for i in members)
+        digest = hashlib.md5(f"{language}|{key}".encode('utf-8')).hexdigest()[:10]
+        clusters.append(DuplicateCluster(
+            cluster_id=f"{language[:2]}-{digest}",
+            language=language,
+            members=members,
+            frequency=len({paper_of(records[i]) for i in members}),
+        ))
+    return clusters
+
+
+def print_report(records, clusters, top=25):
+    repeated = sorted((c for c in clusters if c.frequency > 1), key=lambda c: -c.frequency)
+    print(f"\n{'='*60}")
+    print(f"NEAR-DUPLICATE REPORT")
+    print(f"{'='*60}")
+    print(f"Questions: {len(records)}")
+    print(f"Clusters:  {len(clusters)}")
+    print(f"Repeated:  {len(repeated)} cluster(s) seen in more than one paper")
+    print(f"{'='*60}")
+    for cluster in repeated[:top]:
+        sample = records[cluster.members[0]]
+        papers = sorted({paper_key(records[i]).split(':', 1)[1] for i in cluster.members})
+        print(f"\n🔁 {cluster.cluster_id} × {cluster.frequency} [{sample.subject_code}]")
+        print(f"   {sample.text[:100]}")
+        print(f"   Papers: {', '.join(papers[:6])}{' ...' if len(papers) > 6 else ''}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Find repeated exam questions across question banks with MinHash/LSH'
+    )
+    parser.add_argument('root', nargs='?', default=str(STUDY_MATERIALS_DIR),
+                        help='Directory to scan for *-question-bank-final.json')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Jaccard similarity threshold (default: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--num-perm', type=int, default=DEFAULT_NUM_PERM,
+                        help=f'MinHash permutations (default: {DEFAULT_NUM_PERM})')
+    parser.add_argument('--write', action='store_true',
+                        help=f'Write "{ANNOTATION_KEY}" annotations back into the bank files')
+    parser.add_argument('--top', type=int, default=25, help='Clusters to show in the report')
+    args = parser.parse_args()
+
+    banks = []
+    records = []
+    for bank_path, data, bank_records in iter_corpus(args.root):
+        banks.append((bank_path, data))
+        records.extend(bank_records)
+
+    if not records:
+        print("❌ No questions found!")
+        sys.exit(1)
+
+    clusters = cluster_questions(records, args.threshold, args.num_perm)
+    print_report(records, clusters, args.top)
+
+    if args.write:
+        for cluster in clusters:
+            for i in cluster.members:
+                set_annotation(records[i], ANNOTATION_KEY, {
+                    'cluster_id': cluster.cluster_id,
+                    'frequency': cluster.frequency,
+                    'occurrences': len(cluster.members),
+                })
+        for bank_path, data in banks:
+            save_bank(bank_path, data)
+            print(f"💾 Annotated: {bank_path.name}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Per-Question LaTeX Fragment Cache
+After the refactor stage, convert_mdx_to_pdf splits each paper's refactored
+LaTeX at its "Question N(x) [M marks]" headings and stores every question's
+LaTeX, and its solution's, in .cache/fragments. Tools that assemble new
+documents from existing questions (mock_paper.py) read the fragments from
+here instead of running Pandoc again.
+
+One cache file per paper, named by the paper's path, holds its sections
+keyed by canonical question number ("1(a)", "3(c) OR"). It is only used
+while the SHA-256 of the MDX and of the conversion scripts still match, so
+an edited paper is never served stale LaTeX.
+
+Usage:
+    # List the cached fragments of a paper
+    python3 question_fragments.py <file-solution.mdx>
+
+    # In the pipeline
+    from question_fragments import store_fragments, load_fragments
+"""
+
+import sys
+import os
+import re
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from cache_utils import get_cache_dir, hash_bytes, hash_file, load_json, save_json
+from refactor_pandoc_latex import get_project_root
+from question_bank_corpus import SOLUTION_HEADING_RE, heading_number
+
+
+# Bump when the fragment layout changes
+FRAGMENT_VERSION = 1
+# Scripts whose output ends up in a fragment
+PIPELINE_SCRIPTS = ('convert_mdx_to_pdf.py', 'refactor_pandoc_latex.py')
+
+SUBSECTION_RE = re.compile(r'^\\subsection\*\{(.*)\}(?:\\label\{[^}]*\})?\s*$')
+HEADING_LINE_RE = re.compile(r'^\\(?:section|subsection|subsubsection)\*?\{')
+
+_pipeline_hash = None
+
+
+def pipeline_hash():
+    """Hash of the conversion scripts; any change invalidates every fragment."""
+    global _pipeline_hash
+    if _pipeline_hash is None:
+        here = Path(__file__).resolve().parent
+        _pipeline_hash = hash_bytes(''.join(hash_file(here / name) for name in PIPELINE_SCRIPTS).encode('ascii'))
+    return _pipeline_hash
+
+
+def _cache_file(mdx_path):
+    path = Path(mdx_path).resolve()
+    try:
+        key = path.relative_to(get_project_root()).as_posix()
+    except ValueError:
+        key = str(path)
+    return get_cache_dir('fragments') / f"{hash_bytes(key.encode('utf-8'))[:24]}.json"
+
+
+def _source_key(mdx_path):
+    return f"{FRAGMENT_VERSION}:{pipeline_hash()}:{hash_file(mdx_path)}"
+
+
+def split_question(lines):
+    """(question LaTeX, solution LaTeX) of one section's body lines."""
+    for i, line in enumerate(lines):
+        if line.strip() == r'\begin{solutionbox}':
+            return '\n'.join(lines[:i]).strip(), '\n'.join(lines[i:]).strip()
+    # No answer box: the first paragraph is the question
+    text = '\n'.join(lines).strip()
+    question, _, solution = text.partition('\n\n')
+    return question.strip(), solution.strip()
+
+
+def split_sections(tex):
+    """
+    Per-question fragments of a refactored paper.
+
+    Returns:
+        Tuple of (preamble lines, {number: {'marks', 'question', 'solution'}})
+    """
+    head, _, body = tex.partition('\\begin{document}')
+    preamble = [line for line in head.splitlines()
+                if line.strip() and not line.lstrip().startswith('\\documentclass')]
+    body = body.rsplit('\\end{document}', 1)[0]
+
+    sections = {}
+    current = None
+    lines = []
+
+    def flush():
+        if current is not None and current[0] not in sections:
+            question, solution = split_question(lines)
+            sections[current[0]] = {'marks': current[1], 'question': question, 'solution': solution}
+
+    for line in body.split('\n'):
+        if HEADING_LINE_RE.match(line.strip()):
+            flush()
+            current, lines = None, []
+            heading = SUBSECTION_RE.match(line.strip())
+            match = SOLUTION_HEADING_RE.match(f"## {heading.group(1)}") if heading else None
+            if match:
+                number, _, _, _, marks = heading_number(match)
+                current = (number, marks)
+            continue
+        if current is not None:
+            lines.append(line)
+    flush()
+    return preamble, sections
+
+
+def store_fragments(mdx_path, tex_path):
+    """Cache the question fragments of a freshly refactored paper; returns their count."""
+    with open(tex_path, 'r', encoding='utf-8') as f:
+        preamble, sections = split_sections(f.read())
+    save_json(_cache_file(mdx_path), {
+        'source': _source_key(mdx_path),
+        'preamble': preamble,
+        'sections': sections,
+    })
+    return len(sections)
+
+
+def load_fragments(mdx_path):
+    """
+    Cached fragments of a paper, or None if it was never converted or has
+    changed since.
+
+    Returns:
+        Dict with 'preamble' (lines) and 'sections' ({number: fragment})
+    """
+    data = load_json(_cache_file(mdx_path))
+    if not data or data.get('source') != _source_key(mdx_path):
+        return None
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Show the cached question fragments of solution papers')
+    parser.add_argument('files', nargs='+', help='Solution MDX files')
+    args = parser.parse_args()
+
+    for mdx in args.files:
+        data = load_fragments(mdx)
+        if data is None:
+            print(f"❌ {mdx}: no current fragments (convert it with convert_mdx_to_pdf.py --no-pdf)")
+            continue
+        print(f"✅ {mdx}: {len(data['sections'])} question(s)")
+        for number, fragment in data['sections'].items():
+            print(f"   {number:10} [{fragment['marks']:2}] {len(fragment['question']):5} + "
+                  f"{len(fragment['solution']):5} chars")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Cross-Subject Question Search
+Builds a BM25 inverted index over every question bank and solution MDX file
+(question text and answer bodies, English and Gujarati) and searches it.
+
+The index is written as static JSON shards that the Next.js site can fetch
+and score client-side (see lib/question-search.ts), so no server is needed.
+Builds are incremental: each source file is tokenized once and cached until
+its mtime/size changes.
+
+Usage:
+    # Build (or refresh) the index shards
+    python3 question_search.py build
+
+    # Search from the command line
+    python3 question_search.py search "sliding window protocol"
+    python3 question_search.py search "મોડ્યુલેશન" --language gujarati --subject 1333201
+"""
+
+import sys
+import os
+import re
+import json
+import math
+import time
+import hashlib
+import argparse
+import unicodedata
+from collections import Counter, defaultdict
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from question_bank_corpus import (
+    STUDY_MATERIALS_DIR, find_question_banks, load_bank, parse_solution_sections,
+    subject_code_for, make_question_id,
+)
+from cache_utils import get_cache_dir, get_project_root, file_signature, load_json, save_json
+from content_snapshot import read_text
+from solution_index import load_solution_index
+
+
+INDEX_VERSION = 1
+DEFAULT_INDEX_DIR = get_project_root() / 'public' / 'search-index'
+SOURCE_CACHE_DIR = 'search-sources'
+TERM_SHARDS = 64
+DOC_SHARD_SIZE = 500
+TITLE_WEIGHT = 3  # question text counts more than answer body
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+GUJARATI_DIGITS = str.maketrans('૦૧૨૩૪૫૬૭૮૯', '0123456789')
+# Postpositions written attached to the noun ("મોડેલ્સની" -> "મોડેલ્સ")
+GUJARATI_SUFFIXES = ('માંથી', 'માં', 'થી', 'નું', 'ની', 'નો', 'ના', 'ને')
+TOKEN_RE = re.compile(r'[઀-૿]+|[a-z0-9]+')
+
+
+def tokenize(text):
+    """
+    Split text into index terms.
+
+    Gujarati runs are kept whole (\\w would split them at vowel signs), common
+    attached postpositions are stripped and Latin text is lowercased.
+    Must stay in sync with tokenize() in lib/question-search.ts.
+    """
+    text = unicodedata.normalize('NFC', text or '').lower()
+    text = text.replace('‌', '').replace('‍', '').translate(GUJARATI_DIGITS)
+    terms = []
+    for token in TOKEN_RE.findall(text):
+        if token[0] >= '઀':
+            for suffix in GUJARATI_SUFFIXES:
+                if token.endswith(suffix) and len(token) - len(suffix) >= 2:
+                    token = token[:-len(suffix)]
+                    break
+        elif len(token) < 2:
+            continue
+        terms.append(token)
+    return terms
+
+
+def term_shard(term, shards=TERM_SHARDS):
+    """FNV-1a hash of the UTF-8 term; mirrored in lib/question-search.ts."""
+    h = 0x811c9dc5
+    for byte in term.encode('utf-8'):
+        h = ((h ^ byte) * 0x01000193) & 0xffffffff
+    return h % shards
+
+
+def _weighted_terms(title, body):
+    counts = Counter(tokenize(body))
+    for term in tokenize(title):
+        counts[term] += TITLE_WEIGHT
+    return dict(counts)
+
+
+def _solution_docs(path, rel):
+    content = read_text(path)
+    language = 'gujarati' if path.name.endswith('.gu.mdx') else 'english'
+    subject = subject_code_for(path)
+    docs = []
+    for section in parse_solution_sections(content):
+        docs.append({
+            'id': make_question_id(subject, path.name, section.number, language, section.question),
+            'kind': 'solution',
+            'subject': subject,
+            'language': language,
+            'number': section.number,
+            'marks': section.marks,
+            'title': section.question[:200],
+            'path': rel,
+            'line': section.line,
+            'terms': _weighted_terms(section.question, section.answer),
+        })
+    return docs
+
+
+def _bank_docs(path, rel):
+    _, records = load_bank(path)
+    docs = []
+    for record in records:
+        docs.append({
+            'id': record.qid,
+            'kind': 'bank',
+            'subject': record.subject_code,
+            'language': record.language,
+            'number': record.number,
+            'marks': record.marks,
+            'title': record.text[:200],
+            'path': rel,
+            'unit': record.unit,
+            'terms': _weighted_terms(record.text, record.answer),
+        })
+    return docs
+
+
+def find_sources(root):
+    """All indexable files: solution MDX and final question banks."""
+    root = Path(root)
+    index = load_solution_index()
+    if index.covers(root):
+        solutions = index.files(under=root, kind='mdx')
+    else:
+        solutions = sorted(p for p in root.rglob('*-solution*.mdx') if re.search(r'-solution(\.gu)?\.mdx$', p.name))
+    return solutions + find_question_banks(root)
+
+
+def load_source_docs(path, content_root, cache_dir):
+    """Tokenized documents for one source, reusing the cache when the file is unchanged."""
+    rel = path.relative_to(content_root).as_posix()
+    cache_file = cache_dir / (hashlib.md5(rel.encode('utf-8')).hexdigest() + '.json')
+    signature = file_signature(path)
+    cached = load_json(cache_file)
+    if cached and cached.get('version') == INDEX_VERSION and cached.get('signature') == signature:
+        return cached['docs'], False
+
+    docs = _bank_docs(path, rel) if path.suffix == '.json' else _solution_docs(path, rel)
+    save_json(cache_file, {'version': INDEX_VERSION, 'signature': signature, 'docs': docs})
+    return docs, True
+
+
+def _write_if_changed(path, data):
+    payload = json.dumps(data, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+    if path.exists() and path.read_text(encoding='utf-8') == payload:
+        return False
+    path.write_text(payload, encoding='utf-8')
+    return True
+
+
+def build_index(root=STUDY_MATERIALS_DIR, index_dir=DEFAULT_INDEX_DIR):
+    """
+    Build or refresh the static index shards.
+
+    Returns:
+        Dict with document, source and rewritten-shard counts
+    """
+    root = Path(root).resolve()
+    content_root = get_project_root() / 'content'
+    index_dir = Path(index_dir)
+    index_dir.mkdir(parents=True, exist_ok=True)
+    cache_dir = get_cache_dir(SOURCE_CACHE_DIR)
+
+    sources = find_sources(root)
+    digest = hashlib.md5(json.dumps(
+        [[p.relative_to(content_root).as_posix(), file_signature(p)] for p in sources]
+    ).encode('utf-8')).hexdigest()
+    manifest = load_json(index_dir / 'manifest.json', {})
+    if manifest.get('version') == INDEX_VERSION and manifest.get('sources_digest') == digest:
+        return {'documents': manifest['doc_count'], 'sources': len(sources),
+                'retokenized': 0, 'shards_written': 0}
+
+    docs = []
+    retokenized = 0
+    for path in sources:
+        try:
+            source_docs, changed = load_source_docs(path, content_root, cache_dir)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  WARNING: Skipping {path.name}: {e}")
+            continue
+        retokenized += changed
+        docs.extend(source_docs)
+
+    postings = [defaultdict(list) for _ in range(TERM_SHARDS)]
+    doc_rows = []
+    lengths = []
+    total_length = 0
+    for doc_num, doc in enumerate(docs):
+        length = sum(doc['terms'].values())
+        total_length += length
+        for term, tf in doc['terms'].items():
+            postings[term_shard(term)][term].append([doc_num, tf])
+        lengths.append(length)
+        doc_rows.append([doc['id'], doc['kind'], doc['subject'], doc['language'], doc['number'],
+                         doc['marks'], doc.get('unit', ''), doc['title'], doc['path'],
+                         doc.get('line', 0)])
+
+    written = 0
+    for shard, terms in enumerate(postings):
+        written += _write_if_changed(index_dir / f"terms-{shard:02d}.json", terms)
+    doc_shards = max(1, math.ceil(len(doc_rows) / DOC_SHARD_SIZE))
+    for shard in range(doc_shards):
+        rows = doc_rows[shard * DOC_SHARD_SIZE:(shard + 1) * DOC_SHARD_SIZE]
+        written += _write_if_changed(index_dir / f"docs-{shard:03d}.json", rows)
+    for stale in index_dir.glob('docs-*.json'):
+        if int(stale.stem.split('-')[1]) >= doc_shards:
+            stale.unlink()
+
+    manifest = {
+        'version': INDEX_VERSION,
+        'doc_count': len(doc_rows),
+        'avg_length': total_length / len(doc_rows) if doc_rows else 0,
+        'term_shards': TERM_SHARDS,
+        'doc_shard_size': DOC_SHARD_SIZE,
+        'doc_fields': ['id', 'kind', 'subject', 'language', 'number', 'marks', 'unit',
+                       'title', 'path', 'line'],
+        'k1': BM25_K1,
+        'b': BM25_B,
+        'sources_digest': digest,
+    }
+    written += _write_if_changed(index_dir / 'lengths.json', lengths)
+    written += _write_if_changed(index_dir / 'manifest.json', manifest)
+
+    return {'documents': len(doc_rows), 'sources': len(sources),
+            'retokenized': retokenized, 'shards_written': written}
+
+
+def search(query, index_dir=DEFAULT_INDEX_DIR, limit=10, language=None, subject=None, kind=None):
+    """
+    BM25 search over the shards, loading only the term shards the query needs
+    and the doc shards of the results that are returned.
+
+    Returns:
+        List of (score, doc dict) sorted by descending score
+    """
+    index_dir = Path(index_dir)
+    manifest = load_json(index_dir / 'manifest.json')
+    if not manifest:
+        raise FileNotFoundError(f"No search index in {index_dir}; run the build command first")
+    lengths = load_json(index_dir / 'lengths.json', [])
+
+    n = manifest['doc_count']
+    avg_length = manifest['avg_length'] or 1
+    k1, b = manifest['k1'], manifest['b']
+
+    term_shards = {}
+    scores = defaultdict(float)
+    for term in set(tokenize(query)):
+        shard = term_shard(term, manifest['term_shards'])
+        if shard not in term_shards:
+            term_shards[shard] = load_json(index_dir / f"terms-{shard:02d}.json", {})
+        postings = term_shards[shard].get(term, [])
+        if not postings:
+            continue
+        idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+        for doc_num, tf in postings:
+            norm = k1 * (1 - b + b * lengths[doc_num] / avg_length)
+            scores[doc_num] += idf * tf * (k1 + 1) / (tf + norm)
+
+    doc_shards = {}
+    results = []
+    for doc_num, score in sorted(scores.items(), key=lambda item: (-item[1], item[0])):
+        shard = doc_num // manifest['doc_shard_size']
+        if shard not in doc_shards:
+            doc_shards[shard] = load_json(index_dir / f"docs-{shard:03d}.json", [])
+        doc = dict(zip(manifest['doc_fields'], doc_shards[shard][doc_num % manifest['doc_shard_size']]))
+        if (language and doc['language'] != language) or (subject and doc['subject'] != subject) \
+                or (kind and doc['kind'] != kind):
+            continue
+        results.append((score, doc))
+        if len(results) >= limit:
+            break
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Build and search the cross-subject question index',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python3 question_search.py build
+  python3 question_search.py search "cocomo model" --limit 5
+  python3 question_search.py search "ડેટા ડિક્શનરી" --language gujarati
+        """
+    )
+    parser.add_argument('--index-dir', default=str(DEFAULT_INDEX_DIR),
+                        help='Where the static shards are written/read (default: public/search-index)')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    build = sub.add_parser('build', help='Build or refresh the index')
+    build.add_argument('root', nargs='?', default=str(STUDY_MATERIALS_DIR),
+                       help='Directory to index (default: content/resources/study-materials)')
+
+    find = sub.add_parser('search', help='Search the index')
+    find.add_argument('query')
+    find.add_argument('--limit', type=int, default=10)
+    find.add_argument('--language', choices=['english', 'gujarati'])
+    find.add_argument('--subject', help='Subject code, e.g. 4353202')
+    find.add_argument('--kind', choices=['solution', 'bank'])
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        start = time.time()
+        stats = build_index(args.root, args.index_dir)
+        print(f"✅ Indexed {stats['documents']} documents from {stats['sources']} sources "
+              f"({stats['retokenized']} re-tokenized, {stats['shards_written']} shard(s) written) "
+              f"in {time.time() - start:.2f}s")
+        print(f"Index: {args.index_dir}")
+        return
+
+    try:
+        results = search(args.query, args.index_dir, args.limit, args.language, args.subject, args.kind)
+    except FileNotFoundError as e:
+        print(f"❌ ERROR: {e}")
+        sys.exit(1)
+
+    if not results:
+        print("No matches.")
+        return
+    for score, doc in results:
+        print(f"{score:6.2f}  [{doc['subject']}] {doc['number']} ({doc['marks']} marks, {doc['language']}, {doc['kind']})")
+        print(f"        {doc['title'][:100]}")
+        print(f"        {doc['path']}:{doc['line']}" if doc['line'] else f"        {doc['path']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Streaming Question Bank Output
+Helpers for generators that run extraction as a pipeline
+(solution files -> question records -> mapped records -> writer)
+instead of holding every file and record in memory.
+
+QuestionSpool writes each finished record to a temporary file as soon as it
+is mapped and keeps only a small (sort key, offset, length) entry per
+question. write_json_document() then streams the records back in output
+order into the same JSON layout json.dump(..., indent=2) produces.
+
+Usage:
+    from question_stream import QuestionSpool, write_json_document, intern_str
+"""
+
+import sys
+import json
+import tempfile
+
+
+def intern_str(value):
+    """Intern repeated record fields (source file, season, language, unit)."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class QuestionSpool:
+    """Temporary on-disk store of serialized question records, read back in sorted order"""
+
+    def __init__(self, indent=2):
+        self.indent = indent
+        self._file = tempfile.TemporaryFile()
+        self._index = []  # (sort_key, sequence, offset, length)
+
+    def add(self, record, sort_key=()):
+        """Serialize one record dict and remember where it was written."""
+        data = json.dumps(record, ensure_ascii=False, indent=self.indent).encode('utf-8')
+        offset = self._file.seek(0, 2)
+        self._file.write(data)
+        self._index.append((sort_key, len(self._index), offset, len(data)))
+
+    def __len__(self):
+        return len(self._index)
+
+    def iter_json(self):
+        """Yield serialized records ordered by sort key, then insertion order."""
+        self._index.sort()
+        for _, _, offset, length in self._index:
+            self._file.seek(offset)
+            yield self._file.read(length).decode('utf-8')
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_json_document(output_file, head, array_key, items, indent=2):
+    """
+    Write {**head, array_key: [items...]} to output_file without building the
+    array in memory. items yields records already serialized with the same
+    indent (see QuestionSpool.iter_json). The result matches json.dump with
+    ensure_ascii=False.
+
+    Returns:
+        Number of items written
+    """
+    skeleton = json.dumps({**head, array_key: []}, ensure_ascii=False, indent=indent)
+    prefix, suffix = skeleton.rsplit('[]', 1)
+    item_pad = ' ' * (indent * 2)
+    count = 0
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(prefix)
+        for item in items:
+            f.write('[\n' if count == 0 else ',\n')
+            f.write(item_pad + item.replace('\n', '\n' + item_pad))
+            count += 1
+        f.write('[]' if count == 0 else '\n' + ' ' * indent + ']')
+        f.write(suffix)
+    return count
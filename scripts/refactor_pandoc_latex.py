@@ -201,7 +201,7 @@ def simplify_labels(content):
     
     return content
 
-def apply_box_structure(content, file_path, title=None):
+def apply_box_structure(content, file_path, title=None, metadata=None):
     """Applies solution boxes, headers, and structural fixes (Replacing original refactor_latex.py logic)."""
     
     # 1. Standardize Header/Preamble
@@ -218,33 +218,17 @@ def apply_box_structure(content, file_path, title=None):
     
     basename = os.path.basename(file_path)
     filename_no_ext = os.path.splitext(basename)[0]
-    
-    subject_code = "Unknown Code"
-    exam_season = "Study Material"
-    subject_name = "Subject Name"
-
-    # Minimal Subject Map (Expand as needed)
-    subject_map = {
-        "4300003": "Environment and Sustainability",
-        "4300002": "Communication Skills", 
-        "DI01000061": "Modern Physics",
-        "DI01000071": "Chemistry",
-        "DI01000021": "Mathematics-I",
-        "DI01000051": "Basic Electronics",
-        "DI01000101": "Basic Electronics"
-    }
 
-    parts = filename_no_ext.split('-')
-    if len(parts) >= 1:
-        subject_code = parts[0]
-        if subject_code in subject_map:
-            subject_name = subject_map[subject_code]
-    
-    if len(parts) >= 3:
-        season = parts[1].capitalize()
-        year = parts[2]
-        if season in ["Summer", "Winter"] and year.isdigit():
-            exam_season = f"{season} {year}"
+    if metadata is None:
+        # Imported here: frontmatter_index depends on this module via cache_utils
+        from frontmatter_index import source_metadata
+        metadata = source_metadata(file_path)
+
+    subject_code = metadata.get('subject') or filename_no_ext.split('-')[0]
+    subject_name = metadata.get('subject_name') or "Subject Name"
+    exam_season = "Study Material"
+    if metadata.get('season') and metadata.get('year'):
+        exam_season = f"{metadata['season'].capitalize()} {metadata['year']}"
 
     if title:
         header_title = r"{\Huge\bfseries\color{headcolor} %s}\\[5pt]" % title
@@ -373,7 +357,7 @@ def apply_box_structure(content, file_path, title=None):
     
     return header + "\n".join(new_lines)
 
-def refactor_latex(file_path, title=None):
+def refactor_latex(file_path, title=None, metadata=None):
     """Enhanced refactor with all improvements."""
     
     # Read file
@@ -386,7 +370,7 @@ def refactor_latex(file_path, title=None):
     content = fix_section_titles(content)
     
     # 2. Apply Structural Changes (Box Logic) - Merged from refactor_latex.py
-    content = apply_box_structure(content, file_path, title=title)
+    content = apply_box_structure(content, file_path, title=title, metadata=metadata)
 
     # 3. Post-processing on the structured content
     # Extract body again since apply_box_structure adds headers
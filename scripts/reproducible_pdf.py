@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Reproducible PDF Helpers
+XeLaTeX output normally differs between two builds of the same source: the
+creation/modification dates, the font subset tags and the trailer /ID all
+depend on the wall clock. Deterministic builds pin all three so identical
+sources give byte-identical PDFs, which content-hash caches and ETags need:
+
+- SOURCE_DATE_EPOCH (with FORCE_SOURCE_DATE=1 and TZ=UTC) fixes the PDF
+  dates and \\today, and seeds xdvipdfmx's font subset tags. The epoch is
+  taken from the environment, else from the MDX frontmatter date, else 0.
+- The trailer /ID is rewritten in place to a hash of the PDF's own bytes.
+  The new value has the same length, so xref offsets stay valid.
+
+Mermaid diagrams are named by the hash of their source (mermaid-<hash>.pdf)
+and rendered once into .cache/mermaid, so every build embeds the same
+diagram bytes instead of a fresh headless-browser render.
+
+Usage:
+    # SHA-256 of a PDF (what its ETag is derived from)
+    python3 reproducible_pdf.py <file.pdf>
+
+    # Pin the /ID of an existing PDF
+    python3 reproducible_pdf.py <file.pdf> --fix-id
+
+    # In the build pipeline
+    from reproducible_pdf import deterministic_env, normalize_pdf_id
+"""
+
+import sys
+import os
+import re
+import hashlib
+import argparse
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from cache_utils import hash_file, atomic_write_bytes
+
+
+ID_RE = re.compile(rb'/ID\s*\[\s*<([0-9A-Fa-f]*)>\s*<([0-9A-Fa-f]*)>\s*\]')
+DATE_RE = re.compile(r'^(\d{4})-(\d{2})-(\d{2})')
+
+
+def source_date_epoch(metadata=None):
+    """SOURCE_DATE_EPOCH for a build: environment, then frontmatter date, then 0."""
+    if os.environ.get('SOURCE_DATE_EPOCH', '').isdigit():
+        return int(os.environ['SOURCE_DATE_EPOCH'])
+    match = DATE_RE.match(str((metadata or {}).get('date') or ''))
+    if match:
+        year, month, day = map(int, match.groups())
+        try:
+            return int(datetime(year, month, day, tzinfo=timezone.utc).timestamp())
+        except ValueError:
+            pass
+    return 0
+
+
+def deterministic_env(metadata=None):
+    """Environment for XeLaTeX runs that should not depend on the wall clock."""
+    env = dict(os.environ)
+    env['SOURCE_DATE_EPOCH'] = str(source_date_epoch(metadata))
+    env['FORCE_SOURCE_DATE'] = '1'
+    env['TZ'] = 'UTC'
+    return env
+
+
+def normalize_pdf_id(pdf_path):
+    """
+    Replace the trailer /ID with a hash of the PDF's contents.
+
+    Returns:
+        True if the file was rewritten
+    """
+    with open(pdf_path, 'rb') as f:
+        data = f.read()
+    if not ID_RE.search(data):
+        return False
+
+    digest = hashlib.md5(ID_RE.sub(b'/ID[<><>]', data)).hexdigest().upper().encode('ascii')
+
+    def pinned(match):
+        text = match.group(0)
+        start = match.start(0)
+        first = (digest * 4)[:len(match.group(1))]
+        second = (digest * 4)[:len(match.group(2))]
+        return (text[:match.start(1) - start] + first
+                + text[match.end(1) - start:match.start(2) - start] + second
+                + text[match.end(2) - start:])
+
+    fixed = ID_RE.sub(pinned, data)
+    if fixed == data:
+        return False
+    atomic_write_bytes(pdf_path, fixed)
+    return True
+
+
+def pdf_digest(pdf_path):
+    """SHA-256 of the PDF bytes, as used for cache keys and ETags."""
+    return hash_file(pdf_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect or pin the identity of built PDFs')
+    parser.add_argument('pdfs', nargs='+', help='PDF files')
+    parser.add_argument('--fix-id', action='store_true', help='Rewrite the trailer /ID from the file contents')
+    args = parser.parse_args()
+
+    for pdf in args.pdfs:
+        if args.fix_id and normalize_pdf_id(pdf):
+            print(f"📌 Pinned /ID: {pdf}")
+        print(f"{pdf_digest(pdf)}  {pdf}")
+
+
+if __name__ == '__main__':
+    main()
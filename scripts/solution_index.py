@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Solution File Discovery Index
+Persistent index of the GTU solution sources (*-solution.mdx,
+*-solution.gu.mdx and their .tex counterparts) under content/, grouped by
+subject, exam session and language, with En/Gu sibling pairs and mtimes.
+
+Scripts used to rglob the whole content tree (images, PDFs, generated TeX)
+and regex-match every name on each run. The index keeps each directory's
+subdirectories and solution file names keyed by the directory's mtime, so a
+refresh only re-lists directories whose entries changed; everything else
+costs one stat per directory and per solution file.
+
+Usage:
+    # Refresh and summarize the index
+    python3 solution_index.py
+
+    # Solution files of one subject
+    python3 solution_index.py --subject 1333203
+
+    # In a script
+    from solution_index import load_solution_index
+    index = load_solution_index()
+    for english, gujarati in index.pairs(under=some_dir): ...
+"""
+
+import sys
+import os
+import re
+import argparse
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from cache_utils import get_cache_dir, hash_bytes, load_json, save_json
+from refactor_pandoc_latex import get_project_root
+
+
+# Bump when the index layout or file classification changes
+DISCOVERY_VERSION = 1
+CONTENT_DIR = get_project_root() / 'content'
+SOLUTION_RE = re.compile(r'-solution(\.gu)?\.(mdx|tex)$')
+SESSION_RE = re.compile(r'(summer|winter)-(\d{4})', re.IGNORECASE)
+SUBJECT_RE = re.compile(r'^([A-Za-z]*\d{6,})-')
+
+
+def is_solution_source(name):
+    """*-solution.mdx, *-solution.gu.mdx and the matching .tex names."""
+    return SOLUTION_RE.search(name) is not None
+
+
+def classify(rel):
+    """Subject, session, language and kind of a solution file from its path."""
+    parts = rel.split('/')
+    name = parts[-1]
+    subject = None
+    for part in [name] + parts[-2::-1]:
+        match = SUBJECT_RE.match(part)
+        if match:
+            subject = match.group(1)
+            break
+    session = SESSION_RE.search(name)
+    match = SOLUTION_RE.search(name)
+    return {
+        'subject': subject or (parts[-2] if len(parts) > 1 else ''),
+        'session': f"{session.group(1).lower()}-{session.group(2)}" if session else None,
+        'language': 'gujarati' if match.group(1) else 'english',
+        'kind': match.group(2),
+    }
+
+
+def sibling_name(name):
+    """Other-language file name: x-solution.mdx <-> x-solution.gu.mdx."""
+    match = SOLUTION_RE.search(name)
+    stem = name[:match.start()]
+    return f"{stem}-solution{'' if match.group(1) else '.gu'}.{match.group(2)}"
+
+
+def _index_file(root):
+    cache_dir = get_cache_dir('discovery')
+    if Path(root).resolve() == CONTENT_DIR.resolve():
+        return cache_dir / 'solutions.json'
+    return cache_dir / f"solutions-{hash_bytes(str(Path(root).resolve()).encode('utf-8'))[:12]}.json"
+
+
+class SolutionIndex:
+    """Classified solution files under one root, with sibling pairs"""
+
+    def __init__(self, root, files):
+        self.root = Path(root).resolve()
+        self.entries = files  # rel posix path -> {subject, session, language, kind, mtime_ns, sibling}
+
+    def path(self, rel):
+        return self.root / rel
+
+    def _rel_prefix(self, under):
+        if under is None:
+            return ''
+        try:
+            rel = Path(under).resolve().relative_to(self.root).as_posix()
+        except ValueError:
+            return None
+        return '' if rel == '.' else rel + '/'
+
+    def covers(self, path):
+        """True if path lies inside the indexed root."""
+        return self._rel_prefix(path) is not None
+
+    def select(self, under=None, kind='mdx', language=None, subject=None):
+        """Sorted relative paths of matching solution files."""
+        prefix = self._rel_prefix(under)
+        if prefix is None:
+            return []
+        return sorted(rel for rel, e in self.entries.items()
+                      if rel.startswith(prefix)
+                      and (kind is None or e['kind'] == kind)
+                      and (language is None or e['language'] == language)
+                      and (subject is None or e['subject'] == subject))
+
+    def files(self, under=None, kind='mdx', language=None, subject=None):
+        """Sorted absolute Paths of matching solution files."""
+        return [self.root / rel for rel in self.select(under, kind, language, subject)]
+
+    def pairs(self, under=None, kind='mdx', subject=None):
+        """(English Path or None, Gujarati Path or None) for every exam paper."""
+        pairs = []
+        for rel in self.select(under, kind, None, subject):
+            entry = self.entries[rel]
+            sibling = entry['sibling']
+            if entry['language'] == 'english':
+                pairs.append((self.root / rel, self.root / sibling if sibling else None))
+            elif not sibling:
+                pairs.append((None, self.root / rel))
+        return pairs
+
+    def grouped(self, kind='mdx'):
+        """{subject: {session: {language: Path}}}"""
+        groups = defaultdict(lambda: defaultdict(dict))
+        for rel in self.select(kind=kind):
+            entry = self.entries[rel]
+            groups[entry['subject']][entry['session'] or rel][entry['language']] = self.root / rel
+        return groups
+
+
+def _scan(root, rel_dir, cached_dirs, new_dirs, stats, predicate):
+    path = os.path.join(root, rel_dir) if rel_dir else root
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return
+    cached = cached_dirs.get(rel_dir)
+    if cached and cached['mtime_ns'] == mtime:
+        subdirs, names = cached['subdirs'], cached['files']
+    else:
+        subdirs, names = [], []
+        stats['listed'] += 1
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.name.startswith('.') or entry.name == 'node_modules':
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.name)
+                    elif predicate(entry.name):
+                        names.append(entry.name)
+        except OSError:
+            return
+        subdirs.sort()
+        names.sort()
+    new_dirs[rel_dir] = {'mtime_ns': mtime, 'subdirs': subdirs, 'files': names}
+    for sub in subdirs:
+        _scan(root, f"{rel_dir}/{sub}" if rel_dir else sub, cached_dirs, new_dirs, stats, predicate)
+
+
+def scan_directories(root, cached_dirs, predicate=is_solution_source):
+    """
+    Walk root, reusing cached listings of directories whose mtime is unchanged.
+
+    Returns:
+        Tuple of ({rel_dir: {mtime_ns, subdirs, files}}, number of directories re-listed)
+    """
+    stats = {'listed': 0}
+    dirs = {}
+    _scan(str(root), '', cached_dirs, dirs, stats, predicate)
+    return dirs, stats['listed']
+
+
+def refresh_solution_index(root=CONTENT_DIR):
+    """
+    Refresh the on-disk index for root, re-listing only changed directories.
+
+    Returns:
+        Tuple of (SolutionIndex, stats dict with dirs, listed, files)
+    """
+    root = Path(root).resolve()
+    index_file = _index_file(root)
+    cached = load_json(index_file)
+    if not cached or cached.get('version') != DISCOVERY_VERSION:
+        cached = {'dirs': {}, 'files': {}}
+
+    dirs, listed = scan_directories(root, cached['dirs'])
+    stats = {'listed': listed}
+
+    files = {}
+    for rel_dir, listing in dirs.items():
+        names = set(listing['files'])
+        for name in listing['files']:
+            rel = f"{rel_dir}/{name}" if rel_dir else name
+            try:
+                mtime = os.stat(root / rel).st_mtime_ns
+            except OSError:
+                continue
+            sibling = sibling_name(name)
+            files[rel] = {
+                **classify(rel),
+                'mtime_ns': mtime,
+                'sibling': (f"{rel_dir}/{sibling}" if rel_dir else sibling) if sibling in names else None,
+            }
+
+    if dirs != cached['dirs'] or files != cached['files']:
+        save_json(index_file, {'version': DISCOVERY_VERSION, 'root': str(root), 'dirs': dirs, 'files': files})
+    stats.update(dirs=len(dirs), files=len(files))
+    return SolutionIndex(root, files), stats
+
+
+_loaded = {}
+
+
+def load_solution_index(root=CONTENT_DIR):
+    """Refreshed index for root, shared by every caller in the process."""
+    key = str(Path(root).resolve())
+    if key not in _loaded:
+        _loaded[key] = refresh_solution_index(root)[0]
+    return _loaded[key]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Refresh and query the solution file discovery index')
+    parser.add_argument('root', nargs='?', default=str(CONTENT_DIR), help='Content directory (default: content/)')
+    parser.add_argument('--subject', help='List the solution files of one subject')
+    parser.add_argument('--kind', default='mdx', choices=['mdx', 'tex'], help='Source kind (default: mdx)')
+    args = parser.parse_args()
+
+    index, stats = refresh_solution_index(args.root)
+    print(f"🗂️  Indexed {stats['files']} solution files in {stats['dirs']} directories "
+          f"({stats['listed']} re-listed)")
+
+    if args.subject:
+        for english, gujarati in index.pairs(kind=args.kind, subject=args.subject):
+            print(f"   {english.name if english else '—'}  ↔  {gujarati.name if gujarati else '—'}")
+        return
+
+    groups = index.grouped(args.kind)
+    unpaired = [pair for pair in index.pairs(kind=args.kind) if None in pair]
+    print(f"   {len(groups)} subjects, {sum(len(s) for s in groups.values())} exam sessions, "
+          f"{len(unpaired)} papers without a translation")
+    for english, gujarati in unpaired:
+        present = english or gujarati
+        print(f"   ⚠️  {present.relative_to(index.root)} has no {'Gujarati' if english else 'English'} sibling")
+
+
+if __name__ == '__main__':
+    main()
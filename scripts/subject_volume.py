@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Subject Volumes: All Papers of a Subject in One PDF
+Building every paper of a subject separately pays for the preamble, Pandoc
+and two XeLaTeX passes once per paper. A volume converts each paper to its
+refactored LaTeX once, then assembles all papers of one subject and language
+into a single master document with one chapter per exam session and a
+combined table of contents, so one XeLaTeX run replaces dozens.
+
+Each paper's refactored body is cached in .cache/volume, keyed by the MDX
+bytes, its metadata and the conversion scripts, so rebuilding a volume after
+editing one paper only runs Pandoc and the refactor for that paper. Mermaid
+diagrams and print-resolution figures come from their own caches.
+
+Papers are ordered by exam session. Their labels (q1a, q2b, ...) are
+prefixed with the session so they stay unique in the volume. The volume is
+written next to the papers as <code>-solutions-volume.tex (.gu.tex for
+Gujarati).
+
+Usage:
+    # English and Gujarati volumes for every subject under a directory
+    python3 subject_volume.py <directory> [--language english|gujarati]
+
+    # LaTeX only, or with the PDF options of convert_mdx_to_pdf
+    python3 subject_volume.py <directory> --no-pdf
+    python3 subject_volume.py <directory> --deterministic --optimize
+
+    # From the converter
+    python3 convert_mdx_to_pdf.py <directory> --volume
+"""
+
+import sys
+import os
+import re
+import time
+import argparse
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from cache_utils import get_cache_dir, hash_bytes, hash_file, load_json, save_json
+from content_snapshot import read_text
+from frontmatter_index import source_metadata
+from convert_mdx_to_pdf import (find_solution_files, output_paths, process_files, process_mermaid_blocks,
+                                remove_mermaid_pdfs, run_xelatex)
+from image_cache import normalize_images, remove_normalized_images
+from reproducible_pdf import deterministic_env, normalize_pdf_id
+from pdf_optimize import optimize_pdf
+from question_fragments import pipeline_hash
+from job_limits import admission
+from build_metrics import cache_lookup
+
+
+# Bump when the cached fragment layout changes
+VOLUME_VERSION = 1
+# The table of contents shifts page numbers, so a third pass settles them
+XELATEX_PASSES = 3
+SEASON_ORDER = {'summer': 0, 'winter': 1}
+
+INPUT_RE = re.compile(r'\\input\{([^}]+)\}')
+LABEL_RE = re.compile(r'\\(label|ref|pageref|autoref|eqref)\{([^}]+)\}')
+HYPERREF_RE = re.compile(r'\\hyperref\[([^\]]+)\]')
+SECTION_RE = re.compile(r'^\\section\*\{([^{}]*)\}', re.MULTILINE)
+LATEX_SPECIALS_RE = re.compile(r'([&%$#_])')
+
+
+def latex_escape(text):
+    """Escape the LaTeX specials that occur in titles and subject names."""
+    return LATEX_SPECIALS_RE.sub(r'\\\1', text)
+
+
+def fragment_key(mdx_path, metadata):
+    parts = [str(VOLUME_VERSION), pipeline_hash(), hash_file(mdx_path),
+             repr(sorted((k, str(v)) for k, v in metadata.items()))]
+    return hash_bytes('\0'.join(parts).encode('utf-8'))
+
+
+def prefix_labels(body, prefix):
+    """Make a paper's labels (q1a, ...) and references to them unique within a larger document."""
+    body = LABEL_RE.sub(lambda m: f"\\{m.group(1)}{{{prefix}-{m.group(2)}}}", body)
+    return HYPERREF_RE.sub(lambda m: f"\\hyperref[{prefix}-{m.group(1)}]", body)
+
+
+def split_document(tex):
+    """(preamble lines after \\documentclass, body) of a refactored paper."""
+    head, _, rest = tex.partition('\\begin{document}')
+    preamble = [line for line in head.splitlines()
+                if line.strip() and not line.lstrip().startswith('\\documentclass')]
+    body = rest.rsplit('\\end{document}', 1)[0]
+    return preamble, body.strip('\n')
+
+
+def materialize_assets(mdx_path):
+    """Link the paper's cached Mermaid PDFs and figures back into its directory."""
+    content = re.sub(r'```goat', r'```text', read_text(mdx_path))
+    content, _ = process_mermaid_blocks(content, mdx_path.parent)
+    normalize_images(content, mdx_path.parent, mdx_path.parent)
+
+
+def paper_sort_key(paper):
+    metadata = paper['metadata']
+    return (metadata.get('year') or '9999', SEASON_ORDER.get(metadata.get('season'), 2), paper['mdx'].name)
+
+
+def paper_heading(metadata, mdx_path):
+    if metadata.get('season') and metadata.get('year'):
+        return f"{metadata['season'].capitalize()} {metadata['year']}"
+    return metadata.get('title') or mdx_path.name
+
+
+def collect_fragments(files, jobs=1):
+    """
+    Refactored LaTeX of each paper, from cache or by converting it.
+
+    Returns:
+        Tuple of (list of paper dicts, reused count, failed Paths)
+    """
+    cache_dir = get_cache_dir('volume')
+    papers, missing = [], []
+    for mdx_path in files:
+        metadata = source_metadata(mdx_path)
+        key = fragment_key(mdx_path, metadata)
+        fragment = load_json(cache_dir / f"{key}.json")
+        paper = {'mdx': mdx_path, 'metadata': metadata, 'key': key, 'fragment': fragment}
+        papers.append(paper)
+        cache_lookup('volume-paper', fragment is not None)
+        if fragment is None:
+            missing.append(paper)
+        else:
+            materialize_assets(mdx_path)
+
+    failed = []
+    if missing:
+        # LaTeX only: the papers' Mermaid PDFs and figures stay for the volume compile
+        # A failed conversion may leave an older -pandoc.tex behind, so only
+        # the papers that converted in this run are read and cached
+        process_files([p['mdx'] for p in missing], generate_pdf=False, jobs=jobs, failed=failed)
+        for paper in missing:
+            if paper['mdx'] in failed:
+                continue
+            tex_path = output_paths(paper['mdx'])[0]
+            preamble, body = split_document(read_text(tex_path))
+            paper['fragment'] = {'preamble': preamble, 'body': body}
+            save_json(cache_dir / f"{paper['key']}.json", paper['fragment'])
+
+    papers = [p for p in papers if p['fragment'] is not None and p['mdx'] not in failed]
+    return papers, len(files) - len(missing), failed
+
+
+def _relative(path, start):
+    return Path(os.path.relpath(path, start)).as_posix()
+
+
+def merged_preamble(sources, out_dir):
+    """
+    One preamble for a document built from several papers' LaTeX.
+
+    Args:
+        sources: (paper directory, preamble lines) pairs
+        out_dir: Directory the combined document is compiled in
+
+    Returns:
+        Preamble lines with \\input paths rebased onto out_dir and a
+        \\graphicspath covering every paper's figures and diagrams
+    """
+    preamble = []
+    graphic_dirs = []
+    for paper_dir, lines in sources:
+
+        def rebase(match):
+            target = match.group(1)
+            if not os.path.isabs(target):
+                target = _relative((Path(paper_dir) / target).resolve(), out_dir)
+            return f"\\input{{{target}}}"
+
+        for line in lines:
+            line = INPUT_RE.sub(rebase, line)
+            if line not in preamble:
+                preamble.append(line)
+
+        # Figures and diagrams are referenced relative to each paper's directory
+        rel = _relative(paper_dir, out_dir)
+        rel = './' if rel == '.' else rel + '/'
+        if rel not in graphic_dirs:
+            graphic_dirs.append(rel)
+
+    preamble.append(r"\graphicspath{%s}" % ''.join(f"{{{d}}}" for d in graphic_dirs))
+    return preamble
+
+
+def assemble_volume(papers, volume_dir, subject, subject_name):
+    """LaTeX source of a volume of papers, already in chapter order."""
+    preamble = merged_preamble([(p['mdx'].parent, p['fragment']['preamble']) for p in papers], volume_dir)
+    title = latex_escape(subject_name or f"{subject} Solutions")
+    parts = [
+        r"\documentclass[10pt,a4paper]{article}",
+        *preamble,
+        "",
+        r"\begin{document}",
+        "",
+        r"\begin{center}",
+        r"{\Huge\bfseries\color{headcolor} %s}\\[5pt]" % title,
+        r"{\LARGE %s -- Solutions Volume}\\[3pt]" % latex_escape(subject),
+        r"{\normalsize\textit{%d exam papers with detailed solutions}}" % len(papers),
+        r"\end{center}",
+        "",
+        r"\tableofcontents",
+    ]
+
+    for paper in papers:
+        heading = latex_escape(paper_heading(paper['metadata'], paper['mdx']))
+        prefix = f"{paper['metadata'].get('season') or ''}{paper['metadata'].get('year') or ''}" or paper['key'][:8]
+        body = prefix_labels(paper['fragment']['body'], prefix)
+        body = SECTION_RE.sub(lambda m: f"{m.group(0)}\\addcontentsline{{toc}}{{subsection}}{{{m.group(1)}}}", body)
+        parts += [
+            "",
+            r"\clearpage",
+            r"\phantomsection",
+            r"\addcontentsline{toc}{section}{%s}" % heading,
+            r"\markboth{%s}{%s}" % (heading, heading),
+            f"% {paper['mdx'].name}",
+            body,
+        ]
+
+    parts += ["", r"\end{document}", ""]
+    return '\n'.join(parts)
+
+
+def volume_paths(volume_dir, subject, language):
+    suffix = '.gu' if language == 'gujarati' else ''
+    tex_path = Path(volume_dir) / f"{subject}-solutions-volume{suffix}.tex"
+    return tex_path, tex_path.with_suffix('.pdf')
+
+
+def compile_volume(tex_path, metadata=None, keep_aux=False, deterministic=False, optimize=False,
+                   passes=XELATEX_PASSES):
+    """Run XeLaTeX on an assembled document; returns True if the PDF was produced."""
+    pdf_path = tex_path.with_suffix('.pdf')
+    env = deterministic_env(metadata) if deterministic else None
+    with admission():
+        generated = run_xelatex(tex_path, passes=passes, env=env, description=f"Compiling {tex_path.name}")
+    if not generated:
+        print(f"❌ ERROR: PDF was not generated")
+        return False
+    if deterministic:
+        normalize_pdf_id(pdf_path)
+    if optimize:
+        try:
+            before, after = optimize_pdf(pdf_path)
+            if after < before:
+                print(f"🗜️  Optimized PDF: {before / 1024:.0f} KiB -> {after / 1024:.0f} KiB")
+        except Exception as e:
+            print(f"⚠️  WARNING: PDF optimization failed, keeping the XeLaTeX output: {e}")
+
+    if not keep_aux:
+        for ext in ('.aux', '.log', '.out', '.toc', '.lof', '.lot'):
+            aux_file = tex_path.with_suffix(ext)
+            if aux_file.exists():
+                aux_file.unlink()
+    return True
+
+
+def build_volumes(files, generate_pdf=True, keep_aux=False, jobs=1, deterministic=False, optimize=False,
+                  language=None):
+    """
+    Build one volume per subject and language from solution MDX files.
+
+    Returns:
+        Tuple of (success_count, failure_count) over volumes
+    """
+    groups = defaultdict(list)
+    for mdx_path in files:
+        metadata = source_metadata(mdx_path)
+        if language and metadata['language'] != language:
+            continue
+        groups[(metadata['subject'] or mdx_path.name.split('-')[0], metadata['language'])].append(mdx_path)
+
+    success_count = failure_count = 0
+    paper_dirs = set()
+    for (subject, lang), group in sorted(groups.items()):
+        start = time.perf_counter()
+        print(f"\n{'#'*60}")
+        print(f"VOLUME: {subject} ({lang}), {len(group)} paper(s)")
+        print(f"{'#'*60}\n")
+
+        papers, reused, failed = collect_fragments(group, jobs=jobs)
+        for mdx_path in failed:
+            print(f"⚠️  Left out (conversion failed): {mdx_path.name}")
+        if not papers:
+            failure_count += 1
+            continue
+        papers.sort(key=paper_sort_key)
+        paper_dirs.update(p['mdx'].parent for p in papers)
+
+        volume_dir = Path(os.path.commonpath([str(p['mdx'].parent) for p in papers]))
+        tex_path, pdf_path = volume_paths(volume_dir, subject, lang)
+        with open(tex_path, 'w', encoding='utf-8') as f:
+            f.write(assemble_volume(papers, volume_dir, subject, papers[0]['metadata'].get('subject_name')))
+        print(f"📚 Assembled {tex_path.name}: {len(papers)} paper(s), {reused} from cache")
+
+        ok = True
+        if generate_pdf:
+            # The newest paper's date pins the volume's timestamps
+            ok = compile_volume(tex_path, papers[-1]['metadata'], keep_aux=keep_aux,
+                                deterministic=deterministic, optimize=optimize)
+        if ok:
+            success_count += 1
+            print(f"✅ {pdf_path if generate_pdf else tex_path} ({time.perf_counter() - start:.1f}s)")
+        else:
+            failure_count += 1
+
+    # Diagrams and figures are embedded now
+    if generate_pdf and not keep_aux:
+        for work_dir in sorted(paper_dirs):
+            remove_mermaid_pdfs(work_dir)
+            remove_normalized_images(work_dir)
+    return success_count, failure_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build one PDF per subject and language from all its papers')
+    parser.add_argument('path', help='Subject directory (or any directory of solution files)')
+    parser.add_argument('--language', choices=('english', 'gujarati'), help='Only build this language')
+    parser.add_argument('--no-pdf', action='store_true', help='Assemble the volume LaTeX only')
+    parser.add_argument('--keep-aux', action='store_true', help='Keep auxiliary files (.aux, .log, etc.)')
+    parser.add_argument('--deterministic', action='store_true', help='Build byte-reproducible PDFs')
+    parser.add_argument('--optimize', action='store_true', help='Recompress, pack and linearize the PDFs')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='Parallel workers for papers not in the cache (0 = one per CPU)')
+    args = parser.parse_args()
+
+    files = find_solution_files(Path(args.path).resolve())
+    if not files:
+        print("❌ No files to process!")
+        sys.exit(1)
+
+    success_count, failure_count = build_volumes(
+        files,
+        generate_pdf=not args.no_pdf,
+        keep_aux=args.keep_aux,
+        jobs=args.jobs or os.cpu_count() or 1,
+        deterministic=args.deterministic,
+        optimize=args.optimize,
+        language=args.language
+    )
+    print(f"\n📚 Volumes: {success_count} built, {failure_count} failed")
+    sys.exit(0 if failure_count == 0 else 1)
+
+
+if __name__ == '__main__':
+    main()
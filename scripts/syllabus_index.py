@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Precompiled Syllabus Topic Index
+Compiles a subject syllabus (<code>.json) once into normalized
+unit -> topics -> subtopics lookups plus a single multi-pattern matcher
+(Aho-Corasick, see keyword_pack.PhraseMatcher) over every topic and
+subtopic title, whose tables are stored with the index.
+
+Generators previously scanned underpinningTheory for every question and
+re-normalized every title each time. With the index, topic tagging is one
+pass over the question text. The compiled form is cached on disk and
+invalidated by the syllabus file hash.
+
+Usage:
+    python3 syllabus_index.py <syllabus.json> ["question text to tag"]
+"""
+
+import sys
+import os
+import re
+import argparse
+import unicodedata
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from cache_utils import get_cache_dir, hash_file, load_json, save_json
+from keyword_pack import PhraseMatcher
+
+
+# Bump when normalize_text() or the compiled layout changes
+INDEX_VERSION = 4
+ROMAN_UNITS = {'I': '1', 'II': '2', 'III': '3', 'IV': '4', 'V': '5', 'VI': '6', 'VII': '7', 'VIII': '8'}
+
+
+def normalize_text(text):
+    """Lowercase, NFKD-normalize and replace punctuation with spaces (generator-compatible)."""
+    text = unicodedata.normalize('NFKD', text.lower())
+    text = re.sub(r'\s+', ' ', text).strip()
+    text = re.sub(r'[^\w\s]', ' ', text)
+    return text
+
+
+def unit_key(unit):
+    """Canonical unit key: 'Unit-I', 'Unit-1', 'I' and '1' all become '1'."""
+    value = re.sub(r'^unit[\s\-–—]*', '', str(unit).strip(), flags=re.IGNORECASE)
+    return ROMAN_UNITS.get(value.upper(), value)
+
+
+def compile_syllabus(data):
+    """Compile parsed syllabus JSON into the cacheable index layout."""
+    units = []
+    unit_lookup = {}
+    phrases = []
+    phrase_ids = {}
+    entries = []  # [unit_index, topic_index, subtopic_index or -1, phrase_id]
+
+    def phrase_id(normalized):
+        if normalized not in phrase_ids:
+            phrase_ids[normalized] = len(phrases)
+            phrases.append(normalized)
+        return phrase_ids[normalized]
+
+    for u_index, unit in enumerate(data.get('underpinningTheory', [])):
+        unit_lookup.setdefault(unit_key(unit.get('unitNumber', '')), u_index)
+        topics = []
+        for t_index, topic in enumerate(unit.get('topics', [])):
+            if isinstance(topic, str):
+                topic = {'title': topic}
+            title = topic.get('title', '')
+            subtopics = [s if isinstance(s, str) else s.get('title', '') for s in topic.get('subtopics', [])]
+            topics.append({'title': title, 'subtopics': subtopics})
+            normalized = normalize_text(title)
+            if normalized:
+                entries.append([u_index, t_index, -1, phrase_id(normalized)])
+            for s_index, subtopic in enumerate(subtopics):
+                normalized = normalize_text(subtopic)
+                if normalized:
+                    entries.append([u_index, t_index, s_index, phrase_id(normalized)])
+        units.append({'unitNumber': unit.get('unitNumber', ''), 'title': unit.get('unitTitle', ''), 'topics': topics})
+
+    return {
+        'version': INDEX_VERSION,
+        'units': units,
+        'unit_lookup': unit_lookup,
+        'phrases': phrases,
+        'entries': entries,
+        # Aho-Corasick tables, so loading the cached index does not rebuild the automaton
+        'matcher': PhraseMatcher(phrases).tables(),
+    }
+
+
+class SyllabusIndex:
+    """Unit/topic lookups and one-pass topic matching for a compiled syllabus"""
+
+    def __init__(self, compiled):
+        self.units = compiled['units']
+        self._unit_lookup = compiled['unit_lookup']
+        self._unit_keys = {u_index: key for key, u_index in self._unit_lookup.items()}
+        self.phrases = compiled['phrases']
+        self._matcher = PhraseMatcher.from_tables(self.phrases, compiled['matcher'])
+        self._entries_by_phrase = [[] for _ in self.phrases]
+        for entry in compiled['entries']:
+            self._entries_by_phrase[entry[3]].append(entry)
+
+    def unit(self, unit):
+        """Unit dict (title, topics) for 'Unit-I' / 'Unit-1' / 'I' / '1', or {}."""
+        u_index = self._unit_lookup.get(unit_key(unit))
+        return self.units[u_index] if u_index is not None else {}
+
+    def matched_phrases(self, normalized_text):
+        """IDs of all phrases that occur as substrings of the text, in one scan."""
+        return self._matcher.found(normalized_text)
+
+    def unit_matches(self, normalized_text):
+        """
+        Like matches(), for every unit at once from a single scan.
+
+        Returns:
+            Dict of canonical unit key -> list of (kind, title)
+        """
+        grouped = {}
+        for kind_title, u_index in self._hits(normalized_text, None):
+            key = self._unit_keys.get(u_index)
+            if key is not None:
+                grouped.setdefault(key, []).append(kind_title)
+        return grouped
+
+    def matches(self, normalized_text, unit=None):
+        """
+        Topic/subtopic entries found in the text, in syllabus order.
+
+        Returns:
+            List of (kind, title) where kind is 'topic' or 'subtopic'
+        """
+        u_filter = self._unit_lookup.get(unit_key(unit), -1) if unit is not None else None
+        return [kind_title for kind_title, _ in self._hits(normalized_text, u_filter)]
+
+    def _hits(self, normalized_text, u_filter):
+        hits = []
+        for pid in self.matched_phrases(normalized_text):
+            for entry in self._entries_by_phrase[pid]:
+                if u_filter is None or entry[0] == u_filter:
+                    hits.append(entry)
+        hits.sort(key=lambda e: (e[0], e[1], e[2]))
+
+        results = []
+        for u, t_index, s_index, _ in hits:
+            topic = self.units[u]['topics'][t_index]
+            if s_index < 0:
+                results.append((('topic', topic['title']), u))
+            else:
+                results.append((('subtopic', topic['subtopics'][s_index]), u))
+        return results
+
+
+def load_syllabus_index(syllabus_path):
+    """
+    Load the compiled index for a syllabus file, compiling it if the cached
+    copy is missing or the syllabus content has changed.
+    """
+    syllabus_path = Path(syllabus_path)
+    digest = hash_file(syllabus_path)
+    cache_file = get_cache_dir('syllabus') / f"{syllabus_path.stem}.json"
+
+    compiled = load_json(cache_file)
+    if not compiled or compiled.get('version') != INDEX_VERSION or compiled.get('source_hash') != digest:
+        data = load_json(syllabus_path)
+        if data is None:
+            raise ValueError(f"Could not read syllabus: {syllabus_path}")
+        compiled = compile_syllabus(data)
+        compiled['source_hash'] = digest
+        save_json(cache_file, compiled)
+    return SyllabusIndex(compiled)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile a syllabus topic index and optionally tag a question')
+    parser.add_argument('syllabus', help='Path to <code>.json syllabus')
+    parser.add_argument('question', nargs='?', help='Question text to tag')
+    args = parser.parse_args()
+
+    index = load_syllabus_index(args.syllabus)
+    topic_count = sum(len(u['topics']) for u in index.units)
+    print(f"✅ Indexed {len(index.units)} units, {topic_count} topics, {len(index.phrases)} phrases")
+
+    if args.question:
+        for kind, title in index.matches(normalize_text(args.question)):
+            print(f"   {kind}: {title}")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,11 +4,17 @@ import subprocess
 import difflib
 import os
 import argparse
+from pathlib import Path
+
+# Files are read through the content snapshot when one has been built
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from content_snapshot import open_text
+from solution_index import load_solution_index
 
 def check_line_counts(file_en, file_gu):
     print(f"\n--- Checking Line Counts ---")
-    with open(file_en, 'r') as f: lines_en = f.readlines()
-    with open(file_gu, 'r') as f: lines_gu = f.readlines()
+    with open_text(file_en) as f: lines_en = f.readlines()
+    with open_text(file_gu) as f: lines_gu = f.readlines()
     
     count_en = len(lines_en)
     count_gu = len(lines_gu)
@@ -25,7 +31,7 @@ def check_line_counts(file_en, file_gu):
 
 def extract_structure(filename):
     structure = []
-    with open(filename, 'r') as f:
+    with open_text(filename) as f:
         for i, line in enumerate(f, 1):
             # Match sections, subsections, subsubsections
             match = re.search(r'\\(section|subsection|subsubsection|paragraph|subparagraph)\{([^}]*)\}', line)
@@ -74,7 +80,7 @@ def check_structure(file_en, file_gu):
 def check_content_compliance(filename):
     print(f"\n--- Checking Content Compliance: {filename} ---")
     errors = 0
-    with open(filename, 'r') as f:
+    with open_text(filename) as f:
         lines = f.readlines()
         
     for i, line in enumerate(lines, 1):
@@ -110,7 +116,7 @@ def check_structure_strict(filename):
     
     current_state = "ROOT"
     
-    with open(filename, 'r') as f:
+    with open_text(filename) as f:
         for i, line in enumerate(f, 1):
             line = line.strip()
             if line.startswith('\\section{'):
@@ -142,7 +148,7 @@ def check_word_counts(filename):
         7: (200, 300)
     }
     
-    with open(filename, 'r') as f:
+    with open_text(filename) as f:
         content = f.read()
 
     subsections = re.split(r'\\subsection\{', content)
@@ -189,7 +195,7 @@ def check_word_counts(filename):
 def check_toc_setup(filename):
     print(f"\n--- Checking TOC Setup: {filename} ---")
     errors = 0
-    with open(filename, 'r') as f:
+    with open_text(filename) as f:
         content = f.read()
     
     # Check for tocdepth=5
@@ -219,7 +225,7 @@ def check_toc_setup(filename):
 def check_mnemonics(filename):
     print(f"\n--- Checking Mnemonics: {filename} ---")
     warnings = 0
-    with open(filename, 'r') as f:
+    with open_text(filename) as f:
         content = f.read()
     
     # Find all subsections
@@ -246,7 +252,7 @@ def check_mnemonics(filename):
 def check_question_structure(filename):
     print(f"\n--- Checking Question Structure Pattern: {filename} ---")
     errors = 0
-    with open(filename, 'r') as f:
+    with open_text(filename) as f:
         lines = f.readlines()
     
     subsection_lines = []
@@ -277,7 +283,7 @@ def check_question_structure(filename):
 
 def check_hierarchy_levels(filename):
     print(f"\n--- Checking 5-Level Hierarchy: {filename} ---")
-    with open(filename, 'r') as f:
+    with open_text(filename) as f:
         content = f.read()
     
     levels = {
@@ -304,7 +310,7 @@ def check_caption_presence(filename):
     """Check that all tables, figures, and listings have captions."""
     print(f"\n--- Checking Caption Presence: {filename} ---")
     errors = 0
-    with open(filename, 'r') as f:
+    with open_text(filename) as f:
         content = f.read()
     
     # Check tables have \caption{}
@@ -340,7 +346,7 @@ def check_caption_positions(filename):
     """Check that table captions are at TOP and figure captions are at BOTTOM."""
     print(f"\n--- Checking Table/Figure Caption Positions: {filename} ---")
     warnings = 0
-    with open(filename, 'r') as f:
+    with open_text(filename) as f:
         content = f.read()
     
     # Find tables and check caption position
@@ -383,7 +389,7 @@ def check_caption_positions(filename):
 def check_custom_commands(filename):
     print(f"\n--- Checking for Custom Commands: {filename} ---")
     errors = 0
-    with open(filename, 'r') as f:
+    with open_text(filename) as f:
         content = f.read()
     
     # Check for \newcommand definitions
@@ -408,7 +414,7 @@ def check_custom_commands(filename):
 def check_document_structure(filename):
     print(f"\n--- Checking Document Structure: {filename} ---")
     errors = 0
-    with open(filename, 'r') as f:
+    with open_text(filename) as f:
         content = f.read()
     
     required_elements = [
@@ -435,7 +441,7 @@ def check_document_structure(filename):
 def check_pdf_metadata(filename):
     print(f"\n--- Checking PDF Metadata: {filename} ---")
     warnings = 0
-    with open(filename, 'r') as f:
+    with open_text(filename) as f:
         content = f.read()
     
     if r'\hypersetup{' not in content:
@@ -457,7 +463,7 @@ def check_pdf_metadata(filename):
 
 def check_preamble_usage(filename, language="English"):
     print(f"\n--- Checking Preamble Usage: {filename} ({language}) ---")
-    with open(filename, 'r') as f:
+    with open_text(filename) as f:
         content = f.read()
     
     expected_preamble = 'preamble.gu.tex' if language == "Gujarati" else 'preamble.tex'
@@ -476,7 +482,7 @@ def check_preamble_usage(filename, language="English"):
 def check_list_types(filename):
     print(f"\n--- Checking Semantic List Types: {filename} ---")
     warnings = 0
-    with open(filename, 'r') as f:
+    with open_text(filename) as f:
         content = f.read()
     
     # Check for proper list usage patterns
@@ -505,7 +511,7 @@ def check_list_types(filename):
 def check_textbf_after_subsection(filename):
     print(f"\n--- Checking \\textbf{{}} After Subsections: {filename} ---")
     warnings = 0
-    with open(filename, 'r') as f:
+    with open_text(filename) as f:
         lines = f.readlines()
     
     for i, line in enumerate(lines):
@@ -535,7 +541,7 @@ def check_textbf_after_subsection(filename):
 def check_section_numbering(filename):
     print(f"\n--- Checking Section Numbering Pattern: {filename} ---")
     errors = 0
-    with open(filename, 'r') as f:
+    with open_text(filename) as f:
         content = f.read()
     
     sections = re.findall(r'\\section\{([^}]+)\}', content)
@@ -557,7 +563,7 @@ def check_section_numbering(filename):
 def check_subsection_labeling(filename):
     print(f"\n--- Checking Subsection Labeling: {filename} ---")
     warnings = 0
-    with open(filename, 'r') as f:
+    with open_text(filename) as f:
         content = f.read()
     
     subsections = re.findall(r'\\subsection\{([^}]+)\}', content)
@@ -585,9 +591,9 @@ def check_list_count_parity(file_en, file_gu):
     print(f"\n--- Checking List Count Parity (En vs Gu) ---")
     warnings = 0
     
-    with open(file_en, 'r') as f:
+    with open_text(file_en) as f:
         content_en = f.read()
-    with open(file_gu, 'r') as f:
+    with open_text(file_gu) as f:
         content_gu = f.read()
     
     list_types = ['description', 'itemize', 'enumerate']
@@ -610,9 +616,9 @@ def check_list_count_parity(file_en, file_gu):
 def check_table_count_parity(file_en, file_gu):
     print(f"\n--- Checking Table Count Parity (En vs Gu) ---")
     
-    with open(file_en, 'r') as f:
+    with open_text(file_en) as f:
         content_en = f.read()
-    with open(file_gu, 'r') as f:
+    with open_text(file_gu) as f:
         content_gu = f.read()
     
     tables_en = len(re.findall(r'\\begin\{table\}', content_en))
@@ -628,9 +634,9 @@ def check_table_count_parity(file_en, file_gu):
 def check_figure_count_parity(file_en, file_gu):
     print(f"\n--- Checking Figure Count Parity (En vs Gu) ---")
     
-    with open(file_en, 'r') as f:
+    with open_text(file_en) as f:
         content_en = f.read()
-    with open(file_gu, 'r') as f:
+    with open_text(file_gu) as f:
         content_gu = f.read()
     
     figures_en = len(re.findall(r'\\begin\{figure\}', content_en))
@@ -738,7 +744,7 @@ def check_filename_convention(filename):
 def check_content_after_toc(filename):
     print(f"\n--- Checking Content After TOC: {filename} ---")
     
-    with open(filename, 'r') as f:
+    with open_text(filename) as f:
         content = f.read()
     
     # Find position of \tableofcontents
@@ -761,7 +767,7 @@ def check_content_after_toc(filename):
 def check_preamble_path(filename, language="English"):
     print(f"\n--- Checking Preamble Path: {filename} ({language}) ---")
     
-    with open(filename, 'r') as f:
+    with open_text(filename) as f:
         content = f.read()
     
     # Check for \input command
@@ -791,7 +797,7 @@ def check_preamble_path(filename, language="English"):
 def check_table_format(filename):
     print(f"\n--- Checking Table Format Standards: {filename} ---")
     warnings = 0
-    with open(filename, 'r') as f:
+    with open_text(filename) as f:
         content = f.read()
     
     # Find all table environments
@@ -813,7 +819,7 @@ def check_table_format(filename):
 def check_figure_placement(filename):
     print(f"\n--- Checking Figure Placement Specifiers: {filename} ---")
     warnings = 0
-    with open(filename, 'r') as f:
+    with open_text(filename) as f:
         content = f.read()
     
     # Find all figure environments
@@ -834,7 +840,7 @@ def check_figure_placement(filename):
 def check_solution_content_structure(filename):
     print(f"\n--- Checking Solution Content Structure: {filename} ---")
     errors = 0
-    with open(filename, 'r') as f:
+    with open_text(filename) as f:
         content = f.read()
     
     # Find all solution blocks: from \subsubsection{Solution} to \paragraph{Mnemonic}
@@ -869,9 +875,9 @@ def check_description_item_count(file_en, file_gu):
     print(f"\n--- Checking Description List Item Counts (En vs Gu) ---")
     warnings = 0
     
-    with open(file_en, 'r') as f:
+    with open_text(file_en) as f:
         content_en = f.read()
-    with open(file_gu, 'r') as f:
+    with open_text(file_gu) as f:
         content_gu = f.read()
     
     # Extract description blocks
@@ -902,9 +908,9 @@ def check_code_math_diagram_identity(file_en, file_gu):
     print(f"\n--- Checking Code/Math/Diagram Identity (En vs Gu) ---")
     warnings = 0
     
-    with open(file_en, 'r') as f:
+    with open_text(file_en) as f:
         content_en = f.read()
-    with open(file_gu, 'r') as f:
+    with open_text(file_gu) as f:
         content_gu = f.read()
     
     # Extract code listings
@@ -967,9 +973,9 @@ def check_sectioning_line_alignment(file_en, file_gu):
     print(f"\n--- Checking Sectioning Command Line Alignment ---")
     errors = 0
     
-    with open(file_en, 'r') as f:
+    with open_text(file_en) as f:
         lines_en = f.readlines()
-    with open(file_gu, 'r') as f:
+    with open_text(file_gu) as f:
         lines_gu = f.readlines()
     
     # Define sectioning commands to track
@@ -1030,7 +1036,7 @@ def check_sectioning_line_alignment(file_en, file_gu):
 def check_smart_quotes(filename):
     print(f"\n--- Checking Smart Quotes Usage: {filename} ---")
     warnings = 0
-    with open(filename, 'r') as f:
+    with open_text(filename) as f:
         lines = f.readlines()
     
     in_lstlisting = False
@@ -1059,7 +1065,7 @@ def check_smart_quotes(filename):
 def check_marks_format(filename):
     print(f"\n--- Checking Marks Format in Subsections: {filename} ---")
     warnings = 0
-    with open(filename, 'r') as f:
+    with open_text(filename) as f:
         content = f.read()
     
     # Find all subsections
@@ -1088,7 +1094,7 @@ def check_typography(filename):
 def check_syntax(filename, language="English"):
     print(f"\n--- Checking Syntax: {filename} ({language}) ---")
     errors = 0
-    with open(filename, 'r') as f:
+    with open_text(filename) as f:
         lines = f.readlines()
     
     in_lstlisting = False
@@ -1135,18 +1141,8 @@ def run_chktex(filename):
     except FileNotFoundError:
         print("⚠️  ChkTeX not installed/found. Skipping.")
 
-if __name__ == "__main__":
-    import argparse
-    
-    parser = argparse.ArgumentParser(description='Verify GTU LaTeX Solutions.')
-    parser.add_argument('file_en', help='English Solution File (path to .tex file)')
-    parser.add_argument('file_gu', help='Gujarati Solution File (path to .gu.tex file)')
-    
-    args = parser.parse_args()
-    
-    file_en = args.file_en
-    file_gu = args.file_gu
-    
+def verify_pair(file_en, file_gu, compile_check=True):
+    """Run every check on an English/Gujarati solution pair; True if all pass."""
     print("========================================")
     print(f"      VERIFICATION REPORT               ")
     print(f" En: {file_en}")
@@ -1232,8 +1228,8 @@ if __name__ == "__main__":
     run_chktex(file_gu)
     
     # Compilation checks (optional but recommended)
-    pass_compile_en = check_compilation(file_en, "English")
-    pass_compile_gu = check_compilation(file_gu, "Gujarati")
+    pass_compile_en = check_compilation(file_en, "English") if compile_check else True
+    pass_compile_gu = check_compilation(file_gu, "Gujarati") if compile_check else True
     
     print("\n========================================")
     # ALL checks must pass (no warnings allowed)
@@ -1282,8 +1278,70 @@ if __name__ == "__main__":
     if all(all_checks):
         print("OVERALL STATUS: ✅ PASSED")
         print("\nAll quality checks passed. Solution files meet all standards.")
-        sys.exit(0)
+        return True
     else:
         print("OVERALL STATUS: ❌ FAILED")
         print("\nFix all issues above before proceeding. No warnings are allowed.")
-        sys.exit(1)
+        return False
+
+def find_tex_pairs(directory):
+    """(English, Gujarati) solution .tex pairs under a directory; papers missing a language are skipped."""
+    index = load_solution_index()
+    if index.covers(directory):
+        pairs = index.pairs(under=directory, kind='tex')
+    else:
+        pairs = []
+        for file_en in sorted(Path(directory).rglob('*-solution.tex')):
+            file_gu = file_en.with_name(file_en.name[:-len('.tex')] + '.gu.tex')
+            pairs.append((file_en, file_gu if file_gu.exists() else None))
+    return [(en, gu) for en, gu in pairs if en and gu]
+
+
+def verify_directory(directory, compile_check=True, queue=None, jobs=1):
+    """Verify every solution pair under a directory, optionally through the work queue; True if all pass."""
+    pairs = find_tex_pairs(directory)
+    if not pairs:
+        print(f"❌ No English/Gujarati solution pairs found in: {directory}")
+        return False
+    
+    failed = []
+    if queue is None:
+        for file_en, file_gu in pairs:
+            if not verify_pair(str(file_en), str(file_gu), compile_check=compile_check):
+                failed.append(file_en.name)
+    else:
+        from work_queue import open_queue, project_relative, run_batch
+        # Largest pairs first, like the PDF batch builder
+        items = [({'en': project_relative(en), 'gu': project_relative(gu), 'compile_check': compile_check},
+                  en.stat().st_size + gu.stat().st_size) for en, gu in pairs]
+        for payload, status, result, error in run_batch(open_queue(queue), 'verify', items, jobs):
+            if result:
+                print(result['log'], end='')
+            if error:
+                print(f"❌ ERROR: {error}")
+            if not (status == 'done' and result['ok']):
+                failed.append(Path(payload['en']).name)
+    
+    print("========================================")
+    print(f"Verified {len(pairs)} pair(s): {len(pairs) - len(failed)} passed, {len(failed)} failed")
+    for name in failed:
+        print(f"   ❌ {name}")
+    return not failed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Verify GTU LaTeX Solutions.')
+    parser.add_argument('file_en', help='English Solution File (path to .tex file), or a directory to verify every pair in')
+    parser.add_argument('file_gu', nargs='?', help='Gujarati Solution File (path to .gu.tex file)')
+    parser.add_argument('--skip-compile', action='store_true', help='Skip the pdflatex/xelatex compilation checks')
+    parser.add_argument('--queue', help='Directory mode: distribute pairs through this work queue (see work_queue.py)')
+    parser.add_argument('--jobs', '-j', type=int, default=1, help='Directory mode with --queue: local workers')
+    
+    args = parser.parse_args()
+    
+    if os.path.isdir(args.file_en):
+        sys.exit(0 if verify_directory(args.file_en, compile_check=not args.skip_compile,
+                                       queue=args.queue, jobs=args.jobs or os.cpu_count() or 1) else 1)
+    if not args.file_gu:
+        parser.error('file_gu is required unless file_en is a directory')
+    sys.exit(0 if verify_pair(args.file_en, args.file_gu, compile_check=not args.skip_compile) else 1)
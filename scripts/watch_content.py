@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Content Watch Mode
+Watches content/ while solutions are being edited and rebuilds only the
+artifacts a save affects, in one long-lived process so the content snapshot,
+solution index and frontmatter index stay warm between rebuilds:
+
+- *-solution.mdx / *-solution.gu.mdx  -> that file's LaTeX (and PDF) via
+  convert_mdx_to_pdf, then, if its subject has a question bank, a check
+  that its "## Question" headings still parse (question_bank_corpus.py)
+- *-solution.tex / *-solution.gu.tex  -> verify_solutions on the En/Gu pair
+- other files (images, generated *-pandoc.tex, editor temp files) are ignored
+
+Changes are collected until the tree has been quiet for --debounce seconds,
+so an editor's write-rename-chmod sequence or a multi-file save triggers one
+rebuild. On Linux, directories are watched with inotify (through ctypes, no
+extra package); elsewhere, or with --poll, the tree is re-scanned every
+--interval seconds.
+
+Verification skips the pdflatex/xelatex compile unless --compile is given,
+and conversion stops at LaTeX unless --pdf is given, which keeps feedback for
+the refactor and verification steps under a second.
+
+Regenerating the subject's question-bank shard is out of scope. Each subject
+generator writes its own bank schema and statistics from exported .md
+solutions at fixed paths, so one paper's records cannot be replaced safely
+from here. The heading check only catches papers the generators and corpus
+tools would no longer read; banks are still regenerated by hand.
+
+Usage:
+    # Watch everything under content/
+    python3 watch_content.py
+
+    # One subject, with PDFs and compile checks
+    python3 watch_content.py content/resources/study-materials/32-ict/sem-3/1333203-dsa --pdf --compile
+
+    # No question-heading checks, polling instead of inotify
+    python3 watch_content.py --no-banks --poll
+"""
+
+import sys
+import os
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from solution_index import CONTENT_DIR, SOLUTION_RE, is_solution_source, sibling_name
+from convert_mdx_to_pdf import convert_mdx_to_pdf
+from verify_solutions import verify_pair
+from content_snapshot import read_text, refresh_default_snapshot
+from question_bank_corpus import BANK_PATTERN, parse_solution_sections
+
+
+DEFAULT_DEBOUNCE = 0.3
+DEFAULT_INTERVAL = 1.0
+
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+EVENT_HEADER = struct.Struct('iIII')
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE_SELF
+
+
+def _watched_dirs(root):
+    for dirpath, dirnames, _ in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith('.') and d != 'node_modules']
+        yield dirpath
+
+
+class InotifyWatcher:
+    """Recursive inotify watch on a directory tree (Linux only)"""
+
+    def __init__(self, root):
+        libc_name = ctypes.util.find_library('c')
+        if not sys.platform.startswith('linux') or not libc_name:
+            raise OSError(errno.ENOSYS, 'inotify is only available on Linux')
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self._dirs = {}
+        for path in _watched_dirs(root):
+            self._add(path)
+
+    def _add(self, path):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                raise OSError(err, 'inotify watch limit reached (fs.inotify.max_user_watches)')
+            return
+        self._dirs[wd] = path
+
+    def wait(self, timeout):
+        """Paths changed within timeout seconds (empty list on timeout)."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        changed = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                print("⚠️  inotify queue overflowed; some saves may have been missed")
+                continue
+            if mask & IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+            directory = self._dirs.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and not name.startswith('.'):
+                    for sub in _watched_dirs(path):
+                        self._add(sub)
+                continue
+            if mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                changed.append(path)
+        return changed
+
+    def close(self):
+        os.close(self._fd)
+
+
+class PollingWatcher:
+    """Portable fallback: compares source mtimes every interval seconds"""
+
+    def __init__(self, root, interval=DEFAULT_INTERVAL):
+        self.root = root
+        self.interval = interval
+        self._mtimes = self._scan()
+
+    def _scan(self):
+        mtimes = {}
+        for dirpath in _watched_dirs(self.root):
+            try:
+                with os.scandir(dirpath) as it:
+                    for entry in it:
+                        if entry.is_file() and is_solution_source(entry.name):
+                            mtimes[entry.path] = entry.stat().st_mtime_ns
+            except OSError:
+                continue
+        return mtimes
+
+    def wait(self, timeout):
+        time.sleep(min(timeout, self.interval))
+        mtimes = self._scan()
+        changed = [path for path, mtime in mtimes.items() if self._mtimes.get(path) != mtime]
+        self._mtimes = mtimes
+        return changed
+
+    def close(self):
+        pass
+
+
+def find_question_bank(path, root):
+    """The question bank of the subject a file belongs to, or None."""
+    path = Path(path).resolve()
+    # Search up to content/ so watching a subfolder still finds the subject's bank
+    stop = CONTENT_DIR.resolve() if CONTENT_DIR.resolve() in path.parents else Path(root).resolve()
+    directory = path.parent
+    while directory == stop or stop in directory.parents:
+        matches = sorted(directory.glob(BANK_PATTERN))
+        if matches:
+            return matches[0]
+        directory = directory.parent
+    return None
+
+
+def plan_rebuild(paths, root, banks=True):
+    """
+    Work out the artifacts affected by a batch of changed files.
+
+    Returns:
+        Dict with 'convert' (MDX Paths), 'verify' ((English, Gujarati) TeX
+        pairs) and 'banks' ((question bank, MDX) pairs to check), each
+        sorted and de-duplicated
+    """
+    convert, verify, bank_checks = set(), set(), set()
+    for path in map(Path, paths):
+        match = SOLUTION_RE.search(path.name)
+        if not match or not path.exists():
+            continue
+        if match.group(2) == 'mdx':
+            convert.add(path)
+            bank = find_question_bank(path, root) if banks else None
+            if bank:
+                bank_checks.add((bank, path))
+        else:
+            sibling = path.with_name(sibling_name(path.name))
+            if sibling.exists():
+                verify.add((sibling, path) if match.group(1) else (path, sibling))
+            else:
+                print(f"⚠️  {path.name}: no {'English' if match.group(1) else 'Gujarati'} sibling to verify against")
+    return {'convert': sorted(convert), 'verify': sorted(verify), 'banks': sorted(bank_checks)}
+
+
+def rebuild(plan, generate_pdf=False, compile_check=False):
+    """Run a rebuild plan; returns (succeeded, failed) counts."""
+    succeeded = failed = 0
+
+    def record(ok):
+        nonlocal succeeded, failed
+        if ok:
+            succeeded += 1
+        else:
+            failed += 1
+
+    for mdx_path in plan['convert']:
+        record(convert_mdx_to_pdf(mdx_path, generate_pdf=generate_pdf))
+    for file_en, file_gu in plan['verify']:
+        record(verify_pair(str(file_en), str(file_gu), compile_check=compile_check))
+    for bank, mdx_path in plan['banks']:
+        # Same parser the search index and mock papers use to pick questions out of solutions
+        sections = parse_solution_sections(read_text(mdx_path))
+        if sections:
+            print(f"\n🏦 {mdx_path.name}: {len(sections)} question(s) parse for {bank.name} "
+                  f"(run the subject's generator to update the bank)")
+        else:
+            print(f"\n⚠️  {mdx_path.name}: no '## Question ... [N marks]' headings parse; "
+                  f"{bank.name} tools will not find its questions")
+        record(bool(sections))
+    return succeeded, failed
+
+
+def watch(root, debounce=DEFAULT_DEBOUNCE, poll=False, interval=DEFAULT_INTERVAL,
+          banks=True, generate_pdf=False, compile_check=False):
+    """Watch root until interrupted, rebuilding affected artifacts after each quiet period."""
+    watcher = None
+    if not poll:
+        try:
+            watcher = InotifyWatcher(root)
+            print(f"👀 Watching {root} (inotify)")
+        except OSError as e:
+            print(f"⚠️  inotify unavailable ({e.strerror}); falling back to polling")
+    if watcher is None:
+        watcher = PollingWatcher(root, interval)
+        print(f"👀 Watching {root} (polling every {interval}s)")
+
+    refresh_default_snapshot()
+    try:
+        while True:
+            pending = set(watcher.wait(3600))
+            if not pending:
+                continue
+            # Debounce: keep collecting until nothing changed for `debounce` seconds
+            while True:
+                more = watcher.wait(debounce)
+                if not more:
+                    break
+                pending.update(more)
+
+            start = time.perf_counter()
+            plan = plan_rebuild(sorted(pending), root, banks=banks)
+            if not any(plan.values()):
+                continue
+            print(f"\n🔁 {len(pending)} change(s): {len(plan['convert'])} to convert, "
+                  f"{len(plan['verify'])} pair(s) to verify, {len(plan['banks'])} bank check(s)")
+            succeeded, failed = rebuild(plan, generate_pdf=generate_pdf, compile_check=compile_check)
+            status = '✅' if not failed else '❌'
+            print(f"{status} Rebuilt {succeeded + failed} artifact(s), {failed} failed, "
+                  f"in {time.perf_counter() - start:.2f}s. Waiting for changes...")
+            # Saved files would otherwise be read from disk until the next full refresh
+            refresh_default_snapshot()
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+    finally:
+        watcher.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rebuild the artifacts affected by each saved solution file')
+    parser.add_argument('path', nargs='?', default=str(CONTENT_DIR), help='Directory to watch (default: content/)')
+    parser.add_argument('--debounce', type=float, default=DEFAULT_DEBOUNCE,
+                        help=f'Quiet period before rebuilding, in seconds (default: {DEFAULT_DEBOUNCE})')
+    parser.add_argument('--poll', action='store_true', help='Poll for changes instead of using inotify')
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL,
+                        help=f'Polling interval in seconds (default: {DEFAULT_INTERVAL})')
+    parser.add_argument('--pdf', action='store_true', help='Compile PDFs, not just LaTeX, for changed MDX files')
+    parser.add_argument('--compile', action='store_true', help='Include compilation checks when verifying TeX pairs')
+    parser.add_argument('--no-banks', action='store_true', help='Do not check saved solutions against their question bank')
+    args = parser.parse_args()
+
+    root = Path(args.path).resolve()
+    if not root.is_dir():
+        print(f"❌ ERROR: Not a directory: {root}")
+        sys.exit(1)
+
+    watch(str(root), debounce=args.debounce, poll=args.poll, interval=args.interval,
+          banks=not args.no_banks, generate_pdf=args.pdf, compile_check=args.compile)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+Build Work Queue with Leases, Retries and Shared Artifacts
+Lets the batch builders (convert_mdx_to_pdf.py and verify_solutions.py in
+directory mode) hand their jobs to a queue that any number of worker
+processes, on this machine or on other build boxes, drain together.
+
+- A worker leases one job at a time, highest estimated cost first, and
+  renews the lease while it runs. If the worker dies, the lease expires and
+  another worker picks the job up again, up to MAX_ATTEMPTS times.
+- A job that runs but fails (a LaTeX error, a failed check) is finished
+  with its result; only crashes and lost workers are retried.
+- Jobs carry project-relative paths, so workers resolve them against their
+  own checkout. Built files are copied into .cache/artifacts by content
+  hash and listed in the job result; the submitting node fetches any it
+  does not already have, so with a shared STUDY_CACHE_DIR any node can
+  serve what another one built.
+
+The default backend is a SQLite file (.cache/queue/jobs.db) that needs no
+server. It uses a rollback journal rather than WAL, so it also works when
+the file is on a shared filesystem with working POSIX locks (NFSv4, SMB).
+Other backends register a URL scheme in BACKENDS and implement the same
+methods as SQLiteQueue.
+
+Usage:
+    # Submit a batch and build it with 4 local workers (other hosts may join)
+    python3 convert_mdx_to_pdf.py content --queue .cache/queue/jobs.db --jobs 4
+
+    # On another build box with the same checkout and cache
+    python3 work_queue.py worker --queue /shared/cache/queue/jobs.db
+
+    # Queue contents
+    python3 work_queue.py status
+"""
+
+import sys
+import os
+import io
+import json
+import time
+import uuid
+import shutil
+import socket
+import sqlite3
+import argparse
+import threading
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from cache_utils import get_cache_dir, hash_file
+from refactor_pandoc_latex import get_project_root
+
+
+MAX_ATTEMPTS = 3
+LEASE_SECONDS = 600
+POLL_SECONDS = 1.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    batch TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    priority REAL NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    worker TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    created REAL NOT NULL,
+    finished REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, batch, priority);
+"""
+
+
+@dataclass
+class Job:
+    """One leased unit of work"""
+    id: int
+    batch: str
+    kind: str
+    payload: dict
+    attempts: int
+
+
+def default_queue_path():
+    return get_cache_dir('queue') / 'jobs.db'
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class SQLiteQueue:
+    """Work queue in a single SQLite file"""
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else default_queue_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.spec = f"sqlite://{self.path}"
+        self._db = sqlite3.connect(str(self.path), timeout=60, isolation_level=None)
+        self._db.executescript(SCHEMA)
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        # IMMEDIATE takes the write lock up front, so two workers never lease the same job
+        self._db.execute('BEGIN IMMEDIATE')
+        try:
+            yield self._db
+            self._db.execute('COMMIT')
+        except BaseException:
+            self._db.execute('ROLLBACK')
+            raise
+
+    def enqueue(self, batch, kind, items, max_attempts=MAX_ATTEMPTS):
+        """Add (payload dict, priority) items; higher priority is leased first."""
+        now = time.time()
+        with self._transaction() as db:
+            db.executemany(
+                'INSERT INTO jobs (batch, kind, payload, priority, max_attempts, created) VALUES (?, ?, ?, ?, ?, ?)',
+                [(batch, kind, json.dumps(payload), priority, max_attempts, now) for payload, priority in items])
+
+    def lease(self, worker, kinds=None, batch=None, seconds=LEASE_SECONDS):
+        """The next job to run, or None. Expired leases count as pending."""
+        now = time.time()
+        query = ("SELECT id, batch, kind, payload, attempts, max_attempts FROM jobs "
+                 "WHERE (status = 'pending' OR (status = 'leased' AND lease_expires < ?))")
+        params = [now]
+        if batch:
+            query += ' AND batch = ?'
+            params.append(batch)
+        if kinds:
+            query += f" AND kind IN ({','.join('?' * len(kinds))})"
+            params.extend(kinds)
+        query += ' ORDER BY priority DESC, id LIMIT 1'
+
+        with self._transaction() as db:
+            while True:
+                row = db.execute(query, params).fetchone()
+                if row is None:
+                    return None
+                job_id, job_batch, kind, payload, attempts, max_attempts = row
+                if attempts >= max_attempts:
+                    # Its last worker died too
+                    db.execute("UPDATE jobs SET status = 'failed', error = ?, finished = ? WHERE id = ?",
+                               ('lease expired on every attempt', now, job_id))
+                    continue
+                db.execute("UPDATE jobs SET status = 'leased', worker = ?, attempts = attempts + 1, "
+                           "lease_expires = ? WHERE id = ?", (worker, now + seconds, job_id))
+                return Job(job_id, job_batch, kind, json.loads(payload), attempts + 1)
+
+    def renew(self, job, worker, seconds=LEASE_SECONDS):
+        """Extend a lease; False if the job was taken over by another worker."""
+        with self._transaction() as db:
+            cursor = db.execute("UPDATE jobs SET lease_expires = ? WHERE id = ? AND worker = ? AND status = 'leased'",
+                                (time.time() + seconds, job.id, worker))
+            return cursor.rowcount == 1
+
+    def complete(self, job, worker, result):
+        with self._transaction() as db:
+            db.execute("UPDATE jobs SET status = 'done', result = ?, finished = ? "
+                       "WHERE id = ? AND worker = ? AND status = 'leased'",
+                       (json.dumps(result), time.time(), job.id, worker))
+
+    def fail(self, job, worker, error):
+        """Record a crash; the job goes back to pending until its attempts run out."""
+        with self._transaction() as db:
+            db.execute("UPDATE jobs SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'pending' END, "
+                       "error = ?, lease_expires = NULL, "
+                       "finished = CASE WHEN attempts >= max_attempts THEN ? ELSE NULL END "
+                       "WHERE id = ? AND worker = ? AND status = 'leased'",
+                       (error, time.time(), job.id, worker))
+
+    def finished_jobs(self, batch, exclude=()):
+        """[(id, payload, status, result, error)] of the batch's finished jobs."""
+        rows = self._db.execute("SELECT id, payload, status, result, error FROM jobs "
+                                "WHERE batch = ? AND status IN ('done', 'failed') ORDER BY finished",
+                                (batch,)).fetchall()
+        return [(job_id, json.loads(payload), status, json.loads(result) if result else None, error)
+                for job_id, payload, status, result, error in rows if job_id not in exclude]
+
+    def counts(self, batch=None):
+        """{status: count}, for one batch or the whole queue."""
+        if batch:
+            rows = self._db.execute('SELECT status, COUNT(*) FROM jobs WHERE batch = ? GROUP BY status', (batch,))
+        else:
+            rows = self._db.execute('SELECT status, COUNT(*) FROM jobs GROUP BY status')
+        return dict(rows.fetchall())
+
+    def unfinished(self, batch=None):
+        counts = self.counts(batch)
+        return counts.get('pending', 0) + counts.get('leased', 0)
+
+    def purge(self, batch):
+        with self._transaction() as db:
+            db.execute('DELETE FROM jobs WHERE batch = ?', (batch,))
+
+    def close(self):
+        self._db.close()
+
+
+BACKENDS = {'sqlite': SQLiteQueue}
+
+
+def open_queue(spec=None):
+    """Queue for a spec: None (default SQLite file), a path, or scheme://location."""
+    if spec and '://' in str(spec):
+        scheme, location = str(spec).split('://', 1)
+        if scheme not in BACKENDS:
+            raise ValueError(f"unknown queue backend '{scheme}' (known: {', '.join(sorted(BACKENDS))})")
+        return BACKENDS[scheme](location or None)
+    return SQLiteQueue(spec)
+
+
+# --- Artifacts ---------------------------------------------------------------
+
+def project_relative(path):
+    """Path as workers on other checkouts see it (absolute if outside the project)."""
+    path = Path(path).resolve()
+    try:
+        return path.relative_to(get_project_root()).as_posix()
+    except ValueError:
+        return str(path)
+
+
+def publish_artifacts(paths):
+    """Copy built files into .cache/artifacts; returns {project-relative path: sha256}."""
+    store = get_cache_dir('artifacts')
+    published = {}
+    for path in map(Path, paths):
+        if not path.exists():
+            continue
+        digest = hash_file(path)
+        target = store / digest
+        if not target.exists():
+            tmp = store / f".{digest}.{os.getpid()}"
+            shutil.copyfile(path, tmp)
+            os.replace(tmp, target)
+        published[project_relative(path)] = digest
+    return published
+
+
+def fetch_artifacts(published):
+    """Put published files in place in this checkout; returns how many were copied."""
+    store = get_cache_dir('artifacts')
+    root = get_project_root()
+    copied = 0
+    for rel, digest in (published or {}).items():
+        path = root / rel
+        source = store / digest
+        if (path.exists() and hash_file(path) == digest) or not source.exists():
+            continue
+        tmp = path.with_name(f".{path.name}.{os.getpid()}")
+        shutil.copyfile(source, tmp)
+        os.replace(tmp, path)
+        copied += 1
+    return copied
+
+
+# --- Job handlers ------------------------------------------------------------
+# Imported inside the handlers: the batch builders import this module
+
+def run_convert(payload):
+    from convert_mdx_to_pdf import _convert_job, output_path
+
+    mdx_path = get_project_root() / payload['mdx']
+    ok, timings, log = _convert_job(mdx_path, payload['generate_pdf'], payload['keep_aux'],
+                                    payload['deterministic'], payload['optimize'], payload['export_formats'])
+    outputs = [output_path(mdx_path, ext)
+               for ext in ['tex'] + (['pdf'] if payload['generate_pdf'] else []) + payload['export_formats']]
+    return {'ok': ok, 'timings': timings, 'log': log, 'artifacts': publish_artifacts(outputs) if ok else {}}
+
+
+def run_verify(payload):
+    from verify_solutions import verify_pair
+
+    root = get_project_root()
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        ok = verify_pair(str(root / payload['en']), str(root / payload['gu']),
+                         compile_check=payload['compile_check'])
+    return {'ok': ok, 'log': log.getvalue()}
+
+
+HANDLERS = {'convert': run_convert, 'verify': run_verify}
+
+
+def _renew_until(stop, queue_spec, job, worker, seconds):
+    queue = open_queue(queue_spec)
+    try:
+        while not stop.wait(seconds / 3):
+            if not queue.renew(job, worker, seconds):
+                return
+    finally:
+        queue.close()
+
+
+def run_worker(queue_spec=None, kinds=None, batch=None, until_done=False, lease_seconds=LEASE_SECONDS,
+               idle_exit=None):
+    """
+    Lease and run jobs until stopped.
+
+    With until_done, return once the batch (or the whole queue) has no
+    pending or leased jobs left; with idle_exit, after that many seconds
+    without work. Returns the number of jobs run.
+    """
+    queue = open_queue(queue_spec)
+    worker = worker_name()
+    ran = 0
+    idle_since = time.monotonic()
+    asset_dirs = set()
+    try:
+        while True:
+            job = queue.lease(worker, kinds=kinds, batch=batch, seconds=lease_seconds)
+            if job is None:
+                if until_done and not queue.unfinished(batch):
+                    break
+                if idle_exit is not None and time.monotonic() - idle_since > idle_exit:
+                    break
+                time.sleep(POLL_SECONDS)
+                continue
+
+            stop = threading.Event()
+            renewer = threading.Thread(target=_renew_until, args=(stop, queue.spec, job, worker, lease_seconds),
+                                       daemon=True)
+            renewer.start()
+            try:
+                result = HANDLERS[job.kind](job.payload)
+            except Exception as e:
+                queue.fail(job, worker, f"{type(e).__name__}: {e}")
+            else:
+                queue.complete(job, worker, result)
+                if job.kind == 'convert' and job.payload['generate_pdf'] and not job.payload['keep_aux']:
+                    asset_dirs.add((get_project_root() / job.payload['mdx']).parent)
+            finally:
+                stop.set()
+                renewer.join()
+            ran += 1
+            idle_since = time.monotonic()
+    finally:
+        queue.close()
+        if asset_dirs:
+            # Diagrams and figures this worker left behind; they are embedded now
+            from convert_mdx_to_pdf import remove_mermaid_pdfs
+            from image_cache import remove_normalized_images
+            with contextlib.redirect_stdout(io.StringIO()):
+                for work_dir in sorted(asset_dirs):
+                    remove_mermaid_pdfs(work_dir)
+                    remove_normalized_images(work_dir)
+    return ran
+
+
+def run_batch(queue, kind, items, workers=1):
+    """
+    Enqueue a batch, drain it with local worker processes (other hosts may
+    help) and yield (payload, status, result, error) as jobs finish.
+    """
+    batch = uuid.uuid4().hex[:12]
+    queue.enqueue(batch, kind, items)
+    print(f"📮 Queued {len(items)} {kind} job(s) as batch {batch} in {queue.spec}")
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 0 else None
+    try:
+        local = [pool.submit(run_worker, queue.spec, [kind], batch, True) for _ in range(workers)] if pool else []
+        reported = set()
+        while True:
+            for job_id, payload, status, result, error in queue.finished_jobs(batch, reported):
+                reported.add(job_id)
+                yield payload, status, result, error
+            if len(reported) == len(items):
+                break
+            for future in local:
+                if future.done() and future.exception():
+                    raise RuntimeError(f"local worker failed: {future.exception()}")
+            time.sleep(POLL_SECONDS)
+    finally:
+        if pool:
+            pool.shutdown()
+    queue.purge(batch)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run or inspect the build work queue')
+    sub = parser.add_subparsers(dest='command', required=True)
+    worker = sub.add_parser('worker', help='Lease and run jobs')
+    worker.add_argument('--queue', help='Queue file or URL (default: .cache/queue/jobs.db)')
+    worker.add_argument('--kinds', help=f"Comma-separated job kinds (default: {','.join(HANDLERS)})")
+    worker.add_argument('--lease', type=int, default=LEASE_SECONDS, help='Lease length in seconds')
+    worker.add_argument('--idle-exit', type=float, help='Exit after this many seconds without work')
+    worker.add_argument('--until-done', action='store_true', help='Exit once no job is pending or running')
+    status = sub.add_parser('status', help='Show job counts')
+    status.add_argument('--queue', help='Queue file or URL (default: .cache/queue/jobs.db)')
+    args = parser.parse_args()
+
+    if args.command == 'status':
+        queue = open_queue(args.queue)
+        counts = queue.counts()
+        print(f"📮 {queue.spec}: " + (', '.join(f"{n} {s}" for s, n in sorted(counts.items())) or 'empty'))
+        return
+
+    kinds = args.kinds.split(',') if args.kinds else None
+    print(f"👷 Worker {worker_name()} on {args.queue or default_queue_path()}")
+    ran = run_worker(args.queue, kinds=kinds, until_done=args.until_done, lease_seconds=args.lease,
+                     idle_exit=args.idle_exit)
+    print(f"👋 Ran {ran} job(s)")
+
+
+if __name__ == '__main__':
+    main()